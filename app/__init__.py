@@ -10,6 +10,7 @@ Glossary:
 
 import logging
 import os
+import weakref
 from typing import Any
 
 from flask import Flask
@@ -23,6 +24,8 @@ from .extensions import cache, csrf, db, limiter, mail, migrate, server_session
 from .logging_config import configure_logging
 from .middleware import register_middleware
 from .resilience import register_resilience_handlers
+from .services.public_media_service import install_media_cache_headers
+from .utils.performance_monitor import install_query_metrics
 from .utils.redis_pool import LazyRedisClient, get_redis_pool
 
 logger = logging.getLogger(__name__)
@@ -42,6 +45,7 @@ def create_app(config: dict[str, Any] | None = None) -> Flask:
 
     db.init_app(app)
     _configure_db_timeouts(app)
+    install_query_metrics(app)
     migrate.init_app(app, db)
     csrf.init_app(app)
     mail.init_app(app)
@@ -52,6 +56,7 @@ def create_app(config: dict[str, Any] | None = None) -> Flask:
 
     configure_login_manager(app)
     register_middleware(app)
+    install_media_cache_headers(app)
     register_blueprints(app)
     from . import models  # noqa: F401  # ensure models registered for Alembic
     from .template_context import register_template_context
@@ -66,6 +71,7 @@ def create_app(config: dict[str, Any] | None = None) -> Flask:
 
     register_commands(app)
     _run_optional_create_all(app)
+    _register_fork_safety(app)
 
     return app
 
@@ -335,6 +341,40 @@ def _configure_db_timeouts(app: Flask) -> None:
                 cursor.close()
 
 
+# --- Fork safety ---
+# Purpose: Keep a preloaded app safe to share across forked Gunicorn workers.
+# Inputs: Fully built Flask app.
+# Outputs: Registers an after-fork hook that drops inherited DB connections.
+def _register_fork_safety(app: Flask) -> None:
+    """Discard pooled DB connections inherited from the parent after a fork.
+
+    With ``GUNICORN_PRELOAD_APP`` the master builds the app (and may open
+    connections, e.g. ``db.create_all``) before forking. Sockets must not be
+    shared across processes, so each child drops the inherited pool without
+    closing it (the parent still owns those sockets). Redis pools already
+    rebuild per PID in ``get_redis_pool``.
+    """
+    if not hasattr(os, "register_at_fork"):  # pragma: no cover - non-POSIX
+        return
+    app_ref = weakref.ref(app)
+
+    def _reset_inherited_pools() -> None:
+        child_app = app_ref()
+        if child_app is None:
+            return
+        try:
+            with child_app.app_context():
+                for engine in db.engines.values():
+                    engine.dispose(close=False)
+        except Exception:
+            logger.warning(
+                "Suppressed exception fallback at app/__init__.py:367",
+                exc_info=True,
+            )
+
+    os.register_at_fork(after_in_child=_reset_inherited_pools)
+
+
 # --- Setup logging ---
 # Purpose: Configure log levels and app log formatters.
 # Inputs: Flask app placeholder for backward compatibility.
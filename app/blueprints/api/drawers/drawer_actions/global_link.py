@@ -136,6 +136,7 @@ def global_link_confirm():
 
     updated = 0
     skipped = 0
+    unit_types = GlobalLinkSuggestionService.unit_type_map()
 
     for raw_id in item_ids:
         try:
@@ -160,7 +161,7 @@ def global_link_confirm():
                 continue
 
             if not GlobalLinkSuggestionService.is_pair_compatible(
-                global_item.default_unit, inventory_item.unit
+                global_item.default_unit, inventory_item.unit, unit_types
             ):
                 skipped += 1
                 continue
@@ -35,10 +35,14 @@ from app.services.batchbot_usage_service import (
 from app.services.cache_invalidation import (
     ingredient_list_cache_key,
     product_bootstrap_cache_key,
+    product_bootstrap_version,
     recipe_bootstrap_cache_key,
+    recipe_bootstrap_version,
+    reference_data_cache_key,
 )
-from app.utils.cache_utils import should_bypass_cache
+from app.utils.cache_utils import should_bypass_cache, stable_cache_key
 from app.utils.code_generator import generate_recipe_prefix
+from app.utils.payload_diff import diff_payloads
 from app.utils.permissions import require_permission
 
 # Configure logging
@@ -220,7 +224,7 @@ def get_dashboard_alerts():
 from app.models.product_category import ProductCategory
 from app.models.unit import Unit
 
-from ...utils.unit_utils import get_global_unit_list
+from ...utils.unit_utils import get_unit_search_index
 from .container_routes import container_api_bp
 from .ingredient_routes import ingredient_api_bp
 from .reservation_routes import reservation_api_bp
@@ -299,39 +303,17 @@ def get_category(cat_id):
 @login_required
 @require_permission("inventory.view")
 def list_units():
-    """Unified unit search using get_global_unit_list (standard + org custom)."""
+    """Unified unit search over the scoped unit index (standard + org custom)."""
     unit_type = (
         request.args.get("type") or request.args.get("unit_type") or ""
     ).strip()
     q = (request.args.get("q") or "").strip()
     try:
-        units = get_global_unit_list() or []
+        results = get_unit_search_index().search(q, unit_type or None, limit=50)
     except Exception:
-        logger.warning("Suppressed exception fallback at app/blueprints/api/routes.py:302", exc_info=True)
-        units = []
-
-    if unit_type:
-        units = [u for u in units if getattr(u, "unit_type", None) == unit_type]
-    if q:
-        q_lower = q.lower()
-        units = [
-            u
-            for u in units
-            if (getattr(u, "name", "") or "").lower().find(q_lower) != -1
-        ]
-
-    try:
-        units.sort(
-            key=lambda u: (
-                str(getattr(u, "unit_type", "") or ""),
-                str(getattr(u, "name", "") or ""),
-            )
-        )
-    except Exception:
-        logger.warning("Suppressed exception fallback at app/blueprints/api/routes.py:322", exc_info=True)
-        pass
+        logger.warning("Suppressed exception fallback at app/blueprints/api/routes.py:309", exc_info=True)
+        results = []
 
-    results = units[:50]
     return jsonify(
         {
             "success": True,
@@ -349,6 +331,75 @@ def list_units():
     )
 
 
+# --- Reference data ---
+# Purpose: Return units, ingredient categories, and container lists in one versioned payload.
+# Inputs: Optional If-None-Match header or `v` query param with a known version.
+# Outputs: JSON payload with ETag, or 304 when the client's version is current.
+@api_bp.route("/reference-data", methods=["GET"])
+@login_required
+@require_permission("inventory.view")
+def get_reference_data():
+    """Browser-cacheable reference data for unit, category, and container pickers."""
+    org_id = _resolve_org_id()
+    cache_key = reference_data_cache_key(org_id)
+    cached = None if should_bypass_cache() else cache.get(cache_key)
+    if not cached:
+        payload = _build_reference_data_payload()
+        cached = {"version": stable_cache_key("reference_data", payload), **payload}
+        cache.set(
+            cache_key,
+            cached,
+            timeout=current_app.config.get("REFERENCE_DATA_CACHE_TTL", 3600),
+        )
+
+    version = cached["version"]
+    if request.args.get("v") == version:
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(cached)
+    response.set_etag(version)
+    # Pickers reuse the browser copy for a short window, then revalidate with
+    # the ETag; unchanged data answers 304.
+    response.cache_control.private = True
+    response.cache_control.max_age = int(
+        current_app.config.get("REFERENCE_DATA_BROWSER_MAX_AGE", 60)
+    )
+    return response.make_conditional(request)
+
+
+def _build_reference_data_payload() -> dict:
+    from ...models import IngredientCategory
+    from ...services.developer.reference_data_service import ReferenceDataService
+
+    units = [
+        {
+            "id": unit.id,
+            "name": unit.name,
+            "symbol": unit.symbol,
+            "unit_type": unit.unit_type,
+            "base_unit": unit.is_base_unit,
+            "is_custom": unit.is_custom,
+        }
+        for unit in get_unit_search_index().units
+    ]
+    categories = [
+        {"id": cat.id, "name": cat.name, "default_density": cat.default_density}
+        for cat in IngredientCategory.query.filter_by(
+            organization_id=None, is_active=True, is_global_category=True
+        )
+        .order_by(IngredientCategory.name.asc())
+        .all()
+    ]
+    curated = ReferenceDataService.load_curated_container_lists()
+    containers = {
+        "material": list(curated.get("materials", [])),
+        "type": list(curated.get("types", [])),
+        "style": list(curated.get("styles", [])),
+        "color": list(curated.get("colors", [])),
+    }
+    return {"units": units, "categories": categories, "containers": containers}
+
+
 # --- Create unit ---
 # Purpose: Create a new unit for inventory usage.
 # Inputs: Function arguments plus active request/application context.
@@ -539,8 +590,8 @@ def get_ingredients():
 # =========================================================
 # --- Recipe bootstrap ---
 # Purpose: Return current master recipes + current variations.
-# Inputs: Function arguments plus active request/application context.
-# Outputs: Return value or response payload for caller/HTTP client.
+# Inputs: Optional If-None-Match header, `v` (known version), or `since` (delta base).
+# Outputs: 304, a delta against `since`, or the full payload; all carry the version ETag.
 @api_bp.route("/bootstrap/recipes", methods=["GET"])
 @login_required
 @require_permission("recipes.view")
@@ -550,17 +601,17 @@ def bootstrap_recipes():
     if not org_id:
         return jsonify({"recipes": [], "count": 0})
 
-    cache_key = recipe_bootstrap_cache_key(org_id)
-    bypass_cache = should_bypass_cache()
-    cache_ttl = current_app.config.get("RECIPE_BOOTSTRAP_CACHE_TTL", 300)
+    return _serve_bootstrap(
+        "recipes",
+        org_id,
+        version=recipe_bootstrap_version(org_id),
+        cache_key_for=lambda version: recipe_bootstrap_cache_key(org_id, version),
+        build_payload=lambda: _build_recipe_bootstrap_payload(org_id),
+        cache_ttl=current_app.config.get("RECIPE_BOOTSTRAP_CACHE_TTL", 300),
+    )
 
-    if not bypass_cache:
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return jsonify(
-                {"recipes": cached, "count": len(cached), "cache": "hit", "version": 1}
-            )
 
+def _build_recipe_bootstrap_payload(org_id: int) -> dict:
     masters = (
         Recipe.scoped().options(
             load_only(
@@ -638,16 +689,13 @@ def bootstrap_recipes():
             }
         )
 
-    cache.set(cache_key, recipes, timeout=cache_ttl)
-    return jsonify(
-        {"recipes": recipes, "count": len(recipes), "cache": "miss", "version": 1}
-    )
+    return {"recipes": recipes, "count": len(recipes)}
 
 
 # --- Product bootstrap ---
 # Purpose: Return product list + SKU inventory ids.
-# Inputs: Function arguments plus active request/application context.
-# Outputs: Return value or response payload for caller/HTTP client.
+# Inputs: Optional If-None-Match header, `v` (known version), or `since` (delta base).
+# Outputs: 304, a delta against `since`, or the full payload; all carry the version ETag.
 @api_bp.route("/bootstrap/products", methods=["GET"])
 @login_required
 @require_permission("products.view")
@@ -657,15 +705,17 @@ def bootstrap_products():
     if not org_id:
         return jsonify({"products": [], "sku_inventory_ids": []})
 
-    cache_key = product_bootstrap_cache_key(org_id)
-    bypass_cache = should_bypass_cache()
-    cache_ttl = current_app.config.get("PRODUCT_BOOTSTRAP_CACHE_TTL", 300)
+    return _serve_bootstrap(
+        "products",
+        org_id,
+        version=product_bootstrap_version(org_id),
+        cache_key_for=lambda version: product_bootstrap_cache_key(org_id, version),
+        build_payload=lambda: _build_product_bootstrap_payload(org_id),
+        cache_ttl=current_app.config.get("PRODUCT_BOOTSTRAP_CACHE_TTL", 300),
+    )
 
-    if not bypass_cache:
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return jsonify({**cached, "cache": "hit", "version": 1})
 
+def _build_product_bootstrap_payload(org_id: int) -> dict:
     products = (
         Product.scoped().options(load_only(Product.id, Product.name))
         .filter(
@@ -686,7 +736,7 @@ def bootstrap_products():
         .all()
     )
 
-    payload = {
+    return {
         "products": [{"id": product.id, "name": product.name} for product in products],
         "sku_inventory_ids": [
             row.inventory_item_id
@@ -695,8 +745,45 @@ def bootstrap_products():
         ],
     }
 
-    cache.set(cache_key, payload, timeout=cache_ttl)
-    return jsonify({**payload, "cache": "miss", "version": 1})
+
+# --- Bootstrap responses ---
+# Purpose: Answer a bootstrap request from the org's namespace version.
+# Inputs: Payload kind, org, current version, versioned cache-key factory, builder, TTL.
+# Outputs: 304 when the client is current (nothing loaded or serialized), a delta
+#          when the `since` payload is still cached, otherwise the full payload.
+def _serve_bootstrap(kind, org_id, *, version, cache_key_for, build_payload, cache_ttl):
+    etag = f"{kind}-{org_id}-{version}"
+    known = request.args.get("v") or request.args.get("since")
+    if known == str(version) or request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+        return _finish_bootstrap_response(response, etag)
+
+    cache_key = cache_key_for(version)
+    payload = None if should_bypass_cache() else cache.get(cache_key)
+    cache_state = "hit"
+    if payload is None:
+        cache_state = "miss"
+        payload = build_payload()
+        cache.set(cache_key, payload, timeout=cache_ttl)
+
+    since = request.args.get("since", type=int)
+    previous = cache.get(cache_key_for(since)) if since is not None else None
+    if previous is not None:
+        body = {
+            "mode": "delta",
+            "since": since,
+            "changes": diff_payloads(previous, payload),
+        }
+    else:
+        body = {**payload, "mode": "full"}
+    response = jsonify({**body, "cache": cache_state, "version": version})
+    return _finish_bootstrap_response(response, etag)
+
+
+def _finish_bootstrap_response(response, etag):
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
 
 
 # =========================================================
@@ -804,6 +891,8 @@ def batchbot_chat():
                 "tool_results": response.tool_results,
                 "usage": response.usage,
                 "quota": _serialize_quota(response.quota, response.credits),
+                "context": response.context,
+                "history_entry": response.history_entry,
             }
         )
     except BatchBotLimitError as exc:
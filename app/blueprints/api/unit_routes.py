@@ -17,7 +17,7 @@ from flask_login import login_required
 from app.models.models import Unit
 from app.services.unit_conversion import ConversionEngine
 from app.utils.permissions import require_permission
-from app.utils.unit_utils import get_global_unit_list
+from app.utils.unit_utils import get_global_unit_list, get_unit_search_index
 
 logger = logging.getLogger(__name__)
 
@@ -74,7 +74,7 @@ def unit_search():
 
     Query params:
       - type: unit_type to filter (e.g., 'count')
-      - q: substring match on name (optional)
+      - q: substring match on name or prefix match on symbol (optional)
     """
     try:
         unit_type = (
@@ -82,31 +82,8 @@ def unit_search():
         ).strip()
         q = (request.args.get("q") or "").strip()
 
-        # Reuse the same source of truth as other unit lists
-        units = get_global_unit_list() or []
-
-        # Filter by type if provided
-        if unit_type:
-            units = [u for u in units if (getattr(u, "unit_type", None) == unit_type)]
-
-        # Filter by query (case-insensitive substring on name)
-        if q:
-            q_lower = q.lower()
-            units = [
-                u
-                for u in units
-                if (getattr(u, "name", "") or "").lower().find(q_lower) != -1
-            ]
-
-        # Sort like other lists
-        units.sort(
-            key=lambda u: (
-                str(getattr(u, "unit_type", "") or ""),
-                str(getattr(u, "name", "") or ""),
-            )
-        )
-
-        results = units[:25]
+        # Same scoped source of truth as other unit lists, pre-sorted and indexed
+        results = get_unit_search_index().search(q, unit_type or None, limit=25)
         return jsonify(
             {
                 "success": True,
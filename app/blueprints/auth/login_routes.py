@@ -50,6 +50,10 @@ from . import auth_bp
 
 logger = logging.getLogger(__name__)
 
+_NETWORK_THROTTLE_MESSAGE = (
+    "Too many failed login attempts from this network. Please try again in a few minutes."
+)
+
 
 # --- Loadtest login diagnostics ---
 # Purpose: Emit safe context for debugging load-test auth failures.
@@ -290,7 +294,11 @@ def login():
         lockout_state = LoginLockoutService.is_locked(
             user_id=getattr(user, "id", None),
             identifier=normalized_identifier,
+            ip=request.remote_addr,
         )
+        if lockout_state.locked and not lockout_state.requires_password_reset:
+            flash(_NETWORK_THROTTLE_MESSAGE, "error")
+            return _render_login_page(429)
         if lockout_state.locked:
             flash(
                 "Too many failed login attempts. Please reset your password to unlock your account.",
@@ -443,11 +451,15 @@ def login():
         post_failure_state = LoginLockoutService.record_failure(
             user_id=getattr(user, "id", None),
             identifier=normalized_identifier,
+            ip=request.remote_addr,
         )
         if login_identifier and login_identifier.startswith("[REDACTED]"):
             logger.warning(
                 "Load test login failed: invalid credentials for %s", login_identifier
             )
+        if post_failure_state.locked and not post_failure_state.requires_password_reset:
+            flash(_NETWORK_THROTTLE_MESSAGE, "error")
+            return _render_login_page(429)
         if post_failure_state.locked:
             flash(
                 "Too many failed login attempts. Please reset your password to unlock your account.",
@@ -22,6 +22,8 @@ from app.utils.permissions import (
 
 from ...models import Batch, InventoryItem, Product, ProductVariant, db
 from ...models.inventory_lot import InventoryLot
+from ...services.batch_service.cost_rollup import BatchCostRollupService
+from ...services.freshness_service import FreshnessService
 from ...services.inventory_adjustment import process_inventory_adjustment
 
 finish_batch_bp = Blueprint("finish_batch", __name__)
@@ -309,6 +311,18 @@ def _complete_batch_internal(batch_id, form_data):
             logger.warning("Suppressed exception fallback at app/blueprints/batches/finish_batch.py:305", exc_info=True)
             pass
 
+        # Cache the cost rollup so history pages skip child-table aggregation.
+        try:
+            BatchCostRollupService.persist_rollup(batch)
+        except Exception:
+            logger.warning("Suppressed exception fallback at app/blueprints/batches/finish_batch.py:316", exc_info=True)
+
+        # Cache the freshness summary so history views never recompute it.
+        try:
+            FreshnessService.persist_batch_freshness(batch)
+        except Exception:
+            logger.warning("Suppressed exception fallback at app/blueprints/batches/finish_batch.py:323", exc_info=True)
+
         try:
             db.session.commit()
             return True, f"Batch {batch.label_code} completed successfully!"
@@ -312,13 +312,15 @@ def vendor_signup():
 @permission_required("dashboard.view")
 def get_server_time():
     """Get current server time in UTC and user's timezone, also auto-complete expired timers."""
+    from app.services.job_scheduler import scheduler_owns_maintenance
     from app.services.timer_service import TimerService
     from app.utils.timezone_utils import TimezoneUtils
 
-    # Auto-complete expired timers on each server time request.
-    # This provides a lightweight way to keep timers updated.
+    # Auto-complete expired timers on each server time request unless the
+    # dedicated job scheduler owns timer expiry.
     try:
-        TimerService.complete_expired_timers()
+        if not scheduler_owns_maintenance():
+            TimerService.complete_expired_timers()
     except Exception as exc:
         # Don't let timer errors break the time endpoint.
         logger.warning("Suppressed exception fallback at app/blueprints/dashboard/routes.py:389", exc_info=True)
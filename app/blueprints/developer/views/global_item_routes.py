@@ -602,20 +602,38 @@ def global_item_edit(item_id):
 
     try:
         # Sync linked inventory items in the same transaction so orgs see updated defaults.
+        # Large fan-outs are queued and applied by the scheduler instead.
         # Unit safety: inventory units are only updated when they still match the prior default.
+        sync_result = None
         try:
-            GlobalItemSyncService.sync_linked_inventory_items(item, before=before)
+            sync_result = GlobalItemSyncService.request_sync(
+                item, before=before, requested_by=current_user.id
+            )
         except Exception as sync_exc:
             logging.warning("GLOBAL_ITEM_EDIT: sync skipped due to error: %s", sync_exc)
 
         db.session.commit()
         logging.info(
-            "GLOBAL_ITEM_EDIT: user=%s item_id=%s before=%s",
+            "GLOBAL_ITEM_EDIT: user=%s item_id=%s before=%s sync=%s",
             current_user.id,
             item.id,
             before,
+            sync_result,
         )
-        flash("Global item updated successfully", "success")
+        if sync_result and sync_result.get("queued"):
+            flash(
+                "Global item updated successfully. "
+                f"{sync_result['linked']} linked inventory items are queued for the scheduler worker to sync.",
+                "success",
+            )
+        elif sync_result and sync_result.get("updated"):
+            flash(
+                "Global item updated successfully. Synced "
+                f"{sync_result['updated']} linked inventory items.",
+                "success",
+            )
+        else:
+            flash("Global item updated successfully", "success")
     except Exception as exc:
         logger.warning("Suppressed exception fallback at app/blueprints/developer/views/global_item_routes.py:613", exc_info=True)
         db.session.rollback()
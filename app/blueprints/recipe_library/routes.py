@@ -32,6 +32,10 @@ from app.extensions import cache, db, limiter
 from app.models import Organization, ProductCategory, Recipe
 from app.models.statistics import BatchStats
 from app.services.cache_invalidation import recipe_library_cache_key
+from app.services.recipe_library_search_service import (
+    LibrarySearchFilters,
+    RecipeLibrarySearchService,
+)
 from app.services.statistics import AnalyticsDataService
 from app.utils.cache_utils import should_bypass_cache, stable_cache_key
 from app.utils.permissions import _org_tier_includes_permission
@@ -121,7 +125,9 @@ def recipe_library():
     sale_filter = (request.args.get("sale") or "any").lower()
     org_filter = _safe_int(request.args.get("organization"))
     origin_filter = (request.args.get("origin") or "any").lower()
-    sort_mode = (request.args.get("sort") or "newest").lower()
+    type_filter = (request.args.get("type") or "any").lower()
+    sort_mode = (request.args.get("sort") or "").lower()
+    cursor = (request.args.get("after") or "").strip() or None
     preview_remaining = None
     search_remaining = None
 
@@ -155,7 +161,9 @@ def recipe_library():
         "sale": sale_filter,
         "org": org_filter or 0,
         "origin": origin_filter,
+        "type": type_filter,
         "sort": sort_mode,
+        "after": cursor or "",
     }
     raw_cache_key = stable_cache_key("recipe_library_public", cache_payload)
     cache_key = recipe_library_cache_key(raw_cache_key)
@@ -167,68 +175,20 @@ def recipe_library():
         if cached_page is not None:
             return cached_page
 
-    query = (
-        Recipe.query.options(
-            joinedload(Recipe.product_category),
-            joinedload(Recipe.stats),
-            joinedload(Recipe.organization),
-        )
-        .outerjoin(Organization, Recipe.organization_id == Organization.id)
-        .filter(
-            Recipe.is_public.is_(True),
-            Recipe.status == "published",
-            Recipe.marketplace_status == "listed",
-            Recipe.test_sequence.is_(None),
-            Recipe.is_archived.is_(False),
-            Recipe.is_current.is_(True),
-            (Organization.recipe_library_blocked.is_(False))
-            | (Organization.recipe_library_blocked.is_(None)),
-        )
+    search_page = RecipeLibrarySearchService.search(
+        LibrarySearchFilters(
+            search=search_query,
+            category_id=category_filter,
+            product_type=type_filter,
+            sale=sale_filter,
+            organization_id=org_filter,
+            origin=origin_filter,
+        ),
+        sort=sort_mode,
+        cursor=cursor,
     )
-
-    if category_filter:
-        query = query.filter(Recipe.category_id == category_filter)
-    if sale_filter == "sale":
-        query = query.filter(Recipe.is_for_sale.is_(True))
-    elif sale_filter == "free":
-        query = query.filter(Recipe.is_for_sale.is_(False))
-    if org_filter:
-        query = query.filter(Recipe.organization_id == org_filter)
-    if origin_filter == "batchtrack":
-        query = query.filter(Recipe.org_origin_type == "batchtrack_native")
-    elif origin_filter == "purchased":
-        query = query.filter(Recipe.org_origin_purchased.is_(True))
-    elif origin_filter == "authored":
-        query = query.filter(
-            (Recipe.org_origin_type.in_(["authored", "published"]))
-            | (Recipe.org_origin_type.is_(None))
-        )
-
-    if search_query:
-        tokens = [token.strip() for token in search_query.split() if token.strip()]
-        for token in tokens:
-            like_expr = f"%{token}%"
-            query = query.filter(
-                or_(
-                    Recipe.name.ilike(like_expr),
-                    Recipe.public_description.ilike(like_expr),
-                )
-            )
-
-    if sort_mode == "oldest":
-        query = query.order_by(Recipe.updated_at.asc())
-    elif sort_mode == "downloads":
-        query = query.order_by(
-            Recipe.download_count.desc(), Recipe.updated_at.desc(), Recipe.name.asc()
-        )
-    elif sort_mode == "price_high":
-        query = query.order_by(
-            nullslast(Recipe.sale_price.desc()), Recipe.updated_at.desc()
-        )
-    else:
-        query = query.order_by(Recipe.updated_at.desc(), Recipe.name.asc())
-
-    recipes = query.limit(30).all()
+    sort_mode = search_page.sort
+    recipes = search_page.recipes
     cost_map = _fetch_cost_rollups([r.id for r in recipes])
 
     recipe_cards = [
@@ -240,16 +200,7 @@ def recipe_library():
     organizations = (
         db.session.query(Organization.id, Organization.name)
         .join(Recipe, Recipe.organization_id == Organization.id)
-        .filter(
-            Recipe.is_public.is_(True),
-            Recipe.status == "published",
-            Recipe.marketplace_status == "listed",
-            Recipe.test_sequence.is_(None),
-            Recipe.is_archived.is_(False),
-            Recipe.is_current.is_(True),
-            (Organization.recipe_library_blocked.is_(False))
-            | (Organization.recipe_library_blocked.is_(None)),
-        )
+        .filter(*RecipeLibrarySearchService.listed_filters())
         .distinct()
         .order_by(Organization.name.asc())
         .all()
@@ -278,7 +229,13 @@ def recipe_library():
         sale_filter=sale_filter,
         org_filter=org_filter,
         origin_filter=origin_filter,
+        type_filter=type_filter,
         sort_mode=sort_mode,
+        category_counts=search_page.category_counts,
+        product_type_counts=search_page.product_type_counts,
+        total_matches=search_page.total,
+        next_cursor=search_page.next_cursor,
+        is_continuation=bool(cursor),
         preview_remaining=preview_remaining,
         search_remaining=search_remaining,
         show_public_header=True,
@@ -16,7 +16,6 @@ from datetime import datetime, timedelta, timezone
 from flask import flash, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
 from sqlalchemy import func
-from sqlalchemy.orm import joinedload
 from wtforms.validators import ValidationError
 
 from app.extensions import db
@@ -147,24 +146,26 @@ def _enforce_anti_plagiarism(ingredients, *, skip_check: bool):
     if not org_id:
         return
 
-    purchased_recipes = (
-        Recipe.scoped().options(joinedload(Recipe.recipe_ingredients))
-        .filter(
-            Recipe.organization_id == org_id,
-            Recipe.org_origin_purchased.is_(True),
-            Recipe.test_sequence.is_(None),
-        )
-        .all()
+    purchased_filters = (
+        Recipe.organization_id == org_id,
+        Recipe.org_origin_purchased.is_(True),
+        Recipe.test_sequence.is_(None),
     )
-
-    for purchased in purchased_recipes:
-        if RecipeProportionalityService.are_recipes_proportionally_identical(
-            ingredients,
-            purchased.recipe_ingredients,
-        ):
-            raise ValidationError(
-                "This recipe is identical to a recipe you have purchased. Please create a variation of your purchased recipe instead."
-            )
+    # Flush only: the recipe save that follows commits (or rolls back) with it.
+    RecipeProportionalityService.ensure_fingerprints(
+        organization_id=org_id,
+        recipe_filters=purchased_filters,
+        commit=False,
+    )
+    if RecipeProportionalityService.find_proportional_matches(
+        ingredients,
+        organization_id=org_id,
+        recipe_filters=purchased_filters,
+        limit=1,
+    ):
+        raise ValidationError(
+            "This recipe is identical to a recipe you have purchased. Please create a variation of your purchased recipe instead."
+        )
 
 
 # =========================================================
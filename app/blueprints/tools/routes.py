@@ -234,6 +234,31 @@ def tools_soap_quality_nudge():
     return jsonify({"success": True, "result": result})
 
 
+# --- Soap blend optimizer API route ---
+# Purpose: Solve for the cheapest oil blend meeting quality target ranges in one call.
+# Inputs: JSON payload with candidate oils (costs, min/max pct), target ranges, and optional target oils grams.
+# Outputs: JSON success response containing optimized rows, predicted metrics, and target status; 400 when too many oils are sent.
+@tools_bp.route("/api/soap/optimize-blend", methods=["POST"])
+@limiter.limit("300/hour;20/minute")
+def tools_soap_optimize_blend():
+    from app.services.tools.soap_tool import MAX_OPTIMIZER_OILS, optimize_oil_blend
+
+    payload = request.get_json(silent=True) or {}
+    oils = payload.get("oils") if isinstance(payload, dict) else None
+    if isinstance(oils, list) and len(oils) > MAX_OPTIMIZER_OILS:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "error": f"Choose at most {MAX_OPTIMIZER_OILS} candidate oils to optimize.",
+                }
+            ),
+            400,
+        )
+    result = optimize_oil_blend(payload)
+    return jsonify({"success": True, "result": result})
+
+
 # --- Soap bulk-oils catalog API route ---
 # Purpose: Return paged oils/butters/waxes catalog rows for bulk-oil picker modal.
 # Inputs: Query params mode/q/sort/offset/limit for server-side paging/search.
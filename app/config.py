@@ -392,6 +392,8 @@ class BaseConfig:
     GLOBAL_LIBRARY_CACHE_TTL = SETTINGS.get("GLOBAL_LIBRARY_CACHE_TTL", 300)
     RECIPE_LIBRARY_CACHE_TTL = SETTINGS.get("RECIPE_LIBRARY_CACHE_TTL", 180)
     RECIPE_FORM_CACHE_TTL = SETTINGS.get("RECIPE_FORM_CACHE_TTL", 60)
+    PUBLIC_MEDIA_MANIFEST_TTL = SETTINGS.get("PUBLIC_MEDIA_MANIFEST_TTL", 0)
+    PUBLIC_PRICING_CATALOG_TTL = SETTINGS.get("PUBLIC_PRICING_CATALOG_TTL", 300)
 
     BILLING_STATUS_CACHE_TTL = SETTINGS.get("BILLING_STATUS_CACHE_TTL", 120)
 
@@ -464,6 +466,13 @@ class BaseConfig:
     DB_STATEMENT_TIMEOUT_MS = SETTINGS.get("DB_STATEMENT_TIMEOUT_MS", 15000)
     DB_LOCK_TIMEOUT_MS = SETTINGS.get("DB_LOCK_TIMEOUT_MS", 5000)
     DB_IDLE_TX_TIMEOUT_MS = SETTINGS.get("DB_IDLE_TX_TIMEOUT_MS", 60000)
+    QUERY_METRICS_HEADERS_ENABLED = SETTINGS.get(
+        "QUERY_METRICS_HEADERS_ENABLED", False
+    )
+    INVENTORY_CODE_SEQUENCE_BLOCK_SIZE = SETTINGS.get(
+        "INVENTORY_CODE_SEQUENCE_BLOCK_SIZE", 100
+    )
+    BATCH_LABEL_SEQUENCE_BLOCK_SIZE = SETTINGS.get("BATCH_LABEL_SEQUENCE_BLOCK_SIZE", 1)
 
     BILLING_CACHE_ENABLED = SETTINGS.get("BILLING_CACHE_ENABLED", True)
     BILLING_GATE_CACHE_TTL_SECONDS = SETTINGS.get("BILLING_GATE_CACHE_TTL_SECONDS", 60)
@@ -489,9 +498,11 @@ class BaseConfig:
     GOOGLE_AI_ENABLE_SEARCH = SETTINGS.get("GOOGLE_AI_ENABLE_SEARCH", True)
     GOOGLE_AI_ENABLE_FILE_SEARCH = SETTINGS.get("GOOGLE_AI_ENABLE_FILE_SEARCH", True)
     GOOGLE_AI_SEARCH_TOOL = SETTINGS.get("GOOGLE_AI_SEARCH_TOOL") or "google_search"
+    GOOGLE_AI_CLIENT_BACKEND = SETTINGS.get("GOOGLE_AI_CLIENT_BACKEND") or "gemini"
     BATCHBOT_REQUEST_TIMEOUT_SECONDS = SETTINGS.get(
         "BATCHBOT_REQUEST_TIMEOUT_SECONDS", 45
     )
+    BATCHBOT_CONTEXT_CACHE_TTL = SETTINGS.get("BATCHBOT_CONTEXT_CACHE_TTL", 300)
     BATCHBOT_DEFAULT_MAX_REQUESTS = SETTINGS.get("BATCHBOT_DEFAULT_MAX_REQUESTS", 0)
     BATCHBOT_REQUEST_WINDOW_DAYS = SETTINGS.get("BATCHBOT_REQUEST_WINDOW_DAYS", 30)
     BATCHBOT_CHAT_MAX_MESSAGES = SETTINGS.get("BATCHBOT_CHAT_MAX_MESSAGES", 60)
@@ -517,6 +528,52 @@ class BaseConfig:
     POSTHOG_CAPTURE_PAGEVIEW = SETTINGS.get("POSTHOG_CAPTURE_PAGEVIEW", True)
     POSTHOG_CAPTURE_PAGELEAVE = SETTINGS.get("POSTHOG_CAPTURE_PAGELEAVE", True)
 
+    SCHEDULER_ENABLED = SETTINGS.get("SCHEDULER_ENABLED", False)
+    SCHEDULER_LOCK_BACKEND = SETTINGS.get("SCHEDULER_LOCK_BACKEND") or "auto"
+    SCHEDULER_LEADER_TTL_SECONDS = SETTINGS.get("SCHEDULER_LEADER_TTL_SECONDS", 30)
+    SCHEDULER_MAX_WORKERS = SETTINGS.get("SCHEDULER_MAX_WORKERS", 2)
+    SCHEDULER_LATENCY_WORKERS = SETTINGS.get("SCHEDULER_LATENCY_WORKERS", 2)
+    SCHEDULER_POLL_SECONDS = SETTINGS.get("SCHEDULER_POLL_SECONDS", 1.0)
+    SCHEDULER_JITTER_RATIO = SETTINGS.get("SCHEDULER_JITTER_RATIO", 0.1)
+    SCHEDULER_TIMER_EXPIRY_INTERVAL_SECONDS = SETTINGS.get(
+        "SCHEDULER_TIMER_EXPIRY_INTERVAL_SECONDS", 60
+    )
+    SCHEDULER_RESERVATION_CLEANUP_INTERVAL_SECONDS = SETTINGS.get(
+        "SCHEDULER_RESERVATION_CLEANUP_INTERVAL_SECONDS", 300
+    )
+    SCHEDULER_RETENTION_SWEEP_INTERVAL_SECONDS = SETTINGS.get(
+        "SCHEDULER_RETENTION_SWEEP_INTERVAL_SECONDS", 86400
+    )
+    SCHEDULER_FRESHNESS_SNAPSHOT_INTERVAL_SECONDS = SETTINGS.get(
+        "SCHEDULER_FRESHNESS_SNAPSHOT_INTERVAL_SECONDS", 86400
+    )
+    SCHEDULER_DOMAIN_EVENT_INTERVAL_SECONDS = SETTINGS.get(
+        "SCHEDULER_DOMAIN_EVENT_INTERVAL_SECONDS", 10
+    )
+    SCHEDULER_RESERVATION_COUNTER_SYNC_INTERVAL_SECONDS = SETTINGS.get(
+        "SCHEDULER_RESERVATION_COUNTER_SYNC_INTERVAL_SECONDS", 2
+    )
+    SCHEDULER_RESERVATION_RECONCILE_INTERVAL_SECONDS = SETTINGS.get(
+        "SCHEDULER_RESERVATION_RECONCILE_INTERVAL_SECONDS", 60
+    )
+    POS_RESERVATION_COUNTERS = SETTINGS.get("POS_RESERVATION_COUNTERS") or "off"
+    POS_RESERVATION_COUNTER_TTL_SECONDS = SETTINGS.get(
+        "POS_RESERVATION_COUNTER_TTL_SECONDS", 86400
+    )
+    SCHEDULER_GLOBAL_ITEM_SYNC_INTERVAL_SECONDS = SETTINGS.get(
+        "SCHEDULER_GLOBAL_ITEM_SYNC_INTERVAL_SECONDS", 15
+    )
+    GLOBAL_ITEM_SYNC_INLINE_LIMIT = SETTINGS.get("GLOBAL_ITEM_SYNC_INLINE_LIMIT", 500)
+    SCHEDULER_GLOBAL_ITEM_COST_STATS_INTERVAL_SECONDS = SETTINGS.get(
+        "SCHEDULER_GLOBAL_ITEM_COST_STATS_INTERVAL_SECONDS", 300
+    )
+    SCHEDULER_BILLING_WEBHOOK_INTERVAL_SECONDS = SETTINGS.get(
+        "SCHEDULER_BILLING_WEBHOOK_INTERVAL_SECONDS", 5
+    )
+    BILLING_WEBHOOK_WORKERS = SETTINGS.get("BILLING_WEBHOOK_WORKERS", 4)
+    BILLING_WEBHOOK_BATCH_SIZE = SETTINGS.get("BILLING_WEBHOOK_BATCH_SIZE", 500)
+    AFFILIATE_PAYOUT_WORKERS = SETTINGS.get("AFFILIATE_PAYOUT_WORKERS", 4)
+
 
 # --- DevelopmentConfig ---
 # Purpose: Override settings for local development defaults.
@@ -59,6 +59,13 @@ FIELDS = [
         "description": "Search tool identifier.",
         "recommended": "google_search",
     },
+    {
+        "key": "GOOGLE_AI_CLIENT_BACKEND",
+        "cast": "str",
+        "default": "gemini",
+        "description": "AI client backend (gemini, or stub for offline benchmarks).",
+        "recommended": "gemini",
+    },
     {
         "key": "BATCHBOT_REQUEST_TIMEOUT_SECONDS",
         "cast": "int",
@@ -66,6 +73,13 @@ FIELDS = [
         "description": "BatchBot request timeout.",
         "recommended": "45",
     },
+    {
+        "key": "BATCHBOT_CONTEXT_CACHE_TTL",
+        "cast": "int",
+        "default": 300,
+        "description": "Seconds a cached BatchBot org context snapshot is reused.",
+        "recommended": "300",
+    },
     {
         "key": "BATCHBOT_DEFAULT_MAX_REQUESTS",
         "cast": "int",
@@ -104,6 +104,23 @@ FIELDS = [
         "include_in_docs": False,
         "include_in_checklist": False,
     },
+    {
+        "key": "PUBLIC_MEDIA_MANIFEST_TTL",
+        "cast": "int",
+        "default": 0,
+        "description": "Seconds between public media folder mtime checks (0 checks on every lookup).",
+        "default_by_env": {"staging": 30, "production": 30},
+        "include_in_docs": False,
+        "include_in_checklist": False,
+    },
+    {
+        "key": "PUBLIC_PRICING_CATALOG_TTL",
+        "cast": "int",
+        "default": 300,
+        "description": "Seconds a built public pricing catalog is served before it is rebuilt to pick up Stripe price changes.",
+        "include_in_docs": False,
+        "include_in_checklist": False,
+    },
     {
         "key": "REDIS_MAX_CONNECTIONS",
         "cast": "int",
@@ -94,6 +94,27 @@ FIELDS = [
         "description": "Idle-in-transaction timeout in milliseconds.",
         "recommended": "60000",
     },
+    {
+        "key": "QUERY_METRICS_HEADERS_ENABLED",
+        "cast": "bool",
+        "default": False,
+        "description": "Add X-Query-Count/X-Query-Time-Ms response headers (load testing).",
+        "recommended": "0",
+    },
+    {
+        "key": "INVENTORY_CODE_SEQUENCE_BLOCK_SIZE",
+        "cast": "int",
+        "default": 100,
+        "description": "Inventory lot/event code sequence numbers reserved per counter round trip (numbers unused when the session ends are skipped).",
+        "recommended": "100",
+    },
+    {
+        "key": "BATCH_LABEL_SEQUENCE_BLOCK_SIZE",
+        "cast": "int",
+        "default": 1,
+        "description": "Batch label sequence numbers reserved per round trip (above 1, labels stay unique but may skip numbers).",
+        "recommended": "1",
+    },
 ]
 
 # --- Database section ---
@@ -88,6 +88,34 @@ FIELDS = [
         "description": "JSON list of explicit username/password pairs.",
         "note": 'Example: [{"username":"user1","password":"pass"}]',
     },
+    {
+        "key": "LOCUST_USER_CREDENTIALS_FILE",
+        "cast": "str",
+        "default": None,
+        "description": "Path to a credentials JSON file (used when LOCUST_USER_CREDENTIALS is unset).",
+        "note": "Written by loadtests/data_generator.py seed --credentials-out.",
+    },
+    {
+        "key": "LOCUST_ENABLE_PRODUCTION_FLOWS",
+        "cast": "bool",
+        "default": True,
+        "description": "Enable production-flow users (batches, POS, bulk inventory, exports).",
+        "recommended": "1",
+    },
+    {
+        "key": "LOCUST_SLO_ENFORCE",
+        "cast": "bool",
+        "default": False,
+        "description": "Exit non-zero when a scenario SLO is breached.",
+        "recommended": "1",
+    },
+    {
+        "key": "LOCUST_REPORT_PATH",
+        "cast": "str",
+        "default": None,
+        "description": "Write the p50/p95/p99 + query summary (.json or Markdown).",
+        "note": "Example: logs/locust-summary.md",
+    },
 ]
 
 # --- Load section ---
@@ -66,6 +66,167 @@ FIELDS = [
         "description": "Enable automatic PostHog pageleave tracking.",
         "recommended": "true",
     },
+    {
+        "key": "SCHEDULER_ENABLED",
+        "cast": "bool",
+        "default": False,
+        "description": "Set when the `flask run-scheduler` worker is deployed so request handlers skip periodic maintenance.",
+        "recommended": "true",
+    },
+    {
+        "key": "SCHEDULER_LOCK_BACKEND",
+        "cast": "str",
+        "default": "auto",
+        "description": "Scheduler leader lock: auto, redis, postgres, or local.",
+        "recommended": "auto",
+    },
+    {
+        "key": "SCHEDULER_LEADER_TTL_SECONDS",
+        "cast": "int",
+        "default": 30,
+        "description": "Redis leader lease TTL for the job scheduler.",
+        "recommended": "30",
+    },
+    {
+        "key": "SCHEDULER_MAX_WORKERS",
+        "cast": "int",
+        "default": 2,
+        "description": "Maximum long-running scheduled jobs (sweeps, syncs, snapshots) running concurrently.",
+        "recommended": "2",
+    },
+    {
+        "key": "SCHEDULER_LATENCY_WORKERS",
+        "cast": "int",
+        "default": 2,
+        "description": "Workers reserved for domain-event dispatch, billing webhooks, and POS counter persistence.",
+        "recommended": "2",
+    },
+    {
+        "key": "SCHEDULER_POLL_SECONDS",
+        "cast": "float",
+        "default": 1.0,
+        "description": "Scheduler tick interval in seconds.",
+        "recommended": "1.0",
+    },
+    {
+        "key": "SCHEDULER_JITTER_RATIO",
+        "cast": "float",
+        "default": 0.1,
+        "description": "Random delay added to each job interval, as a fraction of the interval.",
+        "recommended": "0.1",
+    },
+    {
+        "key": "SCHEDULER_TIMER_EXPIRY_INTERVAL_SECONDS",
+        "cast": "int",
+        "default": 60,
+        "description": "Interval for completing expired batch timers (0 disables).",
+        "recommended": "60",
+    },
+    {
+        "key": "SCHEDULER_RESERVATION_CLEANUP_INTERVAL_SECONDS",
+        "cast": "int",
+        "default": 300,
+        "description": "Interval for releasing expired POS reservations (0 disables).",
+        "recommended": "300",
+    },
+    {
+        "key": "SCHEDULER_RETENTION_SWEEP_INTERVAL_SECONDS",
+        "cast": "int",
+        "default": 86400,
+        "description": "Interval for the recipe retention deletion sweep (0 disables).",
+        "recommended": "86400",
+    },
+    {
+        "key": "SCHEDULER_FRESHNESS_SNAPSHOT_INTERVAL_SECONDS",
+        "cast": "int",
+        "default": 86400,
+        "description": "Interval for daily freshness snapshots (0 disables).",
+        "recommended": "86400",
+    },
+    {
+        "key": "SCHEDULER_DOMAIN_EVENT_INTERVAL_SECONDS",
+        "cast": "int",
+        "default": 10,
+        "description": "Interval for domain-event outbox dispatch (0 disables).",
+        "recommended": "10",
+    },
+    {
+        "key": "SCHEDULER_RESERVATION_COUNTER_SYNC_INTERVAL_SECONDS",
+        "cast": "int",
+        "default": 2,
+        "description": "Interval for persisting queued POS counter reservations (0 disables).",
+        "recommended": "2",
+    },
+    {
+        "key": "SCHEDULER_RESERVATION_RECONCILE_INTERVAL_SECONDS",
+        "cast": "int",
+        "default": 60,
+        "description": "Interval for reconciling POS reservation counters with the DB (0 disables).",
+        "recommended": "60",
+    },
+    {
+        "key": "POS_RESERVATION_COUNTERS",
+        "cast": "str",
+        "default": "off",
+        "description": "POS reservation fast path: off, redis (Lua counters), or memory (single process).",
+        "recommended": "redis",
+    },
+    {
+        "key": "POS_RESERVATION_COUNTER_TTL_SECONDS",
+        "cast": "int",
+        "default": 86400,
+        "description": "Idle TTL for per-SKU reservation counters in Redis.",
+        "recommended": "86400",
+    },
+    {
+        "key": "SCHEDULER_GLOBAL_ITEM_SYNC_INTERVAL_SECONDS",
+        "cast": "int",
+        "default": 15,
+        "description": "Interval for applying queued global item sync jobs (0 disables).",
+        "recommended": "15",
+    },
+    {
+        "key": "GLOBAL_ITEM_SYNC_INLINE_LIMIT",
+        "cast": "int",
+        "default": 500,
+        "description": "Linked inventory items a global item edit syncs inline before queueing a background job (0 always inline).",
+        "recommended": "500",
+    },
+    {
+        "key": "SCHEDULER_GLOBAL_ITEM_COST_STATS_INTERVAL_SECONDS",
+        "cast": "int",
+        "default": 300,
+        "description": "Interval for recomputing stale or missing global item cost distributions (0 disables).",
+        "recommended": "300",
+    },
+    {
+        "key": "SCHEDULER_BILLING_WEBHOOK_INTERVAL_SECONDS",
+        "cast": "int",
+        "default": 5,
+        "description": "Interval for applying received billing webhooks from the inbox (0 disables).",
+        "recommended": "5",
+    },
+    {
+        "key": "BILLING_WEBHOOK_WORKERS",
+        "cast": "int",
+        "default": 4,
+        "description": "Threads applying billing webhooks in parallel; events for one customer always run in order.",
+        "recommended": "4",
+    },
+    {
+        "key": "BILLING_WEBHOOK_BATCH_SIZE",
+        "cast": "int",
+        "default": 500,
+        "description": "Maximum inbox rows one billing webhook worker pass claims.",
+        "recommended": "500",
+    },
+    {
+        "key": "AFFILIATE_PAYOUT_WORKERS",
+        "cast": "int",
+        "default": 4,
+        "description": "Concurrent provider transfers an affiliate payout run pushes; each batch keeps its own idempotency key.",
+        "recommended": "4",
+    },
 ]
 
 # --- Operations section ---
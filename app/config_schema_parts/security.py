@@ -201,6 +201,14 @@ FIELDS = [
         "description": "Rolling failed-login window in seconds.",
         "recommended": "900",
     },
+    {
+        "key": "AUTH_LOGIN_IP_LOCKOUT_THRESHOLD",
+        "cast": "int",
+        "default": 50,
+        "description": "Failed login attempts allowed from one client IP within the rolling window before it is throttled.",
+        "recommended": "50",
+        "note": "Set to 0 to disable per-IP throttling.",
+    },
     {
         "key": "BOT_TRAP_DB_MAX_HIT_ROWS",
         "cast": "int",
@@ -95,9 +95,10 @@ def path_matches_rule(path: str, rule: str) -> bool:
     return path == rule
 
 
-def wants_json_response() -> bool:
-    accepts = request.accept_mimetypes
-    return request.path.startswith("/api/") or (
+def wants_json_response(req=None) -> bool:
+    req = request if req is None else req
+    accepts = req.accept_mimetypes
+    return req.path.startswith("/api/") or (
         "application/json" in accepts and not accepts.accept_html
     )
 
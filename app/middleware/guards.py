@@ -40,11 +40,12 @@ from .common import (
 logger = logging.getLogger(__name__)
 
 
-def enforce_edge_origin_auth(app):
+def enforce_edge_origin_auth(app, req=None):
     if not config_flag("ENFORCE_EDGE_ORIGIN_AUTH", app=app):
         return None
 
-    request_path = request.path or "/"
+    req = request if req is None else req
+    request_path = req.path or "/"
     exempt_rules = config_csv("EDGE_ORIGIN_AUTH_EXEMPT_PATHS", "/health", app=app)
     if any(path_matches_rule(request_path, rule) for rule in exempt_rules):
         return None
@@ -57,17 +58,17 @@ def enforce_edge_origin_auth(app):
         return ("Service unavailable", 503)
 
     header_name = config_str("EDGE_ORIGIN_AUTH_HEADER", "X-Edge-Origin-Auth", app=app)
-    provided_secret = request.headers.get(header_name, "")
+    provided_secret = req.headers.get(header_name, "")
     if hmac.compare_digest(str(provided_secret), expected_secret):
         return None
 
     logger.warning(
         "Blocked request missing valid edge origin auth header: path=%s ip=%s ua=%s",
         request_path,
-        PublicBotTrapService.resolve_request_ip(request),
-        (request.headers.get("User-Agent") or "-")[:160],
+        PublicBotTrapService.resolve_request_ip(req),
+        (req.headers.get("User-Agent") or "-")[:160],
     )
-    if wants_json_response():
+    if wants_json_response(req):
         return jsonify({"error": "Forbidden"}), 403
     return ("Forbidden", 403)
 
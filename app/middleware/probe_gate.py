@@ -0,0 +1,108 @@
+"""WSGI gate for high-confidence scanner probes.
+
+Synopsis:
+Rejects obvious exploit-probe paths before Flask pushes a request context, so a
+scanner flood never opens a session, loads a user, or runs the before-request
+pipeline. Edge-origin auth still applies first, and the bot-trap hit is recorded
+inside a bare app context unless Redis already holds a block for the client IP.
+Because no session is loaded, ``logout_user()`` cannot run here; the gate
+expires the session and remember-me cookies on the 403 instead.
+
+Glossary:
+- Probe gate: WSGI wrapper installed around ``app.wsgi_app`` (inside ProxyFix).
+- High-confidence probe: Path matched by ``MiddlewareProbeService``'s compiled rules.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from flask import Flask, jsonify
+from werkzeug.wrappers import Request
+from werkzeug.wsgi import get_path_info
+
+from ..route_access import RouteAccessConfig
+from ..services.middleware_probe_service import MiddlewareProbeService
+from ..services.public_bot_trap_service import PublicBotTrapService
+from .common import config_flag, wants_json_response
+from .guards import enforce_edge_origin_auth
+
+logger = logging.getLogger(__name__)
+
+
+class ProbePathGate:
+    """Answer high-confidence probe paths with 403 ahead of the Flask app."""
+
+    def __init__(self, app: Flask, wsgi_app):
+        self.app = app
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        path = "/" + get_path_info(environ).lstrip("/")
+        if not self._should_gate(path):
+            return self.wsgi_app(environ, start_response)
+        with self.app.app_context():
+            response = self._reject(Request(environ), path)
+        return response(environ, start_response)
+
+    def _should_gate(self, path: str) -> bool:
+        if not MiddlewareProbeService.is_high_confidence_probe_path(path):
+            return False
+        if RouteAccessConfig.is_passive_public_asset_path(path):
+            return False
+        return not (
+            config_flag("SKIP_PERMISSIONS", app=self.app)
+            or config_flag("TESTING_DISABLE_AUTH", app=self.app)
+        )
+
+    def _reject(self, req: Request, path: str):
+        edge_origin_auth_response = enforce_edge_origin_auth(self.app, req)
+        if edge_origin_auth_response is not None:
+            return self.app.make_response(edge_origin_auth_response)
+
+        request_ip = PublicBotTrapService.resolve_request_ip(req)
+        # An IP already blocked in Redis gains nothing from another strike write.
+        already_blocked = PublicBotTrapService.is_ip_block_cached(request_ip)
+        if not already_blocked:
+            try:
+                PublicBotTrapService.record_hit(
+                    request=req,
+                    source="middleware_early_path_block",
+                    reason="high_confidence_probe_path",
+                    extra={"path": path},
+                    block=True,
+                )
+            except Exception as exc:
+                logger.debug("Failed to record early path block hit for %s: %s", path, exc)
+
+        logger.warning(
+            "Early-blocked high-confidence probe path: path=%s ip=%s already_blocked=%s",
+            path,
+            request_ip,
+            already_blocked,
+        )
+        if wants_json_response(req):
+            response = self.app.make_response((jsonify({"error": "Access blocked"}), 403))
+        else:
+            response = self.app.make_response(("Forbidden", 403))
+        self._expire_login_cookies(req, response)
+        return response
+
+    def _expire_login_cookies(self, req: Request, response) -> None:
+        # Stands in for logout_user(): a signed-in browser probing exploit
+        # paths loses its session and remember-me cookies.
+        interface = self.app.session_interface
+        session_cookie = interface.get_cookie_name(self.app)
+        if session_cookie in req.cookies:
+            response.delete_cookie(
+                session_cookie,
+                path=interface.get_cookie_path(self.app),
+                domain=interface.get_cookie_domain(self.app),
+            )
+        remember_cookie = self.app.config.get("REMEMBER_COOKIE_NAME") or "remember_token"
+        if remember_cookie in req.cookies:
+            response.delete_cookie(
+                remember_cookie,
+                path=self.app.config.get("REMEMBER_COOKIE_PATH") or "/",
+                domain=self.app.config.get("REMEMBER_COOKIE_DOMAIN"),
+            )
@@ -35,6 +35,7 @@ from .guards import (
     enforce_edge_origin_auth,
     handle_developer_context,
 )
+from .probe_gate import ProbePathGate
 from .security_headers import apply_security_headers
 
 logger = logging.getLogger(__name__)
@@ -43,6 +44,11 @@ logger = logging.getLogger(__name__)
 def register_middleware(app: Flask) -> None:
     """Attach global middleware to the Flask app."""
 
+    if not app.extensions.get("probe_path_gate"):
+        # Installed before ProxyFix so the gate sees proxy-corrected client IPs.
+        app.wsgi_app = ProbePathGate(app, app.wsgi_app)
+        app.extensions["probe_path_gate"] = True
+
     trust_proxy_headers = config_flag("ENABLE_PROXY_FIX", app=app) or config_flag(
         "TRUST_PROXY_HEADERS", app=app
     )
@@ -102,37 +108,6 @@ def register_middleware(app: Flask) -> None:
         ):
             return None
 
-        if MiddlewareProbeService.is_high_confidence_probe_path(path):
-            request_ip = PublicBotTrapService.resolve_request_ip(request)
-            try:
-                PublicBotTrapService.record_hit(
-                    request=request,
-                    source="middleware_early_path_block",
-                    reason="high_confidence_probe_path",
-                    extra={"path": path},
-                    block=True,
-                )
-            except Exception as exc:
-                logger.debug("Failed to record early path block hit for %s: %s", path, exc)
-
-            logger.warning(
-                "Early-blocked high-confidence probe path: path=%s ip=%s user_id=%s",
-                path,
-                request_ip,
-                getattr(current_user, "id", None),
-            )
-            if current_user.is_authenticated:
-                try:
-                    logout_user()
-                except Exception:
-                    logger.warning(
-                        "Suppressed exception fallback at app/middleware/registry.py:109",
-                        exc_info=True,
-                    )
-            if wants_json_response():
-                return jsonify({"error": "Access blocked"}), 403
-            return ("Forbidden", 403)
-
         try:
             if PublicBotTrapService.should_block_request(request, current_user):
                 logger.warning(
@@ -13,6 +13,7 @@ from .app_setting import AppSetting
 from .affiliate import (
     AffiliateMonthlyEarning,
     AffiliatePayoutAccount,
+    AffiliatePayoutBatch,
     AffiliateProfile,
     AffiliateReferral,
 )
@@ -67,6 +68,7 @@ from .recipe import (
     RecipeIngredient,
     RecipeLineage,
 )
+from .recipe_fingerprint import RecipeFingerprint
 from .recipe_marketplace import RecipeModerationEvent
 from .stripe_event import StripeEvent
 from .unit import ConversionLog, CustomUnitMapping, Unit
@@ -119,7 +121,9 @@ from .freshness_snapshot import FreshnessSnapshot
 from . import user_lifecycle  # noqa: F401  # register User lifecycle hooks
 
 # Import inventory lot model
-from .inventory_lot import InventoryLot
+from .inventory_lot import InventoryCodeSequence, InventoryLot
+from .global_item_cost_stats import GlobalItemCostStats
+from .global_item_sync_job import GlobalItemSyncJob
 
 # Import unified inventory history model
 from .unified_inventory_history import UnifiedInventoryHistory
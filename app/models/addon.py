@@ -1,5 +1,9 @@
 from datetime import datetime, timezone
 
+from sqlalchemy import event
+
+from app.services.cache_invalidation import invalidate_pricing_catalog_cache
+
 from ..extensions import db
 
 
@@ -39,6 +43,21 @@ class Addon(db.Model):
     )
 
 
+@event.listens_for(Addon, "after_insert")
+def _addon_after_insert(mapper, connection, target):
+    invalidate_pricing_catalog_cache()
+
+
+@event.listens_for(Addon, "after_update")
+def _addon_after_update(mapper, connection, target):
+    invalidate_pricing_catalog_cache()
+
+
+@event.listens_for(Addon, "after_delete")
+def _addon_after_delete(mapper, connection, target):
+    invalidate_pricing_catalog_cache()
+
+
 class OrganizationAddon(db.Model):
     __tablename__ = "organization_addon"
 
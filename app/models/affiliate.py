@@ -186,3 +186,45 @@ class AffiliatePayoutAccount(db.Model):
     )
 
     organization = db.relationship("Organization")
+
+
+class AffiliatePayoutBatch(db.Model):
+    """Checkpoint for one org-month payout push.
+
+    Written before the provider call so an interrupted run resumes with the
+    same idempotency key instead of sending a second transfer.
+    """
+
+    __tablename__ = "affiliate_payout_batch"
+
+    id = db.Column(db.Integer, primary_key=True)
+    organization_id = db.Column(
+        db.Integer, db.ForeignKey("organization.id"), nullable=False, index=True
+    )
+    earning_month = db.Column(db.Date, nullable=False)
+    status = db.Column(
+        db.String(16), nullable=False, default="planned", index=True
+    )  # planned, pushing, sent, failed, canceled
+    idempotency_key = db.Column(db.String(128), nullable=False, unique=True)
+    earning_ids = db.Column(db.JSON, nullable=False)
+    amount_cents = db.Column(db.Integer, nullable=False, default=0)
+    currency = db.Column(db.String(3), nullable=False, default="usd")
+    payout_provider = db.Column(db.String(32), nullable=False, default="stripe")
+    destination = db.Column(db.String(255), nullable=False)
+    payout_reference = db.Column(db.String(128), nullable=True)
+    run_id = db.Column(db.String(32), nullable=True, index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error_message = db.Column(db.Text, nullable=True)
+    created_at = db.Column(
+        db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index(
+            "ix_affiliate_payout_batch_org_month", "organization_id", "earning_month"
+        ),
+    )
+
+    organization = db.relationship("Organization")
@@ -16,6 +16,8 @@ import sqlalchemy as sa
 from flask import current_app, has_app_context
 from sqlalchemy import event, inspect
 
+from app.services.cache_invalidation import invalidate_batchbot_context_cache
+
 from ..extensions import db
 from ..utils.timezone_utils import TimezoneUtils
 from .db_dialect import is_postgres
@@ -62,6 +64,12 @@ class Batch(ScopedModelMixin, db.Model):
     notes = db.Column(db.Text)
     tags = db.Column(db.Text)
     total_cost = db.Column(db.Float)
+    # Cost rollup cached at completion (six category totals + timestamp)
+    cost_rollup = db.Column(db.JSON, nullable=True)
+    cost_rolled_up_at = db.Column(db.DateTime, nullable=True)
+    # Freshness summary cached at completion (BatchFreshnessSummary + timestamp)
+    freshness_summary = db.Column(db.JSON, nullable=True)
+    freshness_computed_at = db.Column(db.DateTime, nullable=True)
     created_by = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
     organization_id = db.Column(
         db.Integer, db.ForeignKey("organization.id"), nullable=True
@@ -227,6 +235,25 @@ def _log_batch_cost_update(mapper, connection, target):
         logger.exception("Failed to log batch total_cost update")
 
 
+def _invalidate_batch_caches(target) -> None:
+    invalidate_batchbot_context_cache(getattr(target, "organization_id", None))
+
+
+@event.listens_for(Batch, "after_insert")
+def _batch_after_insert(mapper, connection, target):
+    _invalidate_batch_caches(target)
+
+
+@event.listens_for(Batch, "after_update")
+def _batch_after_update(mapper, connection, target):
+    _invalidate_batch_caches(target)
+
+
+@event.listens_for(Batch, "after_delete")
+def _batch_after_delete(mapper, connection, target):
+    _invalidate_batch_caches(target)
+
+
 class BatchLabelCounter(db.Model):
     __tablename__ = "batch_label_counter"
 
@@ -304,6 +331,8 @@ class BatchIngredient(ScopedModelMixin, db.Model):
     batch = db.relationship("Batch", backref="batch_ingredients")
     inventory_item = db.relationship("InventoryItem", backref="batch_usages")
 
+    __table_args__ = (db.Index("ix_batch_ingredient_batch_id", "batch_id"),)
+
 
 class BatchContainer(ScopedModelMixin, db.Model):
     __tablename__ = "batch_container"
@@ -325,6 +354,8 @@ class BatchContainer(ScopedModelMixin, db.Model):
     batch = db.relationship("Batch", backref="containers")
     inventory_item = db.relationship("InventoryItem")
 
+    __table_args__ = (db.Index("ix_batch_container_batch_id", "batch_id"),)
+
 
 class BatchConsumable(ScopedModelMixin, db.Model):
     __tablename__ = "batch_consumable"
@@ -374,6 +405,8 @@ class ExtraBatchContainer(ScopedModelMixin, db.Model):
     batch = db.relationship("Batch", backref="extra_containers")
     inventory_item = db.relationship("InventoryItem")
 
+    __table_args__ = (db.Index("ix_extra_batch_container_batch_id", "batch_id"),)
+
 
 class BatchTimer(ScopedModelMixin, db.Model):
     __tablename__ = "batch_timer"
@@ -407,6 +440,8 @@ class ExtraBatchIngredient(ScopedModelMixin, db.Model):
     batch = db.relationship("Batch", backref="extra_ingredients")
     inventory_item = db.relationship("InventoryItem", backref="extra_batch_usages")
 
+    __table_args__ = (db.Index("ix_extra_batch_ingredient_batch_id", "batch_id"),)
+
 
 class ExtraBatchConsumable(ScopedModelMixin, db.Model):
     __tablename__ = "extra_batch_consumable"
@@ -1,3 +1,7 @@
+from sqlalchemy import event
+
+from app.services.cache_invalidation import invalidate_reference_data_cache
+
 from ..extensions import db
 from ..utils.timezone_utils import TimezoneUtils
 from .mixins import ScopedModelMixin
@@ -63,3 +67,18 @@ class Tag(ScopedModelMixin, db.Model):
     __table_args__ = (
         db.UniqueConstraint("name", "organization_id", name="_tag_name_org_uc"),
     )
+
+
+@event.listens_for(IngredientCategory, "after_insert")
+def _ingredient_category_after_insert(mapper, connection, target):
+    invalidate_reference_data_cache()
+
+
+@event.listens_for(IngredientCategory, "after_update")
+def _ingredient_category_after_update(mapper, connection, target):
+    invalidate_reference_data_cache()
+
+
+@event.listens_for(IngredientCategory, "after_delete")
+def _ingredient_category_after_delete(mapper, connection, target):
+    invalidate_reference_data_cache()
@@ -1,3 +1,7 @@
+from sqlalchemy import event
+
+from app.services.cache_invalidation import invalidate_feature_flag_cache
+
 from ..extensions import db
 from .mixins import TimestampMixin
 
@@ -12,3 +16,18 @@ class FeatureFlag(TimestampMixin, db.Model):
 
     def __repr__(self) -> str:
         return f"<FeatureFlag {self.key} enabled={self.enabled}>"
+
+
+@event.listens_for(FeatureFlag, "after_insert")
+def _feature_flag_after_insert(mapper, connection, target):
+    invalidate_feature_flag_cache()
+
+
+@event.listens_for(FeatureFlag, "after_update")
+def _feature_flag_after_update(mapper, connection, target):
+    invalidate_feature_flag_cache()
+
+
+@event.listens_for(FeatureFlag, "after_delete")
+def _feature_flag_after_delete(mapper, connection, target):
+    invalidate_feature_flag_cache()
@@ -0,0 +1,191 @@
+"""Precomputed global item cost distribution model.
+
+Synopsis:
+Stores one row of cost quantiles, IQR fences, trimmed aggregates, and a
+histogram per global item so distribution reads are a single-row lookup.
+Inventory lot and item listeners flag rows stale when contributing costs
+change; the statistics service recomputes only stale items.
+
+Glossary:
+- Cost stats row: Precomputed distribution for one global item.
+- Stale flag: Marker that contributing lots changed since the last refresh.
+- IQR fences: Q1 - 1.5*IQR and Q3 + 1.5*IQR outlier cut-offs.
+"""
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..utils.timezone_utils import TimezoneUtils
+from .inventory import InventoryItem
+from .inventory_lot import InventoryLot
+
+
+class GlobalItemCostStats(db.Model):
+    """Precomputed unit-cost distribution across all orgs for one global item."""
+
+    __tablename__ = "global_item_cost_stats"
+
+    id = db.Column(db.Integer, primary_key=True)
+    global_item_id = db.Column(
+        db.Integer,
+        db.ForeignKey("global_item.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    sample_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    min_cost = db.Column(db.Float, nullable=True)
+    max_cost = db.Column(db.Float, nullable=True)
+    p10 = db.Column(db.Float, nullable=True)
+    q1 = db.Column(db.Float, nullable=True)
+    median = db.Column(db.Float, nullable=True)
+    q3 = db.Column(db.Float, nullable=True)
+    p90 = db.Column(db.Float, nullable=True)
+    lower_fence = db.Column(db.Float, nullable=True)
+    upper_fence = db.Column(db.Float, nullable=True)
+    mean_ex_outliers = db.Column(db.Float, nullable=True)
+    low = db.Column(db.Float, nullable=True)
+    high = db.Column(db.Float, nullable=True)
+    outliers_low_count = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+    outliers_high_count = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+    histogram = db.Column(db.JSON, nullable=True)
+    is_stale = db.Column(
+        db.Boolean, nullable=False, default=False, server_default=db.false()
+    )
+    computed_at = db.Column(db.DateTime, default=TimezoneUtils.utc_now)
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "global_item_id", name="uq_global_item_cost_stats_global_item_id"
+        ),
+        db.Index("ix_global_item_cost_stats_stale", "is_stale"),
+    )
+
+    def to_distribution(self) -> dict:
+        """Serialize in the `get_cost_distribution` response shape."""
+        return {
+            "count": int(self.sample_count or 0),
+            "mean_ex_outliers": self.mean_ex_outliers,
+            "low": self.low,
+            "high": self.high,
+            "min": self.min_cost,
+            "max": self.max_cost,
+            "outliers_low_count": int(self.outliers_low_count or 0),
+            "outliers_high_count": int(self.outliers_high_count or 0),
+            "histogram": list(self.histogram or []),
+            "p10": self.p10,
+            "q1": self.q1,
+            "median": self.median,
+            "q3": self.q3,
+            "p90": self.p90,
+        }
+
+
+_MARKED_INFO_KEY = "global_item_cost_stats_marked"
+
+
+# --- Stale marker ---
+# Purpose: Flag precomputed cost stats for recompute inside the current flush.
+# Inputs: Flush connection, global item ids whose lot costs changed, and the
+#         flushing session (ids already flagged in its transaction are skipped).
+# Outputs: None (at most one UPDATE on global_item_cost_stats).
+def mark_cost_stats_stale(connection, global_item_ids, session=None) -> None:
+    ids = {int(gid) for gid in global_item_ids if gid}
+    if session is not None:
+        marked = session.info.setdefault(_MARKED_INFO_KEY, set())
+        ids -= marked
+        marked.update(ids)
+    if not ids:
+        return
+    table = GlobalItemCostStats.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.global_item_id.in_(ids), table.c.is_stale.is_(False))
+        .values(is_stale=True)
+    )
+
+
+def _lot_global_item_id(connection, inventory_item_id, session=None):
+    if not inventory_item_id:
+        return None
+    if session is not None:
+        # Lot writes nearly always follow a load of their item; reuse it.
+        key = inspect(InventoryItem).identity_key_from_primary_key(
+            (inventory_item_id,)
+        )
+        item = session.identity_map.get(key)
+        if item is not None and "global_item_id" in inspect(item).dict:
+            return item.global_item_id
+    item_tbl = InventoryItem.__table__
+    row = connection.execute(
+        item_tbl.select()
+        .with_only_columns(item_tbl.c.global_item_id)
+        .where(item_tbl.c.id == inventory_item_id)
+    ).first()
+    return row[0] if row else None
+
+
+@event.listens_for(InventoryLot, "after_insert")
+def _lot_after_insert(mapper, connection, target):
+    if (getattr(target, "unit_cost", None) or 0) > 0:
+        session = inspect(target).session
+        mark_cost_stats_stale(
+            connection,
+            [_lot_global_item_id(connection, target.inventory_item_id, session)],
+            session,
+        )
+
+
+@event.listens_for(InventoryLot, "after_update")
+def _lot_after_update(mapper, connection, target):
+    state = inspect(target)
+    if not (
+        state.attrs.unit_cost.history.has_changes()
+        or state.attrs.inventory_item_id.history.has_changes()
+    ):
+        return
+    item_ids = {target.inventory_item_id}
+    item_ids.update(state.attrs.inventory_item_id.history.deleted or ())
+    mark_cost_stats_stale(
+        connection,
+        [_lot_global_item_id(connection, item_id, state.session) for item_id in item_ids],
+        state.session,
+    )
+
+
+@event.listens_for(InventoryLot, "after_delete")
+def _lot_after_delete(mapper, connection, target):
+    session = inspect(target).session
+    mark_cost_stats_stale(
+        connection,
+        [_lot_global_item_id(connection, target.inventory_item_id, session)],
+        session,
+    )
+
+
+@event.listens_for(InventoryItem.global_item_id, "set", active_history=True)
+def _item_global_link_set(target, value, oldvalue, initiator):
+    # active_history loads the previous link so after_update can flag it too.
+    return value
+
+
+@event.listens_for(InventoryItem, "after_update")
+def _item_after_update(mapper, connection, target):
+    history = inspect(target).attrs.global_item_id.history
+    if history.has_changes():
+        mark_cost_stats_stale(
+            connection,
+            list(history.added or ()) + list(history.deleted or ()),
+            inspect(target).session,
+        )
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_marked_ids(session, transaction):
+    # A new transaction may see rows refreshed meanwhile, and a rolled-back
+    # savepoint undoes its UPDATE; flag the ids again in either case.
+    if transaction.parent is None or transaction.nested:
+        session.info.pop(_MARKED_INFO_KEY, None)
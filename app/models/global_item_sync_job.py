@@ -0,0 +1,45 @@
+"""Deferred global item sync jobs.
+
+Synopsis:
+Queue rows for global item edits whose linked-inventory fan-out is too large
+to apply inside the developer's request. The scheduler drains pending rows
+through the set-based GlobalItemSyncService and records per-field affected
+counts on the job.
+
+Glossary:
+- Fan-out: Number of org inventory items linked to one global item.
+- Before snapshot: Global item field values prior to the edit, used to decide
+  which linked items still carry the untouched global default.
+"""
+
+from app.extensions import db
+from app.utils.timezone_utils import TimezoneUtils
+
+
+class GlobalItemSyncJob(db.Model):
+    """Pending or finished linked-inventory sync for one global item edit."""
+
+    __tablename__ = "global_item_sync_job"
+
+    id = db.Column(db.Integer, primary_key=True)
+    global_item_id = db.Column(
+        db.Integer,
+        db.ForeignKey("global_item.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    status = db.Column(
+        db.String(16), nullable=False, default="pending", index=True
+    )  # pending, running, done, failed
+    before_snapshot = db.Column(db.JSON, nullable=True)
+    linked_count = db.Column(db.Integer, nullable=True)
+    result = db.Column(db.JSON, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    error_message = db.Column(db.Text, nullable=True)
+    requested_by = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
+    created_at = db.Column(db.DateTime, default=TimezoneUtils.utc_now, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<GlobalItemSyncJob {self.id} global_item={self.global_item_id} ({self.status})>"
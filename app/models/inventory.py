@@ -15,6 +15,7 @@ from flask_login import current_user
 from sqlalchemy import event
 
 from app.services.cache_invalidation import (
+    invalidate_batchbot_context_cache,
     invalidate_ingredient_list_cache,
     invalidate_inventory_list_cache,
     invalidate_product_list_cache,
@@ -267,6 +268,7 @@ def _invalidate_inventory_item_caches(target: "InventoryItem") -> None:
         return
     item_type = (getattr(target, "type", "") or "").lower()
     invalidate_inventory_list_cache(org_id)
+    invalidate_batchbot_context_cache(org_id)
     if item_type == "ingredient":
         invalidate_ingredient_list_cache(org_id)
     if item_type.startswith("product"):
@@ -6,6 +6,7 @@ Defines FIFO inventory lots with base quantities and expiration data.
 Glossary:
 - Inventory lot: Physical stock unit tracked for FIFO.
 - Base quantity: Integer quantity stored in canonical units.
+- InventoryCodeSequence: Per-organization counter behind lot/event code suffixes.
 """
 
 from datetime import datetime, timezone
@@ -210,3 +211,28 @@ class InventoryLot(ScopedModelMixin, db.Model):
         self.remaining_quantity_base = new_remaining_base
         sync_lot_quantities_from_base(self, self.inventory_item)
         return True
+
+
+class InventoryCodeSequence(db.Model):
+    """Last allocated lot/event code number per organization and prefix."""
+
+    __tablename__ = "inventory_code_sequence"
+
+    id = db.Column(db.Integer, primary_key=True)
+    organization_id = db.Column(
+        db.Integer, db.ForeignKey("organization.id"), nullable=False
+    )
+    prefix = db.Column(db.String(8), nullable=False)
+    current_value = db.Column(db.BigInteger, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=TimezoneUtils.utc_now)
+    updated_at = db.Column(
+        db.DateTime, default=TimezoneUtils.utc_now, onupdate=TimezoneUtils.utc_now
+    )
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "organization_id",
+            "prefix",
+            name="uq_inventory_code_sequence_org_prefix",
+        ),
+    )
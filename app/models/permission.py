@@ -1,5 +1,9 @@
 from datetime import datetime, timezone
 
+from sqlalchemy import event
+
+from app.services.cache_invalidation import invalidate_pricing_catalog_cache
+
 from ..extensions import db
 
 
@@ -34,6 +38,21 @@ class Permission(db.Model):
         return True
 
 
+@event.listens_for(Permission, "after_insert")
+def _permission_after_insert(mapper, connection, target):
+    invalidate_pricing_catalog_cache()
+
+
+@event.listens_for(Permission, "after_update")
+def _permission_after_update(mapper, connection, target):
+    invalidate_pricing_catalog_cache()
+
+
+@event.listens_for(Permission, "after_delete")
+def _permission_after_delete(mapper, connection, target):
+    invalidate_pricing_catalog_cache()
+
+
 # Association table for many-to-many relationship
 role_permission = db.Table(
     "role_permission",
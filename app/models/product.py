@@ -15,7 +15,10 @@ from sqlalchemy import event, func
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import object_session, synonym
 
-from app.services.cache_invalidation import invalidate_product_list_cache
+from app.services.cache_invalidation import (
+    invalidate_batchbot_context_cache,
+    invalidate_product_list_cache,
+)
 
 from ..extensions import db
 from .mixins import ScopedModelMixin
@@ -503,6 +506,7 @@ def _invalidate_product_caches(target) -> None:
     org_id = getattr(target, "organization_id", None)
     if org_id:
         invalidate_product_list_cache(org_id)
+        invalidate_batchbot_context_cache(org_id)
 
 
 @event.listens_for(Product, "after_insert")
@@ -14,6 +14,7 @@ import sqlalchemy as sa
 from sqlalchemy import event
 
 from app.services.cache_invalidation import (
+    invalidate_batchbot_context_cache,
     invalidate_public_recipe_library_cache,
     invalidate_recipe_list_cache,
 )
@@ -401,6 +402,7 @@ class RecipeIngredient(ScopedModelMixin, db.Model):
 def _invalidate_recipe_caches(org_id: int | None) -> None:
     if org_id:
         invalidate_recipe_list_cache(org_id)
+        invalidate_batchbot_context_cache(org_id)
     invalidate_public_recipe_library_cache()
 
 
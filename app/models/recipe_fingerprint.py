@@ -0,0 +1,133 @@
+"""Recipe proportion fingerprint model.
+
+Synopsis:
+Stores a precomputed, normalized proportion signature per recipe so duplicate
+and near-duplicate lookups can use indexed hash probes instead of rebuilding
+and comparing every recipe signature pairwise.
+
+Glossary:
+- Ingredient set hash: Digest of the sorted canonical ingredient keys.
+- Ratio bucket hash: Digest of the proportion vector rounded to a fixed grid.
+- Fingerprint version: Algorithm revision used to detect stale rows; version 0
+  marks a row whose ingredient links, names, or densities changed since it was
+  computed.
+"""
+
+from sqlalchemy import event, inspect, select
+
+from ..extensions import db
+from ..utils.timezone_utils import TimezoneUtils
+from .global_item import GlobalItem
+from .inventory import InventoryItem
+from .mixins import ScopedModelMixin
+from .recipe import RecipeIngredient
+
+STALE_FINGERPRINT_VERSION = 0
+
+# Inventory item columns the canonical key or base conversion reads.
+_FINGERPRINT_ITEM_FIELDS = ("global_item_id", "name", "density")
+
+
+class RecipeFingerprint(ScopedModelMixin, db.Model):
+    """Normalized proportion fingerprint for one recipe (org-scoped)."""
+
+    __tablename__ = "recipe_fingerprint"
+
+    id = db.Column(db.Integer, primary_key=True)
+    recipe_id = db.Column(
+        db.Integer,
+        db.ForeignKey("recipe.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    organization_id = db.Column(
+        db.Integer, db.ForeignKey("organization.id"), nullable=True
+    )
+    ingredient_set_hash = db.Column(db.String(64), nullable=False)
+    ratio_bucket_hash = db.Column(db.String(64), nullable=True)
+    ingredient_count = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+    proportions = db.Column(db.JSON, nullable=True)
+    totals = db.Column(db.JSON, nullable=True)
+    fingerprint_version = db.Column(
+        db.Integer, nullable=False, default=1, server_default="1"
+    )
+    computed_at = db.Column(
+        db.DateTime, default=TimezoneUtils.utc_now, onupdate=TimezoneUtils.utc_now
+    )
+
+    recipe = db.relationship(
+        "Recipe",
+        backref=db.backref("fingerprint", uselist=False, passive_deletes=True),
+    )
+
+    __table_args__ = (
+        db.UniqueConstraint("recipe_id", name="uq_recipe_fingerprint_recipe_id"),
+        db.Index(
+            "ix_recipe_fingerprint_org_set", "organization_id", "ingredient_set_hash"
+        ),
+        db.Index("ix_recipe_fingerprint_set", "ingredient_set_hash"),
+        db.Index("ix_recipe_fingerprint_bucket", "ratio_bucket_hash"),
+    )
+
+
+# --- Stale marker ---
+# Purpose: Flag fingerprints of recipes that use the given inventory items.
+# Inputs: Connection (flush or session) and inventory item ids that changed.
+# Outputs: None (UPDATE on recipe_fingerprint); backfill paths recompute them.
+def mark_fingerprints_stale_for_items(connection, inventory_item_ids) -> None:
+    ids = {int(item_id) for item_id in inventory_item_ids if item_id}
+    if not ids:
+        return
+    table = RecipeFingerprint.__table__
+    ingredients = RecipeIngredient.__table__
+    connection.execute(
+        table.update()
+        .where(
+            table.c.recipe_id.in_(
+                select(ingredients.c.recipe_id).where(
+                    ingredients.c.inventory_item_id.in_(ids)
+                )
+            ),
+            table.c.fingerprint_version != STALE_FINGERPRINT_VERSION,
+        )
+        .values(fingerprint_version=STALE_FINGERPRINT_VERSION)
+    )
+
+
+@event.listens_for(InventoryItem, "after_update")
+def _item_after_update(mapper, connection, target):
+    state = inspect(target)
+    if any(
+        state.attrs[field].history.has_changes() for field in _FINGERPRINT_ITEM_FIELDS
+    ):
+        mark_fingerprints_stale_for_items(connection, [target.id])
+
+
+@event.listens_for(GlobalItem, "after_update")
+def _global_item_after_update(mapper, connection, target):
+    state = inspect(target)
+    items = InventoryItem.__table__
+    clauses = []
+    # Linked items without their own density convert with the global density.
+    if state.attrs.density.history.has_changes():
+        clauses.append(
+            (items.c.global_item_id == target.id) & items.c.density.is_(None)
+        )
+    # Unlinked items resolve their canonical key by global item name.
+    name_history = state.attrs.name.history
+    if name_history.has_changes():
+        names = {
+            str(name).strip().lower()
+            for name in list(name_history.added or ()) + list(name_history.deleted or ())
+            if name
+        }
+        if names:
+            clauses.append(
+                items.c.global_item_id.is_(None)
+                & db.func.lower(items.c.name).in_(names)
+            )
+    if not clauses:
+        return
+    linked = connection.execute(select(items.c.id).where(db.or_(*clauses))).scalars()
+    mark_fingerprints_stale_for_items(connection, linked)
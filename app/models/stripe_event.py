@@ -3,17 +3,31 @@ from app.utils.timezone_utils import TimezoneUtils
 
 
 class StripeEvent(db.Model):
-    """Model to track Stripe webhook events for idempotency"""
+    """Billing webhook inbox row: dedupe key, raw payload, and processing state."""
 
     __tablename__ = "stripe_event"
 
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.String(255), unique=True, nullable=False, index=True)
     event_type = db.Column(db.String(128), nullable=False)
+    provider = db.Column(db.String(16), nullable=False, default="stripe")
+    payload = db.Column(db.JSON, nullable=True)
+    # Events sharing a key (the billing customer) are applied in order.
+    ordering_key = db.Column(db.String(255), nullable=True)
+    event_created = db.Column(db.Integer, nullable=True)  # provider epoch seconds
     received_at = db.Column(db.DateTime, default=TimezoneUtils.utc_now, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
     processed_at = db.Column(db.DateTime, nullable=True)
-    status = db.Column(db.String(32), default="received")  # received, processed, failed
+    next_attempt_at = db.Column(db.DateTime, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    status = db.Column(
+        db.String(32), default="received"
+    )  # received, processing, processed, failed
     error_message = db.Column(db.Text, nullable=True)
 
+    __table_args__ = (
+        db.Index("ix_stripe_event_status_ordering", "status", "ordering_key"),
+    )
+
     def __repr__(self):
         return f"<StripeEvent {self.event_id} ({self.event_type})>"
@@ -1,8 +1,10 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import func
+from sqlalchemy import event, func
 from sqlalchemy.orm import backref
 
+from app.services.cache_invalidation import invalidate_pricing_catalog_cache
+
 from ..extensions import db
 
 # Association table for subscription tier permissions
@@ -244,3 +246,18 @@ class SubscriptionTier(db.Model):
                 return tier
 
         return None
+
+
+@event.listens_for(SubscriptionTier, "after_insert")
+def _subscription_tier_after_insert(mapper, connection, target):
+    invalidate_pricing_catalog_cache()
+
+
+@event.listens_for(SubscriptionTier, "after_update")
+def _subscription_tier_after_update(mapper, connection, target):
+    invalidate_pricing_catalog_cache()
+
+
+@event.listens_for(SubscriptionTier, "after_delete")
+def _subscription_tier_after_delete(mapper, connection, target):
+    invalidate_pricing_catalog_cache()
@@ -117,6 +117,7 @@ class UnifiedInventoryHistory(ScopedModelMixin, db.Model):
         db.Index("idx_unified_change_type", "change_type"),
         db.Index("idx_unified_expiration", "expiration_date"),
         db.Index("ix_unified_history_org", "organization_id"),
+        db.Index("ix_unified_history_batch_timestamp", "batch_id", "timestamp"),
     )
 
     def __repr__(self):
@@ -1,6 +1,9 @@
 from datetime import datetime, timezone
 
 from flask_login import current_user
+from sqlalchemy import event
+
+from app.services.cache_invalidation import invalidate_unit_catalog_cache
 
 from ..extensions import db
 from ..utils.timezone_utils import TimezoneUtils
@@ -107,3 +110,18 @@ class ConversionLog(TimestampMixin, ScopedModelMixin, db.Model):
     ingredient_name = db.Column(db.String(128), nullable=True)
 
     user = db.relationship("User", backref="conversion_logs")
+
+
+@event.listens_for(Unit, "after_insert")
+def _unit_after_insert(mapper, connection, target):
+    invalidate_unit_catalog_cache()
+
+
+@event.listens_for(Unit, "after_update")
+def _unit_after_update(mapper, connection, target):
+    invalidate_unit_catalog_cache()
+
+
+@event.listens_for(Unit, "after_delete")
+def _unit_after_delete(mapper, connection, target):
+    invalidate_unit_catalog_cache()
@@ -1,5 +1,6 @@
 """Static asset pipeline and operations commands."""
 
+import json
 import subprocess
 from pathlib import Path
 
@@ -39,6 +40,21 @@ def build_soap_assets_command():
     click.echo("Soap asset build complete.")
 
 
+@click.command("build-media-manifest")
+@with_appcontext
+def build_media_manifest_command():
+    """Rebuild the public media manifest (hashes, dimensions, variants)."""
+    from app.services.public_media_service import write_media_manifest
+
+    manifest_path = write_media_manifest()
+    payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+    entry_count = sum(len(record["entries"]) for record in payload["folders"].values())
+    click.echo(
+        f"Media manifest rebuilt: {len(payload['folders'])} folder(s), "
+        f"{entry_count} file(s) -> {manifest_path}"
+    )
+
+
 @click.command("minify-static")
 @with_appcontext
 def minify_static_command():
@@ -54,5 +70,6 @@ def minify_static_command():
 ASSET_COMMANDS = [
     build_assets_command,
     build_soap_assets_command,
+    build_media_manifest_command,
     minify_static_command,
 ]
@@ -117,9 +117,218 @@ def dispatch_domain_events_command(poll_interval: float, batch_size: int, once:
         dispatcher.run_forever(poll_interval=poll_interval)
 
 
+@click.command("rebuild-recipe-fingerprints")
+@click.option(
+    "--org-id",
+    type=int,
+    default=None,
+    help="Limit the rebuild to one organization.",
+)
+@click.option(
+    "--all",
+    "rebuild_all",
+    is_flag=True,
+    help="Recompute every fingerprint instead of only missing/stale rows.",
+)
+@click.option(
+    "--batch-size",
+    default=500,
+    show_default=True,
+    type=int,
+    help="Recipes loaded and committed per chunk.",
+)
+@with_appcontext
+def rebuild_recipe_fingerprints_command(
+    org_id: int | None, rebuild_all: bool, batch_size: int
+):
+    """Backfill the recipe proportion fingerprint index (production-safe)."""
+    from app.services.recipe_proportionality_service import (
+        RecipeProportionalityService,
+    )
+
+    try:
+        written = RecipeProportionalityService.ensure_fingerprints(
+            organization_id=org_id,
+            include_current=rebuild_all,
+            batch_size=batch_size,
+        )
+        click.echo(f"Rebuilt {written} recipe fingerprint(s).")
+    except Exception as e:
+        logger.warning("Suppressed exception fallback at app/scripts/commands/maintenance.py:151", exc_info=True)
+        click.echo(f"❌ Recipe fingerprint rebuild failed: {str(e)}")
+        db.session.rollback()
+        raise
+
+
+@click.command("build-library-search-index")
+@with_appcontext
+def build_library_search_index_command():
+    """Create and fill the SQLite FTS5 recipe library index (no-op on PostgreSQL)."""
+    from app.services.recipe_library_search_service import RecipeLibrarySearchService
+
+    if RecipeLibrarySearchService.create_sqlite_index():
+        click.echo("Recipe library search index is ready.")
+    else:
+        click.echo("No SQLite FTS5 index built (PostgreSQL uses migration 0034 indexes).")
+
+
+@click.command("refresh-global-item-cost-stats")
+@click.option(
+    "--global-item-id",
+    type=int,
+    default=None,
+    help="Refresh a single global item.",
+)
+@click.option(
+    "--all",
+    "refresh_all",
+    is_flag=True,
+    help="Recompute every linked global item instead of only missing/stale rows.",
+)
+@with_appcontext
+def refresh_global_item_cost_stats_command(
+    global_item_id: int | None, refresh_all: bool
+):
+    """Precompute global item cost distributions (production-safe)."""
+    from app.services.statistics.global_item_stats import GlobalItemStatsService
+
+    try:
+        if global_item_id:
+            GlobalItemStatsService.refresh_cost_distribution(global_item_id)
+            refreshed = 1
+        else:
+            refreshed = GlobalItemStatsService.refresh_stale_cost_distributions(
+                include_fresh=refresh_all
+            )
+        click.echo(f"Refreshed {refreshed} global item cost distribution(s).")
+    except Exception as e:
+        logger.warning("Suppressed exception fallback at app/scripts/commands/maintenance.py:192", exc_info=True)
+        click.echo(f"❌ Global item cost stats refresh failed: {str(e)}")
+        db.session.rollback()
+        raise
+
+
+@click.command("backfill-batch-cost-rollups")
+@click.option(
+    "--chunk-size",
+    type=int,
+    default=500,
+    show_default=True,
+    help="Completed batches aggregated per grouped query.",
+)
+@with_appcontext
+def backfill_batch_cost_rollups_command(chunk_size: int):
+    """Cache cost rollups on completed batches missing them (production-safe)."""
+    from app.services.batch_service.cost_rollup import BatchCostRollupService
+
+    try:
+        updated = BatchCostRollupService.backfill_completed(chunk_size=chunk_size)
+        click.echo(f"Cached cost rollups for {updated} completed batch(es).")
+    except Exception as e:
+        logger.warning("Suppressed exception fallback at app/scripts/commands/maintenance.py:215", exc_info=True)
+        click.echo(f"❌ Batch cost rollup backfill failed: {str(e)}")
+        db.session.rollback()
+        raise
+
+
+@click.command("backfill-batch-freshness")
+@click.option(
+    "--chunk-size",
+    type=int,
+    default=500,
+    show_default=True,
+    help="Completed batches summarized per joined history query.",
+)
+@with_appcontext
+def backfill_batch_freshness_command(chunk_size: int):
+    """Cache freshness summaries on completed batches missing them (production-safe)."""
+    from app.services.freshness_service import FreshnessService
+
+    try:
+        updated = FreshnessService.backfill_completed(chunk_size=chunk_size)
+        click.echo(f"Cached freshness summaries for {updated} completed batch(es).")
+    except Exception as e:
+        logger.warning("Suppressed exception fallback at app/scripts/commands/maintenance.py:238", exc_info=True)
+        click.echo(f"❌ Batch freshness backfill failed: {str(e)}")
+        db.session.rollback()
+        raise
+
+
+@click.command("run-scheduler")
+@click.option(
+    "--once",
+    is_flag=True,
+    help="Run every enabled job (or --job selections) once and exit.",
+)
+@click.option(
+    "--job",
+    "job_names",
+    multiple=True,
+    help="Limit --once to specific job names (repeatable).",
+)
+@click.option(
+    "--list",
+    "list_jobs",
+    is_flag=True,
+    help="Print enabled jobs and their intervals, then exit.",
+)
+@with_appcontext
+def run_scheduler_command(once: bool, job_names: tuple[str, ...], list_jobs: bool):
+    """Run the leader-elected periodic maintenance job scheduler."""
+    import json
+
+    from flask import current_app
+
+    from app.services.job_scheduler import (
+        JobScheduler,
+        build_default_jobs,
+        resolve_leader_lock,
+    )
+
+    app = current_app._get_current_object()
+    jobs = build_default_jobs(app)
+    if list_jobs:
+        for job in jobs:
+            click.echo(
+                f"{job.name}: every {job.interval_seconds:g}s (+0-{job.jitter_seconds:g}s jitter, {job.lane} lane) - {job.description}"
+            )
+        return
+
+    scheduler = JobScheduler(
+        app,
+        jobs,
+        lock=resolve_leader_lock(app),
+        max_workers=int(app.config.get("SCHEDULER_MAX_WORKERS") or 2),
+        latency_workers=int(app.config.get("SCHEDULER_LATENCY_WORKERS") or 2),
+    )
+    if once:
+        try:
+            metrics = scheduler.run_once(job_names or None)
+        finally:
+            scheduler.shutdown()
+        if not metrics:
+            click.echo("Another scheduler holds the leader lock; nothing ran.")
+        click.echo(json.dumps(metrics, indent=2, default=str))
+        return
+
+    click.echo(
+        f"Starting job scheduler ({len(jobs)} jobs, lock={scheduler.lock.backend})..."
+    )
+    scheduler.run_forever(
+        poll_seconds=float(app.config.get("SCHEDULER_POLL_SECONDS") or 1.0)
+    )
+    click.echo(json.dumps(scheduler.metrics_snapshot(), indent=2, default=str))
+
+
 MAINTENANCE_COMMANDS = [
     update_permissions_command,
     update_addons_command,
     update_subscription_tiers_command,
     dispatch_domain_events_command,
+    rebuild_recipe_fingerprints_command,
+    build_library_search_index_command,
+    refresh_global_item_cost_stats_command,
+    backfill_batch_cost_rollups_command,
+    backfill_batch_freshness_command,
+    run_scheduler_command,
 ]
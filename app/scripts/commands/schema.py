@@ -10,6 +10,13 @@ from ...extensions import db
 logger = logging.getLogger(__name__)
 
 
+def _build_sqlite_search_index() -> None:
+    # create_all skips migrations, so SQLite databases built here need the
+    # recipe library FTS5 mirror from migration 0042 created explicitly.
+    from ...services.recipe_library_search_service import RecipeLibrarySearchService
+
+    if RecipeLibrarySearchService.create_sqlite_index():
+        print("✅ Recipe library search index built")
 
 @click.command("create-app")
 @with_appcontext
@@ -51,6 +58,7 @@ def create_app_command():
         print("🏗️  Creating database tables...")
         db.create_all()
         print("✅ Database tables created")
+        _build_sqlite_search_index()
 
         inspector = inspect(db.engine)
         tables = inspector.get_table_names()
@@ -110,6 +118,7 @@ def sync_schema_command():
         existing_tables = set(inspect(db.engine).get_table_names())
 
         db.create_all()
+        _build_sqlite_search_index()
 
         inspector = inspect(db.engine)
         tables_after = set(inspector.get_table_names())
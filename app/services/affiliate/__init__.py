@@ -1,6 +1,13 @@
 """Affiliate service package exports."""
 
 from .payout_notification_service import AffiliatePayoutNotificationService
+from .payout_providers import (
+    FakePayoutProvider,
+    PayoutProviderError,
+    PayoutTransferRequest,
+    StripePayoutProvider,
+)
+from .payout_runner import AffiliatePayoutRunner
 from .payout_status import (
     PAYOUT_STATUS_COMPLETE,
     PAYOUT_STATUS_PENDING,
@@ -14,10 +21,15 @@ from .payout_status import (
 
 __all__ = [
     "AffiliatePayoutNotificationService",
+    "AffiliatePayoutRunner",
+    "FakePayoutProvider",
     "PAYOUT_STATUS_COMPLETE",
     "PAYOUT_STATUS_PENDING",
     "PAYOUT_STATUS_SENT",
     "PAYOUT_STATUS_UNSUCCESSFUL",
+    "PayoutProviderError",
+    "PayoutTransferRequest",
+    "StripePayoutProvider",
     "is_payout_complete",
     "normalize_payout_status",
     "payout_status_label",
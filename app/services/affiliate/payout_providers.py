@@ -0,0 +1,143 @@
+"""Affiliate payout transfer providers.
+
+Synopsis:
+Thin adapters the payout runner pushes transfers through. The Stripe provider
+forwards the runner's idempotency key so a retried or resumed push returns the
+original transfer, and can look a transfer up by its checkpoint id for
+checkpoints whose pushes all failed; the fake provider mimics that contract
+locally, with optional latency and failures, for tests and throughput runs.
+
+Glossary:
+- Transfer request: Amount, destination, and metadata for one org-month batch.
+- Idempotency key: Stable per checkpoint; repeating it never pays twice.
+- Transfer lookup: Search for a transfer carrying a checkpoint's
+  `payout_batch_id` metadata, for pushes whose outcome is unknown.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+
+class PayoutProviderError(Exception):
+    """Raised when a provider rejects or cannot complete a transfer."""
+
+
+@dataclass(frozen=True)
+class PayoutTransferRequest:
+    amount_cents: int
+    currency: str
+    destination: str
+    idempotency_key: str
+    description: str = ""
+    metadata: dict[str, str] = field(default_factory=dict)
+
+
+class StripePayoutProvider:
+    """Push affiliate payouts as Stripe Connect transfers."""
+
+    name = "stripe"
+
+    def is_ready(self) -> bool:
+        from ..billing_service import BillingService
+
+        return bool(BillingService.ensure_stripe())
+
+    def create_transfer(self, request: PayoutTransferRequest) -> str:
+        from ..billing_service import stripe
+
+        try:
+            transfer = stripe.Transfer.create(
+                amount=int(request.amount_cents),
+                currency=request.currency,
+                destination=request.destination,
+                description=request.description,
+                metadata=dict(request.metadata),
+                idempotency_key=request.idempotency_key,
+            )
+        except Exception as exc:
+            raise PayoutProviderError(str(exc)) from exc
+        return str(getattr(transfer, "id", "") or transfer.get("id"))
+
+    def find_transfer(
+        self, request: PayoutTransferRequest, *, created_after: datetime | None = None
+    ) -> str | None:
+        from ..billing_service import stripe
+
+        batch_id = request.metadata.get("payout_batch_id")
+        params: dict[str, Any] = {"destination": request.destination, "limit": 100}
+        if created_after is not None:
+            if created_after.tzinfo is None:
+                created_after = created_after.replace(tzinfo=timezone.utc)
+            params["created"] = {"gte": int(created_after.timestamp())}
+        try:
+            for transfer in stripe.Transfer.list(**params).auto_paging_iter():
+                metadata = transfer.get("metadata") or {}
+                if batch_id and metadata.get("payout_batch_id") == batch_id:
+                    return str(transfer.get("id"))
+        except Exception as exc:
+            raise PayoutProviderError(str(exc)) from exc
+        return None
+
+
+class FakePayoutProvider:
+    """In-memory provider honouring idempotency keys, for local throughput runs."""
+
+    name = "stripe"
+
+    def __init__(
+        self,
+        *,
+        latency_seconds: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int | None = None,
+    ):
+        self.latency_seconds = max(0.0, float(latency_seconds or 0.0))
+        self.failure_rate = min(1.0, max(0.0, float(failure_rate or 0.0)))
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.transfers: dict[str, dict[str, Any]] = {}
+        self.calls = 0
+
+    def is_ready(self) -> bool:
+        return True
+
+    def create_transfer(self, request: PayoutTransferRequest) -> str:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        with self._lock:
+            self.calls += 1
+            existing = self.transfers.get(request.idempotency_key)
+            if existing is not None:
+                return existing["id"]
+            if self.failure_rate and self._random.random() < self.failure_rate:
+                raise PayoutProviderError("fake provider declined the transfer")
+            transfer_id = f"tr_fake_{len(self.transfers) + 1}"
+            self.transfers[request.idempotency_key] = {
+                "id": transfer_id,
+                "amount_cents": int(request.amount_cents),
+                "currency": request.currency,
+                "destination": request.destination,
+                "metadata": dict(request.metadata),
+            }
+            return transfer_id
+
+    def find_transfer(
+        self, request: PayoutTransferRequest, *, created_after: datetime | None = None
+    ) -> str | None:
+        batch_id = request.metadata.get("payout_batch_id")
+        with self._lock:
+            for transfer in self.transfers.values():
+                if batch_id and transfer["metadata"].get("payout_batch_id") == batch_id:
+                    return transfer["id"]
+        return None
+
+    @property
+    def transferred_cents(self) -> int:
+        with self._lock:
+            return sum(row["amount_cents"] for row in self.transfers.values())
@@ -0,0 +1,616 @@
+"""Concurrent, resumable affiliate payout runner.
+
+Synopsis:
+Plans eligible pending org-month payout batches with one grouped query (the
+arrears window becomes an earning-month cutoff and zero-commission batches are
+excluded), flips churn-blocked rows with one bulk UPDATE, and writes an
+`AffiliatePayoutBatch` checkpoint per batch before any money moves. Claimed
+checkpoints are pushed to the provider on a bounded thread pool with a stable
+idempotency key each, and every result is committed as it returns, so an
+interrupted run resumes where it stopped without paying twice. Before a batch
+with a terminally failed checkpoint is planned again, the provider is asked
+whether that checkpoint's transfer went out after all; if not, an unchanged
+batch reopens the failed checkpoint and keeps its idempotency key.
+
+Glossary:
+- Batch: Payable earning rows for one referrer organization and earning month.
+- Checkpoint: `AffiliatePayoutBatch` row; planned -> pushing -> sent/failed/canceled.
+- Stale claim: Checkpoint left in pushing by a run that died; resumed with its key.
+- Settled by lookup: Failed checkpoint the provider reports as paid; recorded
+  as sent instead of being planned again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from flask import current_app
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from ...extensions import db
+from ...models import Organization
+from ...models.affiliate import (
+    AffiliateMonthlyEarning,
+    AffiliatePayoutAccount,
+    AffiliatePayoutBatch,
+    AffiliateReferral,
+)
+from ...utils.timezone_utils import TimezoneUtils
+from .payout_providers import PayoutTransferRequest, StripePayoutProvider
+from .payout_status import (
+    PAYOUT_STATUS_COMPLETE,
+    PAYOUT_STATUS_PENDING,
+    PAYOUT_STATUS_SENT,
+    PAYOUT_STATUS_UNSUCCESSFUL,
+    payout_status_query_values,
+)
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_PLANNED = "planned"
+CHECKPOINT_PUSHING = "pushing"
+CHECKPOINT_SENT = "sent"
+CHECKPOINT_FAILED = "failed"
+CHECKPOINT_CANCELED = "canceled"
+
+PAYOUT_MAX_ATTEMPTS = 3
+# A checkpoint stuck in pushing this long belonged to a run that died.
+_STALE_CLAIM_SECONDS = 600
+_DEFAULT_WORKERS = 4
+
+
+def latest_eligible_month(as_of_date: date, arrears_days: int) -> date:
+    """Return the newest earning month whose arrears window has closed."""
+    # Month M is eligible once its last day + arrears_days <= as_of_date,
+    # i.e. once the first day of M+1 <= as_of_date - arrears_days + 1.
+    boundary = as_of_date - timedelta(days=int(arrears_days) - 1)
+    return (boundary.replace(day=1) - timedelta(days=1)).replace(day=1)
+
+
+def _month_end(month_start: date) -> date:
+    return (month_start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+
+def _idempotency_base(organization_id: int, earning_month: date, earning_ids: list[int]) -> str:
+    digest = hashlib.sha256(",".join(str(i) for i in sorted(earning_ids)).encode()).hexdigest()
+    return f"affiliate-payout-{organization_id}-{earning_month:%Y%m}-{digest[:16]}"
+
+
+# --- AffiliatePayoutRunner ---
+# Purpose: Push every eligible affiliate payout batch with bounded concurrency.
+class AffiliatePayoutRunner:
+    """Plan, checkpoint, and push affiliate payout batches."""
+
+    def __init__(
+        self,
+        provider=None,
+        *,
+        max_workers: int | None = None,
+        as_of_date: date | None = None,
+        arrears_days: int = 30,
+        send_email: bool = True,
+    ):
+        self.provider = provider or StripePayoutProvider()
+        self.max_workers = max_workers
+        self.as_of_date = as_of_date or TimezoneUtils.utc_now().date()
+        self.arrears_days = int(arrears_days)
+        self.send_email = send_email
+        self.run_id = uuid.uuid4().hex
+        self.cutoff_month = latest_eligible_month(self.as_of_date, self.arrears_days)
+        self._pending_values = payout_status_query_values(PAYOUT_STATUS_PENDING)
+        self._settled_values = payout_status_query_values(
+            PAYOUT_STATUS_SENT
+        ) + payout_status_query_values(PAYOUT_STATUS_COMPLETE)
+
+    # --- Run ---
+    # Purpose: Resume open checkpoints, plan new batches, and push them.
+    # Inputs: Maximum batches to push in this run.
+    # Outputs: Summary counts compatible with AffiliateService auto payouts.
+    def run(self, *, limit_batches: int = 50) -> dict[str, Any]:
+        limit = max(1, int(limit_batches or 50))
+        summary = {
+            "ok": True,
+            "reason": None,
+            "run_id": self.run_id,
+            "processed_batches": 0,
+            "resumed_batches": 0,
+            "sent_batches": 0,
+            "skipped_not_eligible": 0,
+            "skipped_no_payable": 0,
+            "failed_batches": 0,
+            "canceled_batches": 0,
+            "recovered_batches": 0,
+            "blocked_rows": 0,
+            "sent_commission_cents": 0,
+        }
+        if not self.provider.is_ready():
+            return {**summary, "ok": False, "reason": "stripe_not_configured"}
+
+        summary["skipped_not_eligible"] = self._count_not_eligible()
+        resumable = self._resumable_checkpoint_ids(limit)
+        summary["resumed_batches"] = len(resumable)
+        planned = self._plan(limit - len(resumable), summary)
+        checkpoints = self._cancel_changed(self._claim(resumable + planned), summary)
+        summary["processed_batches"] = (
+            len(checkpoints) + summary["canceled_batches"] + summary["skipped_no_payable"]
+        )
+        sent = self._push(checkpoints, summary)
+        if self.send_email and sent:
+            self._notify(sent)
+        return summary
+
+    def _worker_count(self) -> int:
+        configured = self.max_workers or current_app.config.get("AFFILIATE_PAYOUT_WORKERS")
+        return max(1, int(configured or _DEFAULT_WORKERS))
+
+    def _pending_batch_keys(self):
+        earning = AffiliateMonthlyEarning
+        return (
+            select(earning.referrer_organization_id, earning.earning_month)
+            .join(
+                AffiliatePayoutAccount,
+                AffiliatePayoutAccount.organization_id == earning.referrer_organization_id,
+            )
+            .where(
+                earning.payout_status.in_(self._pending_values),
+                earning.commission_amount_cents > 0,
+                AffiliatePayoutAccount.payout_provider == self.provider.name,
+                AffiliatePayoutAccount.payout_account_reference.isnot(None),
+                AffiliatePayoutAccount.payout_account_reference != "",
+            )
+            .group_by(earning.referrer_organization_id, earning.earning_month)
+        )
+
+    def _count_not_eligible(self) -> int:
+        waiting = self._pending_batch_keys().where(
+            AffiliateMonthlyEarning.earning_month > self.cutoff_month
+        )
+        return int(db.session.execute(select(func.count()).select_from(waiting.subquery())).scalar() or 0)
+
+    def _resumable_checkpoint_ids(self, limit: int) -> list[int]:
+        stale = TimezoneUtils.utc_now() - timedelta(seconds=_STALE_CLAIM_SECONDS)
+        return list(
+            db.session.execute(
+                select(AffiliatePayoutBatch.id)
+                .where(
+                    AffiliatePayoutBatch.payout_provider == self.provider.name,
+                    or_(
+                        AffiliatePayoutBatch.status == CHECKPOINT_PLANNED,
+                        and_(
+                            AffiliatePayoutBatch.status == CHECKPOINT_PUSHING,
+                            AffiliatePayoutBatch.claimed_at < stale,
+                        ),
+                    ),
+                )
+                .order_by(AffiliatePayoutBatch.id.asc())
+                .limit(limit)
+            ).scalars()
+        )
+
+    def _plan(self, limit: int, summary: dict[str, Any]) -> list[int]:
+        if limit <= 0:
+            return []
+        earning = AffiliateMonthlyEarning
+        open_checkpoint = (
+            select(AffiliatePayoutBatch.id)
+            .where(
+                AffiliatePayoutBatch.organization_id == earning.referrer_organization_id,
+                AffiliatePayoutBatch.earning_month == earning.earning_month,
+                AffiliatePayoutBatch.status.in_((CHECKPOINT_PLANNED, CHECKPOINT_PUSHING)),
+            )
+            .exists()
+        )
+        keys = db.session.execute(
+            self._pending_batch_keys()
+            .where(earning.earning_month <= self.cutoff_month, ~open_checkpoint)
+            .order_by(earning.earning_month.asc(), earning.referrer_organization_id.asc())
+            .limit(limit)
+        ).all()
+        if not keys:
+            return []
+        wanted = {(int(org_id), month) for org_id, month in keys}
+        # Paid-after-all batches settle their rows before the rows are read.
+        failed_by_base, held, recovered = self._settle_failed_checkpoints(wanted, summary)
+        wanted -= held
+
+        rows = db.session.execute(
+            select(
+                earning.id,
+                earning.referrer_organization_id,
+                earning.earning_month,
+                earning.commission_amount_cents,
+                earning.currency,
+                earning.payout_status,
+                AffiliateReferral.churned_at,
+                AffiliatePayoutAccount.payout_account_reference,
+            )
+            .outerjoin(AffiliateReferral, AffiliateReferral.id == earning.affiliate_referral_id)
+            .join(
+                AffiliatePayoutAccount,
+                AffiliatePayoutAccount.organization_id == earning.referrer_organization_id,
+            )
+            .where(
+                earning.referrer_organization_id.in_({org_id for org_id, _ in wanted}),
+                earning.earning_month.in_({month for _, month in wanted}),
+                earning.payout_status.not_in(self._settled_values),
+                earning.commission_amount_cents > 0,
+            )
+            .order_by(earning.id.asc())
+        ).all()
+
+        batches: dict[tuple[int, date], dict[str, Any]] = {}
+        block_ids: list[int] = []
+        unsuccessful_values = set(payout_status_query_values(PAYOUT_STATUS_UNSUCCESSFUL))
+        for row in rows:
+            key = (int(row.referrer_organization_id), row.earning_month)
+            if key not in wanted:
+                continue
+            batch = batches.setdefault(
+                key,
+                {
+                    "ids": [],
+                    "amount_cents": 0,
+                    "currency": str(row.currency or "usd").lower(),
+                    "destination": (row.payout_account_reference or "").strip(),
+                },
+            )
+            if self._churned_before_eligible(row.churned_at, row.earning_month):
+                summary["blocked_rows"] += 1
+                if row.payout_status not in unsuccessful_values:
+                    block_ids.append(int(row.id))
+                continue
+            batch["ids"].append(int(row.id))
+            batch["amount_cents"] += int(row.commission_amount_cents or 0)
+
+        if block_ids:
+            db.session.execute(
+                update(earning)
+                .where(earning.id.in_(block_ids))
+                .values(
+                    payout_status=PAYOUT_STATUS_UNSUCCESSFUL,
+                    updated_at=TimezoneUtils.utc_now(),
+                )
+            )
+            db.session.commit()
+
+        prior_rounds = Counter(
+            key.rsplit("-", 1)[0]
+            for key in db.session.execute(
+                select(AffiliatePayoutBatch.idempotency_key).where(
+                    AffiliatePayoutBatch.organization_id.in_({org_id for org_id, _ in wanted}),
+                    AffiliatePayoutBatch.earning_month.in_({month for _, month in wanted}),
+                )
+            ).scalars()
+        )
+        checkpoints: list[AffiliatePayoutBatch] = []
+        reopened: list[int] = []
+        for (org_id, month), batch in sorted(batches.items(), key=lambda item: (item[0][1], item[0][0])):
+            if not batch["ids"] or batch["amount_cents"] <= 0 or not batch["destination"]:
+                summary["skipped_no_payable"] += 1
+                continue
+            base = _idempotency_base(org_id, month, batch["ids"])
+            failed = failed_by_base.pop(base, None)
+            if failed is not None and (
+                failed.destination,
+                int(failed.amount_cents or 0),
+                failed.currency,
+            ) == (batch["destination"], batch["amount_cents"], batch["currency"]):
+                # Same transfer parameters: retry under the failed checkpoint's key.
+                failed.status = CHECKPOINT_PLANNED
+                failed.attempts = 0
+                failed.run_id = None
+                failed.claimed_at = None
+                failed.finished_at = None
+                reopened.append(failed.id)
+                continue
+            checkpoints.append(
+                AffiliatePayoutBatch(
+                    organization_id=org_id,
+                    earning_month=month,
+                    status=CHECKPOINT_PLANNED,
+                    idempotency_key=f"{base}-{prior_rounds[base]}",
+                    earning_ids=batch["ids"],
+                    amount_cents=batch["amount_cents"],
+                    currency=batch["currency"],
+                    payout_provider=self.provider.name,
+                    destination=batch["destination"],
+                )
+            )
+        # The provider holds no transfer for these; a changed batch replaces them.
+        for superseded in failed_by_base.values():
+            superseded.status = CHECKPOINT_CANCELED
+            superseded.error_message = "Superseded: provider lookup found no transfer."
+        db.session.commit()
+        # Batches whose rows were all blocked or zero never reach a checkpoint.
+        summary["skipped_no_payable"] += len(wanted - recovered - set(batches))
+        return reopened + self._insert_checkpoints(checkpoints)
+
+    # --- Failed checkpoints ---
+    # Purpose: Ask the provider whether terminally failed pushes were paid after all.
+    # Inputs: Org-month keys about to be planned; run summary.
+    # Outputs: Unpaid failed checkpoints by idempotency base, keys held back
+    #          because the lookup itself failed, and keys settled by lookup.
+    def _settle_failed_checkpoints(
+        self, wanted: set[tuple[int, date]], summary: dict[str, Any]
+    ) -> tuple[
+        dict[str, AffiliatePayoutBatch], set[tuple[int, date]], set[tuple[int, date]]
+    ]:
+        failed = db.session.execute(
+            select(AffiliatePayoutBatch)
+            .where(
+                AffiliatePayoutBatch.organization_id.in_({org_id for org_id, _ in wanted}),
+                AffiliatePayoutBatch.earning_month.in_({month for _, month in wanted}),
+                AffiliatePayoutBatch.status == CHECKPOINT_FAILED,
+                AffiliatePayoutBatch.payout_provider == self.provider.name,
+            )
+            .order_by(AffiliatePayoutBatch.id.asc())
+        ).scalars().all()
+        unpaid: dict[str, AffiliatePayoutBatch] = {}
+        held: set[tuple[int, date]] = set()
+        recovered: set[tuple[int, date]] = set()
+        for checkpoint in failed:
+            key = (int(checkpoint.organization_id), checkpoint.earning_month)
+            if key not in wanted:
+                continue
+            try:
+                reference = self.provider.find_transfer(
+                    self._transfer_request(checkpoint, None),
+                    created_after=checkpoint.created_at,
+                )
+            except Exception as exc:
+                # Unknown outcome: planning now could pay the same rows twice.
+                logger.warning(
+                    "Affiliate payout batch %s transfer lookup failed: %s", checkpoint.id, exc
+                )
+                held.add(key)
+                continue
+            if reference:
+                self._record_sent(checkpoint, reference)
+                summary["recovered_batches"] += 1
+                recovered.add(key)
+                continue
+            base = checkpoint.idempotency_key.rsplit("-", 1)[0]
+            older = unpaid.get(base)
+            if older is not None:
+                older.status = CHECKPOINT_CANCELED
+                older.error_message = "Superseded: provider lookup found no transfer."
+            unpaid[base] = checkpoint
+        return unpaid, held, recovered
+
+    @staticmethod
+    def _insert_checkpoints(checkpoints: list[AffiliatePayoutBatch]) -> list[int]:
+        if not checkpoints:
+            return []
+        db.session.add_all(checkpoints)
+        try:
+            db.session.commit()
+            return [checkpoint.id for checkpoint in checkpoints]
+        except IntegrityError:
+            db.session.rollback()
+
+        # A concurrent run planned some of these batches; keep the rest.
+        inserted: list[int] = []
+        for checkpoint in checkpoints:
+            db.session.add(checkpoint)
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                continue
+            inserted.append(checkpoint.id)
+        return inserted
+
+    def _churned_before_eligible(self, churned_at: datetime | None, earning_month: date) -> bool:
+        if churned_at is None:
+            return False
+        if churned_at.tzinfo is not None:
+            churned_at = churned_at.astimezone(timezone.utc)
+        eligible_on = _month_end(earning_month) + timedelta(days=self.arrears_days)
+        return churned_at.date() <= eligible_on
+
+    def _claim(self, checkpoint_ids: list[int]) -> list[AffiliatePayoutBatch]:
+        if not checkpoint_ids:
+            return []
+        now = TimezoneUtils.utc_now()
+        stale = now - timedelta(seconds=_STALE_CLAIM_SECONDS)
+        db.session.execute(
+            update(AffiliatePayoutBatch)
+            .where(
+                AffiliatePayoutBatch.id.in_(checkpoint_ids),
+                or_(
+                    AffiliatePayoutBatch.status == CHECKPOINT_PLANNED,
+                    and_(
+                        AffiliatePayoutBatch.status == CHECKPOINT_PUSHING,
+                        AffiliatePayoutBatch.claimed_at < stale,
+                    ),
+                ),
+            )
+            .values(
+                status=CHECKPOINT_PUSHING,
+                run_id=self.run_id,
+                claimed_at=now,
+                attempts=AffiliatePayoutBatch.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return list(
+            db.session.execute(
+                select(AffiliatePayoutBatch)
+                .where(
+                    AffiliatePayoutBatch.id.in_(checkpoint_ids),
+                    AffiliatePayoutBatch.run_id == self.run_id,
+                    AffiliatePayoutBatch.status == CHECKPOINT_PUSHING,
+                )
+                .order_by(AffiliatePayoutBatch.id.asc())
+                .execution_options(populate_existing=True)
+            ).scalars()
+        )
+
+    def _cancel_changed(
+        self, checkpoints: list[AffiliatePayoutBatch], summary: dict[str, Any]
+    ) -> list[AffiliatePayoutBatch]:
+        """Drop checkpoints whose earning rows were settled since planning."""
+        all_ids = {int(i) for checkpoint in checkpoints for i in checkpoint.earning_ids}
+        if not all_ids:
+            return checkpoints
+        settled = set(
+            db.session.execute(
+                select(AffiliateMonthlyEarning.id).where(
+                    AffiliateMonthlyEarning.id.in_(all_ids),
+                    AffiliateMonthlyEarning.payout_status.in_(self._settled_values),
+                )
+            ).scalars()
+        )
+        if not settled:
+            return checkpoints
+        keep: list[AffiliatePayoutBatch] = []
+        now = TimezoneUtils.utc_now()
+        for checkpoint in checkpoints:
+            if settled.isdisjoint(int(i) for i in checkpoint.earning_ids):
+                keep.append(checkpoint)
+                continue
+            checkpoint.status = CHECKPOINT_CANCELED
+            checkpoint.error_message = "Earning rows were settled before the push."
+            checkpoint.finished_at = now
+            summary["canceled_batches"] += 1
+        db.session.commit()
+        return keep
+
+    def _push(
+        self, checkpoints: list[AffiliatePayoutBatch], summary: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        if not checkpoints:
+            return []
+        names = dict(
+            db.session.execute(
+                select(Organization.id, Organization.name).where(
+                    Organization.id.in_({c.organization_id for c in checkpoints})
+                )
+            ).all()
+        )
+        by_id = {checkpoint.id: checkpoint for checkpoint in checkpoints}
+        sent: list[dict[str, Any]] = []
+        with ThreadPoolExecutor(
+            max_workers=min(self._worker_count(), len(checkpoints)),
+            thread_name_prefix="affiliate-payout",
+        ) as executor:
+            # Only the provider call runs off-thread; results commit here in order of arrival.
+            futures = {
+                executor.submit(
+                    self.provider.create_transfer,
+                    self._transfer_request(checkpoint, names.get(checkpoint.organization_id)),
+                ): checkpoint.id
+                for checkpoint in checkpoints
+            }
+            for future in as_completed(futures):
+                checkpoint = by_id[futures[future]]
+                try:
+                    reference = future.result()
+                except Exception as exc:
+                    self._record_failure(checkpoint, exc)
+                    summary["failed_batches"] += 1
+                    continue
+                sent.append(self._record_sent(checkpoint, reference))
+                summary["sent_batches"] += 1
+                summary["sent_commission_cents"] += int(checkpoint.amount_cents or 0)
+        return sent
+
+    def _transfer_request(
+        self, checkpoint: AffiliatePayoutBatch, organization_name: str | None
+    ) -> PayoutTransferRequest:
+        return PayoutTransferRequest(
+            amount_cents=int(checkpoint.amount_cents),
+            currency=checkpoint.currency,
+            destination=checkpoint.destination,
+            idempotency_key=checkpoint.idempotency_key,
+            description=(
+                f"Affiliate payout {organization_name or checkpoint.organization_id} "
+                f"{checkpoint.earning_month.strftime('%Y-%m')}"
+            ),
+            metadata={
+                "organization_id": str(checkpoint.organization_id),
+                "earning_month": checkpoint.earning_month.isoformat(),
+                "source": "affiliate_payout_batch",
+                "arrears_days": str(self.arrears_days),
+                "forced": "false",
+                "payout_batch_id": str(checkpoint.id),
+            },
+        )
+
+    def _record_sent(self, checkpoint: AffiliatePayoutBatch, reference: str) -> dict[str, Any]:
+        now = TimezoneUtils.utc_now()
+        result = db.session.execute(
+            update(AffiliateMonthlyEarning)
+            .where(
+                AffiliateMonthlyEarning.id.in_(checkpoint.earning_ids),
+                AffiliateMonthlyEarning.payout_status.not_in(self._settled_values),
+            )
+            .values(
+                payout_status=PAYOUT_STATUS_SENT,
+                payout_reference=reference,
+                updated_at=now,
+            )
+        )
+        checkpoint.status = CHECKPOINT_SENT
+        checkpoint.payout_reference = reference
+        checkpoint.error_message = None
+        checkpoint.finished_at = now
+        db.session.commit()
+        return {
+            "organization_id": int(checkpoint.organization_id),
+            "earning_month": checkpoint.earning_month,
+            "earning_ids": list(checkpoint.earning_ids),
+            "amount_cents": int(checkpoint.amount_cents or 0),
+            "updated_rows": int(result.rowcount or 0),
+            "payout_reference": reference,
+        }
+
+    @staticmethod
+    def _record_failure(checkpoint: AffiliatePayoutBatch, exc: Exception) -> None:
+        logger.warning(
+            "Affiliate payout batch %s failed (attempt %s): %s",
+            checkpoint.id,
+            checkpoint.attempts,
+            exc,
+        )
+        # Below the cap the checkpoint is retried next run with the same key.
+        if int(checkpoint.attempts or 0) >= PAYOUT_MAX_ATTEMPTS:
+            checkpoint.status = CHECKPOINT_FAILED
+            checkpoint.finished_at = TimezoneUtils.utc_now()
+        else:
+            checkpoint.status = CHECKPOINT_PLANNED
+        checkpoint.error_message = str(exc)[:2000]
+        db.session.commit()
+
+    @staticmethod
+    def _notify(sent: list[dict[str, Any]]) -> None:
+        from ..affiliate_service import AffiliateService
+
+        owner_by_earning = dict(
+            db.session.execute(
+                select(AffiliateMonthlyEarning.id, AffiliateMonthlyEarning.referrer_user_id).where(
+                    AffiliateMonthlyEarning.id.in_([i for batch in sent for i in batch["earning_ids"]])
+                )
+            ).all()
+        )
+        for batch in sent:
+            referrer_user_ids = {
+                int(owner_by_earning[i]) for i in batch["earning_ids"] if owner_by_earning.get(i)
+            }
+            AffiliateService.notify_payout_status_update(
+                organization_id=batch["organization_id"],
+                earning_month=batch["earning_month"],
+                payout_status=PAYOUT_STATUS_SENT,
+                commission_amount_cents=batch["amount_cents"],
+                updated_rows=batch["updated_rows"],
+                payout_reference=batch["payout_reference"],
+                referrer_user_ids=sorted(referrer_user_ids),
+            )
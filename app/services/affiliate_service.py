@@ -12,7 +12,7 @@ import secrets
 from datetime import date, datetime, timedelta, timezone
 from typing import Any
 
-from sqlalchemy import case, func, inspect
+from sqlalchemy import case, func, inspect, select, update
 
 from ..extensions import db
 from ..models import Organization, User
@@ -24,6 +24,7 @@ from ..models.affiliate import (
 )
 from .affiliate import (
     AffiliatePayoutNotificationService,
+    AffiliatePayoutRunner,
     PAYOUT_STATUS_COMPLETE,
     PAYOUT_STATUS_PENDING,
     PAYOUT_STATUS_SENT,
@@ -1100,45 +1101,68 @@ class AffiliateService:
         if not organization_id or not month_date:
             return {"ok": False, "reason": "invalid_input", "updated_rows": 0}
 
-        rows = AffiliateMonthlyEarning.query.filter_by(
-            referrer_organization_id=int(organization_id),
-            earning_month=month_date,
+        earning = AffiliateMonthlyEarning
+        rows = db.session.execute(
+            select(
+                earning.id,
+                earning.payout_status,
+                earning.payout_reference,
+                earning.commission_amount_cents,
+                earning.referrer_user_id,
+            ).where(
+                earning.referrer_organization_id == int(organization_id),
+                earning.earning_month == month_date,
+            )
         ).all()
         if not rows:
             return {"ok": False, "reason": "not_found", "updated_rows": 0}
 
-        now = TimezoneUtils.utc_now()
-        updated_rows = 0
-        status_changed_rows = 0
+        status_changed_ids: list[int] = []
+        changed_ids: list[int] = []
         status_changed_commission_cents = 0
         changed_referrer_user_ids: set[int] = set()
         clean_reference = (payout_reference or "").strip() or None
+        should_store_reference = canonical_target_status in {
+            PAYOUT_STATUS_SENT,
+            PAYOUT_STATUS_COMPLETE,
+        }
         for row in rows:
             changed = False
             current_status = normalize_payout_status(row.payout_status) or PAYOUT_STATUS_PENDING
             if current_status != canonical_target_status:
-                row.payout_status = canonical_target_status
-                status_changed_rows += 1
+                status_changed_ids.append(int(row.id))
                 status_changed_commission_cents += int(row.commission_amount_cents or 0)
                 changed = True
-            should_store_reference = canonical_target_status in {
-                PAYOUT_STATUS_SENT,
-                PAYOUT_STATUS_COMPLETE,
-            }
             if should_store_reference:
                 if clean_reference and row.payout_reference != clean_reference:
-                    row.payout_reference = clean_reference
                     changed = True
             elif row.payout_reference:
-                row.payout_reference = None
                 changed = True
 
             if changed:
-                row.updated_at = now
-                updated_rows += 1
+                changed_ids.append(int(row.id))
                 if row.referrer_user_id:
                     changed_referrer_user_ids.add(int(row.referrer_user_id))
 
+        # Two set-based UPDATEs replace per-row ORM writes for large batches.
+        if status_changed_ids:
+            db.session.execute(
+                update(earning)
+                .where(earning.id.in_(status_changed_ids))
+                .values(payout_status=canonical_target_status)
+            )
+        if changed_ids:
+            values: dict[str, Any] = {"updated_at": TimezoneUtils.utc_now()}
+            if not should_store_reference:
+                values["payout_reference"] = None
+            elif clean_reference:
+                values["payout_reference"] = clean_reference
+            db.session.execute(
+                update(earning).where(earning.id.in_(changed_ids)).values(**values)
+            )
+        updated_rows = len(changed_ids)
+        status_changed_rows = len(status_changed_ids)
+
         if updated_rows > 0 and auto_commit:
             db.session.commit()
         return {
@@ -1351,76 +1375,26 @@ class AffiliateService:
         limit_batches: int = 50,
         as_of_date: date | None = None,
         auto_commit: bool = True,
+        provider=None,
+        max_workers: int | None = None,
     ) -> dict[str, Any]:
-        """Auto-process eligible pending affiliate payout batches via Stripe."""
+        """Auto-process eligible pending affiliate payout batches via Stripe.
+
+        Progress is checkpointed per batch, so the runner always commits;
+        ``auto_commit`` is kept for callers of the old serial loop.
+        """
         if not cls._schema_ready():
             return {"ok": False, "reason": "schema_not_ready", "processed_batches": 0}
-        pending_values = payout_status_query_values(PAYOUT_STATUS_PENDING)
-        batch_rows = (
-            db.session.query(
-                AffiliateMonthlyEarning.referrer_organization_id.label("organization_id"),
-                AffiliateMonthlyEarning.earning_month.label("earning_month"),
-            )
-            .join(
-                AffiliatePayoutAccount,
-                AffiliatePayoutAccount.organization_id
-                == AffiliateMonthlyEarning.referrer_organization_id,
-            )
-            .filter(
-                AffiliateMonthlyEarning.payout_status.in_(pending_values),
-                AffiliatePayoutAccount.payout_provider == "stripe",
-                AffiliatePayoutAccount.payout_account_reference.isnot(None),
-                AffiliatePayoutAccount.payout_account_reference != "",
-            )
-            .group_by(
-                AffiliateMonthlyEarning.referrer_organization_id,
-                AffiliateMonthlyEarning.earning_month,
-            )
-            .order_by(AffiliateMonthlyEarning.earning_month.asc())
-            .limit(max(1, int(limit_batches or 50)))
-            .all()
-        )
-
-        processed_batches = 0
-        sent_batches = 0
-        skipped_not_eligible = 0
-        skipped_no_payable = 0
-        failed_batches = 0
-        sent_commission_cents = 0
-        for batch in batch_rows:
-            processed_batches += 1
-            result = cls.push_monthly_payout_to_stripe(
-                organization_id=batch.organization_id,
-                earning_month=batch.earning_month,
-                force=False,
-                auto_commit=auto_commit,
-                as_of_date=as_of_date,
-                send_email=True,
-            )
-            if result.get("ok"):
-                sent_batches += 1
-                sent_commission_cents += int(result.get("status_changed_commission_cents", 0) or 0)
-                continue
-            reason = str(result.get("reason") or "")
-            if reason == "not_eligible":
-                skipped_not_eligible += 1
-            elif reason in {"no_payable_rows", "blocked_by_churn_window"}:
-                skipped_no_payable += 1
-            else:
-                failed_batches += 1
-
-        return {
-            "ok": True,
-            "reason": None,
-            "processed_batches": int(processed_batches),
-            "sent_batches": int(sent_batches),
-            "skipped_not_eligible": int(skipped_not_eligible),
-            "skipped_no_payable": int(skipped_no_payable),
-            "failed_batches": int(failed_batches),
-            "sent_commission_cents": int(sent_commission_cents),
-            "sent_commission_display": cls._format_currency_cents(sent_commission_cents),
-            "arrears_days": int(cls.PAYOUT_ARREARS_DAYS),
-        }
+        result = AffiliatePayoutRunner(
+            provider,
+            max_workers=max_workers,
+            as_of_date=as_of_date,
+            arrears_days=cls.PAYOUT_ARREARS_DAYS,
+        ).run(limit_batches=limit_batches)
+        sent_commission_cents = int(result.get("sent_commission_cents", 0) or 0)
+        result["sent_commission_display"] = cls._format_currency_cents(sent_commission_cents)
+        result["arrears_days"] = int(cls.PAYOUT_ARREARS_DAYS)
+        return result
 
     @classmethod
     def mark_monthly_earnings_paid(
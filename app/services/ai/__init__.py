@@ -1,5 +1,23 @@
 """AI service helpers."""
 
+from flask import current_app
+
 from .google_ai_client import GoogleAIClient, GoogleAIClientError, GoogleAIResult
+from .stub_ai_client import StubAIClient
+
+
+def get_ai_client():
+    """Return the client selected by ``GOOGLE_AI_CLIENT_BACKEND``."""
+    backend = (current_app.config.get("GOOGLE_AI_CLIENT_BACKEND") or "gemini").lower()
+    if backend == "stub":
+        return StubAIClient.from_app()
+    return GoogleAIClient.from_app()
+
 
-__all__ = ["GoogleAIClient", "GoogleAIClientError", "GoogleAIResult"]
+__all__ = [
+    "GoogleAIClient",
+    "GoogleAIClientError",
+    "GoogleAIResult",
+    "StubAIClient",
+    "get_ai_client",
+]
@@ -0,0 +1,103 @@
+"""Offline stand-in for the Gemini client.
+
+Synopsis:
+Implements the ``GoogleAIClient.generate_content`` contract without network
+access so BatchBot prompt size and latency can be benchmarked locally. Token
+counts are estimated from prompt characters and every call is recorded.
+
+Glossary:
+- Stub backend: ``GOOGLE_AI_CLIENT_BACKEND=stub`` selects this client.
+- Token estimate: Prompt characters divided by ``CHARS_PER_TOKEN``.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from flask import current_app
+
+from .google_ai_client import GoogleAIClientError, GoogleAIResult
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used for prompt-size comparisons."""
+    return _tokens_for_chars(len(text or ""))
+
+
+def _tokens_for_chars(char_count: int) -> int:
+    return (char_count + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class StubAIClient:
+    """Deterministic, network-free client with simulated per-token latency."""
+
+    def __init__(
+        self,
+        *,
+        default_model: str = "stub-model",
+        reply_text: str = "Stub reply.",
+        latency_ms_per_1k_tokens: float = 0.0,
+    ) -> None:
+        self._default_model = default_model
+        self.reply_text = reply_text
+        self.latency_ms_per_1k_tokens = float(latency_ms_per_1k_tokens)
+        self.calls: List[Dict[str, Any]] = []
+
+    @classmethod
+    def from_app(cls) -> "StubAIClient":
+        """Factory mirroring ``GoogleAIClient.from_app``."""
+        return cls(
+            default_model=current_app.config.get("GOOGLE_AI_DEFAULT_MODEL")
+            or "stub-model"
+        )
+
+    def generate_content(
+        self,
+        *,
+        contents: Sequence[Mapping[str, Any]],
+        model: Optional[str] = None,
+        system_instruction: Optional[str] = None,
+        tools: Optional[Sequence[Mapping[str, Any]]] = None,
+        tool_config: Optional[Mapping[str, Any]] = None,
+        safety_settings: Optional[Sequence[Mapping[str, Any]]] = None,
+        generation_config: Optional[Mapping[str, Any]] = None,
+        stream: bool = False,
+    ) -> GoogleAIResult:
+        if not contents:
+            raise GoogleAIClientError(
+                "Gemini requests require at least one content block."
+            )
+
+        prompt_chars = len(system_instruction or "") + sum(
+            len(str(part.get("text") or ""))
+            for message in contents
+            for part in message.get("parts") or ()
+        )
+        prompt_tokens = _tokens_for_chars(prompt_chars)
+        candidate_tokens = estimate_tokens(self.reply_text)
+        if self.latency_ms_per_1k_tokens:
+            time.sleep(prompt_tokens / 1000 * self.latency_ms_per_1k_tokens / 1000)
+
+        usage = {
+            "prompt_token_count": prompt_tokens,
+            "candidates_token_count": candidate_tokens,
+            "total_token_count": prompt_tokens + candidate_tokens,
+        }
+        self.calls.append(
+            {
+                "model": model or self._default_model,
+                "contents": list(contents),
+                "prompt_chars": prompt_chars,
+                "usage": usage,
+            }
+        )
+        return GoogleAIResult(
+            text=self.reply_text,
+            raw=None,
+            finish_reason="STOP",
+            usage_metadata=usage,
+            tool_calls=None,
+        )
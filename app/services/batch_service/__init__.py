@@ -1,5 +1,11 @@
 from .batch_management import BatchManagementService
 from .batch_operations import BatchOperationsService
 from .core import BatchService
+from .cost_rollup import BatchCostRollupService
 
-__all__ = ["BatchService", "BatchOperationsService", "BatchManagementService"]
+__all__ = [
+    "BatchService",
+    "BatchOperationsService",
+    "BatchManagementService",
+    "BatchCostRollupService",
+]
@@ -18,6 +18,8 @@ from app.services.stock_check.core import UniversalStockCheckService
 from app.services.stock_check.types import InventoryCategory
 from app.utils.unit_utils import get_global_unit_list
 
+from .cost_rollup import BatchCostRollupService
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,67 +30,10 @@ class BatchManagementService(BaseService):
     def get_batch_cost_summary(cls, batch):
         """Calculate comprehensive cost summary for a batch"""
         try:
-            # Regular batch ingredients
-            ingredient_total = sum(
-                (ing.quantity_used or 0) * (ing.cost_per_unit or 0)
-                for ing in batch.batch_ingredients
-            )
-
-            # Regular containers
-            container_total = sum(
-                (c.quantity_used or 0) * (c.cost_each or 0) for c in batch.containers
-            )
-
-            # Consumables
-            try:
-                consumable_total = sum(
-                    (c.quantity_used or 0) * (c.cost_per_unit or 0)
-                    for c in getattr(batch, "consumables", []) or []
-                )
-            except Exception:
-                logger.warning("Suppressed exception fallback at app/services/batch_service/batch_management.py:48", exc_info=True)
-                consumable_total = 0
-
-            # Extra ingredients
-            extra_ingredient_total = sum(
-                (e.quantity_used or 0) * (e.cost_per_unit or 0)
-                for e in batch.extra_ingredients
-            )
-
-            # Extra containers
-            extra_container_total = sum(
-                (e.quantity_used or 0) * (e.cost_each or 0)
-                for e in batch.extra_containers
-            )
-
-            # Extra consumables
-            try:
-                extra_consumable_total = sum(
-                    (e.quantity_used or 0) * (e.cost_per_unit or 0)
-                    for e in getattr(batch, "extra_consumables", []) or []
-                )
-            except Exception:
-                logger.warning("Suppressed exception fallback at app/services/batch_service/batch_management.py:69", exc_info=True)
-                extra_consumable_total = 0
-
-            total_cost = (
-                ingredient_total
-                + container_total
-                + consumable_total
-                + extra_ingredient_total
-                + extra_container_total
-                + extra_consumable_total
-            )
-
-            return {
-                "ingredient_total": ingredient_total,
-                "container_total": container_total,
-                "consumable_total": consumable_total,
-                "extra_ingredient_total": extra_ingredient_total,
-                "extra_container_total": extra_container_total,
-                "extra_consumable_total": extra_consumable_total,
-                "total_cost": total_cost,
-            }
+            cached = BatchCostRollupService.cached_rollup(batch)
+            if cached is not None:
+                return cached
+            return BatchCostRollupService.compute_rollups([batch.id])[batch.id]
 
         except Exception as e:
             logger.error(f"Error calculating batch cost summary: {str(e)}")
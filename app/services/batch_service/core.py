@@ -1,11 +1,13 @@
 import logging
 
 from flask_login import current_user
-from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm import selectinload
 
 from app.models import Batch, BatchTimer, Recipe, db
 from app.services.base_service import BaseService
 
+from .cost_rollup import BatchCostRollupService
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,8 +62,11 @@ class BatchService(BaseService):
     ):
         """Get filtered and sorted batches"""
         try:
-            # Build base query with organization scoping
-            base_query = Batch.scoped()
+            # Build base query with organization scoping; list rows render the
+            # lineage recipe name, so load recipes/groups in bulk.
+            base_query = Batch.scoped().options(
+                selectinload(Batch.recipe).selectinload(Recipe.recipe_group)
+            )
 
             # Apply filters
             if status and status != "all":
@@ -135,54 +140,9 @@ class BatchService(BaseService):
     def calculate_batch_costs(cls, batches):
         """Calculate total costs for a list of batches"""
         try:
-            for batch in batches:
-                ingredient_total = sum(
-                    (ing.quantity_used or 0) * (ing.cost_per_unit or 0)
-                    for ing in batch.batch_ingredients
-                )
-                container_total = sum(
-                    (c.quantity_used or 0) * (c.cost_each or 0)
-                    for c in batch.containers
-                )
-                # Consumables
-                try:
-                    consumable_total = sum(
-                        (c.quantity_used or 0) * (c.cost_per_unit or 0)
-                        for c in getattr(batch, "consumables", []) or []
-                    )
-                except Exception:
-                    logger.warning("Suppressed exception fallback at app/services/batch_service/core.py:152", exc_info=True)
-                    consumable_total = 0
-
-                # Extras
-                extra_ingredient_total = sum(
-                    (e.quantity_used or 0) * (e.cost_per_unit or 0)
-                    for e in batch.extra_ingredients
-                )
-                extra_container_total = sum(
-                    (e.quantity_used or 0) * (e.cost_each or 0)
-                    for e in batch.extra_containers
-                )
-                try:
-                    extra_consumable_total = sum(
-                        (e.quantity_used or 0) * (e.cost_per_unit or 0)
-                        for e in getattr(batch, "extra_consumables", []) or []
-                    )
-                except Exception:
-                    logger.warning("Suppressed exception fallback at app/services/batch_service/core.py:169", exc_info=True)
-                    extra_consumable_total = 0
-
-                total_cost = (
-                    ingredient_total
-                    + container_total
-                    + consumable_total
-                    + extra_ingredient_total
-                    + extra_container_total
-                    + extra_consumable_total
-                )
-                # Avoid persisting recalculated cost on read paths.
-                set_committed_value(batch, "total_cost", total_cost)
-
+            # One grouped query for uncached batches; completed batches reuse
+            # the rollup cached on their row.
+            BatchCostRollupService.apply_to_batches(batches)
             return batches
 
         except Exception as e:
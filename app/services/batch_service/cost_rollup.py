@@ -0,0 +1,184 @@
+"""Grouped SQL cost rollups for batches.
+
+Synopsis:
+Computes ingredient, container, and consumable cost totals (plus their extra
+counterparts) for many batches in one grouped UNION ALL query instead of
+walking six lazy relationships per batch. Completed batches keep the rollup on
+the batch row so history pages read it without touching child tables.
+
+Glossary:
+- Rollup: Per-batch cost totals keyed by category.
+- Cached rollup: Rollup persisted to `Batch.cost_rollup` at completion.
+"""
+
+import logging
+
+import sqlalchemy as sa
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models import (
+    Batch,
+    BatchConsumable,
+    BatchContainer,
+    BatchIngredient,
+    ExtraBatchConsumable,
+    ExtraBatchContainer,
+    ExtraBatchIngredient,
+    db,
+)
+from app.utils.timezone_utils import TimezoneUtils
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_KEYS = (
+    "ingredient_total",
+    "container_total",
+    "consumable_total",
+    "extra_ingredient_total",
+    "extra_container_total",
+    "extra_consumable_total",
+)
+
+# (rollup key, model, unit-cost column name)
+_ROLLUP_SOURCES = (
+    ("ingredient_total", BatchIngredient, "cost_per_unit"),
+    ("container_total", BatchContainer, "cost_each"),
+    ("consumable_total", BatchConsumable, "cost_per_unit"),
+    ("extra_ingredient_total", ExtraBatchIngredient, "cost_per_unit"),
+    ("extra_container_total", ExtraBatchContainer, "cost_each"),
+    ("extra_consumable_total", ExtraBatchConsumable, "cost_per_unit"),
+)
+
+
+def empty_rollup() -> dict:
+    """Return a zeroed rollup in the cost summary shape."""
+    rollup = {key: 0.0 for key in ROLLUP_KEYS}
+    rollup["total_cost"] = 0.0
+    return rollup
+
+
+# --- Batch cost rollup service ---
+# Purpose: Aggregate and cache batch cost totals with set-based SQL.
+class BatchCostRollupService:
+    """Grouped cost rollups for batch lists, reports, and completion."""
+
+    # --- Rollup query ---
+    # Purpose: Compute rollups for many batches in one grouped query.
+    # Inputs: Iterable of batch ids.
+    # Outputs: Dict of batch id -> rollup dict (missing ids get zeroed rollups).
+    @classmethod
+    def compute_rollups(cls, batch_ids) -> dict[int, dict]:
+        ids = sorted({int(batch_id) for batch_id in batch_ids if batch_id})
+        rollups = {batch_id: empty_rollup() for batch_id in ids}
+        if not ids:
+            return rollups
+
+        parts = []
+        for key, model, cost_attr in _ROLLUP_SOURCES:
+            table = model.__table__
+            parts.append(
+                sa.select(
+                    table.c.batch_id.label("batch_id"),
+                    sa.literal(key).label("bucket"),
+                    sa.func.sum(
+                        sa.func.coalesce(table.c.quantity_used, 0)
+                        * sa.func.coalesce(table.c[cost_attr], 0)
+                    ).label("amount"),
+                )
+                .where(table.c.batch_id.in_(ids))
+                .group_by(table.c.batch_id)
+            )
+
+        for batch_id, bucket, amount in db.session.execute(sa.union_all(*parts)):
+            rollup = rollups[int(batch_id)]
+            rollup[bucket] = float(amount or 0.0)
+
+        for rollup in rollups.values():
+            rollup["total_cost"] = sum(rollup[key] for key in ROLLUP_KEYS)
+        return rollups
+
+    # --- Apply to loaded batches ---
+    # Purpose: Attach rollups to batch instances without N+1 relationship loads.
+    # Inputs: Iterable of Batch instances.
+    # Outputs: Dict of batch id -> rollup dict; sets committed `total_cost`.
+    @classmethod
+    def apply_to_batches(cls, batches) -> dict[int, dict]:
+        batches = [batch for batch in batches if batch is not None]
+        results: dict[int, dict] = {}
+        pending = []
+        for batch in batches:
+            cached = cls.cached_rollup(batch)
+            if cached is None:
+                pending.append(batch)
+            else:
+                results[batch.id] = cached
+
+        if pending:
+            results.update(cls.compute_rollups(batch.id for batch in pending))
+
+        for batch in batches:
+            rollup = results.get(batch.id) or empty_rollup()
+            # Avoid persisting recalculated cost on read paths.
+            set_committed_value(batch, "total_cost", rollup["total_cost"])
+        return results
+
+    # --- Cached rollup ---
+    # Purpose: Read the rollup persisted on a completed batch.
+    # Inputs: Batch instance.
+    # Outputs: Rollup dict or None when the batch has no cached rollup.
+    @classmethod
+    def cached_rollup(cls, batch) -> dict | None:
+        if not getattr(batch, "cost_rolled_up_at", None):
+            return None
+        stored = getattr(batch, "cost_rollup", None)
+        if not isinstance(stored, dict):
+            return None
+        rollup = empty_rollup()
+        for key in ROLLUP_KEYS:
+            rollup[key] = float(stored.get(key) or 0.0)
+        rollup["total_cost"] = sum(rollup[key] for key in ROLLUP_KEYS)
+        return rollup
+
+    # --- Persist rollup ---
+    # Purpose: Cache the rollup on the batch row (called at completion).
+    # Inputs: Batch instance inside the caller's transaction.
+    # Outputs: Rollup dict; caller commits.
+    @classmethod
+    def persist_rollup(cls, batch) -> dict:
+        rollup = cls.compute_rollups([batch.id]).get(batch.id) or empty_rollup()
+        batch.cost_rollup = {key: rollup[key] for key in ROLLUP_KEYS}
+        batch.total_cost = rollup["total_cost"]
+        batch.cost_rolled_up_at = TimezoneUtils.utc_now()
+        return rollup
+
+    # --- Backfill completed batches ---
+    # Purpose: Cache rollups for completed batches finished before caching existed.
+    # Inputs: Chunk size for the grouped rollup query.
+    # Outputs: Number of batches updated (commits per chunk).
+    @classmethod
+    def backfill_completed(cls, chunk_size: int = 500) -> int:
+        updated = 0
+        last_id = 0
+        while True:
+            batches = (
+                Batch.query.filter(
+                    Batch.status == "completed",
+                    Batch.cost_rolled_up_at.is_(None),
+                    Batch.id > last_id,
+                )
+                .order_by(Batch.id.asc())
+                .limit(chunk_size)
+                .all()
+            )
+            if not batches:
+                return updated
+            rollups = cls.compute_rollups(batch.id for batch in batches)
+            now = TimezoneUtils.utc_now()
+            for batch in batches:
+                rollup = rollups[batch.id]
+                batch.cost_rollup = {key: rollup[key] for key in ROLLUP_KEYS}
+                batch.total_cost = rollup["total_cost"]
+                batch.cost_rolled_up_at = now
+            db.session.commit()
+            updated += len(batches)
+            last_id = batches[-1].id
@@ -0,0 +1,296 @@
+"""Versioned, cached organization context for BatchBot prompts.
+
+Synopsis:
+Builds the org context snapshot (inventory sample, recent recipes, batches,
+marketplace products, tier) once and caches it until one of those entities
+changes; model events bump the org's cache namespace. Each snapshot is
+addressed by a content hash so a turn can send only the diff against the
+version already present in the conversation transcript.
+
+Glossary:
+- Context version: First 12 hex chars of the snapshot's canonical JSON SHA-1.
+- Context marker: ``[context <version>]`` tag that opens every context block.
+- Context diff: Per-section added/removed/changed rows between two versions.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+from flask import current_app
+from sqlalchemy import asc, desc
+
+from app.extensions import cache
+from app.models import Batch, InventoryItem, Product, Recipe
+from app.services.cache_invalidation import (
+    batchbot_context_cache_key,
+    batchbot_context_snapshot_key,
+)
+from app.utils.payload_diff import diff_payloads
+from app.utils.timezone_utils import TimezoneUtils
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_MARKER_RE = re.compile(r"\[context ([0-9a-f]{12})\]")
+_VERSION_LENGTH = 12
+_SNAPSHOT_ARCHIVE_TTL_SECONDS = 24 * 3600
+
+
+@dataclass(frozen=True, slots=True)
+class ContextSnapshot:
+    version: str
+    payload: Mapping[str, Any]
+
+
+@dataclass(frozen=True, slots=True)
+class ContextBlock:
+    """Context text for one turn and how it relates to the previous turn."""
+
+    version: str
+    mode: str  # "full", "diff", or "unchanged"
+    text: str
+    base_version: Optional[str] = None
+
+
+class BatchBotContextService:
+    """Cache, version, and diff the per-org BatchBot context snapshot."""
+
+    # --- Current snapshot ---
+    # Purpose: Return the org snapshot from cache, rebuilding on a namespace bump.
+    # Inputs: Organization model instance.
+    # Outputs: ContextSnapshot with content version and payload.
+    @classmethod
+    def get_snapshot(cls, organization) -> ContextSnapshot:
+        cache_key = batchbot_context_cache_key(organization.id)
+        cached = cls._cache_get(cache_key)
+        if isinstance(cached, dict) and cached.get("version"):
+            return ContextSnapshot(cached["version"], cached["payload"])
+
+        payload = cls.build_payload(organization)
+        snapshot = ContextSnapshot(cls.compute_version(payload), payload)
+        ttl = int(current_app.config.get("BATCHBOT_CONTEXT_CACHE_TTL") or 300)
+        record = {"version": snapshot.version, "payload": payload}
+        cls._cache_set(cache_key, record, ttl)
+        cls._cache_set(
+            batchbot_context_snapshot_key(organization.id, snapshot.version),
+            payload,
+            max(ttl, _SNAPSHOT_ARCHIVE_TTL_SECONDS),
+        )
+        return snapshot
+
+    @classmethod
+    def load_version(cls, organization_id: int, version: str) -> Optional[Mapping[str, Any]]:
+        """Return an archived snapshot payload for ``version`` if still cached."""
+        payload = cls._cache_get(batchbot_context_snapshot_key(organization_id, version))
+        return payload if isinstance(payload, dict) else None
+
+    @staticmethod
+    def compute_version(payload: Mapping[str, Any]) -> str:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:_VERSION_LENGTH]
+
+    # --- Build payload ---
+    # Purpose: Query the org entities that make up the BatchBot context.
+    # Inputs: Organization model instance.
+    # Outputs: JSON-serializable dict (ISO strings, floats).
+    @classmethod
+    def build_payload(cls, organization) -> Dict[str, Any]:
+        inventory_items = (
+            InventoryItem.query.filter_by(organization_id=organization.id)
+            .order_by(asc(InventoryItem.quantity))
+            .limit(6)
+            .all()
+        )
+        recipes = (
+            Recipe.query.filter_by(organization_id=organization.id)
+            .order_by(desc(Recipe.updated_at))
+            .limit(4)
+            .all()
+        )
+        batches = (
+            Batch.query.filter_by(organization_id=organization.id)
+            .order_by(desc(Batch.started_at))
+            .limit(4)
+            .all()
+        )
+        marketplace_products = (
+            Product.query.filter_by(organization_id=organization.id)
+            .order_by(desc(Product.updated_at))
+            .limit(5)
+            .all()
+        )
+
+        tier = getattr(organization, "tier", None)
+        marketplace_enabled = False
+        if tier and getattr(tier, "permissions", None):
+            marketplace_enabled = any(
+                getattr(permission, "name", "") == "integrations.marketplace"
+                for permission in tier.permissions
+            )
+
+        return {
+            "organization": {
+                "id": organization.id,
+                "name": organization.name,
+                "subscription": getattr(tier, "name", "unknown") if tier else "trial",
+            },
+            "limits": {
+                "max_batchbot_requests": getattr(tier, "max_batchbot_requests", None),
+            },
+            "marketplace": {
+                "enabled": marketplace_enabled,
+                "products": [
+                    {
+                        "id": product.id,
+                        "name": product.name,
+                        "sync_status": getattr(product, "marketplace_sync_status", None),
+                        "last_sync": _iso_dt(getattr(product, "marketplace_last_sync", None)),
+                    }
+                    for product in marketplace_products
+                ],
+            },
+            "inventory_sample": [
+                {
+                    "id": item.id,
+                    "name": item.name,
+                    "quantity": _safe_float(item.quantity),
+                    "unit": item.unit,
+                    "type": item.type,
+                    "category_id": item.category_id,
+                    "cost_per_unit": _safe_float(item.cost_per_unit),
+                    "is_perishable": bool(getattr(item, "is_perishable", False)),
+                    "low_stock": bool(
+                        item.quantity is not None
+                        and item.quantity <= (getattr(item, "reorder_point", None) or 2)
+                    ),
+                }
+                for item in inventory_items
+            ],
+            "recent_recipes": [
+                {
+                    "id": recipe.id,
+                    "name": recipe.name,
+                    "predicted_yield": _safe_float(recipe.predicted_yield),
+                    "predicted_yield_unit": recipe.predicted_yield_unit,
+                    "is_portioned": recipe.is_portioned,
+                    "category_id": recipe.category_id,
+                    "updated_at": _iso_dt(recipe.updated_at),
+                }
+                for recipe in recipes
+            ],
+            "recent_batches": [
+                {
+                    "id": batch.id,
+                    "label_code": batch.label_code,
+                    "status": batch.status,
+                    "projected_yield": _safe_float(batch.projected_yield),
+                    "projected_unit": batch.projected_yield_unit,
+                    "started_at": _iso_dt(batch.started_at),
+                    "finished_at": _iso_dt(batch.completed_at or batch.failed_at),
+                }
+                for batch in batches
+            ],
+        }
+
+    # --- Diff ---
+    # Purpose: Describe what changed between two snapshot payloads.
+    # Inputs: Previous and current payload dicts.
+    # Outputs: Dict of changed sections only (empty when identical).
+    @staticmethod
+    def diff(previous: Mapping[str, Any], current: Mapping[str, Any]) -> Dict[str, Any]:
+        return diff_payloads(previous, current)
+
+    # --- Context block ---
+    # Purpose: Render this turn's context relative to the transcript's last version.
+    # Inputs: Organization and normalized history contents.
+    # Outputs: ContextBlock (full snapshot, diff, or unchanged note).
+    @classmethod
+    def build_context_block(
+        cls, organization, history: Sequence[Mapping[str, Any]]
+    ) -> ContextBlock:
+        snapshot = cls.get_snapshot(organization)
+        base_version = latest_context_version(history)
+        if base_version == snapshot.version:
+            return ContextBlock(
+                version=snapshot.version,
+                mode="unchanged",
+                text=f"[context {snapshot.version}] Context unchanged since the previous turn.",
+                base_version=base_version,
+            )
+        previous = (
+            cls.load_version(organization.id, base_version) if base_version else None
+        )
+        if previous is not None:
+            changes = cls.diff(previous, snapshot.payload)
+            return ContextBlock(
+                version=snapshot.version,
+                mode="diff",
+                text=(
+                    f"[context {snapshot.version}] Context changes since "
+                    f"{base_version} (JSON diff):\n{_dumps(changes)}"
+                ),
+                base_version=base_version,
+            )
+        return ContextBlock(
+            version=snapshot.version,
+            mode="full",
+            text=f"[context {snapshot.version}] Context Snapshot (JSON):\n{_dumps(snapshot.payload)}",
+        )
+
+    @staticmethod
+    def _cache_get(key: str) -> Any:
+        try:
+            return cache.get(key)
+        except Exception:
+            logger.warning("Suppressed exception fallback at app/services/batchbot_context_service.py:268", exc_info=True)
+            return None
+
+    @staticmethod
+    def _cache_set(key: str, value: Any, ttl: int) -> None:
+        try:
+            cache.set(key, value, timeout=ttl)
+        except Exception:
+            logger.warning("Suppressed exception fallback at app/services/batchbot_context_service.py:276", exc_info=True)
+
+
+def latest_context_version(history: Sequence[Mapping[str, Any]]) -> Optional[str]:
+    """Return the newest context version tagged in user turns of ``history``."""
+    for message in reversed(list(history or ())):
+        if message.get("role") != "user":
+            continue
+        for part in message.get("parts") or ():
+            found = CONTEXT_MARKER_RE.findall(str(part.get("text") or ""))
+            if found:
+                return found[-1]
+    return None
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def _safe_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _iso_dt(value: Any) -> Optional[str]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    try:
+        return TimezoneUtils.coerce_datetime(value).isoformat()
+    except Exception:
+        logger.warning("Suppressed exception fallback at app/services/batchbot_context_service.py:347", exc_info=True)
+        return None
@@ -2,7 +2,7 @@ from __future__ import annotations
 import logging
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Mapping, Optional, Sequence
 
@@ -11,7 +11,11 @@ from sqlalchemy import asc, desc
 
 from app.extensions import db
 from app.models import Batch, FreshnessSnapshot, InventoryItem, Product, Recipe
-from app.services.ai import GoogleAIClient
+from app.services.ai import get_ai_client
+from app.services.batchbot_context_service import (
+    BatchBotContextService,
+    ContextBlock,
+)
 from app.services.batchbot_credit_service import BatchBotCreditService, CreditSnapshot
 from app.services.batchbot_usage_service import (
     BatchBotUsageService,
@@ -44,6 +48,9 @@ class BatchBotResponse:
     usage: Mapping[str, Any]
     quota: BatchBotUsageSnapshot
     credits: CreditSnapshot
+    context: Mapping[str, Any] = field(default_factory=dict)
+    # Echo this (not the raw prompt) into history so later turns send diffs.
+    history_entry: Optional[Mapping[str, str]] = None
 
 
 class BatchBotService:
@@ -60,7 +67,7 @@ class BatchBotService:
         self.user = user
         self.organization = user.organization
         self.config = current_app.config
-        self.client = GoogleAIClient.from_app()
+        self.client = get_ai_client()
         self.model_name = (
             self.config.get("GOOGLE_AI_BATCHBOT_MODEL")
             or self.config.get("GOOGLE_AI_DEFAULT_MODEL")
@@ -78,7 +85,9 @@ class BatchBotService:
             raise BatchBotServiceError("Prompt is required.")
 
         contents = self._normalize_history(history)
-        composed_prompt = self._compose_prompt(prompt, metadata)
+        composed_prompt, context_block = self._compose_prompt(
+            prompt, metadata, contents
+        )
         contents.append({"role": "user", "parts": [{"text": composed_prompt}]})
 
         result = self.client.generate_content(
@@ -124,25 +133,38 @@ class BatchBotService:
             usage=usage_metadata,
             quota=quota,
             credits=credit_snapshot,
+            context={
+                "version": context_block.version,
+                "mode": context_block.mode,
+                "base_version": context_block.base_version,
+                "prompt_chars": len(composed_prompt),
+            },
+            history_entry={"role": "user", "content": composed_prompt},
         )
 
     # ------------------------------------------------------------------
     # Prompt + Context Builders
     # ------------------------------------------------------------------
     def _compose_prompt(
-        self, prompt: str, metadata: Optional[Mapping[str, Any]]
-    ) -> str:
-        context_blob = json.dumps(
-            self._build_context_snapshot(metadata),
-            default=_json_default,
+        self,
+        prompt: str,
+        metadata: Optional[Mapping[str, Any]],
+        history: Sequence[Mapping[str, Any]] = (),
+    ) -> tuple[str, ContextBlock]:
+        context_block = BatchBotContextService.build_context_block(
+            self.organization, history
+        )
+        session_blob = json.dumps(
+            self._session_context(metadata), default=_json_default
         )
         instructions = (
-            "Context Snapshot (JSON):\n"
-            f"{context_blob}\n\n"
+            f"{context_block.text}\n\n"
+            "Session (JSON):\n"
+            f"{session_blob}\n\n"
             "User Request:\n"
             f"{prompt.strip()}"
         )
-        return instructions
+        return instructions, context_block
 
     def _normalize_history(
         self, history: Optional[Sequence[Mapping[str, str]]]
@@ -158,120 +180,14 @@ class BatchBotService:
             normalized.append({"role": role, "parts": [{"text": str(content)}]})
         return normalized
 
-    def _build_context_snapshot(
+    def _session_context(
         self, metadata: Optional[Mapping[str, Any]]
-    ) -> Mapping[str, Any]:
-        inventory_items = (
-            InventoryItem.query.filter_by(organization_id=self.organization.id)
-            .order_by(asc(InventoryItem.quantity))
-            .limit(6)
-            .all()
-        )
-
-        recipes = (
-            Recipe.query.filter_by(organization_id=self.organization.id)
-            .order_by(desc(Recipe.updated_at))
-            .limit(4)
-            .all()
-        )
-
-        batches = (
-            Batch.query.filter_by(organization_id=self.organization.id)
-            .order_by(desc(Batch.created_at))
-            .limit(4)
-            .all()
-        )
-
-        marketplace_enabled = False
-        tier = getattr(self.organization, "tier", None)
-        if tier and getattr(tier, "permissions", None):
-            marketplace_enabled = any(
-                getattr(permission, "name", "") == "integrations.marketplace"
-                for permission in tier.permissions
-            )
-
-        marketplace_products = (
-            Product.query.filter_by(organization_id=self.organization.id)
-            .order_by(desc(Product.updated_at))
-            .limit(5)
-            .all()
-        )
-
+    ) -> Dict[str, Any]:
+        # Credits move on every turn, so they stay out of the cached snapshot.
         return {
-            "organization": {
-                "id": self.organization.id,
-                "name": self.organization.name,
-                "subscription": (
-                    getattr(self.organization.tier, "name", "unknown")
-                    if self.organization.tier
-                    else "trial"
-                ),
-            },
-            "limits": {
-                "max_batchbot_requests": getattr(
-                    self.organization.tier, "max_batchbot_requests", None
-                ),
-            },
             "credits": {
                 "remaining": BatchBotCreditService.available_credits(self.organization),
             },
-            "marketplace": {
-                "enabled": marketplace_enabled,
-                "products": [
-                    {
-                        "id": product.id,
-                        "name": product.name,
-                        "sync_status": getattr(
-                            product, "marketplace_sync_status", None
-                        ),
-                        "last_sync": _iso_dt(
-                            getattr(product, "marketplace_last_sync", None)
-                        ),
-                    }
-                    for product in marketplace_products
-                ],
-            },
-            "inventory_sample": [
-                {
-                    "id": item.id,
-                    "name": item.name,
-                    "quantity": _safe_float(item.quantity),
-                    "unit": item.unit,
-                    "type": item.type,
-                    "category_id": item.category_id,
-                    "cost_per_unit": _safe_float(item.cost_per_unit),
-                    "is_perishable": getattr(item, "is_perishable", False),
-                    "low_stock": bool(
-                        item.quantity is not None
-                        and item.quantity <= (getattr(item, "reorder_point", None) or 2)
-                    ),
-                }
-                for item in inventory_items
-            ],
-            "recent_recipes": [
-                {
-                    "id": recipe.id,
-                    "name": recipe.name,
-                    "predicted_yield": _safe_float(recipe.predicted_yield),
-                    "predicted_yield_unit": recipe.predicted_yield_unit,
-                    "is_portioned": recipe.is_portioned,
-                    "category_id": recipe.category_id,
-                    "updated_at": _iso_dt(recipe.updated_at),
-                }
-                for recipe in recipes
-            ],
-            "recent_batches": [
-                {
-                    "id": batch.id,
-                    "name": batch.name,
-                    "status": batch.status,
-                    "projected_yield": _safe_float(batch.projected_yield),
-                    "projected_unit": batch.projected_yield_unit,
-                    "created_at": _iso_dt(batch.created_at),
-                    "finished_at": _iso_dt(batch.finished_at),
-                }
-                for batch in batches
-            ],
             "metadata": metadata or {},
         }
 
@@ -22,10 +22,11 @@ from flask import current_app
 from ..extensions import db
 from ..models.models import Organization
 from ..models.pending_signup import PendingSignup
-from ..models.stripe_event import StripeEvent
 from ..models.subscription_tier import SubscriptionTier
 from ..utils.cache_manager import app_cache
 from ..utils.timezone_utils import TimezoneUtils
+from .billing_webhook_queue import BillingWebhookQueue
+from .job_scheduler import scheduler_owns_maintenance
 from .signup_service import SignupService
 
 try:
@@ -295,17 +296,36 @@ class BillingService:
         logger.warning("Billing provider %s not implemented", tier.billing_provider)
         return None
 
-    # Purpose: Dispatch webhook events to provider handlers.
+    # Purpose: Accept verified webhook events into the billing inbox.
     @staticmethod
     def handle_webhook_event(provider, event_data):
-        """Route webhook payloads to the correct billing provider."""
-        if provider == "stripe":
-            return BillingService._handle_stripe_webhook(event_data or {})
+        """Persist a verified webhook; apply it inline unless the scheduler owns processing."""
         if provider == "whop":
             logger.warning("Whop webhook handling not yet implemented")
             return 200
-        logger.error("Unknown webhook provider: %s", provider)
-        return 400
+        if provider != "stripe":
+            logger.error("Unknown webhook provider: %s", provider)
+            return 400
+        event_data = event_data or {}
+        row_id = BillingWebhookQueue.enqueue(provider, event_data)
+        if scheduler_owns_maintenance():
+            return 200
+        if row_id is None:
+            # Without a worker, a provider redelivery is the only retry for a
+            # row whose inline attempt failed.
+            row_id = BillingWebhookQueue.received_row_id(provider, event_data.get("id"))
+            if row_id is None:
+                return 200
+        return 500 if BillingWebhookQueue.process_event(row_id) is False else 200
+
+    # Purpose: Apply one persisted inbox row (called by the webhook worker).
+    @staticmethod
+    def dispatch_webhook_row(row) -> None:
+        """Route a stored webhook payload to its provider handler."""
+        if row.provider == "stripe":
+            BillingService._dispatch_stripe_event(row.payload or {})
+            return
+        logger.warning("No webhook handler for provider %s", row.provider)
 
     # Purpose: Validate tier access and billing standing.
     @staticmethod
@@ -417,7 +437,7 @@ class BillingService:
                 )
                 return
             except Exception:
-                logger.warning("Suppressed exception fallback at app/services/billing_service.py:418", exc_info=True)
+                logger.warning("Suppressed exception fallback at app/services/billing_service.py:431", exc_info=True)
                 pass
         elif current_timeout == desired_timeout or current_timeout == timeout_seconds:
             return
@@ -426,7 +446,7 @@ class BillingService:
             stripe.default_http_client = stripe.RequestsClient(timeout=desired_timeout)
             return
         except Exception:
-            logger.warning("Suppressed exception fallback at app/services/billing_service.py:426", exc_info=True)
+            logger.warning("Suppressed exception fallback at app/services/billing_service.py:439", exc_info=True)
             pass
 
         try:
@@ -443,7 +463,7 @@ class BillingService:
         try:
             secret = current_app.config.get("STRIPE_SECRET_KEY")
         except Exception:
-            logger.warning("Suppressed exception fallback at app/services/billing_service.py:442", exc_info=True)
+            logger.warning("Suppressed exception fallback at app/services/billing_service.py:455", exc_info=True)
             secret = None
         return secret
 
@@ -467,58 +487,33 @@ class BillingService:
             logger.error(f"Failed to retrieve checkout session {session_id}: {str(e)}")
             return None
 
-    # Purpose: Route Stripe webhook events to handlers.
+    # Purpose: Record and apply a Stripe event in one call.
     @staticmethod
     def _handle_stripe_webhook(event: dict) -> int:
         """Handle Stripe webhook event with idempotency"""
-        from sqlalchemy.exc import IntegrityError
-
-        # Insert-first pattern to handle concurrent replays
-        stripe_event = StripeEvent(
-            event_id=event["id"], event_type=event["type"], status="received"
-        )
-
-        try:
-            db.session.add(stripe_event)
-            db.session.commit()
-        except IntegrityError:
-            # Event already exists (concurrent replay)
-            db.session.rollback()
-            logger.info(f"Replay detected for event {event['id']}, skipping")
-            return 200
-
-        try:
-            # Route by event type
-            event_type = event["type"]
-
-            if event_type == "checkout.session.completed":
-                BillingService._handle_checkout_completed(event)
-            elif event_type == "customer.subscription.created":
-                BillingService._handle_subscription_created(event)
-            elif event_type == "customer.subscription.updated":
-                BillingService._handle_subscription_updated(event)
-            elif event_type == "customer.subscription.deleted":
-                BillingService._handle_subscription_deleted(event)
-            elif event_type == "invoice.payment_succeeded":
-                BillingService._handle_payment_succeeded(event)
-            elif event_type == "invoice.payment_failed":
-                BillingService._handle_payment_failed(event)
-            else:
-                logger.info(f"Unhandled webhook event type: {event_type}")
-
-            # Mark as processed
-            stripe_event.status = "processed"
-            stripe_event.processed_at = datetime.now(timezone.utc)
-            db.session.commit()
-
+        row_id = BillingWebhookQueue.enqueue("stripe", event)
+        if row_id is None:
             return 200
+        return 500 if BillingWebhookQueue.process_event(row_id) is False else 200
 
-        except Exception as e:
-            logger.error(f"Error processing webhook event {event['id']}: {str(e)}")
-            stripe_event.status = "failed"
-            stripe_event.error_message = str(e)
-            db.session.commit()
-            return 500
+    # Purpose: Route Stripe webhook events to handlers.
+    @staticmethod
+    def _dispatch_stripe_event(event: dict) -> None:
+        event_type = event.get("type")
+        if event_type == "checkout.session.completed":
+            BillingService._handle_checkout_completed(event)
+        elif event_type == "customer.subscription.created":
+            BillingService._handle_subscription_created(event)
+        elif event_type == "customer.subscription.updated":
+            BillingService._handle_subscription_updated(event)
+        elif event_type == "customer.subscription.deleted":
+            BillingService._handle_subscription_deleted(event)
+        elif event_type == "invoice.payment_succeeded":
+            BillingService._handle_payment_succeeded(event)
+        elif event_type == "invoice.payment_failed":
+            BillingService._handle_payment_failed(event)
+        else:
+            logger.info(f"Unhandled webhook event type: {event_type}")
 
     # Purpose: Handle Stripe checkout.session.completed events.
     @staticmethod
@@ -761,7 +756,7 @@ class BillingService:
                         next_payment_time
                     ).date()
                 except Exception:
-                    logger.warning("Suppressed exception fallback at app/services/billing_service.py:741", exc_info=True)
+                    logger.warning("Suppressed exception fallback at app/services/billing_service.py:729", exc_info=True)
                     pass
 
             db.session.commit()
@@ -0,0 +1,284 @@
+"""Billing webhook inbox and worker.
+
+Synopsis:
+Webhook intake only verifies (in the route), dedupes by provider event id, and
+persists the raw event as a `StripeEvent` row. The worker drains the inbox off
+the request path: events sharing an ordering key (the billing customer) are
+applied one at a time in provider order, different customers run in parallel
+on a bounded thread pool, and failures retry with backoff without letting a
+later event for the same customer overtake them.
+
+Glossary:
+- Inbox row: `StripeEvent` with the raw payload and processing state.
+- Ordering key: Billing customer id; events without one are unordered.
+- Claim: Conditional `received -> processing` update; losing it skips the row.
+- Blocked key: Customer with an event in flight or waiting to retry.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from flask import current_app
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.stripe_event import StripeEvent
+from app.utils.timezone_utils import TimezoneUtils
+
+logger = logging.getLogger(__name__)
+
+STATUS_RECEIVED = "received"
+STATUS_PROCESSING = "processing"
+STATUS_PROCESSED = "processed"
+STATUS_FAILED = "failed"
+
+WEBHOOK_MAX_ATTEMPTS = 5
+_RETRY_BASE_SECONDS = 30
+_RETRY_MAX_SECONDS = 3600
+# A row stuck in processing this long belonged to a worker that died.
+_STALE_PROCESSING_SECONDS = 600
+_DEFAULT_BATCH_SIZE = 500
+_DEFAULT_WORKERS = 4
+
+
+def _ordering_key(event: Mapping[str, Any]) -> Optional[str]:
+    obj = ((event.get("data") or {}).get("object")) or {}
+    if not isinstance(obj, Mapping):
+        return None
+    customer = obj.get("customer")
+    if isinstance(customer, Mapping):
+        customer = customer.get("id")
+    if not customer and obj.get("object") == "customer":
+        customer = obj.get("id")
+    if customer:
+        return str(customer)
+    metadata = obj.get("metadata") or {}
+    org_id = metadata.get("organization_id") if isinstance(metadata, Mapping) else None
+    if org_id:
+        return f"org:{org_id}"
+    return None
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    seconds = min(_RETRY_MAX_SECONDS, _RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1)))
+    return timedelta(seconds=seconds)
+
+
+# --- BillingWebhookQueue ---
+# Purpose: Persist verified webhook events and apply them off the request path.
+class BillingWebhookQueue:
+    """Inbox intake plus an ordered, idempotent, bounded-concurrency worker."""
+
+    # --- Enqueue ---
+    # Purpose: Dedupe by event id and persist the raw event.
+    # Inputs: Provider name and the verified event payload.
+    # Outputs: New inbox row id, or None when the event was already received.
+    @staticmethod
+    def enqueue(provider: str, event: Mapping[str, Any]) -> Optional[int]:
+        # Round-trip so SDK event objects are stored as plain JSON.
+        payload = json.loads(json.dumps(event, default=str))
+        row = StripeEvent(
+            event_id=str(payload["id"]),
+            event_type=str(payload.get("type") or "unknown"),
+            provider=provider,
+            payload=payload,
+            ordering_key=_ordering_key(payload),
+            event_created=payload.get("created"),
+            status=STATUS_RECEIVED,
+        )
+        try:
+            db.session.add(row)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            logger.info("Replay detected for %s event %s, skipping", provider, payload["id"])
+            return None
+        return row.id
+
+    # --- Received row ---
+    # Purpose: Find an inbox row for a redelivered event that was never applied.
+    # Inputs: Provider name and provider event id.
+    # Outputs: Row id while the row is still `received`, else None.
+    @staticmethod
+    def received_row_id(provider: str, event_id: Any) -> Optional[int]:
+        if not event_id:
+            return None
+        return db.session.execute(
+            select(StripeEvent.id).where(
+                StripeEvent.provider == provider,
+                StripeEvent.event_id == str(event_id),
+                StripeEvent.status == STATUS_RECEIVED,
+            )
+        ).scalar_one_or_none()
+
+    # --- Process one ---
+    # Purpose: Apply a single inbox row now (inline intake and tests).
+    # Outputs: True when processed, False on failure, None if another worker holds it.
+    @classmethod
+    def process_event(cls, row_id: int) -> Optional[bool]:
+        return cls._apply(row_id, cls._handler_for_app())
+
+    # --- Drain ---
+    # Purpose: Apply due inbox rows, one ordered lane per customer.
+    # Inputs: Optional batch limit and worker count (config defaults).
+    # Outputs: Counts of processed, failed (retrying or terminal), and skipped rows.
+    @classmethod
+    def process_pending(
+        cls, *, limit: Optional[int] = None, max_workers: Optional[int] = None
+    ) -> Dict[str, int]:
+        app = current_app._get_current_object()
+        limit = max(1, int(limit or app.config.get("BILLING_WEBHOOK_BATCH_SIZE") or _DEFAULT_BATCH_SIZE))
+        workers = max(
+            1, int(max_workers or app.config.get("BILLING_WEBHOOK_WORKERS") or _DEFAULT_WORKERS)
+        )
+        cls._release_stale_claims()
+        lanes = cls._due_lanes(limit)
+        totals = {"processed": 0, "failed": 0, "skipped": 0, "lanes": len(lanes)}
+        if not lanes:
+            return totals
+
+        handler = cls._handler_for_app()
+        if workers == 1 or len(lanes) == 1:
+            results = [cls._run_lane(row_ids, handler) for row_ids in lanes]
+        else:
+
+            def _lane_in_context(row_ids: List[int]) -> Dict[str, int]:
+                with app.app_context():
+                    try:
+                        return cls._run_lane(row_ids, handler)
+                    finally:
+                        db.session.remove()
+
+            with ThreadPoolExecutor(
+                max_workers=min(workers, len(lanes)),
+                thread_name_prefix="billing-webhook",
+            ) as executor:
+                results = list(executor.map(_lane_in_context, lanes))
+
+        for result in results:
+            for key, value in result.items():
+                totals[key] += value
+        return totals
+
+    @staticmethod
+    def _handler_for_app() -> Callable[[StripeEvent], None]:
+        from .billing_service import BillingService
+
+        return BillingService.dispatch_webhook_row
+
+    @staticmethod
+    def _release_stale_claims() -> None:
+        cutoff = TimezoneUtils.utc_now() - timedelta(seconds=_STALE_PROCESSING_SECONDS)
+        db.session.execute(
+            update(StripeEvent)
+            .where(StripeEvent.status == STATUS_PROCESSING, StripeEvent.started_at < cutoff)
+            .values(status=STATUS_RECEIVED)
+            # Loaded rows hold naive timestamps that cannot be compared with the
+            # aware cutoff in Python; the commit below expires them anyway.
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+    @staticmethod
+    def _due_lanes(limit: int) -> List[List[int]]:
+        now = TimezoneUtils.utc_now()
+        blocked_keys = set(
+            db.session.execute(
+                select(StripeEvent.ordering_key)
+                .where(
+                    StripeEvent.ordering_key.isnot(None),
+                    or_(
+                        StripeEvent.status == STATUS_PROCESSING,
+                        and_(
+                            StripeEvent.status == STATUS_RECEIVED,
+                            StripeEvent.next_attempt_at > now,
+                        ),
+                    ),
+                )
+                .distinct()
+            ).scalars()
+        )
+        rows = db.session.execute(
+            select(StripeEvent.id, StripeEvent.ordering_key)
+            .where(
+                StripeEvent.status == STATUS_RECEIVED,
+                StripeEvent.payload.isnot(None),
+                or_(StripeEvent.next_attempt_at.is_(None), StripeEvent.next_attempt_at <= now),
+            )
+            .order_by(
+                StripeEvent.event_created.asc(),
+                StripeEvent.id.asc(),
+            )
+            .limit(limit)
+        ).all()
+
+        lanes: Dict[Any, List[int]] = {}
+        for row_id, key in rows:
+            if key is not None and key in blocked_keys:
+                continue
+            lanes.setdefault(key if key is not None else ("row", row_id), []).append(row_id)
+        return list(lanes.values())
+
+    @classmethod
+    def _run_lane(cls, row_ids: List[int], handler) -> Dict[str, int]:
+        counts = {"processed": 0, "failed": 0, "skipped": 0}
+        for index, row_id in enumerate(row_ids):
+            outcome = cls._apply(row_id, handler)
+            if outcome is None:
+                counts["skipped"] += 1
+                continue
+            if outcome:
+                counts["processed"] += 1
+                continue
+            counts["failed"] += 1
+            # Later events for this customer wait until the failed one succeeds.
+            counts["skipped"] += len(row_ids) - index - 1
+            break
+        return counts
+
+    @staticmethod
+    def _apply(row_id: int, handler) -> Optional[bool]:
+        now = TimezoneUtils.utc_now()
+        claimed = db.session.execute(
+            update(StripeEvent)
+            .where(StripeEvent.id == row_id, StripeEvent.status == STATUS_RECEIVED)
+            .values(
+                status=STATUS_PROCESSING,
+                started_at=now,
+                attempts=StripeEvent.attempts + 1,
+            )
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return None
+
+        row = db.session.get(StripeEvent, row_id)
+        try:
+            handler(row)
+        except Exception as exc:
+            logger.exception("Billing webhook %s failed", row.event_id)
+            db.session.rollback()
+            row = db.session.get(StripeEvent, row_id)
+            attempts = int(row.attempts or 0)
+            if attempts >= WEBHOOK_MAX_ATTEMPTS:
+                row.status = STATUS_FAILED
+                row.next_attempt_at = None
+            else:
+                row.status = STATUS_RECEIVED
+                row.next_attempt_at = TimezoneUtils.utc_now() + _retry_delay(attempts)
+            row.error_message = str(exc)[:2000]
+            db.session.commit()
+            return False
+
+        row.status = STATUS_PROCESSED
+        row.processed_at = TimezoneUtils.utc_now()
+        row.next_attempt_at = None
+        row.error_message = None
+        db.session.commit()
+        return True
@@ -1,11 +1,14 @@
 from __future__ import annotations
 import logging
+import time
 
 from typing import Any, Mapping
 
-from flask import has_app_context
+from flask import g, has_app_context, has_request_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
-from app.extensions import cache
+from app.extensions import cache, db
 from app.utils.cache_utils import stable_cache_key
 
 logger = logging.getLogger(__name__)
@@ -17,10 +20,12 @@ __all__ = [
     "product_list_cache_key",
     "product_list_page_cache_key",
     "product_bootstrap_cache_key",
+    "product_bootstrap_version",
     "invalidate_product_list_cache",
     "recipe_list_cache_key",
     "recipe_list_page_cache_key",
     "recipe_bootstrap_cache_key",
+    "recipe_bootstrap_version",
     "invalidate_recipe_list_cache",
     "global_library_cache_key",
     "invalidate_global_library_cache",
@@ -28,19 +33,36 @@ __all__ = [
     "invalidate_public_recipe_library_cache",
     "inventory_list_cache_key",
     "invalidate_inventory_list_cache",
+    "batchbot_context_cache_key",
+    "batchbot_context_snapshot_key",
+    "invalidate_batchbot_context_cache",
+    "unit_catalog_cache_key",
+    "invalidate_unit_catalog_cache",
+    "reference_data_cache_key",
+    "invalidate_reference_data_cache",
+    "pricing_catalog_cache_key",
+    "invalidate_pricing_catalog_cache",
+    "feature_flag_cache_key",
+    "invalidate_feature_flag_cache",
 ]
 
 _INGREDIENT_LIST_KEY = "bootstrap:ingredients:v1:{org_id}"
 _RECIPE_LIST_NAMESPACE = "recipe_list_cache"
 _RECIPE_PAGE_NAMESPACE = "recipe_list_page_cache"
-_RECIPE_BOOTSTRAP_KEY = "bootstrap_api:recipes:v1:{org_id}"
+_RECIPE_BOOTSTRAP_NAMESPACE = "bootstrap_api:recipes"
 _PRODUCT_LIST_KEY = "bootstrap:products:v1:{org_id}:{sort}"
 _PRODUCT_PAGE_KEY = "bootstrap:products:page:v1:{org_id}:{sort}"
-_PRODUCT_BOOTSTRAP_KEY = "bootstrap_api:products:v1:{org_id}"
+_PRODUCT_BOOTSTRAP_NAMESPACE = "bootstrap_api:products"
 _PRODUCT_SORT_KEYS = ("name", "popular", "stock")
 _GLOBAL_LIBRARY_NAMESPACE = "global_library_cache"
 _RECIPE_LIBRARY_NAMESPACE = "recipe_library_public_cache"
 _INVENTORY_LIST_NAMESPACE = "inventory_list_cache"
+_BATCHBOT_CONTEXT_NAMESPACE = "batchbot_context"
+_UNIT_CATALOG_NAMESPACE = "unit_catalog"
+_REFERENCE_DATA_NAMESPACE = "reference_data"
+_PRICING_CATALOG_NAMESPACE = "pricing_catalog"
+_FEATURE_FLAG_NAMESPACE = "feature_flags"
+_COMMIT_BUMPS_INFO_KEY = "_cache_namespaces_bumped_on_commit"
 
 
 def _org_scope(org_id: int | None) -> str:
@@ -54,7 +76,7 @@ def _safe_delete(key: str) -> None:
         cache.delete(key)
     except Exception:
         # Cache invalidation should never raise downstream.
-        logger.warning("Suppressed exception fallback at app/services/cache_invalidation.py:51", exc_info=True)
+        logger.warning("Suppressed exception fallback at app/services/cache_invalidation.py:76", exc_info=True)
         pass
 
 
@@ -78,14 +100,27 @@ def recipe_list_page_cache_key(org_id: int | None, page: int | None = None) -> s
     return _versioned_key(_RECIPE_PAGE_NAMESPACE, digest)
 
 
-def recipe_bootstrap_cache_key(org_id: int | None) -> str:
-    return _RECIPE_BOOTSTRAP_KEY.format(org_id=_org_scope(org_id))
+def _recipe_bootstrap_namespace(org_id: int | None) -> str:
+    return f"{_RECIPE_BOOTSTRAP_NAMESPACE}:{_org_scope(org_id)}"
+
+
+def recipe_bootstrap_version(org_id: int | None) -> int:
+    """Current recipe bootstrap version for the org; bumps on every recipe change."""
+    return _namespace_version(_recipe_bootstrap_namespace(org_id))
+
+
+def recipe_bootstrap_cache_key(org_id: int | None, version: int | None = None) -> str:
+    """Key for the recipe bootstrap payload at ``version`` (default: current)."""
+    if version is None:
+        version = recipe_bootstrap_version(org_id)
+    return f"{_recipe_bootstrap_namespace(org_id)}:v{int(version)}:payload"
 
 
 def invalidate_recipe_list_cache(org_id: int | None) -> None:
     _bump_namespace(_RECIPE_LIST_NAMESPACE)
     _bump_namespace(_RECIPE_PAGE_NAMESPACE)
-    _safe_delete(recipe_bootstrap_cache_key(org_id))
+    # Older payloads stay cached until their TTL so clients can fetch deltas.
+    _bump_namespace_through_commit(_recipe_bootstrap_namespace(org_id))
 
 
 def product_list_cache_key(org_id: int | None, sort_key: str | None = None) -> str:
@@ -98,15 +133,27 @@ def product_list_page_cache_key(org_id: int | None, sort_key: str | None = None)
     return _PRODUCT_PAGE_KEY.format(org_id=_org_scope(org_id), sort=normalized)
 
 
-def product_bootstrap_cache_key(org_id: int | None) -> str:
-    return _PRODUCT_BOOTSTRAP_KEY.format(org_id=_org_scope(org_id))
+def _product_bootstrap_namespace(org_id: int | None) -> str:
+    return f"{_PRODUCT_BOOTSTRAP_NAMESPACE}:{_org_scope(org_id)}"
+
+
+def product_bootstrap_version(org_id: int | None) -> int:
+    """Current product bootstrap version for the org; bumps on every product change."""
+    return _namespace_version(_product_bootstrap_namespace(org_id))
+
+
+def product_bootstrap_cache_key(org_id: int | None, version: int | None = None) -> str:
+    """Key for the product bootstrap payload at ``version`` (default: current)."""
+    if version is None:
+        version = product_bootstrap_version(org_id)
+    return f"{_product_bootstrap_namespace(org_id)}:v{int(version)}:payload"
 
 
 def invalidate_product_list_cache(org_id: int | None) -> None:
     for sort_key in _PRODUCT_SORT_KEYS:
         _safe_delete(product_list_cache_key(org_id, sort_key))
         _safe_delete(product_list_page_cache_key(org_id, sort_key))
-    _safe_delete(product_bootstrap_cache_key(org_id))
+    _bump_namespace_through_commit(_product_bootstrap_namespace(org_id))
 
 
 def _namespace_version(namespace: str) -> int:
@@ -116,18 +163,24 @@ def _namespace_version(namespace: str) -> int:
     try:
         version = cache.get(version_key)
     except Exception:
-        logger.warning("Suppressed exception fallback at app/services/cache_invalidation.py:113", exc_info=True)
+        logger.warning("Suppressed exception fallback at app/services/cache_invalidation.py:163", exc_info=True)
         version = None
     if not version:
-        version = 1
+        # Seed from the clock so an evicted version key never reissues an old
+        # version; bootstrap ETags are derived from these numbers.
+        version = _clock_version()
         try:
             cache.set(version_key, version)
         except Exception:
-            logger.warning("Suppressed exception fallback at app/services/cache_invalidation.py:119", exc_info=True)
+            logger.warning("Suppressed exception fallback at app/services/cache_invalidation.py:172", exc_info=True)
             pass
     return int(version or 1)
 
 
+def _clock_version() -> int:
+    return int(time.time() * 1000)
+
+
 def _versioned_key(namespace: str, raw_key: str) -> str:
     version = _namespace_version(namespace)
     return f"{namespace}:v{version}:{raw_key}"
@@ -138,23 +191,57 @@ def _bump_namespace(namespace: str) -> None:
         return
     version_key = f"{namespace}:__version__"
     try:
-        version = int(cache.get(version_key) or 1) + 1
+        current = cache.get(version_key)
+        version = int(current) + 1 if current else _clock_version()
     except Exception:
-        logger.warning("Suppressed exception fallback at app/services/cache_invalidation.py:135", exc_info=True)
-        version = 2
+        logger.warning("Suppressed exception fallback at app/services/cache_invalidation.py:194", exc_info=True)
+        version = _clock_version()
     try:
         cache.set(version_key, version)
     except Exception:
-        logger.warning("Suppressed exception fallback at app/services/cache_invalidation.py:139", exc_info=True)
+        logger.warning("Suppressed exception fallback at app/services/cache_invalidation.py:199", exc_info=True)
         pass
 
 
+def _bump_namespace_through_commit(namespace: str) -> None:
+    """Bump now and again once the open transaction commits.
+
+    Model listeners run at flush time, before commit. A build that reads in
+    between still sees the old rows but caches them under the new version;
+    the second bump retires that entry so the committed rows get their own.
+    """
+    _bump_namespace(namespace)
+    if not has_app_context():
+        return
+    try:
+        session = db.session()
+        if session.in_transaction():
+            session.info.setdefault(_COMMIT_BUMPS_INFO_KEY, set()).add(namespace)
+    except Exception:
+        logger.warning("Suppressed exception fallback at app/services/cache_invalidation.py:221", exc_info=True)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_namespaces_after_commit(session):
+    for namespace in session.info.pop(_COMMIT_BUMPS_INFO_KEY, ()):
+        _bump_namespace(namespace)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_commit_bumps(session, previous_transaction):
+    # Only the outermost rollback discards the writes the bumps were for.
+    if previous_transaction.parent is None:
+        session.info.pop(_COMMIT_BUMPS_INFO_KEY, None)
+
+
 def global_library_cache_key(raw_key: str) -> str:
     return _versioned_key(_GLOBAL_LIBRARY_NAMESPACE, raw_key)
 
 
 def invalidate_global_library_cache() -> None:
     _bump_namespace(_GLOBAL_LIBRARY_NAMESPACE)
+    # Default container lists are derived from global item container fields.
+    _bump_namespace(_REFERENCE_DATA_NAMESPACE)
 
 
 def recipe_library_cache_key(raw_key: str) -> str:
@@ -185,3 +272,61 @@ def inventory_list_cache_key(
 
 def invalidate_inventory_list_cache(org_id: int | None) -> None:
     _bump_namespace(_inventory_namespace(org_id))
+
+
+def _batchbot_context_namespace(org_id: int | None) -> str:
+    return f"{_BATCHBOT_CONTEXT_NAMESPACE}:{_org_scope(org_id)}"
+
+
+def batchbot_context_cache_key(org_id: int | None) -> str:
+    """Key for the org's current BatchBot context; bumps when its entities change."""
+    return _versioned_key(_batchbot_context_namespace(org_id), "current")
+
+
+def batchbot_context_snapshot_key(org_id: int | None, version: str) -> str:
+    """Key for an archived context snapshot, addressed by its content version."""
+    return f"{_batchbot_context_namespace(org_id)}:snapshot:{version}"
+
+
+def invalidate_batchbot_context_cache(org_id: int | None) -> None:
+    _bump_namespace(_batchbot_context_namespace(org_id))
+
+
+def unit_catalog_cache_key(raw_key: str) -> str:
+    """Key for a scoped unit list; bumps whenever any unit row changes."""
+    return _versioned_key(_UNIT_CATALOG_NAMESPACE, raw_key)
+
+
+def invalidate_unit_catalog_cache() -> None:
+    _bump_namespace(_UNIT_CATALOG_NAMESPACE)
+    _bump_namespace(_REFERENCE_DATA_NAMESPACE)
+
+
+def reference_data_cache_key(org_id: int | None) -> str:
+    """Key for the org's reference-data payload (units, categories, containers)."""
+    return _versioned_key(_REFERENCE_DATA_NAMESPACE, f"org:{_org_scope(org_id)}")
+
+
+def invalidate_reference_data_cache() -> None:
+    _bump_namespace(_REFERENCE_DATA_NAMESPACE)
+
+
+def pricing_catalog_cache_key() -> str:
+    """Key for the public pricing catalog snapshot; bumps on tier, addon, or permission writes."""
+    return _versioned_key(_PRICING_CATALOG_NAMESPACE, "snapshot")
+
+
+def invalidate_pricing_catalog_cache() -> None:
+    _bump_namespace(_PRICING_CATALOG_NAMESPACE)
+
+
+def feature_flag_cache_key() -> str:
+    """Key for the loaded feature-flag map; bumps whenever any flag row changes."""
+    return _versioned_key(_FEATURE_FLAG_NAMESPACE, "flags")
+
+
+def invalidate_feature_flag_cache() -> None:
+    _bump_namespace(_FEATURE_FLAG_NAMESPACE)
+    # Drop the per-request memo so the rest of this request sees the change.
+    if has_request_context():
+        g.pop("_feature_flag_map", None)
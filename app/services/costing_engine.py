@@ -10,6 +10,8 @@ Glossary:
 
 import logging
 
+from sqlalchemy import func
+
 from app.models import InventoryItem, UnifiedInventoryHistory, db
 
 logger = logging.getLogger(__name__)
@@ -30,27 +32,25 @@ def weighted_unit_cost_for_batch_item(inventory_item_id: int, batch_id: int) ->
         if not inventory_item_id or not batch_id:
             return 0.0
 
-        # Aggregate negative (deductive) entries for this batch+item
-        events = UnifiedInventoryHistory.query.filter(
-            UnifiedInventoryHistory.inventory_item_id == inventory_item_id,
-            UnifiedInventoryHistory.batch_id == batch_id,
-            UnifiedInventoryHistory.quantity_change < 0,
-        ).all()
-
-        if not events:
-            # Fallback to current item moving average if no events yet
-            item = db.session.get(InventoryItem, inventory_item_id)
-            return float(item.cost_per_unit or 0.0) if item else 0.0
-
-        total_qty = 0.0
-        total_cost = 0.0
-        for e in events:
-            qty = abs(float(e.quantity_change or 0.0))
-            unit_cost = float(e.unit_cost or 0.0)
-            total_qty += qty
-            total_cost += qty * unit_cost
+        # Aggregate negative (deductive) entries for this batch+item in SQL
+        qty_expr = func.abs(UnifiedInventoryHistory.quantity_change)
+        total_qty, total_cost = (
+            db.session.query(
+                func.sum(qty_expr),
+                func.sum(qty_expr * func.coalesce(UnifiedInventoryHistory.unit_cost, 0)),
+            )
+            .filter(
+                UnifiedInventoryHistory.inventory_item_id == inventory_item_id,
+                UnifiedInventoryHistory.batch_id == batch_id,
+                UnifiedInventoryHistory.quantity_change < 0,
+            )
+            .one()
+        )
+        total_qty = float(total_qty or 0.0)
+        total_cost = float(total_cost or 0.0)
 
         if total_qty <= 0:
+            # Fallback to current item moving average if no events yet
             item = db.session.get(InventoryItem, inventory_item_id)
             return float(item.cost_per_unit or 0.0) if item else 0.0
 
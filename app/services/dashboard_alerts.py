@@ -366,10 +366,12 @@ class DashboardAlertService:
     def _get_timer_alerts() -> Dict:
         """Get timer-related alerts and auto-complete expired timers"""
         try:
-            # Auto-complete expired timers first
+            # Auto-complete expired timers first unless the job scheduler owns it
+            from ..services.job_scheduler import scheduler_owns_maintenance
             from ..services.timer_service import TimerService
 
-            TimerService.complete_expired_timers()
+            if not scheduler_owns_maintenance():
+                TimerService.complete_expired_timers()
 
             # Use BatchTimer model which exists in your system
             from ..models import BatchTimer
@@ -1,14 +1,127 @@
+"""Density assignment.
+
+Synopsis:
+Assign ingredient densities from the global ingredient library or category
+defaults. Name matching runs against an in-process reference index (exact and
+alias hash maps plus padded n-gram postings) that is built once per app and
+rebuilt when the global library cache version moves.
+
+Glossary:
+- Reference index: Cached GlobalItem density payloads and their lookup maps.
+- Padded n-gram: n-character window over a name padded with n-1 spaces on
+  each side, used to shortlist similarity candidates.
+"""
+
 import logging
+import threading
+import time
+from collections import defaultdict
 from difflib import SequenceMatcher
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
-from flask import current_app
+from flask import current_app, has_app_context
+from sqlalchemy.orm import joinedload
 
 from ..extensions import db
 from ..models import GlobalItem, IngredientCategory, InventoryItem
+from .cache_invalidation import global_library_cache_key
 
 logger = logging.getLogger(__name__)
 
+_REFERENCE_INDEX_KEY = "density_reference_index"
+_REFERENCE_INDEX_LOCK = threading.Lock()
+# Safety net for a rebuild that raced an uncommitted global item change.
+REFERENCE_INDEX_MAX_AGE_SECONDS = 300.0
+
+# Any pair whose SequenceMatcher ratio reaches these thresholds shares a
+# padded n-gram: without one, every matching block is at most n-1 characters
+# and is flanked by unmatched characters, which caps the ratio at
+# 2(n-1)/(2(n-1)+1). Below the lowest bound the index scans every key.
+_NGRAM_SAFE_THRESHOLDS = ((3, 0.8), (2, 2.0 / 3.0))
+
+
+def _ngrams(name: str, size: int) -> Set[str]:
+    pad = " " * (size - 1)
+    padded = f"{pad}{name}{pad}"
+    return {padded[i : i + size] for i in range(len(padded) - size + 1)}
+
+
+# --- Reference index ---
+# Purpose: Hash and n-gram lookups over the global ingredient density payloads.
+class _ReferenceIndex:
+    def __init__(self, items: List[Dict], version_key: Optional[str] = None):
+        self.items = items
+        self.version_key = version_key
+        self.built_at = time.monotonic()
+        self.by_name: Dict[str, Dict] = {}
+        self.by_lower_name: Dict[str, Dict] = {}
+        self.by_alias: Dict[str, Dict] = {}
+        # (item position, normalized name or alias) in the original scan order
+        self.keys: List[Tuple[int, str]] = []
+        self.postings: Dict[int, Dict[str, Set[int]]] = {
+            size: defaultdict(set) for size, _ in _NGRAM_SAFE_THRESHOLDS
+        }
+
+        # First item wins every map, matching the legacy linear scans; similarity
+        # keys keep the legacy order too: each name, then its aliases.
+        for position, item in enumerate(items):
+            name = item.get("name") or ""
+            self.by_name.setdefault(name, item)
+            self.by_lower_name.setdefault(name.lower(), item)
+            self._add_key(position, name)
+            for alias in item.get("aliases") or []:
+                if isinstance(alias, str):
+                    self.by_alias.setdefault(alias.lower(), item)
+                    self._add_key(position, alias)
+
+    def _add_key(self, position: int, raw: str) -> None:
+        key = raw.lower().strip()
+        key_id = len(self.keys)
+        self.keys.append((position, key))
+        for size, postings in self.postings.items():
+            for gram in _ngrams(key, size):
+                postings[gram].add(key_id)
+
+    def is_stale(self, version_key: Optional[str]) -> bool:
+        if version_key != self.version_key:
+            return True
+        return time.monotonic() - self.built_at > REFERENCE_INDEX_MAX_AGE_SECONDS
+
+    def _candidate_ids(self, name: str, threshold: float) -> Iterable[int]:
+        if name:
+            for size, safe_threshold in _NGRAM_SAFE_THRESHOLDS:
+                if threshold >= safe_threshold:
+                    postings = self.postings[size]
+                    found: Set[int] = set()
+                    for gram in _ngrams(name, size):
+                        found |= postings.get(gram, set())
+                    return sorted(found)
+        return range(len(self.keys))
+
+    # --- Best similarity ---
+    # Purpose: Highest-ratio item at or above threshold (first wins on ties).
+    # Inputs: Normalized ingredient name, threshold.
+    # Outputs: Reference item dict or None.
+    def best_similarity(self, name: str, threshold: float) -> Optional[Dict]:
+        best_match = None
+        best_score = 0.0
+        matcher = SequenceMatcher(None)
+        matcher.set_seq1(name)
+        for key_id in self._candidate_ids(name, threshold):
+            position, key = self.keys[key_id]
+            total = len(name) + len(key)
+            # Length bound: ratio can never exceed 2*min/(len_a + len_b).
+            if total and 2.0 * min(len(name), len(key)) / total < threshold:
+                continue
+            matcher.set_seq2(key)
+            bound = matcher.quick_ratio()
+            if bound < threshold or bound <= best_score:
+                continue
+            score = matcher.ratio()
+            if score > best_score and score >= threshold:
+                best_score = score
+                best_match = self.items[position]
+        return best_match
 
 
 class DensityAssignmentService:
@@ -18,7 +131,12 @@ class DensityAssignmentService:
     def _load_reference_data_from_db() -> Dict:
         """Load density reference data from database (GlobalItem)"""
         try:
-            items = GlobalItem.query.filter_by(item_type="ingredient").all()
+            items = (
+                GlobalItem.query.options(joinedload(GlobalItem.ingredient_category))
+                .filter_by(item_type="ingredient")
+                .order_by(GlobalItem.id.asc())
+                .all()
+            )
             payload_items = []
             for gi in items:
                 payload_items.append(
@@ -40,6 +158,33 @@ class DensityAssignmentService:
             )
             return {"common_densities": []}
 
+    @staticmethod
+    def reference_index() -> _ReferenceIndex:
+        """Return this app's reference index, rebuilding it after global item changes."""
+        # The global library namespace version moves on every GlobalItem write.
+        version_key = global_library_cache_key(_REFERENCE_INDEX_KEY)
+        extensions = current_app.extensions
+        index = extensions.get(_REFERENCE_INDEX_KEY)
+        if index is not None and not index.is_stale(version_key):
+            return index
+        with _REFERENCE_INDEX_LOCK:
+            index = extensions.get(_REFERENCE_INDEX_KEY)
+            if index is None or index.is_stale(version_key):
+                index = _ReferenceIndex(
+                    DensityAssignmentService._load_reference_data_from_db().get(
+                        "common_densities", []
+                    ),
+                    version_key,
+                )
+                extensions[_REFERENCE_INDEX_KEY] = index
+        return index
+
+    @staticmethod
+    def reset_reference_index() -> None:
+        """Drop this app's cached reference index so the next lookup rebuilds it."""
+        if has_app_context():
+            current_app.extensions.pop(_REFERENCE_INDEX_KEY, None)
+
     @staticmethod
     def build_global_library_density_options(
         include_uncategorized: bool = True,
@@ -139,10 +284,37 @@ class DensityAssignmentService:
         """
         if not ingredient_name:
             return None, None
+        return DensityAssignmentService._match_against_index(
+            DensityAssignmentService.reference_index(), ingredient_name, threshold
+        )
 
-        reference_data = DensityAssignmentService._load_reference_data_from_db()
-        items = reference_data.get("common_densities", [])
+    @staticmethod
+    def find_best_matches(
+        ingredient_names: Iterable[str], threshold: float = 0.7
+    ) -> List[Tuple[Optional[Dict], Optional[str]]]:
+        """Bulk `find_best_match`: one result per name, in input order, from one index."""
+        names = list(ingredient_names)
+        if not any(names):
+            return [(None, None) for _ in names]
+        index = DensityAssignmentService.reference_index()
+        resolved: Dict[str, Tuple[Optional[Dict], Optional[str]]] = {}
+        results = []
+        for name in names:
+            if not name:
+                results.append((None, None))
+                continue
+            if name not in resolved:
+                resolved[name] = DensityAssignmentService._match_against_index(
+                    index, name, threshold
+                )
+            item, match_type = resolved[name]
+            results.append((dict(item) if item else None, match_type))
+        return results
 
+    @staticmethod
+    def _match_against_index(
+        index: _ReferenceIndex, ingredient_name: str, threshold: float
+    ) -> Tuple[Optional[Dict], Optional[str]]:
         ingredient_lower = ingredient_name.lower().strip()
 
         # High-trust keyword heuristic mapping
@@ -182,40 +354,19 @@ class DensityAssignmentService:
                 }, "category_keyword"
 
         # First: Try exact name match
-        for item in items:
-            if item["name"].lower() == ingredient_lower:
-                return item, "exact"
+        item = index.by_lower_name.get(ingredient_lower)
+        if item is not None:
+            return dict(item), "exact"
 
         # Second: Try alias match
-        for item in items:
-            for alias in item.get("aliases", []):
-                if alias.lower() == ingredient_lower:
-                    return item, "alias"
-
-        # Third: Try similarity matching
-        best_match = None
-        best_score = 0
-
-        for item in items:
-            # Check main name similarity
-            score = DensityAssignmentService._similarity_score(
-                ingredient_name, item["name"]
-            )
-            if score > best_score and score >= threshold:
-                best_score = score
-                best_match = item
-
-            # Check alias similarities
-            for alias in item.get("aliases", []):
-                score = DensityAssignmentService._similarity_score(
-                    ingredient_name, alias
-                )
-                if score > best_score and score >= threshold:
-                    best_score = score
-                    best_match = item
+        item = index.by_alias.get(ingredient_lower)
+        if item is not None:
+            return dict(item), "alias"
 
-        if best_match:
-            return best_match, "similarity"
+        # Third: Try similarity matching on the n-gram shortlist
+        item = index.best_similarity(ingredient_lower, threshold)
+        if item is not None:
+            return dict(item), "similarity"
 
         return None, None
 
@@ -257,16 +408,15 @@ class DensityAssignmentService:
         try:
             if reference_item_name:
                 # Find specific reference item
-                reference_data = DensityAssignmentService._load_reference_data_from_db()
-                items = reference_data.get("common_densities", [])
-
-                for item in items:
-                    if item["name"] == reference_item_name:
-                        ingredient.density = item["density_g_per_ml"]
-                        ingredient.reference_item_name = reference_item_name
-                        ingredient.density_source = "reference_item"
-                        db.session.commit()
-                        return True
+                item = DensityAssignmentService.reference_index().by_name.get(
+                    reference_item_name
+                )
+                if item is not None:
+                    ingredient.density = item["density_g_per_ml"]
+                    ingredient.reference_item_name = reference_item_name
+                    ingredient.density_source = "reference_item"
+                    db.session.commit()
+                    return True
 
             elif use_category_default and category_name:
                 # Use category default density
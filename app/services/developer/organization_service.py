@@ -223,6 +223,7 @@ class OrganizationService:
             from app.models.inventory_lot import InventoryLot
             from app.models.permission import role_permission
             from app.models.recipe import RecipeLineage
+            from app.models.recipe_fingerprint import RecipeFingerprint
             from app.models.recipe_marketplace import RecipeModerationEvent
             from app.models.reservation import Reservation
             from app.models.retention import RetentionDeletionQueue
@@ -353,6 +354,9 @@ class OrganizationService:
                 RecipeLineage.query.filter(
                     RecipeLineage.recipe_id.in_(org_recipe_ids)
                 ).delete(synchronize_session=False)
+                RecipeFingerprint.query.filter(
+                    RecipeFingerprint.recipe_id.in_(org_recipe_ids)
+                ).delete(synchronize_session=False)
                 RetentionDeletionQueue.query.filter(
                     RetentionDeletionQueue.recipe_id.in_(org_recipe_ids)
                 ).delete(synchronize_session=False)
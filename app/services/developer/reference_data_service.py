@@ -4,6 +4,7 @@ from typing import Dict, List
 
 from app.extensions import db
 from app.models import GlobalItem
+from app.services.cache_invalidation import invalidate_reference_data_cache
 from app.utils.settings import get_settings, save_settings
 
 
@@ -85,6 +86,7 @@ class ReferenceDataService:
         settings = read_json_file("settings.json", default={}) or {}
         settings.setdefault("container_management", {})["curated_lists"] = curated_lists
         write_json_file("settings.json", settings)
+        invalidate_reference_data_cache()
 
     @staticmethod
     def _build_default_lists() -> Dict[str, List[str]]:
@@ -1,15 +1,32 @@
+"""Batch freshness.
+
+Synopsis:
+Computes how much shelf life the inventory consumed by a batch had left at the
+time of use, weighted by quantity. Consumption events for one or many batches
+are read with a single join across history, lots and items, and completed
+batches keep their summary on the batch row so history views never recompute.
+
+Glossary:
+- Freshness: Percent of a lot's shelf life remaining when it was consumed.
+- Cached summary: BatchFreshnessSummary persisted to `Batch.freshness_summary`.
+"""
+
 import logging
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional
 
 from flask_login import current_user
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
 
 from app.models import db
 from app.models.batch import Batch
 from app.models.inventory import InventoryItem
 from app.models.inventory_lot import InventoryLot
 from app.models.unified_inventory_history import UnifiedInventoryHistory
+from app.utils.timezone_utils import TimezoneUtils
 
 logger = logging.getLogger(__name__)
 
@@ -86,89 +103,118 @@ class FreshnessService:
             logger.warning(f"Error computing lot freshness: {e}")
             return None
 
+    # --- Consumption rows ---
+    # Purpose: Load batch deduction events with their lot and item columns.
+    # Inputs: Batch ids.
+    # Outputs: Row tuples ordered by batch, then event time (one joined query).
     @staticmethod
-    def _get_batch_consumption_events(batch_id: int) -> List[UnifiedInventoryHistory]:
-        """Fetch all deduction events for a batch, joined with lots for freshness computation."""
-        events = (
-            UnifiedInventoryHistory.query.filter(
-                UnifiedInventoryHistory.batch_id == batch_id,
-                UnifiedInventoryHistory.change_type == "batch",
-                UnifiedInventoryHistory.quantity_change < 0,
+    def _load_consumption_rows(batch_ids: List[int]) -> List[tuple]:
+        lot_item = aliased(InventoryItem)
+        history = UnifiedInventoryHistory
+        return db.session.execute(
+            select(
+                history.batch_id,
+                history.inventory_item_id,
+                history.quantity_change,
+                history.timestamp,
+                history.affected_lot_id,
+                InventoryItem.name,
+                InventoryItem.unit,
+                InventoryItem.is_perishable,
+                InventoryItem.shelf_life_days,
+                InventoryLot.id,
+                InventoryLot.received_date,
+                InventoryLot.expiration_date,
+                InventoryLot.shelf_life_days,
+                lot_item.is_perishable,
+                lot_item.shelf_life_days,
             )
-            .order_by(UnifiedInventoryHistory.timestamp.asc())
-            .all()
-        )
-        return events
+            .join(InventoryItem, InventoryItem.id == history.inventory_item_id)
+            .outerjoin(InventoryLot, InventoryLot.id == history.affected_lot_id)
+            .outerjoin(lot_item, lot_item.id == InventoryLot.inventory_item_id)
+            .where(
+                history.batch_id.in_(batch_ids),
+                history.change_type == "batch",
+                history.quantity_change < 0,
+            )
+            .order_by(history.batch_id.asc(), history.timestamp.asc(), history.id.asc())
+        ).all()
 
     @staticmethod
-    def compute_item_freshness_for_batch(batch: Batch) -> List[ItemFreshness]:
-        """Compute weighted freshness for each inventory item consumed by the batch."""
-        if not batch:
-            return []
-
-        # Scope by org for safety
-        if (
-            current_user.is_authenticated
-            and batch.organization_id != current_user.organization_id
-        ):
-            return []
-
-        events = FreshnessService._get_batch_consumption_events(batch.id)
-        if not events:
-            return []
-
-        # Group events by inventory_item_id
-        per_item: Dict[int, List[UnifiedInventoryHistory]] = {}
-        for ev in events:
-            per_item.setdefault(ev.inventory_item_id, []).append(ev)
+    def _item_freshness_from_rows(rows: List[tuple]) -> List[ItemFreshness]:
+        """Weighted freshness per consumed item from one batch's consumption rows."""
+        # Group rows by inventory_item_id (first use order)
+        per_item: Dict[int, List[tuple]] = {}
+        for row in rows:
+            per_item.setdefault(row[1], []).append(row)
 
         results: List[ItemFreshness] = []
-        for item_id, evs in per_item.items():
-            item: InventoryItem = db.session.get(InventoryItem, item_id)
-            if not item:
-                continue
-
+        for item_id, item_rows in per_item.items():
             total_used = 0.0
             total_weighted = 0.0
             lots_contributed = 0
-
-            for ev in evs:
+            item_name = item_rows[0][5]
+            item_unit = item_rows[0][6]
+            item_perishable = item_rows[0][7]
+            item_shelf_life = item_rows[0][8]
+
+            for (
+                _batch_id,
+                _item_id,
+                quantity_change,
+                timestamp,
+                affected_lot_id,
+                _name,
+                _unit,
+                _perishable,
+                _shelf_life,
+                lot_id,
+                received_date,
+                expiration_date,
+                lot_shelf_life,
+                lot_item_perishable,
+                lot_item_shelf_life,
+            ) in item_rows:
                 # quantity_change is negative for deductions
-                used_amount = abs(float(ev.quantity_change or 0.0))
+                used_amount = abs(float(quantity_change or 0.0))
                 if used_amount <= 0:
                     continue
 
                 freshness_percent = None
-                if ev.affected_lot_id:
-                    lot = db.session.get(InventoryLot, ev.affected_lot_id)
-                    if lot:
-                        freshness_percent = (
-                            FreshnessService._compute_lot_freshness_percent_at_time(
-                                lot, ev.timestamp or datetime.now(timezone.utc)
-                            )
+                if affected_lot_id and lot_id:
+                    lot = SimpleNamespace(
+                        received_date=received_date,
+                        expiration_date=expiration_date,
+                        shelf_life_days=lot_shelf_life,
+                        inventory_item=SimpleNamespace(
+                            is_perishable=lot_item_perishable,
+                            shelf_life_days=lot_item_shelf_life,
+                        ),
+                    )
+                    freshness_percent = (
+                        FreshnessService._compute_lot_freshness_percent_at_time(
+                            lot, timestamp or datetime.now(timezone.utc)
                         )
-                        lots_contributed += 1
+                    )
+                    lots_contributed += 1
 
                 # Fallback: if lot freshness can't be computed, try item's shelf life against event time
                 if (
                     freshness_percent is None
-                    and item.is_perishable
-                    and item.shelf_life_days
-                    and ev.timestamp
+                    and item_perishable
+                    and item_shelf_life
+                    and timestamp
                 ):
-                    received_guess = ev.timestamp - timedelta(
-                        days=int(item.shelf_life_days)
+                    fake_lot = SimpleNamespace(
+                        received_date=timestamp
+                        - timedelta(days=int(item_shelf_life)),
+                        expiration_date=timestamp,
+                        shelf_life_days=item_shelf_life,
+                        inventory_item=None,
                     )
-
-                    class _FakeLot:
-                        received_date = received_guess
-                        expiration_date = ev.timestamp
-                        shelf_life_days = item.shelf_life_days
-                        inventory_item = item
-
                     freshness_percent = (
                         FreshnessService._compute_lot_freshness_percent_at_time(
-                            _FakeLot, ev.timestamp
+                            fake_lot, timestamp
                         )
                     )
 
@@ -183,13 +229,13 @@ class FreshnessService:
                 results.append(
                     ItemFreshness(
                         inventory_item_id=item_id,
-                        item_name=item.name,
+                        item_name=item_name,
                         weighted_freshness_percent=round(
                             total_weighted / total_used, 1
                         ),
                         lots_contributed=lots_contributed,
                         total_used=total_used,
-                        unit=item.unit or "",
+                        unit=item_unit or "",
                     )
                 )
 
@@ -203,21 +249,17 @@ class FreshnessService:
         return results
 
     @staticmethod
-    def compute_batch_freshness(batch: Batch) -> BatchFreshnessSummary:
-        """Compute overall batch freshness as weighted average of all consumed items' freshness.
-
-        Weight by quantity proportion across all items (already weighted within each item by lots).
-        """
-        items = FreshnessService.compute_item_freshness_for_batch(batch)
+    def _summarize(batch_id: int, items: List[ItemFreshness]) -> BatchFreshnessSummary:
+        """Overall freshness as the quantity-weighted average of item freshness."""
         if not items:
             return BatchFreshnessSummary(
-                batch_id=batch.id, overall_freshness_percent=None, items=[]
+                batch_id=batch_id, overall_freshness_percent=None, items=[]
             )
 
         total_used_all = sum(i.total_used for i in items)
         if total_used_all <= 0:
             return BatchFreshnessSummary(
-                batch_id=batch.id, overall_freshness_percent=None, items=items
+                batch_id=batch_id, overall_freshness_percent=None, items=items
             )
 
         total_weighted_all = 0.0
@@ -231,5 +273,139 @@ class FreshnessService:
             else None
         )
         return BatchFreshnessSummary(
-            batch_id=batch.id, overall_freshness_percent=overall, items=items
+            batch_id=batch_id, overall_freshness_percent=overall, items=items
         )
+
+    @staticmethod
+    def _in_scope(batch: Batch) -> bool:
+        # Scope by org for safety
+        return not (
+            current_user.is_authenticated
+            and batch.organization_id != current_user.organization_id
+        )
+
+    @staticmethod
+    def compute_item_freshness_for_batch(batch: Batch) -> List[ItemFreshness]:
+        """Compute weighted freshness for each inventory item consumed by the batch."""
+        if not batch or not FreshnessService._in_scope(batch):
+            return []
+        return FreshnessService.compute_batch_freshness(batch).items
+
+    @staticmethod
+    def compute_batch_freshness(batch: Batch) -> BatchFreshnessSummary:
+        """Compute overall batch freshness as weighted average of all consumed items' freshness.
+
+        Weight by quantity proportion across all items (already weighted within each item by lots).
+        Completed batches return the summary persisted at completion.
+        """
+        return FreshnessService.compute_batch_freshness_many([batch])[batch.id]
+
+    # --- Freshness for many batches ---
+    # Purpose: Summaries for a batch list/report with one joined history query.
+    # Inputs: Batch instances.
+    # Outputs: Dict of batch id -> BatchFreshnessSummary (cached summaries reused).
+    @staticmethod
+    def compute_batch_freshness_many(
+        batches: Iterable[Batch],
+    ) -> Dict[int, BatchFreshnessSummary]:
+        summaries: Dict[int, BatchFreshnessSummary] = {}
+        pending: List[int] = []
+        for batch in batches:
+            if batch is None or batch.id in summaries:
+                continue
+            if not FreshnessService._in_scope(batch):
+                summaries[batch.id] = FreshnessService._summarize(batch.id, [])
+                continue
+            cached = FreshnessService.cached_summary(batch)
+            if cached is not None:
+                summaries[batch.id] = cached
+            else:
+                summaries[batch.id] = None  # placeholder keeps input order
+                pending.append(batch.id)
+
+        if pending:
+            rows_by_batch: Dict[int, List[tuple]] = {}
+            for row in FreshnessService._load_consumption_rows(pending):
+                rows_by_batch.setdefault(row[0], []).append(row)
+            for batch_id in pending:
+                items = FreshnessService._item_freshness_from_rows(
+                    rows_by_batch.get(batch_id, [])
+                )
+                summaries[batch_id] = FreshnessService._summarize(batch_id, items)
+        return summaries
+
+    # --- Cached summary ---
+    # Purpose: Read the freshness summary persisted on a completed batch.
+    # Inputs: Batch instance.
+    # Outputs: BatchFreshnessSummary or None when nothing is cached.
+    @staticmethod
+    def cached_summary(batch: Batch) -> Optional[BatchFreshnessSummary]:
+        if not getattr(batch, "freshness_computed_at", None):
+            return None
+        stored = getattr(batch, "freshness_summary", None)
+        if not isinstance(stored, dict):
+            return None
+        try:
+            items = [ItemFreshness(**item) for item in stored.get("items") or []]
+        except TypeError:
+            logger.warning("Suppressed exception fallback at app/services/freshness_service.py:350", exc_info=True)
+            return None
+        return BatchFreshnessSummary(
+            batch_id=batch.id,
+            overall_freshness_percent=stored.get("overall_freshness_percent"),
+            items=items,
+        )
+
+    # --- Persist summary ---
+    # Purpose: Cache the freshness summary on the batch row (called at completion).
+    # Inputs: Batch instance inside the caller's transaction.
+    # Outputs: BatchFreshnessSummary; caller commits.
+    @staticmethod
+    def persist_batch_freshness(batch: Batch) -> BatchFreshnessSummary:
+        rows = FreshnessService._load_consumption_rows([batch.id])
+        summary = FreshnessService._summarize(
+            batch.id, FreshnessService._item_freshness_from_rows(rows)
+        )
+        batch.freshness_summary = asdict(summary)
+        batch.freshness_computed_at = TimezoneUtils.utc_now()
+        return summary
+
+    # --- Backfill completed batches ---
+    # Purpose: Cache freshness for completed batches finished before caching existed.
+    # Inputs: Chunk size for the joined history query.
+    # Outputs: Number of batches updated (commits per chunk).
+    @staticmethod
+    def backfill_completed(chunk_size: int = 500) -> int:
+        updated = 0
+        last_id = 0
+        while True:
+            batches = (
+                Batch.query.filter(
+                    Batch.status == "completed",
+                    Batch.freshness_computed_at.is_(None),
+                    Batch.id > last_id,
+                )
+                .order_by(Batch.id.asc())
+                .limit(chunk_size)
+                .all()
+            )
+            if not batches:
+                return updated
+            rows_by_batch: Dict[int, List[tuple]] = {}
+            for row in FreshnessService._load_consumption_rows(
+                [batch.id for batch in batches]
+            ):
+                rows_by_batch.setdefault(row[0], []).append(row)
+            now = TimezoneUtils.utc_now()
+            for batch in batches:
+                summary = FreshnessService._summarize(
+                    batch.id,
+                    FreshnessService._item_freshness_from_rows(
+                        rows_by_batch.get(batch.id, [])
+                    ),
+                )
+                batch.freshness_summary = asdict(summary)
+                batch.freshness_computed_at = now
+            db.session.commit()
+            updated += len(batches)
+            last_id = batches[-1].id
@@ -1,23 +1,78 @@
 """Global item synchronization service.
 
 Synopsis:
-Sync linked inventory items with updates to global catalog entries.
+Sync linked inventory items with updates to global catalog entries. Each
+synced field is one conditional bulk UPDATE across every linked org item
+("still matches the old global value or is blank"), so an edit costs a
+handful of statements instead of loading every linked row. Fan-outs above
+GLOBAL_ITEM_SYNC_INLINE_LIMIT are queued as GlobalItemSyncJob rows and
+applied by the scheduler (inline when no scheduler worker runs). Bulk UPDATEs
+bypass mapper events, so the service marks recipe fingerprints and cost
+stats stale itself.
 
 Glossary:
 - Global item: Canonical ingredient entry in the global catalog.
 - Ownership: Flag indicating whether an item is globally managed.
+- Fan-out: Number of linked org inventory items touched by one edit.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import String, func, insert, or_, select, update
 
 from app.extensions import db
 from app.models import GlobalItem, InventoryItem, UnifiedInventoryHistory
+from app.models.global_item_cost_stats import mark_cost_stats_stale
+from app.models.global_item_sync_job import GlobalItemSyncJob
+from app.models.recipe_fingerprint import mark_fingerprints_stale_for_items
+from app.services.cache_invalidation import (
+    invalidate_batchbot_context_cache,
+    invalidate_ingredient_list_cache,
+    invalidate_inventory_list_cache,
+    invalidate_product_list_cache,
+)
+from app.services.job_scheduler import scheduler_owns_maintenance
+from app.utils.timezone_utils import TimezoneUtils
 
 logger = logging.getLogger(__name__)
 
+INGREDIENT_META_FIELDS = (
+    "saponification_value",
+    "iodine_value",
+    "melting_point_c",
+    "flash_point_c",
+    "ph_value",
+    "moisture_content_percent",
+    "comedogenic_rating",
+    "recommended_fragrance_load_pct",
+    "inci_name",
+    "cas_number",
+    "protein_content_pct",
+    "brewing_color_srm",
+    "brewing_potential_sg",
+    "brewing_diastatic_power_lintner",
+    "fatty_acid_profile",
+    "certifications",
+)
+CONTAINER_FIELDS = (
+    "capacity",
+    "capacity_unit",
+    "container_material",
+    "container_type",
+    "container_style",
+    "container_color",
+)
+SYNC_JOB_MAX_ATTEMPTS = 3
+# A running job older than this lost its worker (deploy, OOM) and is retried.
+SYNC_JOB_STALE_RUNNING_SECONDS = 1800
+# Synced fields that feed recipe fingerprints (canonical key, base conversion).
+_FINGERPRINT_FIELDS = ("name", "density")
+
 
 # --- Global item sync ---
 # Purpose: Sync linked inventory items to global item updates.
@@ -33,34 +88,88 @@ class GlobalItemSyncService:
     """
 
     @staticmethod
-    def _maybe_update_value(
-        obj: Any,
-        attr: str,
-        *,
-        new_value: Any,
-        old_value: Any = None,
-        allow_overwrite_if_matches_old: bool = True,
-        allow_overwrite_if_empty: bool = True,
-    ) -> bool:
-        current = getattr(obj, attr, None)
-        should_overwrite = False
-
-        if allow_overwrite_if_empty and (
-            current is None or current == "" or current == []
-        ):
-            should_overwrite = True
-        elif allow_overwrite_if_matches_old and current == old_value:
-            should_overwrite = True
+    def _linked_filter(global_item_id: int) -> List[Any]:
+        table = InventoryItem.__table__
+        return [
+            table.c.global_item_id == global_item_id,
+            table.c.is_archived.is_(False),
+            table.c.organization_id.isnot(None),
+            table.c.ownership == "global",
+        ]
+
+    # --- Field rules ---
+    # Purpose: Translate the sync rules into (field, new, old, conditional, type clause).
+    # Inputs: Mutated GlobalItem and its before snapshot.
+    # Outputs: Ordered rule tuples for mapped inventory columns only.
+    @classmethod
+    def _field_rules(
+        cls, global_item: GlobalItem, before: Dict[str, Any]
+    ) -> List[Tuple[str, Any, Any, bool, Any]]:
+        item_type = InventoryItem.__table__.c.type
+        rules: List[Tuple[str, Any, Any, bool, Any]] = [
+            # Name: always sync for linked items
+            ("name", global_item.name, None, False, None)
+        ]
+        new_default_unit = getattr(global_item, "default_unit", None)
+        if new_default_unit:
+            rules.append(
+                (
+                    "unit",
+                    new_default_unit,
+                    before.get("default_unit"),
+                    True,
+                    item_type != "container",
+                )
+            )
+        if global_item.density is not None:
+            rules.append(
+                (
+                    "density",
+                    global_item.density,
+                    before.get("density"),
+                    True,
+                    item_type == "ingredient",
+                )
+            )
+        for field in INGREDIENT_META_FIELDS:
+            rules.append(
+                (
+                    field,
+                    getattr(global_item, field, None),
+                    before.get(field),
+                    True,
+                    item_type == "ingredient",
+                )
+            )
+        for field in CONTAINER_FIELDS:
+            rules.append(
+                (
+                    field,
+                    getattr(global_item, field, None),
+                    before.get(field),
+                    True,
+                    item_type.in_(("container", "packaging")),
+                )
+            )
+        columns = InventoryItem.__table__.c
+        # Fields the inventory table does not carry (yet) have nothing to sync,
+        # and a value that was and still is unset can never match a row.
+        return [
+            rule
+            for rule in rules
+            if rule[0] in columns and not (rule[1] is None and rule[2] is None)
+        ]
 
-        if should_overwrite:
-            setattr(obj, attr, new_value)
-            return True
-        return False
+    @classmethod
+    def count_linked_items(cls, global_item_id: int) -> int:
+        """Return how many org inventory items follow this global item."""
+        stmt = select(func.count()).where(*cls._linked_filter(global_item_id))
+        return int(db.session.execute(stmt).scalar() or 0)
 
     @classmethod
     def sync_linked_inventory_items(
         cls, global_item: GlobalItem, *, before: Dict[str, Any] | None = None
-    ) -> int:
+    ) -> Dict[str, Any]:
         """Apply changes from a global item edit to linked inventory items.
 
         Args:
@@ -68,132 +177,265 @@ class GlobalItemSyncService:
             before: snapshot of the GlobalItem fields before mutation (old values)
 
         Returns:
-            Number of inventory items updated.
+            Dict with ``updated`` (distinct items changed), ``organizations``
+            (distinct orgs touched) and ``fields`` (rows changed per field).
         """
         before = before or {}
+        table = InventoryItem.__table__
+        linked = cls._linked_filter(global_item.id)
 
-        linked_items = InventoryItem.query.filter(
-            InventoryItem.global_item_id == global_item.id,
-            InventoryItem.is_archived.is_(False),
-            InventoryItem.organization_id.isnot(None),
-            InventoryItem.ownership == "global",
-        ).all()
+        # id -> (organization_id, type, unit after the statements so far)
+        affected: Dict[int, Tuple[int, str, str]] = {}
+        field_counts: Dict[str, int] = {}
+        fingerprint_item_ids: set[int] = set()
 
-        updated_count = 0
+        for field, new_value, old_value, conditional, type_clause in cls._field_rules(
+            global_item, before
+        ):
+            column = table.c[field]
+            conditions = list(linked)
+            conditions.append(column.is_distinct_from(new_value))
+            if type_clause is not None:
+                conditions.append(type_clause)
+            if conditional:
+                overwrite = [column.is_(None)]
+                if isinstance(column.type, String):
+                    overwrite.append(column == "")
+                if old_value is not None:
+                    overwrite.append(column == old_value)
+                conditions.append(or_(*overwrite))
 
-        for inv in linked_items:
-            changed = False
+            stmt = (
+                update(table)
+                .where(*conditions)
+                .values({field: new_value})
+                .returning(table.c.id, table.c.organization_id, table.c.type, table.c.unit)
+            )
+            rows = db.session.execute(stmt).all()
+            if rows:
+                field_counts[field] = len(rows)
+            for row in rows:
+                affected[row.id] = (row.organization_id, row.type, row.unit)
+            if field in _FINGERPRINT_FIELDS:
+                fingerprint_item_ids.update(row.id for row in rows)
 
-            # Name: always sync for linked items
-            if inv.name != global_item.name:
-                inv.name = global_item.name
-                changed = True
-
-            # Inventory unit: never override a user's chosen unit if they diverged.
-            # Only update if it still matches the *previous* global default (or is blank).
-            if inv.type != "container":
-                old_default_unit = before.get("default_unit")
-                new_default_unit = getattr(global_item, "default_unit", None)
-                if new_default_unit:
-                    if cls._maybe_update_value(
-                        inv,
-                        "unit",
-                        new_value=new_default_unit,
-                        old_value=old_default_unit,
-                        allow_overwrite_if_matches_old=True,
-                        allow_overwrite_if_empty=True,
-                    ):
-                        changed = True
-
-            # Ingredient density: update if it still matches old global density or is unset
-            if inv.type == "ingredient":
-                if global_item.density is not None:
-                    if cls._maybe_update_value(
-                        inv,
-                        "density",
-                        new_value=global_item.density,
-                        old_value=before.get("density"),
-                        allow_overwrite_if_matches_old=True,
-                        allow_overwrite_if_empty=True,
-                    ):
-                        changed = True
-
-                # Sync selected ingredient metadata fields (only if they still match the previous global values)
-                meta_fields = [
-                    "saponification_value",
-                    "iodine_value",
-                    "melting_point_c",
-                    "flash_point_c",
-                    "ph_value",
-                    "moisture_content_percent",
-                    "comedogenic_rating",
-                    "recommended_fragrance_load_pct",
-                    "inci_name",
-                    "cas_number",
-                    "protein_content_pct",
-                    "brewing_color_srm",
-                    "brewing_potential_sg",
-                    "brewing_diastatic_power_lintner",
-                    "fatty_acid_profile",
-                    "certifications",
-                ]
-                for field in meta_fields:
-                    if cls._maybe_update_value(
-                        inv,
-                        field,
-                        new_value=getattr(global_item, field, None),
-                        old_value=before.get(field),
-                        allow_overwrite_if_matches_old=True,
-                        allow_overwrite_if_empty=True,
-                    ):
-                        changed = True
-
-            # Container/packaging metadata: capacity + capacity_unit + structured attributes
-            if inv.type in ("container", "packaging"):
-                for field in [
-                    "capacity",
-                    "capacity_unit",
-                    "container_material",
-                    "container_type",
-                    "container_style",
-                    "container_color",
-                ]:
-                    if cls._maybe_update_value(
-                        inv,
-                        field,
-                        new_value=getattr(global_item, field, None),
-                        old_value=before.get(field),
-                        allow_overwrite_if_matches_old=True,
-                        allow_overwrite_if_empty=True,
-                    ):
-                        changed = True
-
-            if changed:
-                updated_count += 1
-                try:
-                    db.session.add(
-                        UnifiedInventoryHistory(
-                            inventory_item_id=inv.id,
-                            change_type="sync_global",
-                            quantity_change=0.0,
-                            quantity_change_base=0,
-                            unit=inv.unit or "count",
-                            notes=f"Synced fields from GlobalItem '{global_item.name}'",
-                            created_by=None,
-                            organization_id=inv.organization_id,
-                        )
-                    )
-                except Exception:
-                    # History is best-effort; don't break sync.
-                    logger.warning("Suppressed exception fallback at app/services/global_item_sync_service.py:186", exc_info=True)
-                    pass
+        if affected:
+            cls._record_history(global_item, affected)
+            cls._invalidate_caches(affected.values())
+            cls._mark_derived_stale(
+                global_item, fingerprint_item_ids, unit_changed="unit" in field_counts
+            )
+
+        result = {
+            "updated": len(affected),
+            "organizations": len({org_id for org_id, _, _ in affected.values()}),
+            "fields": field_counts,
+        }
+        logger.info(
+            "GlobalItemSyncService: synced %s linked inventory items for global_item_id=%s fields=%s",
+            result["updated"],
+            global_item.id,
+            field_counts,
+        )
+        return result
+
+    @staticmethod
+    def _record_history(
+        global_item: GlobalItem, affected: Dict[int, Tuple[int, str, str]]
+    ) -> None:
+        notes = f"Synced fields from GlobalItem '{global_item.name}'"
+        rows = [
+            {
+                "inventory_item_id": item_id,
+                "change_type": "sync_global",
+                "quantity_change": 0.0,
+                "quantity_change_base": 0,
+                "unit": unit or "count",
+                "notes": notes,
+                "created_by": None,
+                "organization_id": org_id,
+            }
+            for item_id, (org_id, _, unit) in affected.items()
+        ]
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(UnifiedInventoryHistory.__table__), rows)
+        except Exception:
+            # History is best-effort; don't break sync.
+            logger.warning("Suppressed exception fallback at app/services/global_item_sync_service.py:242", exc_info=True)
+
+    @staticmethod
+    def _mark_derived_stale(
+        global_item: GlobalItem, fingerprint_item_ids: set[int], *, unit_changed: bool
+    ) -> None:
+        # Mirrors the InventoryItem listeners in recipe_fingerprint and
+        # global_item_cost_stats that the bulk UPDATEs skip.
+        connection = db.session.connection()
+        mark_fingerprints_stale_for_items(connection, fingerprint_item_ids)
+        if unit_changed:
+            # Lot costs are per item unit, so a unit rewrite shifts the spread.
+            mark_cost_stats_stale(connection, [global_item.id])
 
+    @staticmethod
+    def _invalidate_caches(affected_rows) -> None:
+        # Bulk UPDATEs bypass the InventoryItem mapper events, so mirror
+        # their per-org cache invalidation here.
+        types_by_org: Dict[int, set] = {}
+        for org_id, item_type, _ in affected_rows:
+            types_by_org.setdefault(org_id, set()).add((item_type or "").lower())
+        for org_id, item_types in types_by_org.items():
+            invalidate_inventory_list_cache(org_id)
+            invalidate_batchbot_context_cache(org_id)
+            if "ingredient" in item_types:
+                invalidate_ingredient_list_cache(org_id)
+            if any(item_type.startswith("product") for item_type in item_types):
+                invalidate_product_list_cache(org_id)
+
+    # --- Request sync ---
+    # Purpose: Sync inline for small fan-outs, queue a job for large ones.
+    # Inputs: Mutated GlobalItem, before snapshot, requesting user id.
+    # Outputs: Inline counts (``queued`` False) or queued job info.
+    @classmethod
+    def request_sync(
+        cls,
+        global_item: GlobalItem,
+        *,
+        before: Dict[str, Any] | None = None,
+        requested_by: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        linked_count = cls.count_linked_items(global_item.id)
+        inline_limit = cls._inline_limit()
+        # Without a scheduler worker a queued job would never run.
+        if (
+            inline_limit <= 0
+            or linked_count <= inline_limit
+            or not scheduler_owns_maintenance()
+        ):
+            return {
+                "queued": False,
+                "linked": linked_count,
+                **cls.sync_linked_inventory_items(global_item, before=before),
+            }
+
+        job = GlobalItemSyncJob.query.filter_by(
+            global_item_id=global_item.id, status="pending"
+        ).first()
+        if job is None:
+            job = GlobalItemSyncJob(
+                global_item_id=global_item.id,
+                before_snapshot=before or {},
+                requested_by=requested_by,
+            )
+            db.session.add(job)
+        # An already-pending job keeps its older snapshot: linked items that
+        # have not been synced yet still carry those earlier values.
+        job.linked_count = linked_count
+        db.session.flush()
         logger.info(
-            "GlobalItemSyncService: synced %s linked inventory items for global_item_id=%s",
-            updated_count,
+            "GlobalItemSyncService: queued sync job %s for global_item_id=%s (%s linked items)",
+            job.id,
             global_item.id,
+            linked_count,
+        )
+        return {"queued": True, "linked": linked_count, "job_id": job.id}
+
+    @staticmethod
+    def _inline_limit() -> int:
+        if not has_app_context():
+            return 0
+        try:
+            return int(current_app.config.get("GLOBAL_ITEM_SYNC_INLINE_LIMIT") or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    # --- Run pending jobs ---
+    # Purpose: Apply queued large fan-out syncs (scheduler entry point).
+    # Inputs: Maximum jobs to run this tick.
+    # Outputs: processed/succeeded/failed counters.
+    @classmethod
+    def run_pending_jobs(cls, limit: int = 5) -> Dict[str, int]:
+        totals = {"processed": 0, "succeeded": 0, "failed": 0}
+        cls._release_stale_jobs()
+        stmt = (
+            select(GlobalItemSyncJob.id)
+            .where(GlobalItemSyncJob.status == "pending")
+            .order_by(GlobalItemSyncJob.id.asc())
+            .limit(max(1, limit))
+        )
+        job_ids = list(db.session.execute(stmt).scalars())
+        for job_id in job_ids:
+            job = db.session.execute(
+                select(GlobalItemSyncJob)
+                .where(
+                    GlobalItemSyncJob.id == job_id,
+                    GlobalItemSyncJob.status == "pending",
+                )
+                .with_for_update(skip_locked=True)
+            ).scalar_one_or_none()
+            if job is None:
+                continue
+            totals["processed"] += 1
+            job.status = "running"
+            job.attempts = (job.attempts or 0) + 1
+            job.started_at = TimezoneUtils.utc_now()
+            db.session.commit()
+
+            try:
+                global_item = db.session.get(GlobalItem, job.global_item_id)
+                if global_item is None:
+                    result = {"updated": 0, "organizations": 0, "fields": {}}
+                else:
+                    result = cls.sync_linked_inventory_items(
+                        global_item, before=job.before_snapshot or {}
+                    )
+                job.result = result
+                job.status = "done"
+                job.error_message = None
+                job.finished_at = TimezoneUtils.utc_now()
+                db.session.commit()
+                totals["succeeded"] += 1
+            except Exception as exc:
+                logger.exception("Global item sync job %s failed", job_id)
+                db.session.rollback()
+                job = db.session.get(GlobalItemSyncJob, job_id)
+                job.status = (
+                    "failed" if job.attempts >= SYNC_JOB_MAX_ATTEMPTS else "pending"
+                )
+                job.error_message = str(exc)[:2000]
+                job.finished_at = TimezoneUtils.utc_now()
+                db.session.commit()
+                totals["failed"] += 1
+        return totals
+
+    @staticmethod
+    def _release_stale_jobs() -> None:
+        # A job left "running" by a dead worker would otherwise block forever.
+        cutoff = TimezoneUtils.utc_now() - timedelta(
+            seconds=SYNC_JOB_STALE_RUNNING_SECONDS
+        )
+        stale = (
+            GlobalItemSyncJob.status == "running",
+            GlobalItemSyncJob.started_at < cutoff,
+        )
+        db.session.execute(
+            update(GlobalItemSyncJob)
+            .where(*stale, GlobalItemSyncJob.attempts >= SYNC_JOB_MAX_ATTEMPTS)
+            .values(
+                status="failed",
+                error_message="Worker stopped before the sync finished",
+                finished_at=TimezoneUtils.utc_now(),
+            )
+            # Loaded rows hold naive timestamps; evaluating the aware cutoff
+            # against them in Python raises, and the commit expires them anyway.
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(
+            update(GlobalItemSyncJob)
+            .where(*stale)
+            .values(status="pending")
+            .execution_options(synchronize_session=False)
         )
-        return updated_count
+        db.session.commit()
 
     @classmethod
     def relink_inventory_item(cls, inv: InventoryItem, global_item: GlobalItem) -> None:
@@ -217,33 +459,9 @@ class GlobalItemSyncService:
         if inv.type == "ingredient":
             if global_item.density is not None:
                 inv.density = global_item.density
-            for field in [
-                "saponification_value",
-                "iodine_value",
-                "melting_point_c",
-                "flash_point_c",
-                "ph_value",
-                "moisture_content_percent",
-                "comedogenic_rating",
-                "recommended_fragrance_load_pct",
-                "inci_name",
-                "cas_number",
-                "protein_content_pct",
-                "brewing_color_srm",
-                "brewing_potential_sg",
-                "brewing_diastatic_power_lintner",
-                "fatty_acid_profile",
-                "certifications",
-            ]:
+            for field in INGREDIENT_META_FIELDS:
                 setattr(inv, field, getattr(global_item, field, None))
 
         if inv.type in ("container", "packaging"):
-            for field in [
-                "capacity",
-                "capacity_unit",
-                "container_material",
-                "container_type",
-                "container_style",
-                "container_color",
-            ]:
+            for field in CONTAINER_FIELDS:
                 setattr(inv, field, getattr(global_item, field, None))
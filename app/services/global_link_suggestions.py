@@ -1,113 +1,178 @@
+"""Global link suggestions.
+
+Synopsis:
+Suggest curated GlobalItems that an organization's unlinked ingredients can
+be linked to. The org's unlinked ingredients are loaded once into an
+exact-name and trigram index, every candidate global item is scored against
+it in a single pass, and unit compatibility is resolved from a unit-type map
+loaded once per pass.
+
+Glossary:
+- Suggestion: A GlobalItem plus the org items whose names match it.
+- Padded trigram: Three-character window over a name padded with two spaces
+  on each side, used to find fuzzy-match candidates without a full scan.
+"""
+
 import logging
-from typing import List, Optional, Tuple
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from flask import current_app
-from sqlalchemy import func
+from sqlalchemy import func, select
 
 from ..models import GlobalItem, InventoryItem, Unit, db
-from .density_assignment_service import DensityAssignmentService
 
 logger = logging.getLogger(__name__)
 
+# Any pair scoring at least this ratio shares a padded trigram (blocks of at
+# most two characters plus the unmatched gaps around them cap the ratio
+# below 0.8), so the trigram index only prunes pairs that could never pass.
+TRIGRAM_SAFE_THRESHOLD = 0.8
+
+
+def _normalize(name: Optional[str]) -> str:
+    return (name or "").strip().lower()
+
+
+def _trigrams(name: str) -> Set[str]:
+    padded = f"  {name}  "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+# --- Item name index ---
+# Purpose: Exact-name and trigram postings over one org's unlinked item names.
+class _ItemNameIndex:
+    def __init__(self, names: List[Optional[str]]):
+        self.names = [_normalize(name) for name in names]
+        self.by_name: Dict[str, List[int]] = defaultdict(list)
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        for position, name in enumerate(self.names):
+            if not name:
+                continue
+            self.by_name[name].append(position)
+            for gram in _trigrams(name):
+                self.postings[gram].add(position)
+
+    def fuzzy_candidates(self, name: str, threshold: float) -> Iterable[int]:
+        if threshold < TRIGRAM_SAFE_THRESHOLD:
+            return (i for i, candidate in enumerate(self.names) if candidate)
+        found: Set[int] = set()
+        for gram in _trigrams(name):
+            found |= self.postings.get(gram, set())
+        return found
+
+    # --- Score ---
+    # Purpose: Match one global item against the index with the original rules.
+    # Inputs: GlobalItem, threshold.
+    # Outputs: {item position: confidence} (exact 1.0, alias 0.98, else ratio).
+    def score(self, global_item: GlobalItem, threshold: float) -> Dict[int, float]:
+        gname = _normalize(global_item.name)
+        if not gname:
+            return {}
+        scores: Dict[int, float] = {i: 1.0 for i in self.by_name.get(gname, [])}
+        for alias in global_item.aliases or []:
+            if not isinstance(alias, str):
+                continue
+            for position in self.by_name.get(_normalize(alias), []):
+                scores.setdefault(position, 0.98)
+
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(gname)
+        glen = len(gname)
+        for position in self.fuzzy_candidates(gname, threshold):
+            if position in scores:
+                continue
+            name = self.names[position]
+            # Length bound: ratio can never exceed 2*min/(len_a + len_b).
+            if 2.0 * min(len(name), glen) / (len(name) + glen) < threshold:
+                continue
+            matcher.set_seq1(name)
+            if matcher.quick_ratio() < threshold:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= threshold:
+                scores[position] = ratio
+        return {i: conf for i, conf in scores.items() if conf >= threshold}
 
 
 class GlobalLinkSuggestionService:
     """Builds suggestions to link org-owned inventory items to curated GlobalItems."""
 
+    GLOBAL_SCAN_LIMIT = 200
+    ITEM_SCAN_LIMIT = 500
+
+    @staticmethod
+    def unit_type_map() -> Dict[str, str]:
+        """Return {unit name: lowercase unit_type} from one Unit query."""
+        types: Dict[str, str] = {}
+        try:
+            rows = db.session.execute(
+                select(Unit.name, Unit.unit_type).order_by(Unit.id.asc())
+            ).all()
+        except Exception:
+            logger.warning("Suppressed exception fallback at app/services/global_link_suggestions.py:113", exc_info=True)
+            return types
+        for name, unit_type in rows:
+            if name and name not in types:
+                types[name] = (unit_type or "").lower()
+        return types
+
     @staticmethod
     def is_pair_compatible(
-        global_unit_name: Optional[str], item_unit_name: Optional[str]
+        global_unit_name: Optional[str],
+        item_unit_name: Optional[str],
+        unit_types: Optional[Dict[str, str]] = None,
     ) -> bool:
         """Return True if unit classes match or are convertible (weight↔volume). Count↔(weight|volume) is disallowed."""
         if not global_unit_name or not item_unit_name:
             return False
-        try:
-            gunit: Optional[Unit] = (
-                db.session.query(Unit).filter_by(name=global_unit_name).first()
-            )
-            iunit: Optional[Unit] = (
-                db.session.query(Unit).filter_by(name=item_unit_name).first()
-            )
-            if not gunit or not iunit:
-                return False
-            gtype = (gunit.unit_type or "").lower()
-            itype = (iunit.unit_type or "").lower()
-            if gtype == itype:
-                return True
-            # Allow density-based convertibility between weight and volume
-            if {gtype, itype} == {"weight", "volume"}:
-                return True
-            # Otherwise, not compatible (e.g., count vs volume/weight)
-            return False
-        except Exception:
-            logger.warning("Suppressed exception fallback at app/services/global_link_suggestions.py:38", exc_info=True)
+        if unit_types is None:
+            unit_types = GlobalLinkSuggestionService.unit_type_map()
+        gtype = unit_types.get(global_unit_name)
+        itype = unit_types.get(item_unit_name)
+        if gtype is None or itype is None:
             return False
+        if gtype == itype:
+            return True
+        # Allow density-based convertibility between weight and volume
+        if {gtype, itype} == {"weight", "volume"}:
+            return True
+        # Otherwise, not compatible (e.g., count vs volume/weight)
+        return False
 
     @staticmethod
     def _name_match_confidence(item_name: str, global_item: GlobalItem) -> float:
         """Compute confidence based on exact/aka/similarity."""
-        iname = (item_name or "").strip().lower()
-        gname = (global_item.name or "").strip().lower()
-        if not iname or not gname:
-            return 0.0
-        # Exact or case-insensitive match
-        if iname == gname:
-            return 1.0
-        # Alias match
-        try:
-            aka = global_item.aliases or []
-            if any((a or "").strip().lower() == iname for a in aka):
-                return 0.98
-        except Exception:
-            logger.warning("Suppressed exception fallback at app/services/global_link_suggestions.py:56", exc_info=True)
-            pass
-        # Fuzzy
-        try:
-            return DensityAssignmentService._similarity_score(iname, gname)
-        except Exception:
-            logger.warning("Suppressed exception fallback at app/services/global_link_suggestions.py:61", exc_info=True)
-            return 0.0
+        return _ItemNameIndex([item_name]).score(global_item, 0.0).get(0, 0.0)
 
-    @staticmethod
-    def find_candidates_for_global(
-        global_item_id: int, organization_id: int, threshold: float = 0.85
-    ) -> List[InventoryItem]:
-        gi: Optional[GlobalItem] = db.session.get(GlobalItem, int(global_item_id))
-        if not gi or gi.item_type != "ingredient":
-            return []
-
-        # Base query: org-owned, unlinked, not archived, ingredient type
-        query = db.session.query(InventoryItem).filter(
-            InventoryItem.organization_id == organization_id,
-            InventoryItem.global_item_id.is_(None),
-            InventoryItem.is_archived.is_(False),
-            InventoryItem.type == "ingredient",
+    @classmethod
+    def _unlinked_items(cls, organization_id: int) -> List[InventoryItem]:
+        # Org-owned, unlinked, not archived, ingredient type
+        return (
+            db.session.query(InventoryItem)
+            .filter(
+                InventoryItem.organization_id == organization_id,
+                InventoryItem.global_item_id.is_(None),
+                InventoryItem.is_archived.is_(False),
+                InventoryItem.type == "ingredient",
+            )
+            .limit(cls.ITEM_SCAN_LIMIT)
+            .all()
         )
 
-        candidates: List[Tuple[InventoryItem, float]] = []
-        for item in query.limit(500).all():
-            # Require known global unit and pair compatibility
-            if (
-                not gi.default_unit
-                or not GlobalLinkSuggestionService.is_pair_compatible(
-                    gi.default_unit, item.unit
-                )
-            ):
-                continue
-            conf = GlobalLinkSuggestionService._name_match_confidence(item.name, gi)
-            if conf >= threshold:
-                candidates.append((item, conf))
-
-        # Sort by confidence desc, then name len asc for nicer UX
-        candidates.sort(key=lambda t: (-t[1], len(t[0].name or "")))
-        return [c[0] for c in candidates]
-
-    @staticmethod
-    def get_first_suggestion_for_org(
-        organization_id: int, threshold: float = 0.85
-    ) -> Tuple[Optional[GlobalItem], List[InventoryItem]]:
-        """Return the first GlobalItem with at least one candidate for this org (pre-checked list)."""
-        try:
+    # --- Rank suggestions ---
+    # Purpose: Score global items against the org's unlinked items in one pass.
+    # Inputs: Organization id, confidence threshold, optional global items.
+    # Outputs: [(GlobalItem, [(InventoryItem, confidence)])] best matches first.
+    @classmethod
+    def rank_suggestions_for_org(
+        cls,
+        organization_id: int,
+        threshold: float = 0.85,
+        global_items: Optional[List[GlobalItem]] = None,
+    ) -> List[Tuple[GlobalItem, List[Tuple[InventoryItem, float]]]]:
+        if global_items is None:
             global_items = (
                 db.session.query(GlobalItem)
                 .filter(
@@ -115,20 +180,65 @@ class GlobalLinkSuggestionService:
                     GlobalItem.item_type == "ingredient",
                 )
                 .order_by(func.length(GlobalItem.name).asc())
-                .limit(200)
+                .limit(cls.GLOBAL_SCAN_LIMIT)
                 .all()
             )
+        global_items = [
+            gi for gi in global_items if gi.item_type == "ingredient" and gi.default_unit
+        ]
+        if not global_items:
+            return []
+        items = cls._unlinked_items(organization_id)
+        if not items:
+            return []
+
+        index = _ItemNameIndex([item.name for item in items])
+        unit_types = cls.unit_type_map()
+        compatible: Dict[Tuple[str, str], bool] = {}
+        ranked = []
+        for order, gi in enumerate(global_items):
+            matches = []
+            for position, confidence in index.score(gi, threshold).items():
+                item = items[position]
+                pair = (gi.default_unit, item.unit)
+                if pair not in compatible:
+                    compatible[pair] = cls.is_pair_compatible(*pair, unit_types)
+                if compatible[pair]:
+                    matches.append((item, confidence))
+            if not matches:
+                continue
+            # Sort by confidence desc, then name len asc for nicer UX
+            matches.sort(key=lambda t: (-t[1], len(t[0].name or "")))
+            ranked.append((order, gi, matches))
+
+        ranked.sort(key=lambda entry: (-entry[2][0][1], -len(entry[2]), entry[0]))
+        return [(gi, matches) for _, gi, matches in ranked]
+
+    @classmethod
+    def find_candidates_for_global(
+        cls, global_item_id: int, organization_id: int, threshold: float = 0.85
+    ) -> List[InventoryItem]:
+        gi: Optional[GlobalItem] = db.session.get(GlobalItem, int(global_item_id))
+        if not gi or gi.item_type != "ingredient":
+            return []
+        ranked = cls.rank_suggestions_for_org(
+            organization_id, threshold, global_items=[gi]
+        )
+        return [item for item, _ in ranked[0][1]] if ranked else []
+
+    @classmethod
+    def get_first_suggestion_for_org(
+        cls, organization_id: int, threshold: float = 0.85
+    ) -> Tuple[Optional[GlobalItem], List[InventoryItem]]:
+        """Return the best-ranked GlobalItem with at least one candidate for this org (pre-checked list)."""
+        try:
+            ranked = cls.rank_suggestions_for_org(organization_id, threshold)
         except Exception as e:
             current_app.logger.warning(
-                f"GlobalLinkSuggestionService: failed to load global items: {e}"
+                f"GlobalLinkSuggestionService: failed to rank suggestions: {e}"
             )
             return None, []
-
-        for gi in global_items:
-            items = GlobalLinkSuggestionService.find_candidates_for_global(
-                gi.id, organization_id, threshold
-            )
-            if items:
-                return gi, items
-
-        return None, []
+        if not ranked:
+            return None, []
+        global_item, matches = ranked[0]
+        return global_item, [item for item, _ in matches]
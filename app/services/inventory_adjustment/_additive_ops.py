@@ -298,7 +298,7 @@ def _handle_lot_crediting_operation(
     from sqlalchemy import and_
 
     from app.models.inventory_lot import InventoryLot
-    from app.utils.inventory_event_code_generator import generate_inventory_event_code
+    from app.utils.inventory_event_code_generator import generate_inventory_event_codes
 
     logger.info(
         f"LOT_CREDITING: Processing {change_type} credit operation for {quantity} {unit}"
@@ -323,61 +323,64 @@ def _handle_lot_crediting_operation(
             .all()
         )
 
+        # Plan credits up to each lot's free space first so all event codes
+        # come from one block draw
+        credits = []
         remaining_to_credit_base = int(quantity_base)
-        lots_credited = 0
-
-        # Credit back to existing lots first (FIFO order)
         for lot in lots_to_credit:
             if remaining_to_credit_base <= 0:
                 break
-
-            # Calculate how much space is available in this lot
             space_available_base = int(lot.original_quantity_base) - int(
                 lot.remaining_quantity_base
             )
-
             if space_available_base > 0:
-                # Credit back up to the available space
                 credit_amount_base = min(space_available_base, remaining_to_credit_base)
-                lot.remaining_quantity_base = int(lot.remaining_quantity_base) + int(
-                    credit_amount_base
-                )
-                sync_lot_quantities_from_base(lot, item)
-                credit_amount = from_base_quantity(
-                    base_amount=credit_amount_base,
-                    unit_name=lot.unit,
-                    ingredient_id=item.id,
-                    density=item.density,
-                )
-
-                # Create audit record for this credit
-                event_code = generate_inventory_event_code(
-                    change_type, item_id=item.id, code_type="event"
-                )
+                credits.append((lot, credit_amount_base))
+                remaining_to_credit_base -= credit_amount_base
+        event_codes = generate_inventory_event_codes(
+            change_type,
+            len(credits),
+            item_id=item.id,
+            organization_id=item.organization_id,
+            code_type="event",
+        )
+        lots_credited = 0
 
-                history_record = UnifiedInventoryHistory(
-                    inventory_item_id=item.id,
-                    change_type=change_type,
-                    quantity_change=credit_amount,
-                    quantity_change_base=credit_amount_base,
-                    unit=lot.unit,
-                    unit_cost=lot.unit_cost,
-                    notes=f"{change_type.title()}: Credited {credit_amount} back to lot {lot.fifo_code}"
-                    + (f" | {notes}" if notes else ""),
-                    created_by=created_by,
-                    organization_id=item.organization_id,
-                    affected_lot_id=lot.id,  # Link to the specific lot that was credited
-                    batch_id=batch_id,
-                    fifo_code=event_code,
-                )
-                db.session.add(history_record)
+        # Credit back to existing lots first (FIFO order)
+        for (lot, credit_amount_base), event_code in zip(credits, event_codes):
+            lot.remaining_quantity_base = int(lot.remaining_quantity_base) + int(
+                credit_amount_base
+            )
+            sync_lot_quantities_from_base(lot, item)
+            credit_amount = from_base_quantity(
+                base_amount=credit_amount_base,
+                unit_name=lot.unit,
+                ingredient_id=item.id,
+                density=item.density,
+            )
 
-                remaining_to_credit_base -= credit_amount_base
-                lots_credited += 1
+            # Create audit record for this credit
+            history_record = UnifiedInventoryHistory(
+                inventory_item_id=item.id,
+                change_type=change_type,
+                quantity_change=credit_amount,
+                quantity_change_base=credit_amount_base,
+                unit=lot.unit,
+                unit_cost=lot.unit_cost,
+                notes=f"{change_type.title()}: Credited {credit_amount} back to lot {lot.fifo_code}"
+                + (f" | {notes}" if notes else ""),
+                created_by=created_by,
+                organization_id=item.organization_id,
+                affected_lot_id=lot.id,  # Link to the specific lot that was credited
+                batch_id=batch_id,
+                fifo_code=event_code,
+            )
+            db.session.add(history_record)
+            lots_credited += 1
 
-                logger.info(
-                    f"LOT_CREDITING: Credited {credit_amount} back to lot {lot.id} ({lot.fifo_code}), new remaining: {lot.remaining_quantity}"
-                )
+            logger.info(
+                f"LOT_CREDITING: Credited {credit_amount} back to lot {lot.id} ({lot.fifo_code}), new remaining: {lot.remaining_quantity}"
+            )
 
         # If there's still quantity to credit after filling existing lots, create a new lot
         if remaining_to_credit_base > 0:
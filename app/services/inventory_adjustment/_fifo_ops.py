@@ -24,7 +24,10 @@ from app.services.quantity_base import (
     sync_lot_quantities_from_base,
     to_base_quantity,
 )
-from app.utils.inventory_event_code_generator import generate_inventory_event_code
+from app.utils.inventory_event_code_generator import (
+    generate_inventory_event_code,
+    generate_inventory_event_codes,
+)
 from app.utils.timezone_utils import TimezoneUtils
 
 logger = logging.getLogger(__name__)
@@ -414,37 +417,31 @@ def deduct_fifo_inventory(
             bool(getattr(item, "is_tracked", True)) and org_tracks_quantities
         )
 
-        def _resolve_event_code_and_lineage():
-            batch_lineage_id = None
+        def _resolve_event_codes_and_lineage(count):
+            def _generated():
+                return generate_inventory_event_codes(
+                    change_type,
+                    count,
+                    item_id=item_id,
+                    organization_id=item.organization_id,
+                    code_type="event",
+                )
+
             if change_type == "batch" and batch_id:
                 try:
                     from app.models import Batch
 
                     batch = db.session.get(Batch, batch_id)
-                    code = (
-                        batch.label_code
+                    codes = (
+                        [batch.label_code] * count
                         if batch and batch.label_code
-                        else generate_inventory_event_code(
-                            change_type, item_id=item_id, code_type="event"
-                        )
+                        else _generated()
                     )
-                    if batch:
-                        batch_lineage_id = batch.lineage_id
-                    return code, batch_lineage_id
+                    return codes, batch.lineage_id if batch else None
                 except Exception:
-                    logger.warning("Suppressed exception fallback at app/services/inventory_adjustment/_fifo_ops.py:432", exc_info=True)
-                    return (
-                        generate_inventory_event_code(
-                            change_type, item_id=item_id, code_type="event"
-                        ),
-                        None,
-                    )
-            return (
-                generate_inventory_event_code(
-                    change_type, item_id=item_id, code_type="event"
-                ),
-                None,
-            )
+                    logger.warning("Suppressed exception fallback at app/services/inventory_adjustment/_fifo_ops.py:441", exc_info=True)
+                    return _generated(), None
+            return _generated(), None
 
         if not effective_tracking_enabled:
             anchor_ok, anchor_message, anchor_lot = get_or_create_infinite_anchor_lot(
@@ -453,7 +450,7 @@ def deduct_fifo_inventory(
             )
             if not anchor_ok or not anchor_lot:
                 return False, anchor_message or "Infinite anchor lot unavailable"
-            deduction_event_code, batch_lineage_id = _resolve_event_code_and_lineage()
+            (deduction_event_code,), batch_lineage_id = _resolve_event_codes_and_lineage(1)
             history_record = UnifiedInventoryHistory(
                 inventory_item_id=item_id,
                 change_type=change_type,
@@ -515,34 +512,45 @@ def deduct_fifo_inventory(
         total_available_base = sum(
             int(lot.remaining_quantity_base or 0) for lot in active_lots
         )
-        total_available = from_base_quantity(
-            base_amount=total_available_base,
-            unit_name=item.unit,
-            ingredient_id=item.id,
-            density=item.density,
-        )
 
         logger.info(
-            f"FIFO DEDUCT: Need {quantity_needed}, have {total_available} from {len(active_lots)} active lots"
+            f"FIFO DEDUCT: Need {quantity_needed_base}, have {total_available_base} base units from {len(active_lots)} active lots"
         )
 
         if total_available_base < quantity_needed_base:
+            # Display-unit conversion costs a unit lookup; only the error needs it
+            total_available = from_base_quantity(
+                base_amount=total_available_base,
+                unit_name=item.unit,
+                ingredient_id=item.id,
+                density=item.density,
+            )
             return (
                 False,
                 f"Insufficient inventory: need {quantity_needed}, have {total_available}",
             )
 
-        # Execute deduction across lots using FIFO order
+        # Plan the FIFO walk first so all event codes come from one block draw
+        draws = []
         remaining_to_deduct_base = quantity_needed_base
-        lots_affected = 0
-
         for lot in active_lots:
             if remaining_to_deduct_base <= 0:
                 break
-
-            # Calculate how much to deduct from this lot
             lot_remaining_base = int(lot.remaining_quantity_base or 0)
             deduct_from_lot_base = min(lot_remaining_base, remaining_to_deduct_base)
+            draws.append((lot, lot_remaining_base, deduct_from_lot_base))
+            remaining_to_deduct_base -= deduct_from_lot_base
+
+        # Generate event codes for the deduction; prefer batch label when available
+        deduction_event_codes, batch_lineage_id = _resolve_event_codes_and_lineage(
+            len(draws)
+        )
+
+        # Execute deduction across lots using FIFO order
+        lots_affected = 0
+        for (lot, lot_remaining_base, deduct_from_lot_base), deduction_event_code in zip(
+            draws, deduction_event_codes
+        ):
             deduct_from_lot = from_base_quantity(
                 base_amount=deduct_from_lot_base,
                 unit_name=lot.unit,
@@ -554,9 +562,6 @@ def deduct_fifo_inventory(
             lot.remaining_quantity_base = lot_remaining_base - deduct_from_lot_base
             sync_lot_quantities_from_base(lot, item)
 
-            # Generate appropriate event code for this deduction event; prefer batch label when available
-            deduction_event_code, batch_lineage_id = _resolve_event_code_and_lineage()
-
             # Choose unit cost according to valuation method
             event_unit_cost = (
                 float(item.cost_per_unit or 0.0)
@@ -583,8 +588,6 @@ def deduct_fifo_inventory(
                 valuation_method=valuation_method,
             )
             db.session.add(history_record)
-
-            remaining_to_deduct_base -= deduct_from_lot_base
             lots_affected += 1
 
             logger.info(
@@ -18,7 +18,7 @@ from app.services.quantity_base import (
     sync_lot_quantities_from_base,
     to_base_quantity,
 )
-from app.utils.inventory_event_code_generator import generate_inventory_event_code
+from app.utils.inventory_event_code_generator import generate_inventory_event_codes
 
 from ._fifo_ops import (  # Kept for local use within this file and added deduct_fifo_inventory
     INFINITE_ANCHOR_SOURCE_TYPE,
@@ -284,17 +284,29 @@ def handle_recount(
                     f"Cannot recount: need to deduct {abs_delta}, but only {total_available} available",
                 )
 
-            # Drain lots using FIFO order with recount-specific event codes
+            # Plan the FIFO drain first so all RCN codes come from one block draw
+            draws = []
             remaining_to_deduct_base = abs_delta_base
-            lots_affected = 0
-
             for lot in active_lots:
                 if remaining_to_deduct_base <= 0:
                     break
-
-                # Calculate how much to deduct from this lot
                 lot_remaining_base = int(lot.remaining_quantity_base or 0)
                 deduct_from_lot_base = min(lot_remaining_base, remaining_to_deduct_base)
+                draws.append((lot, lot_remaining_base, deduct_from_lot_base))
+                remaining_to_deduct_base -= deduct_from_lot_base
+            event_codes = generate_inventory_event_codes(
+                change_type,
+                len(draws),
+                item_id=item.id,
+                organization_id=item.organization_id,
+                code_type="event",
+            )
+
+            # Drain lots using FIFO order with recount-specific event codes
+            lots_affected = 0
+            for (lot, lot_remaining_base, deduct_from_lot_base), event_code in zip(
+                draws, event_codes
+            ):
                 deduct_from_lot = from_base_quantity(
                     base_amount=deduct_from_lot_base,
                     unit_name=lot.unit,
@@ -308,10 +320,6 @@ def handle_recount(
                 db.session.add(lot)
 
                 # Create RECOUNT-SPECIFIC event history with RCN-xxx code
-                event_code = generate_inventory_event_code(
-                    change_type, item_id=item.id, code_type="event"
-                )
-
                 deduction_history = UnifiedInventoryHistory(
                     inventory_item_id=item.id,
                     change_type=change_type,  # 'recount'
@@ -327,8 +335,6 @@ def handle_recount(
                     fifo_code=event_code,  # RECOUNT's own event code (RCN-xxx)
                 )
                 db.session.add(deduction_history)
-
-                remaining_to_deduct_base -= deduct_from_lot_base
                 lots_affected += 1
 
                 logger.info(
@@ -354,19 +360,30 @@ def handle_recount(
                 < int(lot.original_quantity_base or 0)
             ]
 
+            # Plan refills to capacity first so all RCN codes come from one block draw
+            refills = []
             remaining_to_add_base = int(delta_base)
-            refilled_lots = 0
-
-            # SCENARIO 2: Try to refill existing lots to their capacity (newest first for recount)
             for lot in refillable_lots:
                 if remaining_to_add_base <= 0:
                     break
-
-                # Calculate how much we can add to this lot (up to its original capacity)
                 available_capacity_base = int(lot.original_quantity_base or 0) - int(
                     lot.remaining_quantity_base or 0
                 )
                 refill_amount_base = min(remaining_to_add_base, available_capacity_base)
+                if refill_amount_base > 0:
+                    refills.append((lot, refill_amount_base))
+                    remaining_to_add_base -= refill_amount_base
+            event_codes = generate_inventory_event_codes(
+                change_type,
+                len(refills),
+                item_id=item.id,
+                organization_id=item.organization_id,
+                code_type="event",
+            )
+            refilled_lots = 0
+
+            # SCENARIO 2: Refill existing lots to their capacity (newest first for recount)
+            for (lot, refill_amount_base), event_code in zip(refills, event_codes):
                 refill_amount = from_base_quantity(
                     base_amount=refill_amount_base,
                     unit_name=lot.unit,
@@ -374,41 +391,34 @@ def handle_recount(
                     density=item.density,
                 )
 
-                if refill_amount_base > 0:
-                    # Refill the lot
-                    lot.remaining_quantity_base = int(
-                        lot.remaining_quantity_base or 0
-                    ) + int(refill_amount_base)
-                    sync_lot_quantities_from_base(lot, item)
-                    db.session.add(lot)
-
-                    # Create recount event history for this refill with RCN-xxx code
-                    event_code = generate_inventory_event_code(
-                        change_type, item_id=item.id, code_type="event"
-                    )
-
-                    refill_history = UnifiedInventoryHistory(
-                        inventory_item_id=item.id,
-                        change_type=change_type,  # 'recount'
-                        quantity_change=refill_amount,
-                        quantity_change_base=refill_amount_base,
-                        unit=lot.unit,
-                        unit_cost=lot.unit_cost,
-                        notes=f"RECOUNT: Refilled {refill_amount} to lot {lot.fifo_code}"
-                        + (f" | {notes}" if notes else ""),
-                        created_by=created_by,
-                        organization_id=item.organization_id,
-                        affected_lot_id=lot.id,  # ALWAYS reference the affected lot
-                        fifo_code=event_code,  # RECOUNT's own event code (RCN-xxx)
-                    )
-                    db.session.add(refill_history)
+                # Refill the lot
+                lot.remaining_quantity_base = int(
+                    lot.remaining_quantity_base or 0
+                ) + int(refill_amount_base)
+                sync_lot_quantities_from_base(lot, item)
+                db.session.add(lot)
 
-                    remaining_to_add_base -= refill_amount_base
-                    refilled_lots += 1
+                # Create recount event history for this refill with RCN-xxx code
+                refill_history = UnifiedInventoryHistory(
+                    inventory_item_id=item.id,
+                    change_type=change_type,  # 'recount'
+                    quantity_change=refill_amount,
+                    quantity_change_base=refill_amount_base,
+                    unit=lot.unit,
+                    unit_cost=lot.unit_cost,
+                    notes=f"RECOUNT: Refilled {refill_amount} to lot {lot.fifo_code}"
+                    + (f" | {notes}" if notes else ""),
+                    created_by=created_by,
+                    organization_id=item.organization_id,
+                    affected_lot_id=lot.id,  # ALWAYS reference the affected lot
+                    fifo_code=event_code,  # RECOUNT's own event code (RCN-xxx)
+                )
+                db.session.add(refill_history)
+                refilled_lots += 1
 
-                    logger.info(
-                        f"RECOUNT: Refilled {refill_amount} to lot {lot.id} ({lot.fifo_code})"
-                    )
+                logger.info(
+                    f"RECOUNT: Refilled {refill_amount} to lot {lot.id} ({lot.fifo_code})"
+                )
 
             # SCENARIO 3: Handle overflow if there's still quantity to add
             if remaining_to_add_base > 0:
@@ -0,0 +1,602 @@
+"""In-process periodic job scheduler for maintenance work.
+
+Synopsis:
+Runs maintenance jobs (timer expiry, reservation cleanup, retention sweeps,
+freshness snapshots, domain-event dispatch, billing webhooks) from one
+dedicated process. Only the process holding the leader lock schedules work,
+each job runs on its own jittered interval inside a bounded worker pool, and
+per-job runtime metrics are kept for logging and the CLI summary. Short,
+latency-sensitive jobs (outbox dispatch, webhooks, POS counters) run in their
+own lane so long sweeps cannot hold every worker.
+
+Glossary:
+- Leader lock: Redis key or PostgreSQL advisory lock held by the one scheduler
+  instance allowed to run jobs.
+- Jitter: Random delay added to each interval so replicas and jobs do not
+  fire in lockstep.
+- Overlap skip: A due job that is still running from its previous tick is
+  skipped rather than queued twice.
+- Lane: Worker pool a job runs in; ``latency`` jobs never wait behind
+  ``default`` ones.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from flask import Flask, current_app, has_app_context
+
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+_LEADER_KEY = "batchtrack:scheduler:leader"
+# Stable 32-bit key for pg_try_advisory_lock ("BTSC").
+_ADVISORY_LOCK_KEY = 0x42545343
+
+LANE_DEFAULT = "default"
+LANE_LATENCY = "latency"
+
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+# --- ScheduledJob ---
+# Purpose: Describe one periodic job and its cadence.
+@dataclass(frozen=True)
+class ScheduledJob:
+    name: str
+    func: Callable[[], Any]
+    interval_seconds: float
+    jitter_seconds: float = 0.0
+    description: str = ""
+    lane: str = LANE_DEFAULT
+
+
+# --- JobMetrics ---
+# Purpose: Accumulate runtime metrics for one job.
+@dataclass
+class JobMetrics:
+    runs: int = 0
+    failures: int = 0
+    skipped_overlaps: int = 0
+    last_started_at: Optional[float] = None
+    last_duration_ms: Optional[float] = None
+    max_duration_ms: float = 0.0
+    total_duration_ms: float = 0.0
+    last_result: Any = None
+    last_error: Optional[str] = None
+
+    def record(self, started: float, duration_ms: float, result: Any, error: Optional[str]):
+        self.runs += 1
+        self.last_started_at = started
+        self.last_duration_ms = duration_ms
+        self.max_duration_ms = max(self.max_duration_ms, duration_ms)
+        self.total_duration_ms += duration_ms
+        if error is None:
+            self.last_result = result
+            self.last_error = None
+        else:
+            self.failures += 1
+            self.last_error = error
+
+    def as_dict(self) -> dict:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped_overlaps": self.skipped_overlaps,
+            "last_started_at": self.last_started_at,
+            "last_duration_ms": self.last_duration_ms,
+            "max_duration_ms": round(self.max_duration_ms, 3),
+            "avg_duration_ms": (
+                round(self.total_duration_ms / self.runs, 3) if self.runs else None
+            ),
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+        }
+
+
+# --- LocalLeaderLock ---
+# Purpose: Single-process lock for development, SQLite, and tests.
+class LocalLeaderLock:
+    backend = "local"
+
+    def acquire(self) -> bool:
+        return True
+
+    def renew(self) -> bool:
+        return True
+
+    def release(self) -> None:
+        return None
+
+
+# --- RedisLeaderLock ---
+# Purpose: Leader lease stored as a Redis key with a renewable TTL.
+class RedisLeaderLock:
+    backend = "redis"
+
+    def __init__(self, client, *, key: str = _LEADER_KEY, ttl_seconds: int = 30):
+        self._client = client
+        self._key = key
+        self._ttl_ms = max(1000, int(ttl_seconds * 1000))
+        self._token = uuid.uuid4().hex
+
+    def acquire(self) -> bool:
+        return bool(self._client.set(self._key, self._token, nx=True, px=self._ttl_ms))
+
+    def renew(self) -> bool:
+        return bool(
+            self._client.eval(_RENEW_SCRIPT, 1, self._key, self._token, self._ttl_ms)
+        )
+
+    def release(self) -> None:
+        try:
+            self._client.eval(_RELEASE_SCRIPT, 1, self._key, self._token)
+        except Exception:
+            logger.warning("Suppressed exception fallback at app/services/job_scheduler.py:145", exc_info=True)
+
+
+# --- PostgresAdvisoryLock ---
+# Purpose: Session-level advisory lock held on a dedicated connection.
+class PostgresAdvisoryLock:
+    backend = "postgres"
+
+    def __init__(self, engine, *, key: int = _ADVISORY_LOCK_KEY):
+        self._engine = engine
+        self._key = key
+        self._connection = None
+
+    def acquire(self) -> bool:
+        from sqlalchemy import text
+
+        if self._connection is None:
+            self._connection = self._engine.connect()
+        acquired = self._connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": self._key}
+        ).scalar()
+        self._connection.commit()
+        if not acquired:
+            self._close()
+        return bool(acquired)
+
+    def renew(self) -> bool:
+        # The lock lives as long as the session; a dead connection means lost.
+        from sqlalchemy import text
+
+        if self._connection is None:
+            return False
+        try:
+            self._connection.execute(text("SELECT 1"))
+            self._connection.commit()
+            return True
+        except Exception:
+            logger.warning("Suppressed exception fallback at app/services/job_scheduler.py:182", exc_info=True)
+            self._close()
+            return False
+
+    def release(self) -> None:
+        from sqlalchemy import text
+
+        if self._connection is None:
+            return
+        try:
+            self._connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": self._key}
+            )
+            self._connection.commit()
+        except Exception:
+            logger.warning("Suppressed exception fallback at app/services/job_scheduler.py:197", exc_info=True)
+        self._close()
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                logger.warning("Suppressed exception fallback at app/services/job_scheduler.py:205", exc_info=True)
+            self._connection = None
+
+
+# --- Resolve leader lock ---
+# Purpose: Pick the leader-lock backend from config and available services.
+# Inputs: Flask app with SCHEDULER_LOCK_BACKEND (auto|redis|postgres|local).
+# Outputs: Lock object exposing acquire/renew/release.
+def resolve_leader_lock(app: Flask):
+    backend = str(app.config.get("SCHEDULER_LOCK_BACKEND") or "auto").strip().lower()
+    ttl = int(app.config.get("SCHEDULER_LEADER_TTL_SECONDS") or 30)
+    redis_url = app.config.get("REDIS_URL")
+    if backend == "auto":
+        if redis_url:
+            backend = "redis"
+        elif db.engine.dialect.name == "postgresql":
+            backend = "postgres"
+        else:
+            backend = "local"
+
+    if backend == "redis":
+        if not redis_url:
+            raise RuntimeError("SCHEDULER_LOCK_BACKEND=redis requires REDIS_URL")
+        from app.utils.redis_pool import LazyRedisClient
+
+        return RedisLeaderLock(LazyRedisClient(redis_url, app), ttl_seconds=ttl)
+    if backend == "postgres":
+        return PostgresAdvisoryLock(db.engine)
+    return LocalLeaderLock()
+
+
+# --- JobScheduler ---
+# Purpose: Leader-gated, jittered, bounded-concurrency periodic job runner.
+class JobScheduler:
+    """Run periodic jobs on one leader process with a bounded worker pool."""
+
+    def __init__(
+        self,
+        app: Flask,
+        jobs: Iterable[ScheduledJob],
+        *,
+        lock=None,
+        max_workers: int = 2,
+        latency_workers: int = 2,
+        leader_renew_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.app = app
+        self.jobs = {job.name: job for job in jobs if job.interval_seconds > 0}
+        self.lock = lock or LocalLeaderLock()
+        self.max_workers = max(1, int(max_workers))
+        self.latency_workers = max(1, int(latency_workers))
+        self.leader_renew_seconds = max(1.0, leader_renew_seconds)
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._executors = {
+            LANE_DEFAULT: ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="batchtrack-job"
+            ),
+            LANE_LATENCY: ThreadPoolExecutor(
+                max_workers=self.latency_workers, thread_name_prefix="batchtrack-job-fast"
+            ),
+        }
+        self._metrics = {name: JobMetrics() for name in self.jobs}
+        self._metrics_lock = threading.Lock()
+        self._running: dict[str, Future] = {}
+        self._next_run: dict[str, float] = {}
+        self._is_leader = False
+        self._last_renew = 0.0
+        self._stop = threading.Event()
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader
+
+    # --- Leadership ---
+    # Purpose: Acquire or renew the leader lock; drop leadership on failure.
+    def ensure_leadership(self) -> bool:
+        now = self._clock()
+        try:
+            if not self._is_leader:
+                self._is_leader = bool(self.lock.acquire())
+                if self._is_leader:
+                    self._last_renew = now
+                    self._next_run.clear()
+                    logger.info("Job scheduler acquired leadership (%s)", self.lock.backend)
+            elif now - self._last_renew >= self.leader_renew_seconds:
+                if self.lock.renew():
+                    self._last_renew = now
+                else:
+                    self._is_leader = False
+                    logger.warning("Job scheduler lost leadership (%s)", self.lock.backend)
+        except Exception:
+            logger.warning("Suppressed exception fallback at app/services/job_scheduler.py:292", exc_info=True)
+            self._is_leader = False
+        return self._is_leader
+
+    # --- Tick ---
+    # Purpose: Submit every due job that is not already running.
+    # Inputs: Optional clock reading (defaults to the scheduler clock).
+    # Outputs: Names of jobs submitted this tick.
+    def run_pending(self, now: Optional[float] = None) -> list[str]:
+        if not self.ensure_leadership():
+            return []
+        now = self._clock() if now is None else now
+        submitted = []
+        for name, job in self.jobs.items():
+            due_at = self._next_run.get(name)
+            if due_at is None:
+                # Spread first runs so jobs do not all fire at startup.
+                self._next_run[name] = now + self._jitter(job)
+                due_at = self._next_run[name]
+            if now < due_at:
+                continue
+            self._next_run[name] = now + job.interval_seconds + self._jitter(job)
+            running = self._running.get(name)
+            if running is not None and not running.done():
+                with self._metrics_lock:
+                    self._metrics[name].skipped_overlaps += 1
+                continue
+            self._running[name] = self._submit(job)
+            submitted.append(name)
+        return submitted
+
+    # --- Run once ---
+    # Purpose: Run selected jobs immediately (CLI `--once`), ignoring intervals.
+    def run_once(self, names: Optional[Iterable[str]] = None) -> dict:
+        if not self.ensure_leadership():
+            return {}
+        selected = list(names or self.jobs)
+        futures = [
+            self._submit(self.jobs[name])
+            for name in selected
+            if name in self.jobs
+        ]
+        for future in futures:
+            future.result()
+        return self.metrics_snapshot()
+
+    # --- Run forever ---
+    # Purpose: Loop ticks until stopped, then release the leader lock.
+    def run_forever(self, *, poll_seconds: float = 1.0) -> None:
+        interval = max(0.05, poll_seconds)
+        logger.info(
+            "Job scheduler started (jobs=%s, max_workers=%s, latency_workers=%s, lock=%s)",
+            ",".join(sorted(self.jobs)),
+            self.max_workers,
+            self.latency_workers,
+            self.lock.backend,
+        )
+        try:
+            while not self._stop.is_set():
+                self.run_pending()
+                self._stop.wait(interval)
+        except KeyboardInterrupt:
+            logger.info("Job scheduler interrupted; shutting down cleanly")
+        finally:
+            self.shutdown()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait)
+        if self._is_leader:
+            self.lock.release()
+            self._is_leader = False
+
+    def wait_idle(self, timeout: Optional[float] = None) -> None:
+        for future in list(self._running.values()):
+            future.result(timeout=timeout)
+
+    def metrics_snapshot(self) -> dict:
+        with self._metrics_lock:
+            return {name: metrics.as_dict() for name, metrics in self._metrics.items()}
+
+    def _submit(self, job: ScheduledJob) -> Future:
+        executor = self._executors.get(job.lane) or self._executors[LANE_DEFAULT]
+        return executor.submit(self._execute, job)
+
+    def _jitter(self, job: ScheduledJob) -> float:
+        if job.jitter_seconds <= 0:
+            return 0.0
+        return self._rng.uniform(0.0, job.jitter_seconds)
+
+    def _execute(self, job: ScheduledJob) -> None:
+        started_wall = time.time()
+        started = time.perf_counter()
+        result = None
+        error = None
+        with self.app.app_context():
+            try:
+                result = job.func()
+            except Exception as exc:
+                logger.exception("Scheduled job %s failed", job.name)
+                error = f"{type(exc).__name__}: {exc}"
+                db.session.rollback()
+            finally:
+                db.session.remove()
+        duration_ms = (time.perf_counter() - started) * 1000.0
+        with self._metrics_lock:
+            self._metrics[job.name].record(started_wall, duration_ms, result, error)
+        logger.info(
+            "Scheduled job %s finished in %.1fms (ok=%s result=%s)",
+            job.name,
+            duration_ms,
+            error is None,
+            result,
+        )
+
+
+# --- Maintenance job bodies ---
+# Purpose: Thin wrappers so each job returns a loggable result.
+def _complete_expired_timers():
+    from app.services.timer_service import TimerService
+
+    return TimerService.complete_expired_timers().get("completed_count", 0)
+
+
+def _cleanup_expired_reservations():
+    from app.services.pos_integration import POSIntegrationService
+
+    return POSIntegrationService.cleanup_expired_reservations()
+
+
+def _retention_sweep():
+    from app.services.retention_service import RetentionService
+
+    return RetentionService.nightly_sweep_delete_due()
+
+
+def _freshness_snapshots():
+    from app.services.freshness_snapshot_service import FreshnessSnapshotService
+    from app.utils.timezone_utils import TimezoneUtils
+
+    return FreshnessSnapshotService.compute_for_all(TimezoneUtils.utc_now().date())
+
+
+def _dispatch_domain_events():
+    from app.services.domain_event_dispatcher import DomainEventDispatcher
+
+    dispatcher = DomainEventDispatcher()
+    totals = {"processed": 0, "succeeded": 0, "failed": 0}
+    # Drain a bounded backlog per tick instead of a single batch.
+    for _ in range(10):
+        metrics = dispatcher.dispatch_pending_events()
+        for key in totals:
+            totals[key] += int(metrics.get(key) or 0)
+        if metrics.get("processed", 0) < dispatcher.batch_size:
+            break
+    return totals
+
+
+def _persist_reservation_counters():
+    from app.services.reservation_counter_service import ReservationCounterService
+
+    return ReservationCounterService.persist_pending()
+
+
+def _reconcile_reservation_counters():
+    from app.services.reservation_counter_service import ReservationCounterService
+
+    return ReservationCounterService.reconcile()
+
+
+def _run_global_item_sync_jobs():
+    from app.services.global_item_sync_service import GlobalItemSyncService
+
+    return GlobalItemSyncService.run_pending_jobs()
+
+
+def _refresh_global_item_cost_stats():
+    from app.services.statistics.global_item_stats import GlobalItemStatsService
+
+    # Bounded per tick; the remainder is picked up on the next run.
+    return GlobalItemStatsService.refresh_stale_cost_distributions(limit=200)
+
+
+def _process_billing_webhooks():
+    from app.services.billing_webhook_queue import BillingWebhookQueue
+
+    return BillingWebhookQueue.process_pending()
+
+
+# (job name, config key for interval, callable, description)
+_DEFAULT_JOBS = (
+    (
+        "timers.complete_expired",
+        "SCHEDULER_TIMER_EXPIRY_INTERVAL_SECONDS",
+        _complete_expired_timers,
+        "Complete batch timers past their duration.",
+    ),
+    (
+        "pos.cleanup_expired_reservations",
+        "SCHEDULER_RESERVATION_CLEANUP_INTERVAL_SECONDS",
+        _cleanup_expired_reservations,
+        "Release POS reservations past expires_at.",
+    ),
+    (
+        "retention.sweep_delete_due",
+        "SCHEDULER_RETENTION_SWEEP_INTERVAL_SECONDS",
+        _retention_sweep,
+        "Delete recipes whose retention window elapsed.",
+    ),
+    (
+        "freshness.snapshots",
+        "SCHEDULER_FRESHNESS_SNAPSHOT_INTERVAL_SECONDS",
+        _freshness_snapshots,
+        "Compute today's freshness snapshots for all organizations.",
+    ),
+    (
+        "domain_events.dispatch",
+        "SCHEDULER_DOMAIN_EVENT_INTERVAL_SECONDS",
+        _dispatch_domain_events,
+        "Deliver pending domain events from the outbox.",
+    ),
+    (
+        "pos.persist_reservation_counters",
+        "SCHEDULER_RESERVATION_COUNTER_SYNC_INTERVAL_SECONDS",
+        _persist_reservation_counters,
+        "Write queued fast-path POS reservations to the reservation table.",
+    ),
+    (
+        "pos.reconcile_reservation_counters",
+        "SCHEDULER_RESERVATION_RECONCILE_INTERVAL_SECONDS",
+        _reconcile_reservation_counters,
+        "Correct drift between POS reservation counters and the DB.",
+    ),
+    (
+        "global_items.run_sync_jobs",
+        "SCHEDULER_GLOBAL_ITEM_SYNC_INTERVAL_SECONDS",
+        _run_global_item_sync_jobs,
+        "Apply queued large fan-out global item syncs to linked inventory.",
+    ),
+    (
+        "global_items.refresh_cost_stats",
+        "SCHEDULER_GLOBAL_ITEM_COST_STATS_INTERVAL_SECONDS",
+        _refresh_global_item_cost_stats,
+        "Recompute stale or missing global item cost distributions.",
+    ),
+    (
+        "billing.process_webhooks",
+        "SCHEDULER_BILLING_WEBHOOK_INTERVAL_SECONDS",
+        _process_billing_webhooks,
+        "Apply received billing webhooks in per-customer order.",
+    ),
+)
+
+
+# Short, frequent jobs whose delay users notice; they get their own workers.
+_LATENCY_LANE_JOBS = frozenset(
+    {
+        "domain_events.dispatch",
+        "pos.persist_reservation_counters",
+        "billing.process_webhooks",
+    }
+)
+
+
+# --- Default jobs ---
+# Purpose: Build the maintenance job list from config intervals (0 disables).
+def build_default_jobs(app: Flask) -> list[ScheduledJob]:
+    jitter_ratio = float(app.config.get("SCHEDULER_JITTER_RATIO") or 0.0)
+    jobs = []
+    for name, config_key, func, description in _DEFAULT_JOBS:
+        interval = float(app.config.get(config_key) or 0)
+        if interval <= 0:
+            continue
+        jobs.append(
+            ScheduledJob(
+                name=name,
+                func=func,
+                interval_seconds=interval,
+                jitter_seconds=interval * max(0.0, jitter_ratio),
+                description=description,
+                lane=LANE_LATENCY if name in _LATENCY_LANE_JOBS else LANE_DEFAULT,
+            )
+        )
+    return jobs
+
+
+# --- Request-path guard ---
+# Purpose: Tell request handlers that the scheduler owns periodic maintenance.
+def scheduler_owns_maintenance() -> bool:
+    if not has_app_context():
+        return False
+    return bool(current_app.config.get("SCHEDULER_ENABLED"))
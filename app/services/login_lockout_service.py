@@ -1,19 +1,100 @@
 """Login lockout tracking for repeated failed authentication attempts.
 
 Synopsis:
-Tracks failed login attempts per user identifier and enforces a password-reset
-unlock path after threshold breaches.
+Tracks failed login attempts per account subject (user id or hashed
+identifier) and per client IP in sliding windows. An account that reaches the
+threshold is locked until the password-reset flow clears it; an IP that reaches
+its threshold is throttled until old failures slide out of the window. Each
+check or failure is one atomic Lua round trip on Redis, with an in-process
+backend of identical semantics when Redis is not configured.
+
+Glossary:
+- Subject: Window sorted set (+ lock key) for one account or one IP.
+- Sliding window: Failures newer than ``AUTH_LOGIN_LOCKOUT_WINDOW_SECONDS``.
+- Account lock: Password-reset lock set when an account subject hits threshold.
+- IP throttle: Temporary refusal while an IP's window count is at threshold.
 """
 
 from __future__ import annotations
 
 import hashlib
+import logging
+import threading
 import time
+import uuid
+from collections import deque
 from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
 
 from flask import current_app
 
-from app.utils.cache_manager import app_cache
+logger = logging.getLogger(__name__)
+
+_EXTENSION_KEY = "login_lockout_backend"
+_FALLBACK_EXTENSION_KEY = "login_lockout_memory_fallback"
+_ACCOUNT_LOCK_TTL_SECONDS = 60 * 60 * 24 * 30
+_MEMORY_PRUNE_THRESHOLD = 10_000
+
+STATUS_OK = 0
+STATUS_THROTTLED = 1
+STATUS_LOCKED = 2
+
+# KEYS: (window zset, lock key) per subject.
+# ARGV: now ms, window ms, attempt member, then (threshold, lock ttl s) per subject.
+# Returns (status, window count) per subject.
+_RECORD_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local result = {}
+for i = 1, #KEYS, 2 do
+    local n = (i + 1) / 2
+    local threshold = tonumber(ARGV[2 + 2 * n])
+    local lock_ttl = tonumber(ARGV[3 + 2 * n])
+    local status, count = 0, 0
+    if lock_ttl > 0 and redis.call('exists', KEYS[i + 1]) == 1 then
+        status = 2
+    else
+        redis.call('zremrangebyscore', KEYS[i], '-inf', now - window)
+        redis.call('zadd', KEYS[i], now, ARGV[3])
+        redis.call('pexpire', KEYS[i], window)
+        count = redis.call('zcard', KEYS[i])
+        if count >= threshold then
+            if lock_ttl > 0 then
+                redis.call('set', KEYS[i + 1], count, 'EX', lock_ttl)
+                redis.call('del', KEYS[i])
+                status = 2
+            else
+                status = 1
+            end
+        end
+    end
+    result[#result + 1] = status
+    result[#result + 1] = count
+end
+return result
+"""
+
+# Same KEYS/ARGV layout as the record script; reads without adding an attempt.
+_CHECK_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local result = {}
+for i = 1, #KEYS, 2 do
+    local n = (i + 1) / 2
+    local threshold = tonumber(ARGV[2 + 2 * n])
+    local lock_ttl = tonumber(ARGV[3 + 2 * n])
+    local status = 0
+    local count = redis.call('zcount', KEYS[i], '(' .. string.format('%d', now - window), '+inf')
+    if lock_ttl > 0 then
+        if redis.call('exists', KEYS[i + 1]) == 1 then status = 2 end
+    elseif count >= threshold then
+        status = 1
+    end
+    result[#result + 1] = status
+    result[#result + 1] = count
+end
+return result
+"""
 
 
 @dataclass
@@ -24,10 +105,129 @@ class LoginLockoutState:
     requires_password_reset: bool = False
 
 
+@dataclass(frozen=True)
+class _Subject:
+    window_key: str
+    lock_key: str
+    threshold: int
+    lock_ttl: int  # 0 = throttle only (IP subjects)
+
+
+# --- RedisLockoutBackend ---
+# Purpose: Evaluate every subject of an attempt in one Lua round trip.
+class RedisLockoutBackend:
+    """Lockout windows stored as Redis sorted sets of attempt timestamps."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def _eval(self, script: str, subjects: Sequence[_Subject], now_ms: int, window_ms: int, member: str):
+        keys: List[str] = []
+        args: List[Any] = [now_ms, window_ms, member]
+        for subject in subjects:
+            keys.extend((subject.window_key, subject.lock_key))
+            args.extend((subject.threshold, subject.lock_ttl))
+        flat = self._client.eval(script, len(keys), *keys, *args)
+        return [(int(flat[i]), int(flat[i + 1])) for i in range(0, len(flat), 2)]
+
+    def record(self, subjects, now_ms: int, window_ms: int, member: str) -> List[Tuple[int, int]]:
+        return self._eval(_RECORD_SCRIPT, subjects, now_ms, window_ms, member)
+
+    def check(self, subjects, now_ms: int, window_ms: int) -> List[Tuple[int, int]]:
+        return self._eval(_CHECK_SCRIPT, subjects, now_ms, window_ms, "")
+
+    def clear(self, keys: Sequence[str]) -> None:
+        if keys:
+            self._client.delete(*keys)
+
+
+# --- InMemoryLockoutBackend ---
+# Purpose: Process-local windows with the same semantics as the Lua scripts.
+class InMemoryLockoutBackend:
+    """Single-process lockout store for tests, local development, and fallback."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._windows: Dict[str, deque] = {}
+        self._locks: Dict[str, float] = {}
+
+    def _locked(self, key: str, now_ms: int) -> bool:
+        expires_at = self._locks.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= now_ms:
+            self._locks.pop(key, None)
+            return False
+        return True
+
+    def _trim(self, key: str, now_ms: int, window_ms: int) -> deque:
+        window = self._windows.get(key)
+        if window is None:
+            return deque()
+        while window and window[0] <= now_ms - window_ms:
+            window.popleft()
+        if not window:
+            self._windows.pop(key, None)
+        return window
+
+    def _prune(self, now_ms: int, window_ms: int) -> None:
+        # Redis expires idle windows; here stale ones are dropped once the map is large.
+        if len(self._windows) < _MEMORY_PRUNE_THRESHOLD:
+            return
+        cutoff = now_ms - window_ms
+        for key in [key for key, window in self._windows.items() if window[-1] <= cutoff]:
+            del self._windows[key]
+
+    def record(self, subjects, now_ms: int, window_ms: int, member: str) -> List[Tuple[int, int]]:
+        results = []
+        with self._lock:
+            self._prune(now_ms, window_ms)
+            for subject in subjects:
+                if subject.lock_ttl > 0 and self._locked(subject.lock_key, now_ms):
+                    results.append((STATUS_LOCKED, 0))
+                    continue
+                window = self._trim(subject.window_key, now_ms, window_ms)
+                window.append(now_ms)
+                self._windows[subject.window_key] = window
+                count = len(window)
+                status = STATUS_OK
+                if count >= subject.threshold:
+                    if subject.lock_ttl > 0:
+                        self._locks[subject.lock_key] = now_ms + subject.lock_ttl * 1000
+                        self._windows.pop(subject.window_key, None)
+                        status = STATUS_LOCKED
+                    else:
+                        status = STATUS_THROTTLED
+                results.append((status, count))
+        return results
+
+    def check(self, subjects, now_ms: int, window_ms: int) -> List[Tuple[int, int]]:
+        results = []
+        with self._lock:
+            for subject in subjects:
+                count = len(self._trim(subject.window_key, now_ms, window_ms))
+                if subject.lock_ttl > 0:
+                    locked = self._locked(subject.lock_key, now_ms)
+                    status = STATUS_LOCKED if locked else STATUS_OK
+                else:
+                    status = STATUS_THROTTLED if count >= subject.threshold else STATUS_OK
+                results.append((status, count))
+        return results
+
+    def clear(self, keys: Sequence[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._windows.pop(key, None)
+                self._locks.pop(key, None)
+
+
 class LoginLockoutService:
-    """Manage failed-login counters and password-reset lockouts."""
+    """Manage failed-login windows, IP throttles, and password-reset lockouts."""
 
-    _KEY_PREFIX = "login_lockout:v1"
+    _KEY_PREFIX = "login_lockout:v2"
+    # v1 stored one app_cache dict per account; its password-reset locks live
+    # for up to 30 days, so they are honoured (and cleared) until 2026-11-18.
+    _LEGACY_KEY_PREFIX = "login_lockout:v1"
 
     @staticmethod
     def _enabled() -> bool:
@@ -41,6 +241,14 @@ class LoginLockoutService:
         except (TypeError, ValueError):
             return 10
 
+    @staticmethod
+    def _ip_threshold() -> int:
+        raw = current_app.config.get("AUTH_LOGIN_IP_LOCKOUT_THRESHOLD", 50)
+        try:
+            return max(0, int(raw))
+        except (TypeError, ValueError):
+            return 50
+
     @staticmethod
     def _window_seconds() -> int:
         raw = current_app.config.get("AUTH_LOGIN_LOCKOUT_WINDOW_SECONDS", 900)
@@ -49,95 +257,151 @@ class LoginLockoutService:
         except (TypeError, ValueError):
             return 900
 
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.time() * 1000)
+
+    # --- Backend ---
+    # Purpose: Resolve the lockout store for the current app.
+    # Inputs: REDIS_URL (Redis when set, in-process otherwise).
+    # Outputs: Backend instance cached on the app.
+    @classmethod
+    def backend(cls):
+        app = current_app._get_current_object()
+        cached = app.extensions.get(_EXTENSION_KEY)
+        if cached is not None:
+            return cached
+        redis_url = app.config.get("REDIS_URL")
+        if redis_url:
+            from app.utils.redis_pool import LazyRedisClient
+
+            backend = RedisLockoutBackend(LazyRedisClient(redis_url, app))
+        else:
+            backend = InMemoryLockoutBackend()
+        app.extensions[_EXTENSION_KEY] = backend
+        return backend
+
+    @classmethod
+    def _fallback_backend(cls) -> InMemoryLockoutBackend:
+        return current_app.extensions.setdefault(
+            _FALLBACK_EXTENSION_KEY, InMemoryLockoutBackend()
+        )
+
+    @classmethod
+    def _run(cls, op: str, *args):
+        backend = cls.backend()
+        try:
+            return getattr(backend, op)(*args)
+        except Exception:
+            if isinstance(backend, InMemoryLockoutBackend):
+                raise
+            logger.warning("Suppressed exception fallback at app/services/login_lockout_service.py:295", exc_info=True)
+            return getattr(cls._fallback_backend(), op)(*args)
+
     @classmethod
     def _subject_key(
-        cls, *, user_id: int | None = None, identifier: str | None = None
+        cls,
+        *,
+        user_id: int | None = None,
+        identifier: str | None = None,
+        prefix: str | None = None,
     ) -> str | None:
+        prefix = prefix or cls._KEY_PREFIX
         if user_id is not None:
-            return f"{cls._KEY_PREFIX}:user:{int(user_id)}"
+            return f"{prefix}:user:{int(user_id)}"
         normalized_identifier = (identifier or "").strip().lower()
         if not normalized_identifier:
             return None
         digest = hashlib.sha256(normalized_identifier.encode("utf-8")).hexdigest()
-        return f"{cls._KEY_PREFIX}:identifier:{digest}"
-
-    @staticmethod
-    def _now_ts() -> int:
-        return int(time.time())
+        return f"{prefix}:identifier:{digest}"
 
+    # --- Legacy lock ---
+    # Purpose: Honour password-reset locks written under the v1 key layout.
+    # Inputs: Account user id or identifier.
+    # Outputs: True when a v1 state still requires a password reset.
     @classmethod
-    def _state_for_key(cls, key: str) -> dict:
+    def _legacy_locked(cls, *, user_id: int | None, identifier: str | None) -> bool:
+        key = cls._subject_key(
+            user_id=user_id, identifier=identifier, prefix=cls._LEGACY_KEY_PREFIX
+        )
+        if not key:
+            return False
+        from app.utils.cache_manager import app_cache
+
         state = app_cache.get(key)
-        if not isinstance(state, dict):
-            return {
-                "count": 0,
-                "window_started_at": cls._now_ts(),
-                "requires_password_reset": False,
-            }
-        return {
-            "count": int(state.get("count") or 0),
-            "window_started_at": int(state.get("window_started_at") or cls._now_ts()),
-            "requires_password_reset": bool(state.get("requires_password_reset")),
-        }
+        return isinstance(state, dict) and bool(state.get("requires_password_reset"))
 
     @classmethod
-    def _save_state(cls, key: str, state: dict) -> None:
-        ttl = max(cls._window_seconds(), 60)
-        if state.get("requires_password_reset"):
-            # Persistent lock state until password reset flow clears it.
-            ttl = max(ttl, 60 * 60 * 24 * 30)
-        app_cache.set(key, state, ttl=ttl)
+    def _subjects(
+        cls, *, user_id: int | None, identifier: str | None, ip: str | None
+    ) -> List[_Subject]:
+        subjects: List[_Subject] = []
+        account_key = cls._subject_key(user_id=user_id, identifier=identifier)
+        if account_key:
+            subjects.append(
+                _Subject(
+                    f"{account_key}:window",
+                    f"{account_key}:lock",
+                    cls._threshold(),
+                    max(_ACCOUNT_LOCK_TTL_SECONDS, cls._window_seconds()),
+                )
+            )
+        normalized_ip = (ip or "").strip()
+        ip_threshold = cls._ip_threshold()
+        if normalized_ip and ip_threshold:
+            ip_key = f"{cls._KEY_PREFIX}:ip:{normalized_ip}"
+            subjects.append(
+                _Subject(f"{ip_key}:window", f"{ip_key}:lock", ip_threshold, 0)
+            )
+        return subjects
+
+    @staticmethod
+    def _state(results: Sequence[Tuple[int, int]]) -> LoginLockoutState:
+        statuses = {status for status, _count in results}
+        if STATUS_LOCKED in statuses:
+            return LoginLockoutState(locked=True, requires_password_reset=True)
+        if STATUS_THROTTLED in statuses:
+            return LoginLockoutState(locked=True, requires_password_reset=False)
+        return LoginLockoutState(locked=False)
 
     @classmethod
     def is_locked(
-        cls, *, user_id: int | None = None, identifier: str | None = None
+        cls,
+        *,
+        user_id: int | None = None,
+        identifier: str | None = None,
+        ip: str | None = None,
     ) -> LoginLockoutState:
         if not cls._enabled():
             return LoginLockoutState(locked=False)
-        key = cls._subject_key(user_id=user_id, identifier=identifier)
-        if not key:
+        if cls._legacy_locked(user_id=user_id, identifier=identifier):
+            return LoginLockoutState(locked=True, requires_password_reset=True)
+        subjects = cls._subjects(user_id=user_id, identifier=identifier, ip=ip)
+        if not subjects:
             return LoginLockoutState(locked=False)
-        state = cls._state_for_key(key)
-        locked = bool(state.get("requires_password_reset"))
-        return LoginLockoutState(
-            locked=locked,
-            requires_password_reset=locked,
-        )
+        window_ms = cls._window_seconds() * 1000
+        return cls._state(cls._run("check", subjects, cls._now_ms(), window_ms))
 
     @classmethod
     def record_failure(
-        cls, *, user_id: int | None = None, identifier: str | None = None
+        cls,
+        *,
+        user_id: int | None = None,
+        identifier: str | None = None,
+        ip: str | None = None,
     ) -> LoginLockoutState:
         if not cls._enabled():
             return LoginLockoutState(locked=False)
-        key = cls._subject_key(user_id=user_id, identifier=identifier)
-        if not key:
-            return LoginLockoutState(locked=False)
-
-        now = cls._now_ts()
-        threshold = cls._threshold()
-        window_seconds = cls._window_seconds()
-        state = cls._state_for_key(key)
-        if bool(state.get("requires_password_reset")):
+        if cls._legacy_locked(user_id=user_id, identifier=identifier):
             return LoginLockoutState(locked=True, requires_password_reset=True)
-
-        window_started_at = int(state.get("window_started_at") or now)
-        count = int(state.get("count") or 0)
-        if now - window_started_at >= window_seconds:
-            count = 0
-            window_started_at = now
-
-        count += 1
-        locked = count >= threshold
-        state.update(
-            {
-                "count": count,
-                "window_started_at": window_started_at,
-                "requires_password_reset": locked,
-            }
-        )
-        cls._save_state(key, state)
-        return LoginLockoutState(locked=locked, requires_password_reset=locked)
+        subjects = cls._subjects(user_id=user_id, identifier=identifier, ip=ip)
+        if not subjects:
+            return LoginLockoutState(locked=False)
+        now_ms = cls._now_ms()
+        # Unique member so concurrent failures in the same millisecond all count.
+        member = f"{now_ms}:{uuid.uuid4().hex}"
+        window_ms = cls._window_seconds() * 1000
+        return cls._state(cls._run("record", subjects, now_ms, window_ms, member))
 
     @classmethod
     def clear_failures(
@@ -149,12 +413,23 @@ class LoginLockoutService:
         if not cls._enabled():
             return
         keys: set[str] = set()
-        primary = cls._subject_key(user_id=user_id, identifier=None)
-        if primary:
-            keys.add(primary)
-        for identifier in identifiers or ():
-            alias_key = cls._subject_key(user_id=None, identifier=identifier)
-            if alias_key:
-                keys.add(alias_key)
-        for key in keys:
-            app_cache.delete(key)
+        legacy_keys: set[str] = set()
+        for prefix, bucket in ((cls._KEY_PREFIX, keys), (cls._LEGACY_KEY_PREFIX, legacy_keys)):
+            primary = cls._subject_key(user_id=user_id, identifier=None, prefix=prefix)
+            if primary:
+                bucket.add(primary)
+            for identifier in identifiers or ():
+                alias_key = cls._subject_key(user_id=None, identifier=identifier, prefix=prefix)
+                if alias_key:
+                    bucket.add(alias_key)
+        if legacy_keys:
+            from app.utils.cache_manager import app_cache
+
+            for key in legacy_keys:
+                app_cache.delete(key)
+        # IP windows are left alone: one success must not reset a stuffing run.
+        expanded = sorted(f"{key}:{part}" for key in keys for part in ("window", "lock"))
+        cls._run("clear", expanded)
+        fallback = current_app.extensions.get(_FALLBACK_EXTENSION_KEY)
+        if fallback is not None:
+            fallback.clear(expanded)
@@ -6,11 +6,16 @@ Classifies suspicious unknown paths and applies bot-trap blocking for scanner pr
 Glossary:
 - Unknown endpoint: Request path that does not resolve to a Flask endpoint.
 - Scanner probe: High-signal path patterns used by opportunistic exploit bots.
+- Probe rule pattern: Prefix, token, and suffix tuples compiled into one regex.
+- Probe decision cache: Bounded LRU of (suspicious, high-confidence) per path.
 """
 
 from __future__ import annotations
 
 import logging
+import re
+from functools import lru_cache
+from typing import Iterable
 
 from werkzeug.exceptions import MethodNotAllowed, NotFound
 from werkzeug.routing import RequestRedirect
@@ -19,6 +24,30 @@ from .public_bot_trap_service import PublicBotTrapService
 
 logger = logging.getLogger(__name__)
 
+PROBE_DECISION_CACHE_SIZE = 4096
+# Longer paths are classified uncached so each cache entry stays small.
+PROBE_DECISION_MAX_CACHED_PATH_LENGTH = 256
+
+
+def _compile_probe_rules(
+    prefixes: Iterable[str], tokens: Iterable[str], suffixes: Iterable[str]
+) -> re.Pattern[str]:
+    """Compile one rule set into a single alternation searched in one pass.
+
+    Suffixes never contain ``/``, so matching them at the end of the path is the
+    same as matching the end of its last segment.
+    """
+
+    def _alternation(values: Iterable[str]) -> str:
+        ordered = sorted(set(values), key=lambda value: (-len(value), value))
+        return "|".join(re.escape(value) for value in ordered)
+
+    return re.compile(
+        rf"\A(?:{_alternation(prefixes)})"
+        rf"|(?:{_alternation(tokens)})"
+        rf"|(?:{_alternation(suffixes)})\Z"
+    )
+
 
 class MiddlewareProbeService:
     """Centralized policy for unknown endpoint handling in middleware."""
@@ -108,6 +137,17 @@ class MiddlewareProbeService:
         ".pl",
     )
 
+    _SUSPICIOUS_PATTERN = _compile_probe_rules(
+        SUSPICIOUS_UNKNOWN_PATH_PREFIXES,
+        SUSPICIOUS_UNKNOWN_PATH_TOKENS,
+        SUSPICIOUS_UNKNOWN_PATH_SUFFIXES,
+    )
+    _HIGH_CONFIDENCE_PATTERN = _compile_probe_rules(
+        HIGH_CONFIDENCE_PATH_PREFIXES,
+        HIGH_CONFIDENCE_PATH_TOKENS,
+        HIGH_CONFIDENCE_PATH_SUFFIXES,
+    )
+
     @classmethod
     def derive_unknown_endpoint_status(cls, request) -> int | None:
         """Return status code for an unmatched route, preserving canonical redirects."""
@@ -127,48 +167,24 @@ class MiddlewareProbeService:
         return 404
 
     @classmethod
-    def is_suspicious_unknown_path(cls, path: str) -> bool:
-        """Classify high-signal scanner probe paths."""
+    def classify_path(cls, path: str) -> tuple[bool, bool]:
+        """Return ``(suspicious, high_confidence)`` for a request path."""
         normalized_path = (path or "").strip().lower()
         if not normalized_path or normalized_path == "/":
-            return False
-        if any(
-            normalized_path.startswith(prefix)
-            for prefix in cls.SUSPICIOUS_UNKNOWN_PATH_PREFIXES
-        ):
-            return True
-        if any(
-            token in normalized_path for token in cls.SUSPICIOUS_UNKNOWN_PATH_TOKENS
-        ):
-            return True
-        last_segment = normalized_path.rsplit("/", 1)[-1]
-        if any(
-            last_segment.endswith(suffix)
-            for suffix in cls.SUSPICIOUS_UNKNOWN_PATH_SUFFIXES
-        ):
-            return True
-        return False
+            return (False, False)
+        if len(normalized_path) > PROBE_DECISION_MAX_CACHED_PATH_LENGTH:
+            return _classify_normalized_path.__wrapped__(normalized_path)
+        return _classify_normalized_path(normalized_path)
+
+    @classmethod
+    def is_suspicious_unknown_path(cls, path: str) -> bool:
+        """Classify high-signal scanner probe paths."""
+        return cls.classify_path(path)[0]
 
     @classmethod
     def is_high_confidence_probe_path(cls, path: str) -> bool:
         """Classify aggressive exploit probe paths for immediate short-circuit blocking."""
-        normalized_path = (path or "").strip().lower()
-        if not normalized_path or normalized_path == "/":
-            return False
-        if any(
-            normalized_path.startswith(prefix)
-            for prefix in cls.HIGH_CONFIDENCE_PATH_PREFIXES
-        ):
-            return True
-        if any(token in normalized_path for token in cls.HIGH_CONFIDENCE_PATH_TOKENS):
-            return True
-        last_segment = normalized_path.rsplit("/", 1)[-1]
-        if any(
-            last_segment.endswith(suffix)
-            for suffix in cls.HIGH_CONFIDENCE_PATH_SUFFIXES
-        ):
-            return True
-        return False
+        return cls.classify_path(path)[1]
 
     @classmethod
     def maybe_block_suspicious_unknown_probe(
@@ -212,3 +228,12 @@ class MiddlewareProbeService:
             logger.warning(
                 "Unable to auto-block suspicious unknown path %s: %s", path, exc
             )
+
+
+@lru_cache(maxsize=PROBE_DECISION_CACHE_SIZE)
+def _classify_normalized_path(normalized_path: str) -> tuple[bool, bool]:
+    return (
+        MiddlewareProbeService._SUSPICIOUS_PATTERN.search(normalized_path) is not None,
+        MiddlewareProbeService._HIGH_CONFIDENCE_PATTERN.search(normalized_path)
+        is not None,
+    )
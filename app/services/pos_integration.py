@@ -6,6 +6,7 @@ from flask_login import current_user
 from sqlalchemy import and_, func
 
 from app.services.inventory_adjustment import process_inventory_adjustment
+from app.services.reservation_counter_service import ReservationCounterService
 from app.services.reservation_service import ReservationService
 
 from ..models import InventoryItem, Reservation, db
@@ -51,6 +52,61 @@ class POSIntegrationService:
         Returns:
             (success, message)
         """
+        authenticated = getattr(current_user, "is_authenticated", False)
+        created_by = current_user.id if authenticated else None
+        organization_id = current_user.organization_id if authenticated else None
+
+        # Fast path: admit against atomic SKU counters; the row is persisted
+        # asynchronously by ReservationCounterService.persist_pending.
+        counted = ReservationCounterService.reserve(
+            item_id,
+            quantity,
+            order_id,
+            source=source,
+            notes=notes,
+            sale_price=sale_price,
+            expires_in_hours=expires_in_hours,
+            created_by=created_by,
+            organization_id=organization_id,
+        )
+        if counted is not None:
+            return counted
+
+        expires_at = None
+        if expires_in_hours:
+            expires_at = datetime.now(timezone.utc) + timedelta(hours=expires_in_hours)
+        return POSIntegrationService._reserve_inventory_db(
+            item_id=item_id,
+            quantity=quantity,
+            order_id=order_id,
+            source=source,
+            notes=notes,
+            sale_price=sale_price,
+            expires_at=expires_at,
+            created_by=created_by,
+            organization_id=organization_id,
+        )
+
+    @staticmethod
+    def _reserve_inventory_db(
+        item_id: int,
+        quantity: float,
+        order_id: str,
+        source: str = "shopify",
+        notes: str = None,
+        sale_price: float = None,
+        expires_at: datetime = None,
+        created_by: int = None,
+        organization_id: int = None,
+        check_available: bool = True,
+        reservation_id: str = None,
+    ) -> tuple[bool, str]:
+        """Write the reservation row and inventory moves (canonical DB path).
+
+        ``check_available`` is disabled when persisting a reservation the
+        counter fast path already admitted; ``reservation_id`` carries that
+        operation's id so a replay can detect it.
+        """
         try:
             # Get the original inventory item
             original_item = db.session.get(InventoryItem, item_id)
@@ -59,7 +115,7 @@ class POSIntegrationService:
 
             # Check if we have enough available inventory (ignoring expired lots)
             available = original_item.available_quantity  # This should exclude expired
-            if available < quantity:
+            if check_available and available < quantity:
                 return (
                     False,
                     f"Insufficient inventory. Available: {available}, Requested: {quantity}",
@@ -96,7 +152,7 @@ class POSIntegrationService:
                 change_type="reserved",
                 notes=f"Reserved for order {order_id} ({source}). {notes or ''}",
                 order_id=order_id,
-                created_by=current_user.id if current_user.is_authenticated else None,
+                created_by=created_by,
             )
 
             if not deduction_success:
@@ -121,14 +177,9 @@ class POSIntegrationService:
             source_batch_id = recent_entry.batch_id if recent_entry else None
 
             # 2. CREATE reservation line item (this is now the source of truth)
-            expires_at = None
-            if expires_in_hours:
-                expires_at = datetime.now(timezone.utc) + timedelta(
-                    hours=expires_in_hours
-                )
-
             reservation = Reservation(
                 order_id=order_id,
+                reservation_id=reservation_id,
                 product_item_id=item_id,
                 reserved_item_id=reserved_item.id,
                 quantity=quantity,
@@ -140,12 +191,8 @@ class POSIntegrationService:
                 source=source,
                 expires_at=expires_at,
                 notes=notes,
-                created_by=current_user.id if current_user.is_authenticated else None,
-                organization_id=(
-                    current_user.organization_id
-                    if current_user.is_authenticated
-                    else original_item.organization_id
-                ),
+                created_by=created_by,
+                organization_id=organization_id or original_item.organization_id,
             )
             _db_session().add(reservation)
 
@@ -159,7 +206,7 @@ class POSIntegrationService:
                 change_type="reserved_allocation",
                 unit=original_item.unit,
                 notes=f"Reserved for order {order_id}. {notes or ''}",
-                created_by=current_user.id if current_user.is_authenticated else None,
+                created_by=created_by,
                 cost_override=original_item.cost_per_unit,
             )
 
@@ -170,7 +217,7 @@ class POSIntegrationService:
             return True, f"Reserved {quantity} units for order {order_id}"
 
         except Exception as e:
-            logger.warning("Suppressed exception fallback at app/services/pos_integration.py:172", exc_info=True)
+            logger.warning("Suppressed exception fallback at app/services/pos_integration.py:216", exc_info=True)
             from flask import has_app_context
 
             if has_app_context():
@@ -182,6 +229,14 @@ class POSIntegrationService:
         """
         Release reservation - returns inventory to available stock via FIFO credit
         """
+        counted = ReservationCounterService.finish(order_id, "release")
+        if counted is not None:
+            return counted
+        return POSIntegrationService._release_reservation_db(order_id)
+
+    @staticmethod
+    def _release_reservation_db(order_id: str):
+        """Credit reserved rows back to their FIFO lots (canonical DB path)."""
         try:
             print(f"DEBUG POS: Starting release_reservation for order_id: {order_id}")
             print("DEBUG POS: Delegating to ReservationService.release_reservation")
@@ -197,7 +252,7 @@ class POSIntegrationService:
             return success, message
 
         except Exception as e:
-            logger.warning("Suppressed exception fallback at app/services/pos_integration.py:198", exc_info=True)
+            logger.warning("Suppressed exception fallback at app/services/pos_integration.py:251", exc_info=True)
             print(f"DEBUG POS: Exception in release_reservation: {str(e)}")
             import traceback
 
@@ -210,6 +265,14 @@ class POSIntegrationService:
         """
         Convert reservation to actual sale (Shopify fulfillment webhook)
         """
+        counted = ReservationCounterService.finish(order_id, "confirm", notes)
+        if counted is not None:
+            return counted
+        return POSIntegrationService._confirm_sale_db(order_id, notes)
+
+    @staticmethod
+    def _confirm_sale_db(order_id: str, notes: str = None) -> Tuple[bool, str]:
+        """Mark reservations sold and record the sale (canonical DB path)."""
         try:
             # Find active reservations for this order
             active_reservations = Reservation.query.filter(
@@ -264,7 +327,7 @@ class POSIntegrationService:
             return True, f"Confirmed sale of {total_sold} units for order {order_id}"
 
         except Exception as e:
-            logger.warning("Suppressed exception fallback at app/services/pos_integration.py:264", exc_info=True)
+            logger.warning("Suppressed exception fallback at app/services/pos_integration.py:326", exc_info=True)
             from flask import has_app_context
 
             if has_app_context():
@@ -332,7 +395,7 @@ class POSIntegrationService:
             )
 
         except Exception as e:
-            logger.warning("Suppressed exception fallback at app/services/pos_integration.py:331", exc_info=True)
+            logger.warning("Suppressed exception fallback at app/services/pos_integration.py:394", exc_info=True)
             from flask import has_app_context
 
             if has_app_context():
@@ -357,8 +420,12 @@ class POSIntegrationService:
 
             count = 0
             for reservation in expired_reservations:
-                # Release the expired reservation
-                success, _ = POSIntegrationService.release_reservation(
+                # Release the expired reservation; counters are adjusted in
+                # place because the row is released synchronously here.
+                ReservationCounterService.finish(
+                    reservation.order_id, "release", enqueue=False
+                )
+                success, _ = POSIntegrationService._release_reservation_db(
                     reservation.order_id
                 )
                 if success:
@@ -369,7 +436,7 @@ class POSIntegrationService:
             return count
 
         except Exception:
-            logger.warning("Suppressed exception fallback at app/services/pos_integration.py:367", exc_info=True)
+            logger.warning("Suppressed exception fallback at app/services/pos_integration.py:435", exc_info=True)
             from flask import has_app_context
 
             if has_app_context():
@@ -381,6 +448,9 @@ class POSIntegrationService:
         """
         Get available quantity for POS systems (excludes expired lots only)
         """
+        counted = ReservationCounterService.available(item_id)
+        if counted is not None:
+            return counted
         item = db.session.get(InventoryItem, item_id)
         if not item:
             return 0.0
@@ -650,6 +650,19 @@ class PublicBotTrapService:
         ip_state.last_reason = cls._safe_value(reason, max_len=80) or "unknown"
         return strike_count
 
+    @classmethod
+    def is_ip_block_cached(cls, ip: Optional[str]) -> bool:
+        """Return True when Redis already holds a block for ``ip`` (no DB lookup)."""
+        ip_value = cls._normalize_ip(ip)
+        redis_client = cls._redis_client()
+        if redis_client is None or not ip_value:
+            return False
+        if cls._redis_exists(redis_client, cls._redis_temp_ip_block_key(ip_value)):
+            return True
+        return cls._permanent_ip_blocks_enabled() and cls._redis_exists(
+            redis_client, cls._redis_permanent_ip_block_key(ip_value)
+        )
+
     @classmethod
     def is_blocked(
         cls,
@@ -3,21 +3,34 @@
 Synopsis:
 Resolves media assets for public pages using a simple convention:
 each visual slot has a folder, and the first media file in that folder
-is rendered.
+is rendered. Folder scans are kept in an in-memory manifest (content hash,
+size, dimensions, variants) that is revalidated by directory mtime and can
+be prebuilt on deploy with `flask build-media-manifest`.
 
 Glossary:
 - Media slot: A named UI surface (hero, card, testimonial photo, etc.).
 - Folder-based media: Static asset lookup that does not require strict filenames.
+- Media manifest: Per-folder resolved media entries served from memory.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
+import os
 import re
+import struct
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Tuple
 from urllib.parse import parse_qs, urlencode, urlparse
 
-from flask import current_app, has_app_context
+from flask import current_app, has_app_context, request
+
+logger = logging.getLogger(__name__)
 
 IMAGE_EXTENSIONS = {
     ".png",
@@ -119,6 +132,19 @@ HOMEPAGE_MEDIA_SLOTS: tuple[Tuple[str, str], ...] = (
     ("final-cta-primary", "images/homepage/app-screenshots/final-cta"),
 )
 
+MEDIA_MANIFEST_ROOT = "images"
+MEDIA_MANIFEST_FILE = "dist/media-manifest.json"
+MEDIA_IMMUTABLE_MAX_AGE_SECONDS = 31536000
+_MEDIA_VERSION_LENGTH = 12
+_DEFAULT_MANIFEST_TTL_SECONDS = 0
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# In-process manifest keyed by static root. Each root holds
+# {"folders": {folder: {"mtime_ns", "checked_at", "entries"}},
+#  "file_mtime_ns": persisted manifest mtime, "file_checked_at": monotonic}.
+_MANIFESTS: Dict[str, Dict[str, Any]] = {}
+_MANIFEST_LOCK = threading.Lock()
+
 
 def _allowed_extensions(*, allow_images: bool, allow_videos: bool) -> set[str]:
     extensions: set[str] = set()
@@ -139,40 +165,6 @@ def _get_static_root() -> Path | None:
     return Path(static_folder)
 
 
-def _list_media_files(
-    folder_relative: str, *, allow_images: bool = True, allow_videos: bool = True
-) -> List[Path]:
-    static_root = _get_static_root()
-    if static_root is None:
-        return []
-    relative_folder = str(folder_relative or "").strip().lstrip("/")
-    if not relative_folder:
-        return []
-    folder_path = static_root / relative_folder
-    allowed = _allowed_extensions(allow_images=allow_images, allow_videos=allow_videos)
-    if not allowed:
-        return []
-    try:
-        if not folder_path.is_dir():
-            return []
-        files = [
-            item
-            for item in folder_path.iterdir()
-            if item.is_file()
-            and not item.name.startswith(".")
-            and item.suffix.lower() in allowed
-        ]
-    except OSError:
-        return []
-    return sorted(
-        files,
-        key=lambda path: (
-            0 if path.suffix.lower() in YOUTUBE_LINK_EXTENSIONS else 1,
-            path.name.lower(),
-        ),
-    )
-
-
 def _parse_timestamp_to_seconds(value: str) -> int | None:
     candidate = str(value or "").strip().lower()
     if not candidate:
@@ -335,25 +327,245 @@ def _media_from_path(static_root: Path, path: Path) -> Dict[str, str] | None:
     return {"path": relative_path, "kind": kind}
 
 
+# --- Image dimensions ---
+# Purpose: Read pixel dimensions from common raster headers without Pillow.
+# Inputs: Raw file head bytes (first 64KB) and file extension.
+# Outputs: (width, height) or (None, None) when the format is not recognized.
+def _read_image_dimensions(head: bytes, ext: str) -> tuple[int | None, int | None]:
+    try:
+        if head[:8] == b"\x89PNG\r\n\x1a\n" and len(head) >= 24:
+            width, height = struct.unpack(">II", head[16:24])
+            return width, height
+        if head[:6] in (b"GIF87a", b"GIF89a") and len(head) >= 10:
+            width, height = struct.unpack("<HH", head[6:10])
+            return width, height
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            chunk = head[12:16]
+            if chunk == b"VP8X" and len(head) >= 30:
+                width = int.from_bytes(head[24:27], "little") + 1
+                height = int.from_bytes(head[27:30], "little") + 1
+                return width, height
+            if chunk == b"VP8 " and len(head) >= 30:
+                width, height = struct.unpack("<HH", head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L" and len(head) >= 25:
+                bits = int.from_bytes(head[21:25], "little")
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if head[:2] == b"\xff\xd8":
+            offset = 2
+            while offset + 9 < len(head):
+                if head[offset] != 0xFF:
+                    offset += 1
+                    continue
+                marker = head[offset + 1]
+                if marker in _JPEG_SOF_MARKERS:
+                    height, width = struct.unpack(">HH", head[offset + 5 : offset + 9])
+                    return width, height
+                if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                    offset += 2
+                    continue
+                segment_length = struct.unpack(">H", head[offset + 2 : offset + 4])[0]
+                offset += 2 + segment_length
+    except (struct.error, IndexError):
+        return None, None
+    return None, None
+
+
+def _describe_file(path: Path, kind: str) -> Dict[str, Any]:
+    """Return content hash, size, and (for raster images) dimensions."""
+    digest = hashlib.sha1()
+    head = b""
+    size = 0
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(65536), b""):
+            if not head:
+                head = chunk
+            size += len(chunk)
+            digest.update(chunk)
+    width = height = None
+    if kind == "image":
+        width, height = _read_image_dimensions(head, path.suffix.lower())
+    return {
+        "version": digest.hexdigest()[:_MEDIA_VERSION_LENGTH],
+        "size": size,
+        "width": width,
+        "height": height,
+    }
+
+
+# --- Scan folder ---
+# Purpose: Resolve every media file in one folder into manifest entries.
+# Inputs: Static root and folder path relative to it.
+# Outputs: Sorted entries (.url first, then by name) with version/variants.
+def _scan_folder(static_root: Path, relative_folder: str) -> List[Dict[str, Any]]:
+    folder_path = static_root / relative_folder
+    allowed = _allowed_extensions(allow_images=True, allow_videos=True)
+    try:
+        if not folder_path.is_dir():
+            return []
+        files = [
+            item
+            for item in folder_path.iterdir()
+            if item.is_file()
+            and not item.name.startswith(".")
+            and item.suffix.lower() in allowed
+        ]
+    except OSError:
+        return []
+    files.sort(
+        key=lambda path: (
+            0 if path.suffix.lower() in YOUTUBE_LINK_EXTENSIONS else 1,
+            path.name.lower(),
+        )
+    )
+    entries: List[Dict[str, Any]] = []
+    for file_path in files:
+        resolved = _media_from_path(static_root, file_path)
+        if resolved is None:
+            continue
+        entry: Dict[str, Any] = dict(resolved)
+        try:
+            entry.update(_describe_file(file_path, entry["kind"]))
+        except OSError:
+            continue
+        entries.append(entry)
+
+    # Same-stem files (hero.avif + hero.jpg) are format variants of each other.
+    by_stem: Dict[str, List[Dict[str, Any]]] = {}
+    for entry in entries:
+        if entry["kind"] == "youtube":
+            continue
+        by_stem.setdefault(Path(entry["path"]).stem.lower(), []).append(entry)
+    for entry in entries:
+        siblings = by_stem.get(Path(entry["path"]).stem.lower(), [])
+        entry["variants"] = {
+            Path(sibling["path"]).suffix.lower().lstrip("."): sibling["path"]
+            for sibling in siblings
+            if sibling is not entry
+        }
+    return entries
+
+
+def _folder_mtime_ns(folder_path: Path) -> int | None:
+    try:
+        return folder_path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _manifest_ttl_seconds() -> float:
+    try:
+        return max(
+            0.0,
+            float(
+                current_app.config.get(
+                    "PUBLIC_MEDIA_MANIFEST_TTL", _DEFAULT_MANIFEST_TTL_SECONDS
+                )
+            ),
+        )
+    except (TypeError, ValueError):
+        return float(_DEFAULT_MANIFEST_TTL_SECONDS)
+
+
+def _root_state(static_root: Path) -> Dict[str, Any]:
+    return _MANIFESTS.setdefault(
+        str(static_root),
+        {"folders": {}, "file_mtime_ns": None, "file_checked_at": None},
+    )
+
+
+def _sync_persisted_manifest(
+    static_root: Path, state: Dict[str, Any], now: float, ttl: float
+) -> None:
+    """Adopt a rebuilt on-disk manifest when its mtime changes (caller holds the lock)."""
+    checked_at = state["file_checked_at"]
+    if checked_at is not None and now - checked_at < ttl:
+        return
+    state["file_checked_at"] = now
+    manifest_path = static_root / MEDIA_MANIFEST_FILE
+    file_mtime_ns = _folder_mtime_ns(manifest_path)
+    if file_mtime_ns is None or file_mtime_ns == state["file_mtime_ns"]:
+        return
+    state["file_mtime_ns"] = file_mtime_ns
+    try:
+        payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+        folders = payload.get("folders") or {}
+    except (OSError, ValueError, AttributeError):
+        logger.warning("Suppressed exception fallback at app/services/public_media_service.py:490", exc_info=True)
+        return
+    for folder, record in folders.items():
+        if not isinstance(record, dict) or not isinstance(record.get("entries"), list):
+            continue
+        state["folders"][folder] = {
+            "mtime_ns": record.get("mtime_ns"),
+            "checked_at": None,
+            "entries": record["entries"],
+        }
+
+
+# --- Folder entries ---
+# Purpose: Serve a folder's manifest entries from memory, rescanning on mtime change.
+# Inputs: Static root and folder path relative to it.
+# Outputs: Shared (read-only) list of manifest entries.
+def _folder_entries(static_root: Path, relative_folder: str) -> List[Dict[str, Any]]:
+    now = time.monotonic()
+    ttl = _manifest_ttl_seconds()
+    with _MANIFEST_LOCK:
+        state = _root_state(static_root)
+        _sync_persisted_manifest(static_root, state, now, ttl)
+        cached = state["folders"].get(relative_folder)
+        if (
+            cached is not None
+            and cached["checked_at"] is not None
+            and now - cached["checked_at"] < ttl
+        ):
+            return cached["entries"]
+
+    mtime_ns = _folder_mtime_ns(static_root / relative_folder)
+    if cached is not None and cached["mtime_ns"] == mtime_ns:
+        entries = cached["entries"]
+    else:
+        entries = _scan_folder(static_root, relative_folder) if mtime_ns is not None else []
+    with _MANIFEST_LOCK:
+        state["folders"][relative_folder] = {
+            "mtime_ns": mtime_ns,
+            "checked_at": now,
+            "entries": entries,
+        }
+    return entries
+
+
+def _resolve_folder_media(
+    folder_relative: str, *, allow_images: bool, allow_videos: bool
+) -> Iterable[Dict[str, Any]]:
+    static_root = _get_static_root()
+    if static_root is None:
+        return
+    relative_folder = str(folder_relative or "").strip().strip("/")
+    if not relative_folder or not (allow_images or allow_videos):
+        return
+    for entry in _folder_entries(static_root, relative_folder):
+        if entry["kind"] == "image" and not allow_images:
+            continue
+        if entry["kind"] != "image" and not allow_videos:
+            continue
+        yield dict(entry)
+
+
 def resolve_first_media_from_folder(
     folder_relative: str, *, allow_images: bool = True, allow_videos: bool = True
-) -> Dict[str, str] | None:
+) -> Dict[str, Any] | None:
     """Resolve the first media file from a static folder."""
-    static_root = _get_static_root()
-    if static_root is None:
-        return None
-    files = _list_media_files(
-        folder_relative,
-        allow_images=allow_images,
-        allow_videos=allow_videos,
+    return next(
+        iter(
+            _resolve_folder_media(
+                folder_relative,
+                allow_images=allow_images,
+                allow_videos=allow_videos,
+            )
+        ),
+        None,
     )
-    if not files:
-        return None
-    for file_path in files:
-        resolved = _media_from_path(static_root, file_path)
-        if resolved is not None:
-            return resolved
-    return None
 
 
 def resolve_media_list_from_folder(
@@ -362,26 +574,105 @@ def resolve_media_list_from_folder(
     allow_images: bool = True,
     allow_videos: bool = True,
     limit: int | None = None,
-) -> List[Dict[str, str]]:
+) -> List[Dict[str, Any]]:
     """Resolve sorted media files from a static folder."""
-    static_root = _get_static_root()
-    if static_root is None:
-        return []
-    files = _list_media_files(
+    media: List[Dict[str, Any]] = []
+    for entry in _resolve_folder_media(
         folder_relative,
         allow_images=allow_images,
         allow_videos=allow_videos,
-    )
-    media: List[Dict[str, str]] = []
-    for file_path in files:
+    ):
         if limit is not None and limit >= 0 and len(media) >= limit:
             break
-        resolved = _media_from_path(static_root, file_path)
-        if resolved is not None:
-            media.append(resolved)
+        media.append(entry)
     return media
 
 
+# --- Build manifest ---
+# Purpose: Scan every media folder under images/ and load it into memory.
+# Inputs: Optional static root (defaults to the current app's static folder).
+# Outputs: JSON-serializable manifest payload.
+def build_media_manifest(static_root: Path | None = None) -> Dict[str, Any]:
+    static_root = static_root or _get_static_root()
+    if static_root is None:
+        raise RuntimeError("build_media_manifest requires an app context or static_root")
+    allowed = _allowed_extensions(allow_images=True, allow_videos=True)
+    folders: Dict[str, Dict[str, Any]] = {}
+    media_root = static_root / MEDIA_MANIFEST_ROOT
+    for directory, _dirnames, filenames in os.walk(media_root):
+        if not any(Path(name).suffix.lower() in allowed for name in filenames):
+            continue
+        folder_path = Path(directory)
+        relative_folder = folder_path.relative_to(static_root).as_posix()
+        folders[relative_folder] = {
+            "mtime_ns": _folder_mtime_ns(folder_path),
+            "entries": _scan_folder(static_root, relative_folder),
+        }
+
+    now = time.monotonic()
+    with _MANIFEST_LOCK:
+        state = _root_state(static_root)
+        for relative_folder, record in folders.items():
+            state["folders"][relative_folder] = dict(record, checked_at=now)
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "folders": folders,
+    }
+
+
+def write_media_manifest(static_root: Path | None = None) -> Path:
+    """Build the manifest and persist it so every worker adopts it."""
+    static_root = static_root or _get_static_root()
+    payload = build_media_manifest(static_root)
+    manifest_path = static_root / MEDIA_MANIFEST_FILE
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = manifest_path.with_suffix(".json.tmp")
+    temp_path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(temp_path, manifest_path)
+    return manifest_path
+
+
+def reset_media_manifest() -> None:
+    """Drop every in-memory manifest (tests and manual rebuilds)."""
+    with _MANIFEST_LOCK:
+        _MANIFESTS.clear()
+
+
+def get_media_version(relative_path: str) -> str | None:
+    """Return the content-hash version for a manifest media path."""
+    static_root = _get_static_root()
+    requested = str(relative_path or "").lstrip("/")
+    if static_root is None or not requested.startswith(f"{MEDIA_MANIFEST_ROOT}/"):
+        return None
+    folder, _, _name = requested.rpartition("/")
+    for entry in _folder_entries(static_root, folder):
+        if entry["path"] == requested:
+            return entry.get("version")
+    return None
+
+
+# --- Media cache headers ---
+# Purpose: Mark content-hash-versioned media responses as immutable.
+# Inputs: Flask app; acts on static responses requested with ?v=<version>.
+# Outputs: Registers an after_request hook.
+def install_media_cache_headers(app) -> None:
+    @app.after_request
+    def _apply_media_cache_headers(response):
+        if request.endpoint != "static" or response.status_code not in (200, 304):
+            return response
+        requested_version = request.args.get("v")
+        filename = (request.view_args or {}).get("filename") or ""
+        if not requested_version or not filename.startswith(f"{MEDIA_MANIFEST_ROOT}/"):
+            return response
+        if get_media_version(filename) != requested_version:
+            return response
+        response.cache_control.public = True
+        response.cache_control.max_age = MEDIA_IMMUTABLE_MAX_AGE_SECONDS
+        response.cache_control.immutable = True
+        response.set_etag(requested_version)
+        return response.make_conditional(request)
+
+
 def _attach_card_media(cards: Iterable[Dict[str, str]]) -> List[Dict[str, Any]]:
     resolved_cards: List[Dict[str, Any]] = []
     for card in cards:
@@ -503,7 +794,8 @@ def build_media_signature(entries: Iterable[tuple[str, Dict[str, str] | None]])
         if not value:
             parts.append(f"{safe_key}:none")
             continue
-        parts.append(f"{safe_key}:{media_kind}:{value}")
+        version = str(media.get("version") or "")
+        parts.append(f"{safe_key}:{media_kind}:{value}:{version}")
     if not parts:
         return "none"
     return "|".join(parts)
@@ -2,22 +2,34 @@
 
 Synopsis:
 Builds view-ready data for the public `/pricing` page while delegating feature
-presentation rules to `tier_presentation`.
+presentation rules to `tier_presentation`. The built catalog is held in memory
+as a versioned snapshot, together with its rendered tier-card and comparison
+fragment, so repeat views do not touch the database. Rebuilds (which may look
+up Stripe prices) run outside any lock; while one request rebuilds a variant,
+others keep serving the previous snapshot.
 
 Glossary:
 - Tier card: Display payload for one customer-facing subscription tier.
 - Comparison row: A feature label with availability/limit value by tier.
+- Catalog snapshot: Per-variant contexts and fragments for one catalog version.
+- Variant: Whether the free signup tier is shown (`FEATURE_PRICING_SIGNUP_FREE_TIER`).
+- Build claim: Marker that one request is rebuilding a variant.
 """
 
 from __future__ import annotations
 
 import re
+import threading
+import time
+from dataclasses import dataclass, field
 from typing import Any
 
-from flask import url_for
+from flask import current_app, render_template, url_for
+from markupsafe import Markup
 
 from ..models.subscription_tier import SubscriptionTier
 from ..utils.settings import is_feature_enabled
+from .cache_invalidation import pricing_catalog_cache_key
 from .lifetime_pricing_service import LifetimePricingService
 from .signup_plan_catalog_service import SignupPlanCatalogService
 from .tier_marketing_copy import build_marketing_copy
@@ -29,6 +41,22 @@ from .tier_presentation.helpers import (
 )
 
 
+_SNAPSHOT_EXTENSION_KEY = "public_pricing_catalog"
+_BUILD_CLAIMS_EXTENSION_KEY = "public_pricing_catalog_builds"
+_CATALOG_FRAGMENT_TEMPLATE = "pages/public/_pricing_catalog.html"
+_BUILD_LOCK = threading.Lock()
+
+
+@dataclass
+class PricingCatalogSnapshot:
+    """Built pricing contexts and rendered fragments for one catalog version."""
+
+    version_key: str
+    built_at: float
+    contexts: dict[str, dict[str, Any]] = field(default_factory=dict)
+    fragments: dict[str, Markup] = field(default_factory=dict)
+
+
 # --- Public pricing page service ---
 # Purpose: Build pricing-page tier cards and comparison-table payloads for templates.
 # Inputs: Customer-facing subscription tiers and optional lifetime offer payloads.
@@ -45,11 +73,85 @@ class PublicPricingPageService:
         """Return render-ready context for the `/pricing` page."""
         del request
 
-        db_tiers = cls._load_customer_facing_tiers()
         show_signup_free_tier = is_feature_enabled(cls._SIGNUP_FREE_TIER_FLAG_KEY)
+        variant = "with_free_tier" if show_signup_free_tier else "paid_only"
+        version_key = pricing_catalog_cache_key()
+        snapshot = current_app.extensions.get(_SNAPSHOT_EXTENSION_KEY)
+        if cls._is_current(snapshot, version_key) and variant in snapshot.fragments:
+            return cls._variant_context(snapshot, variant)
+
+        previous = snapshot if snapshot is not None and variant in snapshot.fragments else None
+        claimed = cls._claim_build(variant)
+        if not claimed and previous is not None:
+            # Another request is rebuilding; keep serving the last catalog.
+            return cls._variant_context(previous, variant)
+        try:
+            context = cls._build_catalog_context(
+                show_signup_free_tier=show_signup_free_tier
+            )
+            fragment = Markup(render_template(_CATALOG_FRAGMENT_TEMPLATE, **context))
+            cls._store_variant(version_key, variant, context, fragment)
+        finally:
+            if claimed:
+                cls._release_build(variant)
+        return {**context, "pricing_catalog_html": fragment}
+
+    # --- Catalog snapshot ---
+    # Purpose: Hold built catalogs in process until the catalog version moves.
+    # Inputs: Pricing catalog cache version (bumped by tier/addon/permission writes) and TTL.
+    # Outputs: Whether a snapshot may still be served without rebuilding.
+    @staticmethod
+    def _is_current(snapshot: PricingCatalogSnapshot | None, version_key: str) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.version_key == version_key
+            and time.monotonic() - snapshot.built_at
+            < SignupPlanCatalogService.catalog_ttl_seconds()
+        )
+
+    @staticmethod
+    def _variant_context(snapshot: PricingCatalogSnapshot, variant: str) -> dict[str, Any]:
+        return {
+            **snapshot.contexts[variant],
+            "pricing_catalog_html": snapshot.fragments[variant],
+        }
+
+    @classmethod
+    def _store_variant(
+        cls, version_key: str, variant: str, context: dict[str, Any], fragment: Markup
+    ) -> None:
+        with _BUILD_LOCK:
+            snapshot = current_app.extensions.get(_SNAPSHOT_EXTENSION_KEY)
+            if not cls._is_current(snapshot, version_key):
+                snapshot = PricingCatalogSnapshot(
+                    version_key=version_key, built_at=time.monotonic()
+                )
+                current_app.extensions[_SNAPSHOT_EXTENSION_KEY] = snapshot
+            snapshot.contexts[variant] = context
+            snapshot.fragments[variant] = fragment
+
+    # --- Build claims ---
+    # Purpose: Let one request rebuild a variant while others serve the old one.
+    # Outputs: True when this request owns the rebuild.
+    @staticmethod
+    def _claim_build(variant: str) -> bool:
+        with _BUILD_LOCK:
+            claims = current_app.extensions.setdefault(_BUILD_CLAIMS_EXTENSION_KEY, set())
+            if variant in claims:
+                return False
+            claims.add(variant)
+            return True
+
+    @staticmethod
+    def _release_build(variant: str) -> None:
+        with _BUILD_LOCK:
+            current_app.extensions.get(_BUILD_CLAIMS_EXTENSION_KEY, set()).discard(variant)
+
+    @classmethod
+    def _build_catalog_context(cls, *, show_signup_free_tier: bool) -> dict[str, Any]:
+        db_tiers = cls._load_customer_facing_tiers()
         if not show_signup_free_tier:
-            free_tier = SignupPlanCatalogService.load_customer_facing_free_tier()
-            free_tier_id = str(getattr(free_tier, "id", "") or "") if free_tier else ""
+            free_tier_id = SignupPlanCatalogService.snapshot_free_tier_id()
             if free_tier_id:
                 db_tiers = [
                     tier
@@ -65,7 +167,7 @@ class PublicPricingPageService:
                 "lifetime_has_capacity": False,
             }
 
-        available_tiers = SignupPlanCatalogService.build_available_tiers_payload(
+        available_tiers = SignupPlanCatalogService.snapshot_available_tiers_payload(
             db_tiers,
             include_live_pricing=True,
             allow_live_pricing_network=True,
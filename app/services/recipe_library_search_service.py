@@ -0,0 +1,496 @@
+"""Ranked public recipe library search.
+
+Synopsis:
+Builds one SQL statement that returns a relevance- or field-ordered page of
+listed public recipes (keyset paginated) together with category, product-type,
+and total facet counts. PostgreSQL uses a `tsvector` expression index plus
+`pg_trgm` name similarity; SQLite uses an FTS5 external-content table built by
+migration or CLI, with a token `LIKE` fallback when that table is missing.
+
+Glossary:
+- Listed recipe: Public, published, current, non-archived marketplace listing.
+- Keyset cursor: Opaque token encoding the last row's sort value and id.
+- Facet: Count of matching recipes grouped by category or product type.
+- Product type: Portioned vs bulk, from `ProductCategory.is_typically_portioned`.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
+
+from app.extensions import db
+from app.models import Organization, ProductCategory, Recipe
+
+logger = logging.getLogger(__name__)
+
+# Must stay expression-equivalent to the GIN index created in migration 0034.
+PG_SEARCH_VECTOR_SQL = (
+    "to_tsvector('simple', coalesce(recipe.name, '') || ' ' || "
+    "coalesce(recipe.public_description, ''))"
+)
+PG_TRIGRAM_THRESHOLD = 0.3
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class LibrarySearchFilters:
+    """Normalized public library filter set."""
+
+    search: str = ""
+    category_id: int | None = None
+    product_type: str = "any"
+    sale: str = "any"
+    organization_id: int | None = None
+    origin: str = "any"
+
+
+@dataclass
+class LibrarySearchPage:
+    """One page of library results plus facet counts."""
+
+    recipes: list[Recipe]
+    next_cursor: str | None
+    total: int
+    category_counts: dict[int, int] = field(default_factory=dict)
+    product_type_counts: dict[str, int] = field(default_factory=dict)
+    sort: str = "newest"
+    backend: str = "none"
+
+
+class RecipeLibrarySearchService:
+    """Ranked search, keyset pagination, and facets for the public library."""
+
+    DEFAULT_PAGE_SIZE = 30
+    MAX_PAGE_SIZE = 60
+    FTS_TABLE = "recipe_library_fts"
+    SORT_MODES = ("relevance", "newest", "oldest", "downloads", "price_high")
+    PRODUCT_TYPES = ("portioned", "bulk")
+
+    # -- Public API -------------------------------------------------------------
+    @classmethod
+    def listed_filters(cls) -> tuple[Any, ...]:
+        """Criteria for recipes visible in the public library (needs Organization join)."""
+        return (
+            Recipe.is_public.is_(True),
+            Recipe.status == "published",
+            Recipe.marketplace_status == "listed",
+            Recipe.test_sequence.is_(None),
+            Recipe.is_archived.is_(False),
+            Recipe.is_current.is_(True),
+            (Organization.recipe_library_blocked.is_(False))
+            | (Organization.recipe_library_blocked.is_(None)),
+        )
+
+    @classmethod
+    def search(
+        cls,
+        filters: LibrarySearchFilters,
+        *,
+        sort: str | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> LibrarySearchPage:
+        """Return a ranked/sorted page of listed recipes with facet counts."""
+        page_size = cls._normalize_limit(limit)
+        tokens = cls.tokenize(filters.search)
+        sort_mode = cls._resolve_sort(sort, has_terms=bool(tokens))
+        backend = cls._resolve_backend() if tokens else "none"
+
+        statement = cls._build_statement(
+            filters,
+            tokens=tokens,
+            backend=backend,
+            sort_mode=sort_mode,
+            cursor=cls._decode_cursor(cursor, sort_mode),
+            page_size=page_size,
+        )
+        rows = db.session.execute(statement).all()
+
+        hits: list[tuple[int, int, Any]] = []
+        category_counts: dict[int, int] = {}
+        product_type_counts = {key: 0 for key in cls.PRODUCT_TYPES}
+        total = 0
+        for row in rows:
+            if row.kind == "hit":
+                hits.append((int(row.position), int(row.id), row.sort_value))
+            elif row.kind == "category" and row.category_id is not None:
+                category_counts[int(row.category_id)] = int(row.hits)
+            elif row.kind == "product_type":
+                key = "portioned" if row.portioned else "bulk"
+                product_type_counts[key] += int(row.hits)
+            elif row.kind == "total":
+                total = int(row.hits)
+
+        hits.sort(key=lambda hit: hit[0])
+        next_cursor = None
+        if len(hits) > page_size:
+            hits = hits[:page_size]
+            _pos, last_id, last_value = hits[-1]
+            next_cursor = cls._encode_cursor(last_value, last_id)
+
+        return LibrarySearchPage(
+            recipes=cls._hydrate([hit[1] for hit in hits]),
+            next_cursor=next_cursor,
+            total=total,
+            category_counts=category_counts,
+            product_type_counts=product_type_counts,
+            sort=sort_mode,
+            backend=backend,
+        )
+
+    @staticmethod
+    def tokenize(text: str | None) -> list[str]:
+        """Lowercase word tokens safe to embed in tsquery/FTS5 match syntax."""
+        return [token for token in _TOKEN_RE.findall((text or "").lower()) if token][
+            :8
+        ]
+
+    @classmethod
+    def sqlite_index_statements(cls) -> tuple[str, ...]:
+        """DDL for the SQLite FTS5 mirror of recipe text and its sync triggers."""
+        table = cls.FTS_TABLE
+        return (
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+            "name, public_description, content='recipe', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON recipe BEGIN "
+            f"INSERT INTO {table}(rowid, name, public_description) "
+            "VALUES (new.id, new.name, new.public_description); END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON recipe BEGIN "
+            f"INSERT INTO {table}({table}, rowid, name, public_description) "
+            "VALUES ('delete', old.id, old.name, old.public_description); END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF name, "
+            f"public_description ON recipe BEGIN "
+            f"INSERT INTO {table}({table}, rowid, name, public_description) "
+            "VALUES ('delete', old.id, old.name, old.public_description); "
+            f"INSERT INTO {table}(rowid, name, public_description) "
+            "VALUES (new.id, new.name, new.public_description); END",
+            f"INSERT INTO {table}({table}) VALUES ('rebuild')",
+        )
+
+    @classmethod
+    def create_sqlite_index(cls) -> bool:
+        """Create and populate the SQLite FTS5 mirror (CLI/schema setup only)."""
+        try:
+            bind = db.session.get_bind()
+            if bind.dialect.name != "sqlite":
+                return False
+            for statement in cls.sqlite_index_statements():
+                db.session.execute(sa.text(statement))
+            db.session.commit()
+            return True
+        except SQLAlchemyError:
+            logger.warning("Suppressed exception fallback at app/services/recipe_library_search_service.py:195", exc_info=True)
+            db.session.rollback()
+            return False
+
+    @classmethod
+    def sqlite_index_ready(cls) -> bool:
+        """Return whether the FTS5 mirror exists; never creates it."""
+        try:
+            return (
+                db.session.execute(
+                    sa.text(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+                    ),
+                    {"name": cls.FTS_TABLE},
+                ).first()
+                is not None
+            )
+        except SQLAlchemyError:
+            logger.warning("Suppressed exception fallback at app/services/recipe_library_search_service.py:213", exc_info=True)
+            return False
+
+    # -- Statement construction -------------------------------------------------
+    @classmethod
+    def _build_statement(
+        cls,
+        filters: LibrarySearchFilters,
+        *,
+        tokens: list[str],
+        backend: str,
+        sort_mode: str,
+        cursor: tuple[Any, int] | None,
+        page_size: int,
+    ):
+        rank_expr: Any = sa.cast(sa.literal(0.0), sa.Float)
+        match_criteria: list[Any] = []
+        fts_table = None
+
+        if tokens and backend == "postgres":
+            tsquery = func.to_tsquery(
+                sa.literal_column("'simple'"),
+                " & ".join(f"{token}:*" for token in tokens),
+            )
+            vector = sa.literal_column(PG_SEARCH_VECTOR_SQL)
+            raw = " ".join(tokens)
+            name_lower = func.lower(Recipe.name)
+            match_criteria.append(
+                or_(vector.op("@@")(tsquery), name_lower.op("%")(raw))
+            )
+            rank_expr = sa.cast(
+                func.ts_rank_cd(vector, tsquery) + func.similarity(name_lower, raw),
+                sa.Float,
+            )
+        elif tokens and backend == "fts5":
+            fts_table = sa.table(cls.FTS_TABLE, sa.column("rowid"))
+            match_expr = " AND ".join(f'"{token}"*' for token in tokens)
+            match_criteria.append(
+                sa.literal_column(cls.FTS_TABLE).op("MATCH")(match_expr)
+            )
+            rank_expr = sa.cast(
+                -func.bm25(sa.literal_column(cls.FTS_TABLE), 10.0, 1.0), sa.Float
+            )
+        elif tokens:
+            for token in tokens:
+                like_expr = f"%{token}%"
+                match_criteria.append(
+                    or_(
+                        Recipe.name.ilike(like_expr),
+                        Recipe.public_description.ilike(like_expr),
+                    )
+                )
+
+        sort_expr = cls._sort_expression(sort_mode, rank_expr)
+        portioned_expr = func.coalesce(ProductCategory.is_typically_portioned, False)
+
+        base = (
+            sa.select(
+                Recipe.id.label("id"),
+                Recipe.category_id.label("category_id"),
+                portioned_expr.label("portioned"),
+                sort_expr.label("sort_value"),
+            )
+            .select_from(Recipe)
+            .outerjoin(Organization, Recipe.organization_id == Organization.id)
+            .outerjoin(ProductCategory, ProductCategory.id == Recipe.category_id)
+        )
+        if fts_table is not None:
+            base = base.join(fts_table, fts_table.c.rowid == Recipe.id)
+        base = base.where(
+            *cls.listed_filters(), *cls._scalar_filters(filters), *match_criteria
+        )
+        matches = base.cte("library_matches")
+
+        category_filter = (
+            matches.c.category_id == filters.category_id
+            if filters.category_id
+            else sa.true()
+        )
+        if filters.product_type in cls.PRODUCT_TYPES:
+            type_filter = matches.c.portioned.is_(
+                sa.true() if filters.product_type == "portioned" else sa.false()
+            )
+        else:
+            type_filter = sa.true()
+
+        descending = sort_mode != "oldest"
+        ordering = (
+            (matches.c.sort_value.desc(), matches.c.id.desc())
+            if descending
+            else (matches.c.sort_value.asc(), matches.c.id.asc())
+        )
+        keyset = sa.true()
+        if cursor is not None:
+            cursor_value, cursor_id = cursor
+            if descending:
+                keyset = or_(
+                    matches.c.sort_value < cursor_value,
+                    and_(
+                        matches.c.sort_value == cursor_value,
+                        matches.c.id < cursor_id,
+                    ),
+                )
+            else:
+                keyset = or_(
+                    matches.c.sort_value > cursor_value,
+                    and_(
+                        matches.c.sort_value == cursor_value,
+                        matches.c.id > cursor_id,
+                    ),
+                )
+
+        sort_type = matches.c.sort_value.type
+        null_int = sa.cast(sa.null(), sa.Integer)
+        null_bool = sa.cast(sa.null(), sa.Boolean)
+        null_sort = sa.cast(sa.null(), sort_type)
+
+        page = (
+            sa.select(
+                sa.literal("hit", sa.String).label("kind"),
+                matches.c.id,
+                matches.c.category_id,
+                matches.c.portioned,
+                matches.c.sort_value,
+                func.row_number().over(order_by=ordering).label("position"),
+                sa.literal(1, sa.Integer).label("hits"),
+            )
+            .select_from(matches)
+            .where(category_filter, type_filter, keyset)
+            .order_by(*ordering)
+            .limit(page_size + 1)
+            .subquery("library_page")
+        )
+        category_facets = (
+            sa.select(
+                sa.literal("category", sa.String),
+                null_int,
+                matches.c.category_id,
+                null_bool,
+                null_sort,
+                null_int,
+                func.count(),
+            )
+            .select_from(matches)
+            .where(type_filter)
+            .group_by(matches.c.category_id)
+        )
+        type_facets = (
+            sa.select(
+                sa.literal("product_type", sa.String),
+                null_int,
+                null_int,
+                matches.c.portioned,
+                null_sort,
+                null_int,
+                func.count(),
+            )
+            .select_from(matches)
+            .where(category_filter)
+            .group_by(matches.c.portioned)
+        )
+        total = sa.select(
+            sa.literal("total", sa.String),
+            null_int,
+            null_int,
+            null_bool,
+            null_sort,
+            null_int,
+            func.count(),
+        ).select_from(matches).where(category_filter, type_filter)
+
+        return sa.union_all(
+            sa.select(*page.c), category_facets, type_facets, total
+        )
+
+    @classmethod
+    def _scalar_filters(cls, filters: LibrarySearchFilters) -> list[Any]:
+        criteria: list[Any] = []
+        if filters.sale == "sale":
+            criteria.append(Recipe.is_for_sale.is_(True))
+        elif filters.sale == "free":
+            criteria.append(Recipe.is_for_sale.is_(False))
+        if filters.organization_id:
+            criteria.append(Recipe.organization_id == filters.organization_id)
+        if filters.origin == "batchtrack":
+            criteria.append(Recipe.org_origin_type == "batchtrack_native")
+        elif filters.origin == "purchased":
+            criteria.append(Recipe.org_origin_purchased.is_(True))
+        elif filters.origin == "authored":
+            criteria.append(
+                (Recipe.org_origin_type.in_(["authored", "published"]))
+                | (Recipe.org_origin_type.is_(None))
+            )
+        return criteria
+
+    @staticmethod
+    def _sort_expression(sort_mode: str, rank_expr: Any) -> Any:
+        if sort_mode == "relevance":
+            return rank_expr
+        if sort_mode == "downloads":
+            return func.coalesce(Recipe.download_count, 0)
+        if sort_mode == "price_high":
+            return func.coalesce(Recipe.sale_price, sa.cast(-1, Recipe.sale_price.type))
+        return func.coalesce(Recipe.updated_at, Recipe.created_at)
+
+    # -- Helpers ----------------------------------------------------------------
+    @classmethod
+    def _resolve_backend(cls) -> str:
+        try:
+            dialect = db.session.get_bind().dialect.name
+        except Exception:
+            logger.warning("Suppressed exception fallback at app/services/recipe_library_search_service.py:411", exc_info=True)
+            return "like"
+        if dialect == "postgresql":
+            return "postgres"
+        # Search stays read-only: the FTS5 mirror comes from migration 0042 or
+        # `flask build-library-search-index`; without it, fall back to LIKE.
+        if dialect == "sqlite" and cls.sqlite_index_ready():
+            return "fts5"
+        return "like"
+
+    @classmethod
+    def _resolve_sort(cls, sort: str | None, *, has_terms: bool) -> str:
+        normalized = (sort or "").strip().lower()
+        if normalized not in cls.SORT_MODES:
+            normalized = "relevance" if has_terms else "newest"
+        if normalized == "relevance" and not has_terms:
+            return "newest"
+        return normalized
+
+    @classmethod
+    def _normalize_limit(cls, limit: int | None) -> int:
+        try:
+            value = int(limit or cls.DEFAULT_PAGE_SIZE)
+        except (TypeError, ValueError):
+            value = cls.DEFAULT_PAGE_SIZE
+        return max(1, min(value, cls.MAX_PAGE_SIZE))
+
+    @staticmethod
+    def _encode_cursor(value: Any, recipe_id: int) -> str:
+        if isinstance(value, datetime):
+            encoded_value: Any = value.isoformat()
+        elif isinstance(value, Decimal):
+            encoded_value = str(value)
+        else:
+            encoded_value = value
+        raw = json.dumps([encoded_value, int(recipe_id)], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str | None, sort_mode: str) -> tuple[Any, int] | None:
+        if not cursor:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            value, recipe_id = json.loads(base64.urlsafe_b64decode(padded))
+            if sort_mode in {"newest", "oldest"}:
+                value = datetime.fromisoformat(str(value))
+            elif sort_mode == "downloads":
+                value = int(value)
+            elif sort_mode == "price_high":
+                value = Decimal(str(value))
+            else:
+                value = float(value)
+            return value, int(recipe_id)
+        except (TypeError, ValueError, InvalidOperation, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _hydrate(recipe_ids: list[int]) -> list[Recipe]:
+        if not recipe_ids:
+            return []
+        recipes = (
+            Recipe.query.options(
+                joinedload(Recipe.product_category),
+                joinedload(Recipe.stats),
+                joinedload(Recipe.organization),
+            )
+            .filter(Recipe.id.in_(recipe_ids))
+            .all()
+        )
+        by_id = {recipe.id: recipe for recipe in recipes}
+        return [by_id[rid] for rid in recipe_ids if rid in by_id]
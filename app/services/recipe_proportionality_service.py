@@ -1,15 +1,33 @@
+"""Recipe proportionality comparisons and fingerprint index.
+
+Synopsis:
+Canonicalizes recipe ingredients into unit-normalized proportion signatures,
+compares them for proportional identity, and maintains a stored fingerprint
+per recipe so duplicate lookups probe indexed hashes instead of scanning.
+
+Glossary:
+- Signature: Canonical ingredient key -> base amount/proportion mapping.
+- Fingerprint: Hashed ingredient-set + rounded-ratio bucket for a signature.
+- Bucket probe: Set of ratio bucket hashes a match within tolerance can occupy.
+"""
+
 from __future__ import annotations
 
+import hashlib
+import itertools
 import logging
+import math
 import re
 from dataclasses import dataclass
-from typing import Iterable, Mapping, Sequence
+from typing import Any, Iterable, Mapping, Sequence
 
-from sqlalchemy import func
+from sqlalchemy import func, or_
+from sqlalchemy.orm import selectinload
 
 from app.extensions import db
 from app.models import GlobalItem, InventoryItem, Recipe, RecipeIngredient, Unit
 from app.models.global_item_alias import GlobalItemAlias
+from app.models.recipe_fingerprint import RecipeFingerprint
 from app.services.unit_conversion import ConversionEngine
 
 logger = logging.getLogger(__name__)
@@ -28,6 +46,26 @@ class _RecipeSignature:
     proportions: dict[str, float] | None
 
 
+@dataclass(frozen=True)
+class RecipeFingerprintData:
+    """Hashable proportion fingerprint derived from a recipe signature."""
+
+    ingredient_set_hash: str
+    ratio_bucket_hash: str | None
+    ingredient_count: int
+    proportions: dict[str, float] | None
+    totals: dict[str, float]
+
+
+@dataclass
+class _SignatureContext:
+    """Per-call lookup caches so one signature build issues bounded queries."""
+
+    items: dict[int, InventoryItem]
+    units: dict[str, Unit | None]
+    global_items: dict[str, GlobalItem | None]
+
+
 class RecipeProportionalityService:
     """Centralized proportionality comparisons for recipes using UUCS + Global Library."""
 
@@ -40,6 +78,12 @@ class RecipeProportionalityService:
     _WEIGHT_TYPES = {"weight", "mass"}
     _VOLUME_TYPES = {"volume", "liquid"}
 
+    # Fingerprint index settings. Bump FINGERPRINT_VERSION whenever canonical key
+    # or bucket rules change so stale rows are recomputed by the backfill paths.
+    FINGERPRINT_VERSION = 1
+    BUCKET_RESOLUTION = 0.005  # 0.5% proportion grid
+    MAX_BUCKET_PROBES = 32
+
     @classmethod
     def are_recipes_proportionally_identical(
         cls,
@@ -51,6 +95,274 @@ class RecipeProportionalityService:
         sig_b = cls._build_signature(recipe_b)
         return cls._compare_signatures(sig_a, sig_b)
 
+    # -- Fingerprint index ------------------------------------------------------
+    @classmethod
+    def build_fingerprint(
+        cls,
+        source: Recipe | Sequence[RecipeIngredient] | Sequence[Mapping] | None,
+    ) -> RecipeFingerprintData:
+        """Build the hashable proportion fingerprint for a recipe or payload."""
+        signature = cls._build_signature(source)
+        return cls._fingerprint_from_signature(signature)
+
+    @classmethod
+    def refresh_recipe_fingerprint(cls, recipe: Recipe) -> RecipeFingerprint | None:
+        """Recompute and stage the stored fingerprint for one recipe (no commit)."""
+        if recipe is None or not getattr(recipe, "id", None):
+            return None
+        data = cls.build_fingerprint(recipe)
+        row = RecipeFingerprint.query.filter_by(recipe_id=recipe.id).first()
+        if row is None:
+            row = RecipeFingerprint(recipe_id=recipe.id)
+            db.session.add(row)
+        row.organization_id = recipe.organization_id
+        row.ingredient_set_hash = data.ingredient_set_hash
+        row.ratio_bucket_hash = data.ratio_bucket_hash
+        row.ingredient_count = data.ingredient_count
+        row.proportions = data.proportions
+        row.totals = data.totals
+        row.fingerprint_version = cls.FINGERPRINT_VERSION
+        return row
+
+    @classmethod
+    def ensure_fingerprints(
+        cls,
+        *,
+        organization_id: int | None = None,
+        recipe_filters: Sequence[Any] = (),
+        include_current: bool = False,
+        batch_size: int = 500,
+        commit: bool = True,
+    ) -> int:
+        """Backfill missing or stale fingerprints in scope; returns rows written.
+
+        With ``commit=False`` each batch is only flushed, so request-path
+        callers leave the rows to their own transaction.
+        """
+        query = (
+            db.session.query(Recipe.id)
+            .outerjoin(RecipeFingerprint, RecipeFingerprint.recipe_id == Recipe.id)
+            .filter(*recipe_filters)
+        )
+        if organization_id is not None:
+            query = query.filter(Recipe.organization_id == organization_id)
+        if not include_current:
+            query = query.filter(
+                or_(
+                    RecipeFingerprint.id.is_(None),
+                    RecipeFingerprint.fingerprint_version != cls.FINGERPRINT_VERSION,
+                )
+            )
+        recipe_ids = [row[0] for row in query.order_by(Recipe.id).all()]
+        written = 0
+        for start in range(0, len(recipe_ids), max(1, int(batch_size))):
+            chunk = recipe_ids[start : start + max(1, int(batch_size))]
+            recipes = (
+                Recipe.query.options(selectinload(Recipe.recipe_ingredients))
+                .filter(Recipe.id.in_(chunk))
+                .all()
+            )
+            for recipe in recipes:
+                if cls.refresh_recipe_fingerprint(recipe) is not None:
+                    written += 1
+            if commit:
+                db.session.commit()
+            else:
+                db.session.flush()
+        return written
+
+    @classmethod
+    def find_proportional_matches(
+        cls,
+        source: Recipe | Sequence[RecipeIngredient] | Sequence[Mapping] | None,
+        *,
+        organization_id: int | None = None,
+        include_public: bool = False,
+        recipe_filters: Sequence[Any] = (),
+        exclude_recipe_ids: Iterable[int] = (),
+        tolerance: float | None = None,
+        limit: int | None = None,
+    ) -> list[int]:
+        """Return ids of indexed recipes proportionally identical to ``source``.
+
+        Candidates come from the ingredient-set hash index (and the ratio
+        bucket index when the tolerance fits inside the bucket grid), so only
+        recipes sharing the same canonical ingredients are compared.
+        """
+        fingerprint = cls.build_fingerprint(source)
+        tol = cls.PROPORTION_TOLERANCE if tolerance is None else float(tolerance)
+
+        query = (
+            db.session.query(
+                RecipeFingerprint.recipe_id,
+                RecipeFingerprint.proportions,
+                RecipeFingerprint.totals,
+            )
+            .join(Recipe, Recipe.id == RecipeFingerprint.recipe_id)
+            .filter(
+                RecipeFingerprint.ingredient_set_hash == fingerprint.ingredient_set_hash,
+                RecipeFingerprint.fingerprint_version == cls.FINGERPRINT_VERSION,
+            )
+            .filter(*recipe_filters)
+        )
+        if organization_id is not None and include_public:
+            query = query.filter(
+                or_(
+                    RecipeFingerprint.organization_id == organization_id,
+                    Recipe.is_public.is_(True),
+                )
+            )
+        elif organization_id is not None:
+            query = query.filter(RecipeFingerprint.organization_id == organization_id)
+        elif include_public:
+            query = query.filter(Recipe.is_public.is_(True))
+
+        bucket_keys = cls._bucket_probe_keys(fingerprint.proportions, tol)
+        if bucket_keys:
+            query = query.filter(RecipeFingerprint.ratio_bucket_hash.in_(bucket_keys))
+
+        excluded = {int(rid) for rid in exclude_recipe_ids or () if rid}
+        if excluded:
+            query = query.filter(~RecipeFingerprint.recipe_id.in_(excluded))
+
+        source_signature = _RecipeSignature(
+            totals=fingerprint.totals, proportions=fingerprint.proportions
+        )
+        matches: list[int] = []
+        for recipe_id, proportions, totals in query.order_by(
+            RecipeFingerprint.recipe_id
+        ):
+            candidate = _RecipeSignature(
+                totals=dict(totals or {}), proportions=proportions or None
+            )
+            if cls._compare_signatures(source_signature, candidate, tolerance=tol):
+                matches.append(recipe_id)
+                if limit and len(matches) >= limit:
+                    break
+        return matches
+
+    @classmethod
+    def group_proportional_duplicates(
+        cls,
+        *,
+        organization_id: int | None = None,
+        include_public: bool = False,
+        tolerance: float | None = None,
+    ) -> list[list[int]]:
+        """Cluster indexed recipes into groups of proportional duplicates.
+
+        Rows are streamed in ingredient-set order, so comparisons only happen
+        inside each (typically tiny) set-hash block instead of across all pairs.
+        """
+        tol = cls.PROPORTION_TOLERANCE if tolerance is None else float(tolerance)
+        query = (
+            db.session.query(
+                RecipeFingerprint.recipe_id,
+                RecipeFingerprint.ingredient_set_hash,
+                RecipeFingerprint.proportions,
+                RecipeFingerprint.totals,
+            )
+            .join(Recipe, Recipe.id == RecipeFingerprint.recipe_id)
+            .filter(RecipeFingerprint.fingerprint_version == cls.FINGERPRINT_VERSION)
+        )
+        if organization_id is not None and include_public:
+            query = query.filter(
+                or_(
+                    RecipeFingerprint.organization_id == organization_id,
+                    Recipe.is_public.is_(True),
+                )
+            )
+        elif organization_id is not None:
+            query = query.filter(RecipeFingerprint.organization_id == organization_id)
+        elif include_public:
+            query = query.filter(Recipe.is_public.is_(True))
+
+        groups: list[list[int]] = []
+        rows = query.order_by(
+            RecipeFingerprint.ingredient_set_hash, RecipeFingerprint.recipe_id
+        )
+        for _set_hash, block in itertools.groupby(rows, key=lambda row: row[1]):
+            clusters: list[tuple[_RecipeSignature, list[int]]] = []
+            for recipe_id, _hash, proportions, totals in block:
+                signature = _RecipeSignature(
+                    totals=dict(totals or {}), proportions=proportions or None
+                )
+                for head, members in clusters:
+                    if cls._compare_signatures(head, signature, tolerance=tol):
+                        members.append(recipe_id)
+                        break
+                else:
+                    clusters.append((signature, [recipe_id]))
+            groups.extend(members for _head, members in clusters if len(members) > 1)
+        return groups
+
+    @classmethod
+    def _fingerprint_from_signature(
+        cls, signature: _RecipeSignature
+    ) -> RecipeFingerprintData:
+        keys = sorted(signature.totals.keys())
+        return RecipeFingerprintData(
+            ingredient_set_hash=cls._digest("|".join(keys)),
+            ratio_bucket_hash=cls._bucket_hash(
+                signature.proportions,
+                {
+                    key: cls._bucket_index(value)
+                    for key, value in (signature.proportions or {}).items()
+                },
+            ),
+            ingredient_count=len(keys),
+            proportions=signature.proportions,
+            totals=dict(signature.totals),
+        )
+
+    @classmethod
+    def _bucket_index(cls, value: float) -> int:
+        return int(math.floor(float(value) / cls.BUCKET_RESOLUTION + 0.5))
+
+    @classmethod
+    def _bucket_hash(
+        cls, proportions: dict[str, float] | None, buckets: Mapping[str, int]
+    ) -> str | None:
+        if not proportions:
+            return None
+        encoded = ";".join(f"{key}={buckets[key]}" for key in sorted(buckets))
+        return cls._digest(encoded)
+
+    @classmethod
+    def _bucket_probe_keys(
+        cls, proportions: dict[str, float] | None, tolerance: float
+    ) -> list[str] | None:
+        """Return every bucket hash a match within ``tolerance`` could occupy.
+
+        Returns None when the bucket index cannot narrow the search (no
+        proportions, tolerance wider than the grid, or too many boundary
+        neighbours), in which case callers rely on the ingredient-set block.
+        """
+        if not proportions or tolerance >= cls.BUCKET_RESOLUTION / 2:
+            return None
+        keys = sorted(proportions)
+        options: list[tuple[int, ...]] = []
+        combinations = 1
+        for key in keys:
+            value = float(proportions[key])
+            candidates = {
+                cls._bucket_index(value - tolerance),
+                cls._bucket_index(value),
+                cls._bucket_index(value + tolerance),
+            }
+            combinations *= len(candidates)
+            if combinations > cls.MAX_BUCKET_PROBES:
+                return None
+            options.append(tuple(sorted(candidates)))
+        return [
+            cls._bucket_hash(proportions, dict(zip(keys, combo)))
+            for combo in itertools.product(*options)
+        ]
+
+    @staticmethod
+    def _digest(value: str) -> str:
+        return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
     # -- Signature construction -------------------------------------------------
     @classmethod
     def _build_signature(
@@ -61,8 +373,14 @@ class RecipeProportionalityService:
         if not source:
             return _RecipeSignature(totals=totals, proportions=None)
 
-        for ing in cls._collect_ingredients(source):
-            inventory_item = cls._get_inventory_item(ing.item_id)
+        ingredients = list(cls._collect_ingredients(source))
+        context = _SignatureContext(
+            items=cls._load_inventory_items({ing.item_id for ing in ingredients}),
+            units={},
+            global_items={},
+        )
+        for ing in ingredients:
+            inventory_item = context.items.get(ing.item_id)
             if not inventory_item:
                 continue
 
@@ -70,6 +388,7 @@ class RecipeProportionalityService:
                 amount=ing.quantity,
                 unit_name=ing.unit,
                 inventory_item=inventory_item,
+                context=context,
             )
             if converted is None:
                 continue
@@ -77,6 +396,7 @@ class RecipeProportionalityService:
             canonical_key = cls._build_canonical_key(
                 inventory_item=inventory_item,
                 unit_basis=unit_basis or ing.unit,
+                context=context,
             )
             if not canonical_key:
                 continue
@@ -132,12 +452,18 @@ class RecipeProportionalityService:
     # -- Comparison -------------------------------------------------------------
     @classmethod
     def _compare_signatures(
-        cls, sig_a: _RecipeSignature, sig_b: _RecipeSignature
+        cls,
+        sig_a: _RecipeSignature,
+        sig_b: _RecipeSignature,
+        *,
+        tolerance: float | None = None,
     ) -> bool:
         if not sig_a.totals and not sig_b.totals:
             return True
         if bool(sig_a.proportions) and bool(sig_b.proportions):
-            return cls._compare_proportions(sig_a.proportions, sig_b.proportions)
+            return cls._compare_proportions(
+                sig_a.proportions, sig_b.proportions, tolerance=tolerance
+            )
         if bool(sig_a.proportions) != bool(sig_b.proportions):
             return False
         return cls._compare_totals(sig_a.totals, sig_b.totals)
@@ -147,11 +473,14 @@ class RecipeProportionalityService:
         cls,
         a: dict[str, float],
         b: dict[str, float],
+        *,
+        tolerance: float | None = None,
     ) -> bool:
+        tol = cls.PROPORTION_TOLERANCE if tolerance is None else tolerance
         if set(a.keys()) != set(b.keys()):
             return False
         for key in a.keys():
-            if abs(a[key] - b[key]) > cls.PROPORTION_TOLERANCE:
+            if abs(a[key] - b[key]) > tol:
                 return False
         return True
 
@@ -170,8 +499,15 @@ class RecipeProportionalityService:
 
     # -- Canonicalization helpers ----------------------------------------------
     @classmethod
-    def _get_inventory_item(cls, item_id: int) -> InventoryItem | None:
-        return db.session.get(InventoryItem, item_id)
+    def _load_inventory_items(cls, item_ids: set[int]) -> dict[int, InventoryItem]:
+        if not item_ids:
+            return {}
+        rows = (
+            InventoryItem.query.options(selectinload(InventoryItem.global_item))
+            .filter(InventoryItem.id.in_(sorted(item_ids)))
+            .all()
+        )
+        return {row.id: row for row in rows}
 
     @classmethod
     def _build_canonical_key(
@@ -179,13 +515,16 @@ class RecipeProportionalityService:
         *,
         inventory_item: InventoryItem,
         unit_basis: str,
+        context: _SignatureContext | None = None,
     ) -> str | None:
         canonical = None
         try:
             if inventory_item.global_item_id:
                 canonical = f"global:{inventory_item.global_item_id}"
             else:
-                global_item = cls._lookup_global_item_by_name(inventory_item.name)
+                global_item = cls._lookup_global_item_cached(
+                    inventory_item.name, context
+                )
                 if global_item:
                     canonical = f"global:{global_item.id}"
         except Exception as exc:  # pragma: no cover - defensive
@@ -196,6 +535,17 @@ class RecipeProportionalityService:
         normalized_unit = (unit_basis or "").strip().lower() or "unit"
         return f"{canonical}|{normalized_unit}"
 
+    @classmethod
+    def _lookup_global_item_cached(
+        cls, name: str | None, context: _SignatureContext | None
+    ) -> GlobalItem | None:
+        if context is None:
+            return cls._lookup_global_item_by_name(name)
+        normalized = cls._normalize_name(name)
+        if normalized not in context.global_items:
+            context.global_items[normalized] = cls._lookup_global_item_by_name(name)
+        return context.global_items[normalized]
+
     @classmethod
     def _lookup_global_item_by_name(cls, name: str | None) -> GlobalItem | None:
         normalized = cls._normalize_name(name)
@@ -235,8 +585,9 @@ class RecipeProportionalityService:
         amount: float,
         unit_name: str,
         inventory_item: InventoryItem,
+        context: _SignatureContext | None = None,
     ) -> tuple[float, str] | None:
-        target_unit, unit_type = cls._determine_target_unit(unit_name)
+        target_unit, unit_type = cls._determine_target_unit(unit_name, context)
         if target_unit == unit_name:
             return amount, target_unit
 
@@ -264,8 +615,16 @@ class RecipeProportionalityService:
         return float(converted_value), target_unit
 
     @classmethod
-    def _determine_target_unit(cls, unit_name: str) -> tuple[str, str | None]:
-        unit = cls._get_unit(unit_name)
+    def _determine_target_unit(
+        cls, unit_name: str, context: _SignatureContext | None = None
+    ) -> tuple[str, str | None]:
+        if context is None:
+            unit = cls._get_unit(unit_name)
+        else:
+            cache_key = (unit_name or "").strip().lower()
+            if cache_key not in context.units:
+                context.units[cache_key] = cls._get_unit(unit_name)
+            unit = context.units[cache_key]
         if not unit:
             return unit_name, None
         unit_type = (unit.unit_type or "").lower()
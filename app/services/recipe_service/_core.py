@@ -20,8 +20,10 @@ from ...extensions import db
 from ...models import Batch, InventoryItem, Recipe, RecipeGroup, RecipeIngredient
 from ...models.db_dialect import is_postgres
 from ...models.recipe import RecipeConsumable
+from ...models.recipe_fingerprint import RecipeFingerprint
 from ...services.analytics_tracking_service import AnalyticsTrackingService
 from ...services.lineage_service import generate_group_prefix, generate_variation_prefix
+from ...services.recipe_proportionality_service import RecipeProportionalityService
 from ...utils.code_generator import generate_recipe_prefix
 from ...utils.notes import append_timestamped_note
 from ...utils.recipe_batch_counts import count_batches_for_recipe
@@ -143,6 +145,19 @@ def _is_retryable_group_insert_error(exc: OperationalError) -> bool:
     )
 
 
+# --- Refresh proportion fingerprint ---
+# Purpose: Recompute the stored fingerprint after a recipe save without failing the save.
+# Inputs: Persisted Recipe model.
+# Outputs: None; commits the fingerprint row or rolls back on failure.
+def _refresh_recipe_fingerprint(recipe: Recipe) -> None:
+    try:
+        RecipeProportionalityService.refresh_recipe_fingerprint(recipe)
+        db.session.commit()
+    except Exception:
+        logger.warning("Suppressed exception fallback at app/services/recipe_service/_core.py:157", exc_info=True)
+        db.session.rollback()
+
+
 # --- Derive variation name ---
 # Purpose: Derive a variation display name.
 # Inputs: Candidate recipe name and optional parent recipe name.
@@ -691,6 +706,7 @@ def create_recipe(
             lineage_source_id = cloned_from_id
 
         _log_lineage_event(recipe, lineage_event, lineage_source_id)
+        _refresh_recipe_fingerprint(recipe)
         logger.info(f"Created recipe {recipe.id}: {name}")
 
         # Emit recipe_created
@@ -1153,6 +1169,8 @@ def update_recipe(
             _log_lineage_event(recipe, event_type, notes=stamped)
 
         db.session.commit()
+        if "ingredients" in change_fields:
+            _refresh_recipe_fingerprint(recipe)
         logger.info(f"Updated recipe {recipe_id}: {recipe.name}")
 
         # Emit recipe_updated
@@ -1214,6 +1232,7 @@ def delete_recipe(recipe_id: int) -> Tuple[bool, str]:
 
         # Delete ingredients first (foreign key constraint)
         RecipeIngredient.query.filter_by(recipe_id=recipe_id).delete()
+        RecipeFingerprint.query.filter_by(recipe_id=recipe_id).delete()
 
         # Delete recipe
         db.session.delete(recipe)
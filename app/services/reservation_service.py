@@ -26,7 +26,12 @@ class ReservationService:
                 reservation.source_fifo_id,
                 reservation.quantity,
                 notes=f"Released reservation → credit back lot #{reservation.source_fifo_id}",
-                created_by=current_user.id if current_user.is_authenticated else None,
+                # current_user is unset when the scheduler persists POS releases
+                created_by=(
+                    current_user.id
+                    if getattr(current_user, "is_authenticated", False)
+                    else None
+                ),
             )
             return success
         except Exception as e:
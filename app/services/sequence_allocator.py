@@ -0,0 +1,144 @@
+"""Block allocation for per-organization code sequences.
+
+Synopsis:
+Reserves blocks of sequence numbers from counter rows (batch labels per
+org/year, inventory lot/event codes per org/prefix) with a single upsert ...
+RETURNING inside the caller's transaction, then hands numbers out of the block
+kept on the session. A rollback undoes the reservation and drops the block,
+so rolled-back numbers are handed out again and a block size of 1 keeps
+numbering consecutive. With larger blocks, numbers still unused when the
+session ends are skipped, so sequences can have gaps.
+
+Glossary:
+- Counter row: Table row holding the last allocated number for one key.
+- Block: Contiguous range of numbers reserved by one counter round trip.
+- Session block: Reserved range stored on ``session.info`` until rollback or
+  the session ends.
+"""
+
+from __future__ import annotations
+
+import logging
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models.db_dialect import is_postgres
+from app.utils.timezone_utils import TimezoneUtils
+
+logger = logging.getLogger(__name__)
+
+_SESSION_INFO_KEY = "sequence_blocks"
+
+
+# --- SequenceCounter ---
+# Purpose: Describe one counter table keyed by (organization_id, key column).
+@dataclass(frozen=True)
+class SequenceCounter:
+    name: str
+    model: Any
+    key_column: str
+    value_column: str
+    block_size_setting: str
+    default_block_size: int
+
+
+class SequenceAllocator:
+    """Hand out per-org sequence numbers from reserved blocks."""
+
+    # --- Next value ---
+    # Purpose: Return the next number for (counter, org, key).
+    # Inputs: SequenceCounter, organization id, key value (year, prefix).
+    # Outputs: Positive integer unique for that counter key.
+    @classmethod
+    def next_value(cls, counter: SequenceCounter, organization_id: int, key: Any) -> int:
+        return cls.next_values(counter, organization_id, key, 1)[0]
+
+    # --- Next values ---
+    # Purpose: Return ``count`` numbers, topping up the block as needed.
+    # Inputs: SequenceCounter, organization id, key value, count.
+    # Outputs: List of increasing integers.
+    @classmethod
+    def next_values(
+        cls, counter: SequenceCounter, organization_id: int, key: Any, count: int
+    ) -> List[int]:
+        block_key = (counter.name, int(organization_id), key)
+        blocks = cls._block_store()
+        values: List[int] = []
+        while len(values) < count:
+            block = blocks.get(block_key)
+            if block and block[0] <= block[1]:
+                take = min(count - len(values), block[1] - block[0] + 1)
+                values.extend(range(block[0], block[0] + take))
+                block[0] += take
+                continue
+            size = max(cls._block_size(counter), count - len(values))
+            first, last = cls._reserve_block(counter, organization_id, key, size)
+            blocks[block_key] = [first, last]
+        return values
+
+    @staticmethod
+    def _block_store() -> Dict[Tuple[str, int, Any], List[int]]:
+        return db.session.info.setdefault(_SESSION_INFO_KEY, {})
+
+    @staticmethod
+    def _block_size(counter: SequenceCounter) -> int:
+        value = None
+        if has_app_context():
+            value = current_app.config.get(counter.block_size_setting)
+        try:
+            return max(1, int(value if value is not None else counter.default_block_size))
+        except (TypeError, ValueError):
+            return max(1, counter.default_block_size)
+
+    # --- Reserve block ---
+    # Purpose: Advance the counter row by ``size`` in one upsert ... RETURNING.
+    # Inputs: Counter, org id, key, block size.
+    # Outputs: (first, last) inclusive range now owned by the session.
+    @staticmethod
+    def _reserve_block(
+        counter: SequenceCounter, organization_id: int, key: Any, size: int
+    ) -> Tuple[int, int]:
+        table = counter.model.__table__
+        now = TimezoneUtils.utc_now()
+        insert = pg_insert if is_postgres() else sqlite_insert
+        stmt = (
+            insert(table)
+            .values(
+                organization_id=organization_id,
+                created_at=now,
+                updated_at=now,
+                **{counter.key_column: key, counter.value_column: size},
+            )
+            .on_conflict_do_update(
+                index_elements=["organization_id", counter.key_column],
+                set_={
+                    counter.value_column: table.c[counter.value_column] + size,
+                    "updated_at": now,
+                },
+            )
+            .returning(table.c[counter.value_column])
+        )
+        # Runs in the caller's transaction: no second pooled connection, and a
+        # rollback returns the numbers instead of burning them. On PostgreSQL a
+        # savepoint keeps a failed upsert from aborting the caller's transaction;
+        # SQLite statements fail without poisoning it (and pysqlite savepoints
+        # would commit the reservation on release).
+        guard = db.session.begin_nested() if is_postgres() else nullcontext()
+        with guard:
+            last = int(db.session.execute(stmt).scalar_one())
+        return last - size + 1, last
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_session_blocks(session, previous_transaction):
+    # In-session reservations roll back with the transaction; forget them so
+    # the same numbers are never handed out twice.
+    session.info.pop(_SESSION_INFO_KEY, None)
@@ -3,18 +3,28 @@
 Synopsis:
 Builds customer-facing tier payloads used by signup and checkout surfaces.
 Combines billing price data, permission/add-on entitlements, and tier
-presentation outputs into a concise view model.
+presentation outputs into a concise view model. Built payloads and the free
+tier lookup are kept in a per-app snapshot for one pricing catalog version, so
+repeat builds skip the permission/add-on loads and Stripe price lookups.
 
 Glossary:
 - Available tier payload: JSON-serializable plan dictionary used by templates.
 - Presentation features: Customer-facing single-tier feature list from tier rules.
+- Plan catalog snapshot: Per-tier payloads and the free tier id for one catalog
+  version, dropped when the version moves or the TTL elapses.
 """
 
 from __future__ import annotations
 import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from flask import current_app
 
 from ..models.subscription_tier import SubscriptionTier
 from .billing_service import BillingService
+from .cache_invalidation import pricing_catalog_cache_key
 from .lifetime_pricing_service import LifetimePricingService
 from .tier_marketing_copy import build_marketing_copy
 from .tier_presentation import TierPresentationCore
@@ -22,6 +32,21 @@ from .tier_presentation.helpers import coerce_int, normalize_token_set
 
 logger = logging.getLogger(__name__)
 
+_SNAPSHOT_EXTENSION_KEY = "signup_plan_catalog"
+_DEFAULT_CATALOG_TTL_SECONDS = 300
+_UNSET = object()
+
+
+@dataclass
+class SignupPlanCatalogSnapshot:
+    """Built tier payloads and the free tier id for one catalog version."""
+
+    version_key: str
+    built_at: float
+    tier_payloads: dict[tuple[str, tuple[bool, bool, bool]], dict] = field(
+        default_factory=dict
+    )
+    free_tier_id: Any = _UNSET
 
 
 # --- Signup plan catalog service ---
@@ -34,6 +59,93 @@ class SignupPlanCatalogService:
     _tier_presentation = TierPresentationCore()
     _SIGNUP_PRESENTATION_FEATURE_LIMIT = 9
 
+    # --- Catalog TTL ---
+    # Purpose: Bound how long built catalogs outlive Stripe price edits.
+    # Outputs: Seconds from `PUBLIC_PRICING_CATALOG_TTL` (default 300).
+    @staticmethod
+    def catalog_ttl_seconds() -> float:
+        # Stripe price edits fire no model events; the TTL bounds how long they take to show.
+        try:
+            return max(
+                0.0,
+                float(
+                    current_app.config.get(
+                        "PUBLIC_PRICING_CATALOG_TTL", _DEFAULT_CATALOG_TTL_SECONDS
+                    )
+                ),
+            )
+        except (TypeError, ValueError):
+            return float(_DEFAULT_CATALOG_TTL_SECONDS)
+
+    # --- Catalog snapshot ---
+    # Purpose: Hold built payloads in process until the catalog version moves.
+    # Outputs: Snapshot for the current pricing catalog version.
+    @classmethod
+    def _current_snapshot(cls) -> SignupPlanCatalogSnapshot:
+        version_key = pricing_catalog_cache_key()
+        now = time.monotonic()
+        snapshot = current_app.extensions.get(_SNAPSHOT_EXTENSION_KEY)
+        if (
+            snapshot is None
+            or snapshot.version_key != version_key
+            or now - snapshot.built_at >= cls.catalog_ttl_seconds()
+        ):
+            snapshot = SignupPlanCatalogSnapshot(version_key=version_key, built_at=now)
+            current_app.extensions[_SNAPSHOT_EXTENSION_KEY] = snapshot
+        return snapshot
+
+    # --- Snapshot free tier id ---
+    # Purpose: Resolve the customer-facing free tier once per catalog version.
+    # Outputs: Tier id string, or "" when no free tier qualifies.
+    @classmethod
+    def snapshot_free_tier_id(cls) -> str:
+        snapshot = cls._current_snapshot()
+        if snapshot.free_tier_id is _UNSET:
+            free_tier = cls.load_customer_facing_free_tier()
+            snapshot.free_tier_id = (
+                str(getattr(free_tier, "id", "") or "") if free_tier else ""
+            )
+        return snapshot.free_tier_id
+
+    # --- Snapshot available tiers ---
+    # Purpose: Serve per-tier payloads from the snapshot, building only missing tiers.
+    # Inputs: Tier rows and the same pricing options as `build_available_tiers_payload`.
+    # Outputs: Mapping keyed by tier id in `db_tiers` order; callers must not mutate it.
+    @classmethod
+    def snapshot_available_tiers_payload(
+        cls,
+        db_tiers,
+        *,
+        include_live_pricing: bool = True,
+        allow_live_pricing_network: bool = True,
+        include_yearly_pricing: bool = True,
+    ) -> dict[str, dict]:
+        snapshot = cls._current_snapshot()
+        options = (
+            bool(include_live_pricing),
+            bool(allow_live_pricing_network),
+            bool(include_yearly_pricing),
+        )
+        missing = [
+            tier_obj
+            for tier_obj in db_tiers
+            if (str(tier_obj.id), options) not in snapshot.tier_payloads
+        ]
+        if missing:
+            built = cls.build_available_tiers_payload(
+                missing,
+                include_live_pricing=include_live_pricing,
+                allow_live_pricing_network=allow_live_pricing_network,
+                include_yearly_pricing=include_yearly_pricing,
+            )
+            for tier_id, tier_payload in built.items():
+                snapshot.tier_payloads[(tier_id, options)] = tier_payload
+        return {
+            str(tier_obj.id): snapshot.tier_payloads[(str(tier_obj.id), options)]
+            for tier_obj in db_tiers
+            if (str(tier_obj.id), options) in snapshot.tier_payloads
+        }
+
     @staticmethod
     def load_customer_facing_tiers() -> list[SubscriptionTier]:
         return (
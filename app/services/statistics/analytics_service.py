@@ -101,7 +101,6 @@ class AnalyticsDataService:
         "recent_activity": 30,
         "items_list": 300,
         "global_item_rollup": 300,
-        "cost_distribution": 180,
         "organization": 60,
         "system": 60,
         "waitlist": 60,
@@ -540,16 +539,11 @@ class AnalyticsDataService:
     def get_cost_distribution(
         cls, global_item_id: int, *, force_refresh: bool = False
     ) -> Dict[str, Optional[float]]:
-        """Cost distribution for a global item (reuses global stats service)."""
+        """Cost distribution for a global item (precomputed single-row read)."""
 
-        cache_key = cls._cache_key(f"cost_distribution:{global_item_id}")
-        cached = cls._get_cached(cache_key, force_refresh)
-        if cached is not None:
-            return cached
-
-        result = GlobalItemStatsService.get_cost_distribution(global_item_id)
-        cls._store_cache(cache_key, result)
-        return result
+        return GlobalItemStatsService.get_cost_distribution(
+            global_item_id, force_refresh=force_refresh
+        )
 
     @classmethod
     def get_organization_dashboard(
@@ -1,16 +1,29 @@
 """Global item statistics service.
 
 Synopsis:
-Aggregate adoption, cost, and expiration metrics for global items.
+Aggregate adoption, cost, and expiration metrics for global items. Cost
+distributions are precomputed per global item (quantiles via `percentile_cont`
+on PostgreSQL, NumPy elsewhere) and served from `GlobalItemCostStats`.
 
 Glossary:
 - Global item rollup: Aggregate metrics across all orgs.
 - Cost distribution: Unit cost spread across lots.
 """
 
+import logging
+
+import sqlalchemy as sa
 from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.models import InventoryItem, InventoryLot, RecipeIngredient, db
+from app.models.global_item_cost_stats import GlobalItemCostStats
+from app.utils.timezone_utils import TimezoneUtils
+
+logger = logging.getLogger(__name__)
+
+COST_QUANTILES = (0.10, 0.25, 0.50, 0.75, 0.90)
+COST_HISTOGRAM_BINS = 10
 
 
 # --- Global item stats ---
@@ -107,101 +120,246 @@ class GlobalItemStatsService:
             ),
         }
 
-    @staticmethod
-    def get_cost_distribution(global_item_id: int) -> dict:
-        """Compute cost distribution across all orgs for a global item using InventoryLot.unit_cost.
-        Rules:
-        - Include only lots where unit_cost > 0
-        - Derive non-outlier stats via IQR (exclude values < Q1 - 1.5*IQR or > Q3 + 1.5*IQR)
-        - Return mean (trimmed), low/high (non-outlier bounds), min/max, counts and a simple histogram
+    @classmethod
+    def get_cost_distribution(
+        cls, global_item_id: int, *, force_refresh: bool = False
+    ) -> dict:
+        """Return the precomputed cost distribution for a global item.
+
+        Reads one `GlobalItemCostStats` row. Rows flagged stale by lot/item
+        listeners are served as-is until the `global_items.refresh_cost_stats`
+        scheduler job (or the refresh-global-item-cost-stats command) recomputes
+        them, so reads never write. An item with no row yet is computed without
+        being stored; `force_refresh` recomputes and persists explicitly.
+        Rules are unchanged: only lots with unit_cost > 0 count, outliers are
+        outside the Q1/Q3 1.5*IQR fences, and the histogram has ten bins across
+        the non-outlier range.
         """
-        # Collect costs
-        cost_rows = (
-            db.session.query(InventoryLot.unit_cost)
+        row = GlobalItemCostStats.query.filter_by(
+            global_item_id=global_item_id
+        ).first()
+        if force_refresh:
+            return cls.refresh_cost_distribution(global_item_id, row=row)
+        if row is not None:
+            return row.to_distribution()
+        return GlobalItemCostStats(
+            global_item_id=global_item_id,
+            **cls._compute_cost_distribution(global_item_id),
+        ).to_distribution()
+
+    @classmethod
+    def refresh_cost_distribution(
+        cls, global_item_id: int, *, row: GlobalItemCostStats | None = None
+    ) -> dict:
+        """Recompute and persist one global item's cost distribution."""
+        values = cls._compute_cost_distribution(global_item_id)
+        try:
+            if row is None:
+                row = GlobalItemCostStats.query.filter_by(
+                    global_item_id=global_item_id
+                ).first()
+            if row is None:
+                row = GlobalItemCostStats(global_item_id=global_item_id)
+                db.session.add(row)
+            for key, value in values.items():
+                setattr(row, key, value)
+            row.is_stale = False
+            row.computed_at = TimezoneUtils.utc_now()
+            db.session.commit()
+            return row.to_distribution()
+        except SQLAlchemyError:
+            # Concurrent refresh or read-only session: serve the computed values.
+            logger.warning(
+                "Suppressed exception fallback at app/services/statistics/global_item_stats.py:163",
+                exc_info=True,
+            )
+            db.session.rollback()
+            return GlobalItemCostStats(
+                global_item_id=global_item_id, **values
+            ).to_distribution()
+
+    @classmethod
+    def refresh_stale_cost_distributions(
+        cls, *, include_fresh: bool = False, limit: int | None = None
+    ) -> int:
+        """Recompute stale (or all) stored distributions plus items with no row yet."""
+        query = (
+            db.session.query(InventoryItem.global_item_id)
+            .filter(InventoryItem.global_item_id.isnot(None))
+            .distinct()
+        )
+        if not include_fresh:
+            stored_fresh = db.session.query(GlobalItemCostStats.global_item_id).filter(
+                GlobalItemCostStats.is_stale.is_(False)
+            )
+            query = query.filter(InventoryItem.global_item_id.notin_(stored_fresh))
+        global_item_ids = [gid for (gid,) in query.limit(limit).all()]
+        if not include_fresh and (limit is None or len(global_item_ids) < limit):
+            # Rows whose last linked item was unlinked are stale but unreachable above.
+            orphaned = db.session.query(GlobalItemCostStats.global_item_id).filter(
+                GlobalItemCostStats.is_stale.is_(True),
+                GlobalItemCostStats.global_item_id.notin_(global_item_ids),
+            )
+            if limit is not None:
+                orphaned = orphaned.limit(limit - len(global_item_ids))
+            global_item_ids += [gid for (gid,) in orphaned.all()]
+        for global_item_id in global_item_ids:
+            cls.refresh_cost_distribution(global_item_id)
+        return len(global_item_ids)
+
+    # -- Distribution engine ----------------------------------------------------
+    @classmethod
+    def _compute_cost_distribution(cls, global_item_id: int) -> dict:
+        costs = (
+            sa.select(InventoryLot.unit_cost.label("cost"))
             .join(InventoryItem, InventoryLot.inventory_item_id == InventoryItem.id)
-            .filter(
+            .where(
                 InventoryItem.global_item_id == global_item_id,
                 InventoryLot.unit_cost.isnot(None),
                 InventoryLot.unit_cost > 0,
             )
-            .all()
         )
+        if db.session.get_bind().dialect.name == "postgresql":
+            return cls._compute_with_sql(costs.cte("lot_costs"))
+        return cls._compute_with_numpy(db.session.execute(costs).scalars().all())
 
-        costs = [float(r[0]) for r in cost_rows if r and r[0] is not None]
-        if not costs:
-            return {
-                "count": 0,
-                "mean_ex_outliers": None,
-                "low": None,
-                "high": None,
-                "min": None,
-                "max": None,
-                "outliers_low_count": 0,
-                "outliers_high_count": 0,
-                "histogram": [],
-            }
-
-        costs.sort()
-
-        def percentile(sorted_vals, p):
-            if not sorted_vals:
-                return None
-            n = len(sorted_vals)
-            k = (n - 1) * p
-            f = int(k)
-            c = min(f + 1, n - 1)
-            if f == c:
-                return sorted_vals[int(k)]
-            return sorted_vals[f] + (sorted_vals[c] - sorted_vals[f]) * (k - f)
-
-        q1 = percentile(costs, 0.25)
-        q3 = percentile(costs, 0.75)
-        iqr = (q3 - q1) if (q1 is not None and q3 is not None) else 0
-        lower_fence = q1 - 1.5 * iqr if q1 is not None else None
-        upper_fence = q3 + 1.5 * iqr if q3 is not None else None
-
-        non_outliers = [
-            v
-            for v in costs
-            if (lower_fence is None or v >= lower_fence)
-            and (upper_fence is None or v <= upper_fence)
-        ]
-        outliers_low = [v for v in costs if lower_fence is not None and v < lower_fence]
-        outliers_high = [
-            v for v in costs if upper_fence is not None and v > upper_fence
-        ]
-
-        trimmed_mean = sum(non_outliers) / len(non_outliers) if non_outliers else None
-        low = min(non_outliers) if non_outliers else None
-        high = max(non_outliers) if non_outliers else None
-        min_v = min(costs)
-        max_v = max(costs)
-
-        # Build a simple histogram with 10 bins across non-outlier range (fallback to full range if needed)
-        hist = []
-        if non_outliers and (high is not None) and (low is not None) and high > low:
-            bins = 10
-            width = (high - low) / bins
-            for i in range(bins):
-                start = low + i * width
-                end = start + width if i < bins - 1 else high
-                count = len(
-                    [
-                        v
-                        for v in non_outliers
-                        if (v >= start and (v < end or (i == bins - 1 and v <= end)))
-                    ]
-                )
-                hist.append({"bin_start": start, "bin_end": end, "count": count})
+    @staticmethod
+    def _empty_distribution() -> dict:
+        return {
+            "sample_count": 0,
+            "min_cost": None,
+            "max_cost": None,
+            "p10": None,
+            "q1": None,
+            "median": None,
+            "q3": None,
+            "p90": None,
+            "lower_fence": None,
+            "upper_fence": None,
+            "mean_ex_outliers": None,
+            "low": None,
+            "high": None,
+            "outliers_low_count": 0,
+            "outliers_high_count": 0,
+            "histogram": [],
+        }
+
+    @staticmethod
+    def _histogram_bins(low: float, high: float, counts) -> list[dict]:
+        width = (high - low) / COST_HISTOGRAM_BINS
+        bins = []
+        for index, count in enumerate(counts):
+            start = low + index * width
+            end = start + width if index < COST_HISTOGRAM_BINS - 1 else high
+            bins.append({"bin_start": start, "bin_end": end, "count": int(count)})
+        return bins
+
+    @classmethod
+    def _compute_with_sql(cls, costs) -> dict:
+        cost = costs.c.cost
+        quantiles = db.session.execute(
+            sa.select(
+                func.count(),
+                func.min(cost),
+                func.max(cost),
+                *(
+                    func.percentile_cont(fraction).within_group(cost.asc())
+                    for fraction in COST_QUANTILES
+                ),
+            )
+        ).one()
+        count = int(quantiles[0] or 0)
+        if not count:
+            return cls._empty_distribution()
+        p10, q1, median, q3, p90 = (float(value) for value in quantiles[3:])
+        iqr = q3 - q1
+        lower_fence = q1 - 1.5 * iqr
+        upper_fence = q3 + 1.5 * iqr
+
+        in_range = cost.between(lower_fence, upper_fence)
+        trimmed = db.session.execute(
+            sa.select(
+                func.count().filter(cost < lower_fence),
+                func.count().filter(cost > upper_fence),
+                func.avg(cost).filter(in_range),
+                func.min(cost).filter(in_range),
+                func.max(cost).filter(in_range),
+            )
+        ).one()
+        low = float(trimmed[3]) if trimmed[3] is not None else None
+        high = float(trimmed[4]) if trimmed[4] is not None else None
+
+        histogram = []
+        if low is not None and high is not None and high > low:
+            bucket = func.least(
+                func.width_bucket(cost, low, high, COST_HISTOGRAM_BINS),
+                COST_HISTOGRAM_BINS,
+            )
+            counts = [0] * COST_HISTOGRAM_BINS
+            for bucket_no, bucket_count in db.session.execute(
+                sa.select(bucket, func.count()).where(in_range).group_by(bucket)
+            ):
+                counts[int(bucket_no) - 1] = int(bucket_count)
+            histogram = cls._histogram_bins(low, high, counts)
+
+        return {
+            "sample_count": count,
+            "min_cost": float(quantiles[1]),
+            "max_cost": float(quantiles[2]),
+            "p10": p10,
+            "q1": q1,
+            "median": median,
+            "q3": q3,
+            "p90": p90,
+            "lower_fence": lower_fence,
+            "upper_fence": upper_fence,
+            "mean_ex_outliers": float(trimmed[2]) if trimmed[2] is not None else None,
+            "low": low,
+            "high": high,
+            "outliers_low_count": int(trimmed[0] or 0),
+            "outliers_high_count": int(trimmed[1] or 0),
+            "histogram": histogram,
+        }
+
+    @classmethod
+    def _compute_with_numpy(cls, costs) -> dict:
+        import numpy as np  # deferred: keeps NumPy out of worker boot
+
+        values = np.asarray(costs, dtype=float)
+        if values.size == 0:
+            return cls._empty_distribution()
+        p10, q1, median, q3, p90 = np.percentile(
+            values, [fraction * 100.0 for fraction in COST_QUANTILES]
+        ).tolist()
+        iqr = q3 - q1
+        lower_fence = q1 - 1.5 * iqr
+        upper_fence = q3 + 1.5 * iqr
+        kept = values[(values >= lower_fence) & (values <= upper_fence)]
+        low = float(kept.min()) if kept.size else None
+        high = float(kept.max()) if kept.size else None
+
+        histogram = []
+        if low is not None and high is not None and high > low:
+            counts, _edges = np.histogram(
+                kept, bins=COST_HISTOGRAM_BINS, range=(low, high)
+            )
+            histogram = cls._histogram_bins(low, high, counts.tolist())
 
         return {
-            "count": len(costs),
-            "mean_ex_outliers": trimmed_mean,
+            "sample_count": int(values.size),
+            "min_cost": float(values.min()),
+            "max_cost": float(values.max()),
+            "p10": p10,
+            "q1": q1,
+            "median": median,
+            "q3": q3,
+            "p90": p90,
+            "lower_fence": lower_fence,
+            "upper_fence": upper_fence,
+            "mean_ex_outliers": float(kept.mean()) if kept.size else None,
             "low": low,
             "high": high,
-            "min": min_v,
-            "max": max_v,
-            "outliers_low_count": len(outliers_low),
-            "outliers_high_count": len(outliers_high),
-            "histogram": hist,
+            "outliers_low_count": int((values < lower_fence).sum()),
+            "outliers_high_count": int((values > upper_fence).sum()),
+            "histogram": histogram,
         }
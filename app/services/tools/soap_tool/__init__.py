@@ -8,6 +8,8 @@ Glossary:
 - Soap tool compute: End-to-end calculation bundle for the public soap UI.
 """
 
+from importlib import import_module
+
 from ._advisory import run_quality_nudge
 from ._catalog import get_bulk_catalog_page
 from ._core import SoapToolComputationService
@@ -16,10 +18,30 @@ from ._policy import get_soap_tool_policy
 from ._recipe_payload import build_soap_recipe_payload
 from .types import SoapToolComputeRequest
 
+# NumPy-backed entry points load on first access so importing the package
+# (done by the public tools blueprint at boot) does not pull in NumPy.
+_LAZY_EXPORTS = {
+    "compute_batch_metrics": "._batch",
+    "optimize_oil_blend": "._optimizer",
+    "MAX_OPTIMIZER_OILS": "._optimizer",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 __all__ = [
     "SoapToolComputationService",
     "SoapToolComputeRequest",
     "run_quality_nudge",
+    "compute_batch_metrics",
+    "optimize_oil_blend",
+    "MAX_OPTIMIZER_OILS",
     "compute_lye_water_values",
     "get_bulk_catalog_page",
     "get_soap_tool_policy",
@@ -0,0 +1,389 @@
+"""Vectorized batch computation for many soap formulas.
+
+Synopsis:
+Computes lye/water totals, fatty-acid percentages, iodine/INS, and quality
+metrics for many formulas at once using NumPy matrices (formulas x oils grams,
+oils x SAP, oils x fatty acids). Results mirror the scalar
+`compute_lye_water` + citric reconciliation + `build_quality_report` numbers
+to floating-point rounding; text warnings, tips, and exports stay scalar-only.
+
+Glossary:
+- Oil column: One distinct oil (SAP, iodine, fatty profile) shared across formulas.
+- Grams matrix: Formulas x oil-columns grid of positive oil weights.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+
+from ._lye_water import (
+    DEFAULT_KOH_FALLBACK_PER_G,
+    DEFAULT_NAOH_FALLBACK_PER_G,
+    NAOH_FACTOR_FROM_KOH_SAP,
+    normalize_lye_water_settings,
+    normalize_sap_koh,
+)
+from ._policy import CITRIC_LYE_FACTORS
+from .types import (
+    SoapToolComputeRequest,
+    _clamp,
+    _fatty_profile,
+    _text,
+    _to_float,
+)
+
+SATURATED_ACIDS = ("lauric", "myristic", "palmitic", "stearic")
+UNSATURATED_ACIDS = ("ricinoleic", "oleic", "linoleic", "linolenic")
+QUALITY_ACIDS = {
+    "hardness": ("lauric", "myristic", "palmitic", "stearic"),
+    "cleansing": ("lauric", "myristic"),
+    "conditioning": ("oleic", "linoleic", "linolenic", "ricinoleic"),
+    "bubbly": ("lauric", "myristic", "ricinoleic"),
+    "creamy": ("palmitic", "stearic", "ricinoleic"),
+}
+
+
+# --- Safe vector division ---
+# Purpose: Divide arrays elementwise, returning zero where the guard is false.
+# Inputs: Numerator, denominator, and boolean guard arrays.
+# Outputs: Float array.
+def _safe_divide(numerator, denominator, where) -> np.ndarray:
+    numerator = np.asarray(numerator, dtype=float)
+    out = np.zeros(np.broadcast(numerator, denominator).shape, dtype=float)
+    np.divide(numerator, denominator, out=out, where=where)
+    return out
+
+
+# --- Batch formula row ---
+# Purpose: Hold the numeric inputs one formula contributes to the batch matrices.
+# Inputs: Oil tuples (grams, sap_koh, iodine, fatty profile) plus lye/water settings.
+# Outputs: Immutable formula row.
+@dataclass(frozen=True)
+class _FormulaRow:
+    oils: tuple[tuple[float, float, float, dict[str, float]], ...]
+    settings: dict
+    citric_pct: float
+
+
+# --- Request row adapter ---
+# Purpose: Convert a normalized compute request into a batch formula row.
+# Inputs: Soap compute request.
+# Outputs: Batch formula row.
+def _row_from_request(request: SoapToolComputeRequest) -> _FormulaRow:
+    return _FormulaRow(
+        oils=tuple(
+            (oil.grams, oil.sap_koh, oil.iodine, oil.fatty_profile)
+            for oil in request.oils
+        ),
+        settings=normalize_lye_water_settings(
+            selected=request.lye.selected,
+            superfat_pct=request.lye.superfat,
+            purity_pct=request.lye.purity,
+            water_method=request.water.method,
+            water_pct=request.water.water_pct,
+            lye_concentration_input_pct=request.water.lye_concentration,
+            water_ratio_input=request.water.water_ratio,
+        ),
+        citric_pct=_clamp(request.additives.citric_pct, 0.0, 100.0),
+    )
+
+
+# --- Payload row adapter ---
+# Purpose: Read only the numeric fields the batch needs from a raw payload.
+# Inputs: Raw soap tool payload mapping.
+# Outputs: Batch formula row sanitized exactly like SoapToolComputeRequest.
+def _row_from_payload(payload: Mapping[str, Any] | None) -> _FormulaRow:
+    payload = payload if isinstance(payload, Mapping) else {}
+    oils_raw = payload.get("oils")
+    lye = payload.get("lye")
+    water = payload.get("water")
+    additives = payload.get("additives")
+    lye = lye if isinstance(lye, Mapping) else {}
+    water = water if isinstance(water, Mapping) else {}
+    additives = additives if isinstance(additives, Mapping) else {}
+
+    oils = []
+    for item in oils_raw if isinstance(oils_raw, list) else []:
+        if not isinstance(item, Mapping):
+            continue
+        oils.append(
+            (
+                _clamp(_to_float(item.get("grams"), 0.0), 0.0),
+                _clamp(_to_float(item.get("sap_koh", item.get("sapKoh")), 0.0), 0.0),
+                _clamp(_to_float(item.get("iodine"), 0.0), 0.0),
+                _fatty_profile(item.get("fatty_profile", item.get("fattyProfile"))),
+            )
+        )
+    return _FormulaRow(
+        oils=tuple(oils),
+        settings=normalize_lye_water_settings(
+            selected=_text(lye.get("selected"), "NaOH"),
+            superfat_pct=_to_float(lye.get("superfat"), 5.0),
+            purity_pct=_to_float(lye.get("purity"), 100.0),
+            water_method=_text(water.get("method"), "percent"),
+            water_pct=_to_float(water.get("water_pct", water.get("waterPct")), 33.0),
+            lye_concentration_input_pct=_to_float(
+                water.get("lye_concentration", water.get("lyeConcentration")), 33.0
+            ),
+            water_ratio_input=_to_float(
+                water.get("water_ratio", water.get("waterRatio")), 2.0
+            ),
+        ),
+        citric_pct=_clamp(
+            _to_float(additives.get("citric_pct", additives.get("citricPct")), 0.0),
+            0.0,
+            100.0,
+        ),
+    )
+
+
+# --- Oil column index ---
+# Purpose: Collapse repeated oils across formulas into shared matrix columns.
+# Inputs: Batch formula rows.
+# Outputs: Grams matrix, per-oil SAP/iodine vectors, fatty matrix, acid keys.
+def _build_matrices(rows: list[_FormulaRow]):
+    columns: dict[tuple, int] = {}
+    saps: list[float] = []
+    iodines: list[float] = []
+    profiles: list[dict[str, float]] = []
+    row_index: list[int] = []
+    col_index: list[int] = []
+    weights: list[float] = []
+    acid_keys: dict[str, int] = {}
+
+    for row_idx, row in enumerate(rows):
+        for grams, sap_koh, iodine, profile in row.oils:
+            if grams <= 0:
+                continue
+            # Profile item order only affects de-duplication, never results.
+            key = (sap_koh, iodine, tuple(profile.items()))
+            col = columns.get(key)
+            if col is None:
+                col = columns[key] = len(saps)
+                saps.append(normalize_sap_koh(sap_koh))
+                iodines.append(iodine)
+                profiles.append(profile)
+                for acid in profile:
+                    acid_keys.setdefault(acid, len(acid_keys))
+            row_index.append(row_idx)
+            col_index.append(col)
+            weights.append(grams)
+
+    grams_matrix = np.zeros((len(rows), len(saps)), dtype=float)
+    np.add.at(grams_matrix, (row_index, col_index), weights)
+
+    fatty_matrix = np.zeros((len(saps), len(acid_keys)), dtype=float)
+    for col, profile in enumerate(profiles):
+        for acid, pct in profile.items():
+            if pct > 0:
+                fatty_matrix[col, acid_keys[acid]] = pct / 100.0
+
+    return (
+        grams_matrix,
+        np.asarray(saps, dtype=float),
+        np.asarray(iodines, dtype=float),
+        fatty_matrix,
+        list(acid_keys),
+    )
+
+
+# --- Acid column sum ---
+# Purpose: Sum selected fatty-acid percentage columns, treating missing acids as zero.
+# Inputs: Formula x acid percentage matrix, acid keys, and acids to sum.
+# Outputs: Per-formula float array.
+def _sum_acids(pct_matrix: np.ndarray, acid_keys: list[str], acids) -> np.ndarray:
+    index = [acid_keys.index(acid) for acid in acids if acid in acid_keys]
+    if not index:
+        return np.zeros(pct_matrix.shape[0], dtype=float)
+    return pct_matrix[:, index].sum(axis=1)
+
+
+# --- Batch formula metrics ---
+# Purpose: Vectorize lye/water and quality metrics across many formulas.
+# Inputs: Normalized soap compute requests.
+# Outputs: One dict per request with lye/water fields and a `quality` bundle.
+def compute_batch_metrics(
+    requests: Iterable[SoapToolComputeRequest],
+) -> list[dict[str, Any]]:
+    return _compute_rows([_row_from_request(request) for request in requests])
+
+
+# --- Batch payload bridge ---
+# Purpose: Compute batch metrics straight from raw soap payloads.
+# Inputs: Iterable of raw soap tool payload mappings.
+# Outputs: One metrics dict per payload (see compute_batch_metrics).
+def compute_batch_metrics_from_payloads(
+    payloads: Iterable[Mapping[str, Any] | None],
+) -> list[dict[str, Any]]:
+    return _compute_rows([_row_from_payload(payload) for payload in payloads])
+
+
+# --- Batch matrix compute ---
+# Purpose: Run the vectorized lye/water and quality math over formula rows.
+# Inputs: Batch formula rows.
+# Outputs: One metrics dict per row.
+def _compute_rows(rows: list[_FormulaRow]) -> list[dict[str, Any]]:
+    if not rows:
+        return []
+
+    settings = [row.settings for row in rows]
+    is_koh = np.array([item["lye_type"] == "KOH" for item in settings])
+    superfat = np.array([item["superfat_pct"] for item in settings], dtype=float)
+    purity = np.array([item["lye_purity_pct"] for item in settings], dtype=float)
+    water_pct = np.array([item["water_pct"] for item in settings], dtype=float)
+    conc_input = np.array(
+        [item["lye_concentration_input_pct"] for item in settings], dtype=float
+    )
+    ratio_input = np.array(
+        [item["water_ratio_input"] for item in settings], dtype=float
+    )
+    method = np.array([item["water_method"] for item in settings])
+    citric_pct = np.array([row.citric_pct for row in rows], dtype=float)
+
+    grams, sap, iodine, fatty, acid_keys = _build_matrices(rows)
+
+    # Lye/water (mirrors compute_lye_water_values).
+    total_oils = grams.sum(axis=1)
+    sap_grams = grams * (sap > 0)
+    koh_lye = sap_grams @ (sap / 1000.0)
+    naoh_lye = sap_grams @ ((sap * NAOH_FACTOR_FROM_KOH_SAP) / 1000.0)
+    lye_total = np.where(is_koh, koh_lye, naoh_lye)
+    sap_weight_g = sap_grams.sum(axis=1)
+    sap_avg = _safe_divide(sap_grams @ sap, sap_weight_g, sap_weight_g > 0)
+
+    used_fallback = (lye_total <= 0) & (total_oils > 0)
+    fallback_per_g = np.where(
+        is_koh, DEFAULT_KOH_FALLBACK_PER_G, DEFAULT_NAOH_FALLBACK_PER_G
+    )
+    lye_total = np.where(used_fallback, total_oils * fallback_per_g, lye_total)
+    lye_pure = lye_total * (1.0 - (superfat / 100.0))
+    lye_adjusted = _safe_divide(lye_pure, purity / 100.0, purity > 0)
+
+    water_g = np.where(
+        method == "percent",
+        total_oils * (water_pct / 100.0),
+        np.where(
+            method == "concentration",
+            np.where(
+                lye_adjusted > 0,
+                lye_adjusted * ((100.0 - conc_input) / conc_input),
+                0.0,
+            ),
+            np.where(lye_adjusted > 0, lye_adjusted * ratio_input, 0.0),
+        ),
+    )
+
+    # Citric reconciliation (mirrors _apply_citric_lye_adjustment).
+    citric_factor = np.where(
+        is_koh, CITRIC_LYE_FACTORS["KOH"], CITRIC_LYE_FACTORS["NaOH"]
+    )
+    citric_lye = (total_oils * (citric_pct / 100.0)) * citric_factor
+    total_adjusted = lye_adjusted + citric_lye
+    water_g = np.where(
+        method == "concentration",
+        total_adjusted * ((100.0 - conc_input) / conc_input),
+        np.where(
+            method == "ratio",
+            np.where(total_adjusted > 0, total_adjusted * ratio_input, 0.0),
+            water_g,
+        ),
+    )
+    lye_water_sum = total_adjusted + water_g
+    lye_concentration = (
+        _safe_divide(total_adjusted, lye_water_sum, lye_water_sum > 0) * 100.0
+    )
+    water_lye_ratio = _safe_divide(water_g, total_adjusted, total_adjusted > 0)
+
+    # Fatty acids, iodine, and qualities (mirrors build_quality_report).
+    profiled = grams * (fatty.sum(axis=1) > 0)
+    covered_weight = profiled.sum(axis=1)
+    acid_grams = profiled @ fatty
+    acid_pct = (
+        _safe_divide(acid_grams, covered_weight[:, None], covered_weight[:, None] > 0)
+        * 100.0
+    )
+    iodine_grams = grams * (iodine > 0)
+    iodine_weight = iodine_grams.sum(axis=1)
+    iodine_avg = _safe_divide(iodine_grams @ iodine, iodine_weight, iodine_weight > 0)
+    ins = np.where((sap_avg != 0) & (iodine_avg != 0), sap_avg - iodine_avg, 0.0)
+    coverage_pct = _safe_divide(covered_weight, total_oils, total_oils > 0) * 100.0
+    qualities = {
+        name: _sum_acids(acid_pct, acid_keys, acids)
+        for name, acids in QUALITY_ACIDS.items()
+    }
+    saturated = _sum_acids(acid_pct, acid_keys, SATURATED_ACIDS)
+    unsaturated = _sum_acids(acid_pct, acid_keys, UNSATURATED_ACIDS)
+
+    # Convert once; per-element numpy scalar access dominates otherwise.
+    totals = total_oils.tolist()
+    lye_total_list = lye_total.tolist()
+    lye_pure_list = lye_pure.tolist()
+    lye_adjusted_list = lye_adjusted.tolist()
+    total_adjusted_list = total_adjusted.tolist()
+    citric_lye_list = citric_lye.tolist()
+    water_list = water_g.tolist()
+    concentration_list = lye_concentration.tolist()
+    ratio_list = water_lye_ratio.tolist()
+    sap_avg_list = sap_avg.tolist()
+    fallback_list = used_fallback.tolist()
+    acid_pct_rows = acid_pct.tolist()
+    present_rows = (acid_grams > 0).tolist()
+    quality_rows = {name: values.tolist() for name, values in qualities.items()}
+    coverage_list = coverage_pct.tolist()
+    iodine_list = iodine_avg.tolist()
+    ins_list = ins.tolist()
+    saturated_list = saturated.tolist()
+    unsaturated_list = unsaturated.tolist()
+
+    results: list[dict[str, Any]] = []
+    for idx, item in enumerate(settings):
+        pct_row = acid_pct_rows[idx]
+        present = present_rows[idx]
+        results.append(
+            {
+                "total_oils_g": totals[idx],
+                "lye_type": item["lye_type"],
+                "lye_selected": item["lye_selected"],
+                "superfat_pct": item["superfat_pct"],
+                "lye_purity_pct": item["lye_purity_pct"],
+                "lye_total_g": lye_total_list[idx],
+                "lye_pure_g": lye_pure_list[idx],
+                "lye_adjusted_base_g": lye_adjusted_list[idx],
+                "lye_adjusted_g": total_adjusted_list[idx],
+                "citric_lye_g": citric_lye_list[idx],
+                "water_method": item["water_method"],
+                "water_pct": item["water_pct"],
+                "lye_concentration_input_pct": item["lye_concentration_input_pct"],
+                "water_ratio_input": item["water_ratio_input"],
+                "water_g": water_list[idx],
+                "lye_concentration_pct": concentration_list[idx],
+                "water_lye_ratio": ratio_list[idx],
+                "sap_avg_koh": sap_avg_list[idx],
+                "used_sap_fallback": fallback_list[idx],
+                "quality": {
+                    "qualities": {
+                        name: values[idx] for name, values in quality_rows.items()
+                    },
+                    "fatty_acids_pct": {
+                        acid: pct_row[col]
+                        for col, acid in enumerate(acid_keys)
+                        if present[col]
+                    },
+                    "coverage_pct": coverage_list[idx],
+                    "iodine": iodine_list[idx],
+                    "ins": ins_list[idx],
+                    "sap_avg_koh": sap_avg_list[idx],
+                    "sat_unsat": {
+                        "saturated": saturated_list[idx],
+                        "unsaturated": unsaturated_list[idx],
+                    },
+                },
+            }
+        )
+    return results
+
+
+__all__ = ["compute_batch_metrics", "compute_batch_metrics_from_payloads"]
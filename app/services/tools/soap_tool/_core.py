@@ -164,5 +164,12 @@ class SoapToolComputationService:
         }
         return result
 
+    @classmethod
+    def calculate_batch(cls, payloads: list[dict | None]) -> list[dict]:
+        """Vectorized lye/water + quality metrics for many formulas (no exports)."""
+        from ._batch import compute_batch_metrics_from_payloads
+
+        return compute_batch_metrics_from_payloads(payloads)
+
 
 __all__ = ["SoapToolComputationService"]
@@ -32,13 +32,12 @@ def normalize_sap_koh(sap_koh: float) -> float:
     return normalized
 
 
-# --- Lye/water primitive calculator ---
-# Purpose: Compute canonical lye/water values from primitive soap inputs.
-# Inputs: Oils list and lye/water settings.
-# Outputs: Dictionary mirroring soap lye/water result fields.
-def compute_lye_water_values(
+# --- Lye/water settings normalization ---
+# Purpose: Sanitize lye selection, superfat, purity, and water-method inputs.
+# Inputs: Raw lye/water settings shared by scalar and batch compute paths.
+# Outputs: Normalized settings dictionary.
+def normalize_lye_water_settings(
     *,
-    oils: list[dict],
     selected: str,
     superfat_pct: float,
     purity_pct: float,
@@ -75,6 +74,50 @@ def compute_lye_water_values(
         else DEFAULT_WATER_RATIO
     )
     ratio_input = _clamp(ratio_input, 1.0, 4.0)
+    return {
+        "lye_selected": selected_upper,
+        "lye_type": lye_type,
+        "superfat_pct": superfat,
+        "lye_purity_pct": purity,
+        "water_method": method,
+        "water_pct": water_pct_sanitized,
+        "lye_concentration_input_pct": lye_conc_input,
+        "water_ratio_input": ratio_input,
+    }
+
+
+# --- Lye/water primitive calculator ---
+# Purpose: Compute canonical lye/water values from primitive soap inputs.
+# Inputs: Oils list and lye/water settings.
+# Outputs: Dictionary mirroring soap lye/water result fields.
+def compute_lye_water_values(
+    *,
+    oils: list[dict],
+    selected: str,
+    superfat_pct: float,
+    purity_pct: float,
+    water_method: str,
+    water_pct: float,
+    lye_concentration_input_pct: float,
+    water_ratio_input: float,
+) -> dict:
+    settings = normalize_lye_water_settings(
+        selected=selected,
+        superfat_pct=superfat_pct,
+        purity_pct=purity_pct,
+        water_method=water_method,
+        water_pct=water_pct,
+        lye_concentration_input_pct=lye_concentration_input_pct,
+        water_ratio_input=water_ratio_input,
+    )
+    selected_upper = settings["lye_selected"]
+    lye_type = settings["lye_type"]
+    superfat = settings["superfat_pct"]
+    purity = settings["lye_purity_pct"]
+    method = settings["water_method"]
+    water_pct_sanitized = settings["water_pct"]
+    lye_conc_input = settings["lye_concentration_input_pct"]
+    ratio_input = settings["water_ratio_input"]
 
     total_oils = sum(max(0.0, float(row.get("grams") or 0.0)) for row in oils)
     lye_total = 0.0
@@ -172,5 +215,6 @@ def compute_lye_water(request: SoapToolComputeRequest) -> dict:
 __all__ = [
     "compute_lye_water",
     "compute_lye_water_values",
+    "normalize_lye_water_settings",
     "normalize_sap_koh",
 ]
@@ -0,0 +1,374 @@
+"""Oil-blend optimizer for soap quality targets.
+
+Synopsis:
+Solves for the oil percentages that land hardness, cleansing, conditioning,
+bubbly, creamy, and iodine inside requested ranges in a single call. Each
+candidate oil is reduced to a precomputed quality vector, so blend qualities
+are linear in the oil fractions; a small dense interior-point QP then
+minimizes target-range violations first and blend cost second, subject to
+per-oil min/max percentages.
+
+Glossary:
+- Quality vector: One oil's hardness/cleansing/conditioning/bubbly/creamy/iodine values.
+- Range slack: How far a blend metric sits outside its requested range.
+- Proximity term: Small pull toward the current blend that breaks ties.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+import numpy as np
+
+from ._advisory import _compute_oil_quality_scores
+from ._fatty_acids import compute_fatty_acids, compute_iodine, compute_qualities
+from .types import SoapToolOilInput, _clamp, _to_float
+
+OPTIMIZER_METRICS = (
+    "hardness",
+    "cleansing",
+    "conditioning",
+    "bubbly",
+    "creamy",
+    "iodine",
+)
+MAX_OPTIMIZER_OILS = 100
+_SLACK_LINEAR_WEIGHT = 1000.0
+_SLACK_QUADRATIC_WEIGHT = 1000.0
+_PROXIMITY_WEIGHT = 1e-3
+_TARGET_TOLERANCE = 0.05
+_MAX_IPM_ITERATIONS = 80
+_IPM_TOLERANCE = 1e-9
+_ZERO_FRACTION = 1e-7
+_PROJECTION_ITERATIONS = 100
+
+
+# --- Target range parser ---
+# Purpose: Normalize one target into a (min, max) pair in quality points.
+# Inputs: Number (point target), [min, max] list, or {"min", "max"} mapping.
+# Outputs: Tuple of optional bounds, or None when the target is empty.
+def _parse_target(raw: Any) -> tuple[float | None, float | None] | None:
+    if isinstance(raw, Mapping):
+        low = raw.get("min", raw.get("low"))
+        high = raw.get("max", raw.get("high"))
+    elif isinstance(raw, (list, tuple)) and len(raw) == 2:
+        low, high = raw
+    elif raw in (None, ""):
+        return None
+    else:
+        low = high = raw
+    low_value = None if low in (None, "") else _to_float(low, 0.0)
+    high_value = None if high in (None, "") else _to_float(high, 0.0)
+    if low_value is None and high_value is None:
+        return None
+    if low_value is not None and high_value is not None and low_value > high_value:
+        low_value, high_value = high_value, low_value
+    return low_value, high_value
+
+
+# --- Bounded simplex projection ---
+# Purpose: Snap solver output onto sum == 1 with every oil inside its min/max.
+# Inputs: Raw fractions plus per-oil lower/upper bounds (sum(lower) <= 1 <= sum(upper)).
+# Outputs: Fractions clip(values - tau, lower, upper) with tau bisected so they sum to 1.
+def _project_to_bounded_simplex(values, lower, upper):
+    # Clipping then rescaling can push a capped oil back over its max; shifting
+    # every oil by one common offset before clipping keeps each bound exact.
+    low_tau = float((values - upper).min())
+    high_tau = float((values - lower).max())
+    for _ in range(_PROJECTION_ITERATIONS):
+        tau = 0.5 * (low_tau + high_tau)
+        if np.clip(values - tau, lower, upper).sum() > 1.0:
+            low_tau = tau
+        else:
+            high_tau = tau
+    return np.clip(values - 0.5 * (low_tau + high_tau), lower, upper)
+
+
+# --- Dense convex QP solver ---
+# Purpose: Solve min 1/2 x'Hx + f'x s.t. A x <= b, Aeq x = beq (Mehrotra IPM).
+# Inputs: Dense NumPy matrices/vectors; H must be positive semidefinite.
+# Outputs: Tuple of (solution vector, converged flag, iteration count).
+def _solve_qp(H, f, A, b, Aeq, beq):
+    n = H.shape[0]
+    m = A.shape[0]
+    p = Aeq.shape[0]
+    x = np.full(n, 1.0 / max(n, 1))
+    y = np.zeros(p)
+    z = np.maximum(b - A @ x, 1.0)
+    lam = np.ones(m)
+
+    converged = False
+    iteration = 0
+    for iteration in range(1, _MAX_IPM_ITERATIONS + 1):
+        r_dual = H @ x + f + Aeq.T @ y + A.T @ lam
+        r_eq = Aeq @ x - beq
+        r_ineq = A @ x + z - b
+        mu = float(lam @ z) / m
+        scale = 1.0 + max(np.abs(f).max(initial=0.0), np.abs(b).max(initial=0.0))
+        if (
+            mu < _IPM_TOLERANCE
+            and np.abs(r_dual).max(initial=0.0) < _IPM_TOLERANCE * scale
+            and np.abs(r_eq).max(initial=0.0) < _IPM_TOLERANCE
+            and np.abs(r_ineq).max(initial=0.0) < _IPM_TOLERANCE * scale
+        ):
+            converged = True
+            break
+
+        weight = lam / z
+        kkt = np.zeros((n + p, n + p))
+        kkt[:n, :n] = H + (A.T * weight) @ A + 1e-12 * np.eye(n)
+        kkt[:n, n:] = Aeq.T
+        kkt[n:, :n] = Aeq
+
+        def _direction(r_comp):
+            # r_comp is the complementarity residual target for lam*z.
+            rhs_lam = (r_comp + lam * r_ineq) / z
+            rhs = np.concatenate([-r_dual - A.T @ rhs_lam, -r_eq])
+            step = np.linalg.solve(kkt, rhs)
+            dx = step[:n]
+            dz = -r_ineq - A @ dx
+            dlam = (r_comp - lam * dz) / z
+            return dx, step[n:], dz, dlam
+
+        def _max_step(values, deltas):
+            negative = deltas < 0
+            if not negative.any():
+                return 1.0
+            return min(1.0, float((-values[negative] / deltas[negative]).min()))
+
+        # Predictor (affine scaling) then Mehrotra corrector.
+        dx, dy, dz, dlam = _direction(-lam * z)
+        alpha_aff = min(_max_step(z, dz), _max_step(lam, dlam))
+        mu_aff = float((lam + alpha_aff * dlam) @ (z + alpha_aff * dz)) / m
+        sigma = (mu_aff / mu) ** 3 if mu > 0 else 0.0
+        dx, dy, dz, dlam = _direction(-lam * z - dlam * dz + sigma * mu)
+
+        alpha = 0.99 * min(_max_step(z, dz), _max_step(lam, dlam))
+        x = x + alpha * dx
+        y = y + alpha * dy
+        z = z + alpha * dz
+        lam = lam + alpha * dlam
+
+    return x, converged, iteration
+
+
+# --- Blend optimizer ---
+# Purpose: Compute the cheapest blend that meets quality target ranges.
+# Inputs: Payload with candidate oils (fatty profile, iodine, cost, min/max pct),
+#         target ranges, and optional target oils total.
+# Outputs: Result dict shaped like the quality nudge (ok, warnings, adjusted_rows)
+#          plus predicted metrics, per-target status, cost, and solver info.
+def optimize_oil_blend(payload: Mapping[str, Any] | None) -> dict:
+    data = payload if isinstance(payload, Mapping) else {}
+    oils_raw = data.get("oils")
+    targets_raw = data.get("targets")
+    oils_list = oils_raw if isinstance(oils_raw, list) else []
+    targets_map = targets_raw if isinstance(targets_raw, Mapping) else {}
+
+    if len(oils_list) > MAX_OPTIMIZER_OILS:
+        # The dense KKT solve grows cubically with the candidate count.
+        return {
+            "ok": False,
+            "error": f"Choose at most {MAX_OPTIMIZER_OILS} candidate oils to optimize.",
+            "warnings": [],
+            "adjusted_rows": [],
+        }
+
+    targets: dict[str, tuple[float | None, float | None]] = {}
+    for key in OPTIMIZER_METRICS:
+        parsed = _parse_target(targets_map.get(key))
+        if parsed is not None:
+            targets[key] = parsed
+    if not targets:
+        return {
+            "ok": False,
+            "error": "Select at least one quality target to optimize the blend.",
+            "warnings": [],
+            "adjusted_rows": [],
+        }
+
+    needs_profile = any(key != "iodine" for key in targets)
+    needs_iodine = "iodine" in targets
+    warnings: list[str] = []
+    candidates: list[tuple[int, SoapToolOilInput, Mapping[str, Any]]] = []
+    skipped = 0
+    for index, row in enumerate(oils_list):
+        if not isinstance(row, Mapping):
+            continue
+        oil = SoapToolOilInput.from_payload(row)
+        if (needs_profile and not oil.fatty_profile) or (
+            needs_iodine and oil.iodine <= 0
+        ):
+            skipped += 1
+            continue
+        row_index = row.get("row_index")
+        try:
+            output_index = int(row_index) if row_index not in (None, "", []) else index
+        except (TypeError, ValueError):
+            output_index = index
+        candidates.append((output_index, oil, row))
+
+    if not candidates:
+        return {
+            "ok": False,
+            "error": "None of the candidate oils have the fatty acid/iodine data these targets need.",
+            "warnings": [],
+            "adjusted_rows": [],
+        }
+    if skipped:
+        warnings.append(
+            f"{skipped} oil(s) were left out because they are missing fatty acid or iodine data."
+        )
+
+    n = len(candidates)
+    lower = np.array(
+        [
+            _clamp(_to_float(row.get("min_pct", row.get("minPct")), 0.0), 0.0, 100.0)
+            for _idx, _oil, row in candidates
+        ]
+    ) / 100.0
+    upper = np.array(
+        [
+            _clamp(
+                _to_float(row.get("max_pct", row.get("maxPct")), 100.0), 0.0, 100.0
+            )
+            for _idx, _oil, row in candidates
+        ]
+    ) / 100.0
+    upper = np.maximum(upper, lower)
+    if lower.sum() > 1.0 + 1e-9 or upper.sum() < 1.0 - 1e-9:
+        return {
+            "ok": False,
+            "error": "Per-oil minimum/maximum percentages cannot add up to 100%.",
+            "warnings": warnings,
+            "adjusted_rows": [],
+        }
+
+    # Precomputed quality vectors (fractions of 100 points).
+    vectors = np.zeros((len(OPTIMIZER_METRICS), n))
+    for col, (_idx, oil, _row) in enumerate(candidates):
+        scores = _compute_oil_quality_scores(oil.fatty_profile)
+        for row_idx, key in enumerate(OPTIMIZER_METRICS[:-1]):
+            vectors[row_idx, col] = scores[key]
+        vectors[-1, col] = oil.iodine / 100.0
+
+    costs = np.array(
+        [
+            max(0.0, _to_float(row.get("cost_per_g", row.get("costPerG")), 0.0))
+            for _idx, _oil, row in candidates
+        ]
+    )
+    has_costs = bool((costs > 0).any())
+    cost_scale = costs.max() if has_costs else 1.0
+
+    current_grams = np.array([oil.grams for _idx, oil, _row in candidates])
+    current_total = float(current_grams.sum())
+    reference = current_grams / current_total if current_total > 0 else np.zeros(n)
+
+    metric_rows = [OPTIMIZER_METRICS.index(key) for key in targets]
+    slack_count = len(metric_rows)
+    size = n + slack_count
+
+    H = np.zeros((size, size))
+    H[np.arange(n), np.arange(n)] = 2.0 * _PROXIMITY_WEIGHT
+    H[np.arange(n, size), np.arange(n, size)] = 2.0 * _SLACK_QUADRATIC_WEIGHT
+    f = np.concatenate(
+        [
+            costs / cost_scale - 2.0 * _PROXIMITY_WEIGHT * reference,
+            np.full(slack_count, _SLACK_LINEAR_WEIGHT),
+        ]
+    )
+
+    A_rows: list[np.ndarray] = []
+    b_rows: list[float] = []
+    for slack_idx, (key, metric_row) in enumerate(zip(targets, metric_rows)):
+        low, high = targets[key]
+        vector = vectors[metric_row]
+        if low is not None:
+            row = np.zeros(size)
+            row[:n] = -vector
+            row[n + slack_idx] = -1.0
+            A_rows.append(row)
+            b_rows.append(-low / 100.0)
+        if high is not None:
+            row = np.zeros(size)
+            row[:n] = vector
+            row[n + slack_idx] = -1.0
+            A_rows.append(row)
+            b_rows.append(high / 100.0)
+    identity = np.eye(size)
+    A = np.vstack(
+        [np.array(A_rows).reshape(-1, size), -identity, identity[:n]]
+    )
+    b = np.concatenate(
+        [np.array(b_rows), -lower, np.zeros(slack_count), upper]
+    )
+    Aeq = np.zeros((1, size))
+    Aeq[0, :n] = 1.0
+
+    solution, converged, iterations = _solve_qp(H, f, A, b, Aeq, np.ones(1))
+    raw = solution[:n]
+    # Oils the solver drove to ~0 stay at 0 unless their minimum forbids it.
+    snapped_upper = np.where((raw < _ZERO_FRACTION) & (lower <= 0.0), 0.0, upper)
+    if snapped_upper.sum() < 1.0:
+        snapped_upper = upper
+    fractions = _project_to_bounded_simplex(raw, lower, snapped_upper)
+    if not converged:
+        warnings.append("The optimizer stopped early; the blend may be close but not optimal.")
+
+    target_oils_g = _to_float(data.get("target_oils_g"), 0.0)
+    total_g = target_oils_g if target_oils_g > 0 else (current_total or 100.0)
+    blend_oils = tuple(
+        SoapToolOilInput(
+            name=oil.name,
+            grams=float(fraction) * total_g,
+            sap_koh=oil.sap_koh,
+            iodine=oil.iodine,
+            fatty_profile=oil.fatty_profile,
+        )
+        for (_idx, oil, _row), fraction in zip(candidates, fractions)
+    )
+    fatty_pct = compute_fatty_acids(blend_oils)["fatty_acids_pct"]
+    predicted = dict(compute_qualities(fatty_pct))
+    predicted["iodine"] = compute_iodine(blend_oils)["iodine"]
+
+    target_status = {}
+    for key, (low, high) in targets.items():
+        value = _to_float(predicted.get(key), 0.0)
+        met = (low is None or value >= low - _TARGET_TOLERANCE) and (
+            high is None or value <= high + _TARGET_TOLERANCE
+        )
+        target_status[key] = {"min": low, "max": high, "value": value, "met": met}
+    unmet = [key for key, status in target_status.items() if not status["met"]]
+    if unmet:
+        warnings.append(
+            "These oils cannot reach every target; closest blend returned for: "
+            + ", ".join(unmet)
+            + "."
+        )
+
+    adjusted_rows = [
+        {
+            "index": output_index,
+            "grams": float(fraction) * total_g,
+            "pct": float(fraction) * 100.0,
+        }
+        for (output_index, _oil, _row), fraction in zip(candidates, fractions)
+    ]
+    return {
+        "ok": True,
+        "warnings": warnings,
+        "message": (
+            "Blend optimized to meet the selected targets."
+            if not unmet
+            else "Blend optimized as close to the selected targets as these oils allow."
+        ),
+        "adjusted_rows": adjusted_rows,
+        "predicted": predicted,
+        "targets": target_status,
+        "total_cost": float(costs @ fractions) * total_g if has_costs else None,
+        "solver": {"converged": converged, "iterations": iterations},
+    }
+
+
+__all__ = ["optimize_oil_blend", "OPTIMIZER_METRICS", "MAX_OPTIMIZER_OILS"]
@@ -21,6 +21,7 @@ from flask_wtf.csrf import generate_csrf
 
 from app.extensions import db
 from app.services.marketing_content_service import MarketingContentService
+from app.services.public_media_service import get_media_version
 from app.utils.cache_manager import app_cache
 from app.utils.unit_utils import get_global_unit_list
 
@@ -487,6 +488,11 @@ def static_asset_url(relative_path: str, *, include_version: bool = True) -> str
     if not include_version:
         return url_for("static", filename=selected_path)
 
+    # Public media slots carry a content hash from the media manifest.
+    media_version = get_media_version(selected_path)
+    if media_version:
+        return url_for("static", filename=selected_path, v=media_version)
+
     try:
         static_folder = Path(getattr(current_app, "static_folder", None) or "static")
         version = int((static_folder / selected_path).stat().st_mtime)
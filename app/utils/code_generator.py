@@ -11,14 +11,12 @@ Glossary:
 from __future__ import annotations
 import logging
 
-from sqlalchemy.dialects.postgresql import insert as pg_insert
-
 from app.extensions import db
 from app.models import User
 from app.models.batch import BatchSequence
-from app.models.db_dialect import is_postgres
 from app.models.recipe import Recipe
 from app.services.lineage_service import generate_batch_label, generate_label_prefix
+from app.services.sequence_allocator import SequenceAllocator, SequenceCounter
 from app.utils.timezone_utils import TimezoneUtils
 
 logger = logging.getLogger(__name__)
@@ -26,6 +24,15 @@ logger = logging.getLogger(__name__)
 
 __all__ = ["generate_batch_label_code", "generate_recipe_prefix"]
 
+BATCH_LABEL_COUNTER = SequenceCounter(
+    name="batch_label",
+    model=BatchSequence,
+    key_column="year",
+    value_column="current_sequence",
+    block_size_setting="BATCH_LABEL_SEQUENCE_BLOCK_SIZE",
+    default_block_size=1,
+)
+
 
 # --- Batch label generator ---
 # Purpose: Generate a batch label for a recipe.
@@ -74,48 +81,6 @@ def generate_recipe_prefix(recipe_name: str, org_id: int | None = None) -> str:
 
 
 # --- Batch sequence allocator ---
-# Purpose: Fetch the next batch sequence for org/year.
+# Purpose: Fetch the next batch sequence for org/year from a reserved block.
 def _next_batch_sequence(org_id: int, year: int) -> int:
-    if is_postgres():
-        now = TimezoneUtils.utc_now()
-        table = BatchSequence.__table__
-        stmt = (
-            pg_insert(table)
-            .values(
-                organization_id=org_id,
-                year=year,
-                current_sequence=1,
-                created_at=now,
-                updated_at=now,
-            )
-            .on_conflict_do_update(
-                index_elements=["organization_id", "year"],
-                set_={
-                    "current_sequence": table.c.current_sequence + 1,
-                    "updated_at": now,
-                },
-            )
-            .returning(table.c.current_sequence)
-        )
-        return int(db.session.execute(stmt).scalar_one())
-
-    counter = BatchSequence.query.filter_by(
-        organization_id=org_id,
-        year=year,
-    ).first()
-    if not counter:
-        counter = BatchSequence(
-            organization_id=org_id,
-            year=year,
-            current_sequence=1,
-            created_at=TimezoneUtils.utc_now(),
-            updated_at=TimezoneUtils.utc_now(),
-        )
-        db.session.add(counter)
-        db.session.flush()
-        return 1
-
-    counter.current_sequence = int(counter.current_sequence or 0) + 1
-    counter.updated_at = TimezoneUtils.utc_now()
-    db.session.flush()
-    return int(counter.current_sequence)
+    return SequenceAllocator.next_value(BATCH_LABEL_COUNTER, org_id, year)
@@ -2,22 +2,31 @@
 
 Synopsis:
 Generate and validate compact tracking identifiers for inventory events and
-lot records using deterministic prefixes plus randomized base36 suffixes.
+lot records. Inside an app context suffixes are ``<org>-<sequence>`` in base36,
+drawn from per-org/per-prefix blocks reserved by the sequence allocator;
+without one (scripts, unit helpers) a time/entropy suffix is used instead.
 
 Glossary:
 - Event prefix: Short code indicating the inventory change category.
 - Lot code: Identifier prefixed with ``LOT`` for inventory lot tracking.
+- Sequenced suffix: Base36 org id and zero-padded base36 sequence number.
 - Base36 suffix: Alphanumeric fragment derived from time, item id, and entropy.
 """
 
 from __future__ import annotations
 
+import logging
 import secrets
 import time
-from typing import Dict, Literal, TypedDict
+from typing import Dict, List, Literal, TypedDict
+
+from flask import has_app_context
+
+logger = logging.getLogger(__name__)
 
 __all__ = [
     "generate_inventory_event_code",
+    "generate_inventory_event_codes",
     "parse_inventory_code",
     "validate_inventory_code",
     "int_to_base36",
@@ -26,6 +35,7 @@ __all__ = [
 BASE36_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
 LOT_PREFIX = "LOT"
 DEFAULT_EVENT_PREFIX = "EVT"
+SEQUENCE_WIDTH = 5
 
 EVENT_PREFIXES: Dict[str, str] = {
     "recount": "RCN",
@@ -84,26 +94,105 @@ def _generate_suffix(item_id: int | None = None) -> str:
     return f"{timestamp_component}{item_component}{random_component}".upper()
 
 
+# --- Resolve code prefix ---
+# Purpose: Map a change type and code kind to its code prefix.
+# Inputs: Change type and requested code kind.
+# Outputs: Prefix string.
+def _code_prefix(change_type: str, code_type: Literal["event", "lot"]) -> str:
+    if code_type == "lot":
+        return LOT_PREFIX
+    normalized = (change_type or "").strip().lower()
+    return EVENT_PREFIXES.get(normalized, DEFAULT_EVENT_PREFIX)
+
+
+# --- Allocate sequences ---
+# Purpose: Draw ``count`` numbers for (org, prefix) from the in-process block.
+# Inputs: Prefix, count, optional item id and organization id.
+# Outputs: (organization_id, numbers) or None when sequencing is unavailable.
+def _allocate_sequences(
+    prefix: str, count: int, item_id: int | None, organization_id: int | None
+) -> tuple[int, List[int]] | None:
+    if not has_app_context():
+        return None
+    from sqlalchemy.exc import SQLAlchemyError
+
+    from app.extensions import db
+    from app.models.inventory_lot import InventoryCodeSequence
+    from app.services.sequence_allocator import SequenceAllocator, SequenceCounter
+
+    if organization_id is None and item_id:
+        from app.models import InventoryItem
+
+        item = db.session.get(InventoryItem, item_id)
+        organization_id = getattr(item, "organization_id", None)
+    if not organization_id:
+        return None
+    counter = SequenceCounter(
+        name="inventory_code",
+        model=InventoryCodeSequence,
+        key_column="prefix",
+        value_column="current_value",
+        block_size_setting="INVENTORY_CODE_SEQUENCE_BLOCK_SIZE",
+        default_block_size=100,
+    )
+    try:
+        numbers = SequenceAllocator.next_values(counter, organization_id, prefix, count)
+    except SQLAlchemyError:
+        # The allocator rolled its savepoint back (PostgreSQL), so the caller's
+        # transaction is still usable for the fallback codes.
+        logger.warning("Suppressed exception fallback at app/utils/inventory_event_code_generator.py:140", exc_info=True)
+        return None
+    return organization_id, numbers
+
+
+# --- Generate inventory event codes ---
+# Purpose: Produce ``count`` lot/event codes with one block draw.
+# Inputs: Change type, count, optional item/org ids, and requested code kind.
+# Outputs: List of hyphenated code strings.
+def generate_inventory_event_codes(
+    change_type: str,
+    count: int,
+    *,
+    item_id: int | None = None,
+    organization_id: int | None = None,
+    code_type: Literal["event", "lot"] = "event",
+) -> List[str]:
+    """Generate codes for multi-line adjustments without a round trip per code."""
+    if count <= 0:
+        return []
+    prefix = _code_prefix(change_type, code_type)
+    allocated = _allocate_sequences(prefix, count, item_id, organization_id)
+    if allocated is None:
+        return [f"{prefix}-{_generate_suffix(item_id)}" for _ in range(count)]
+    org_id, numbers = allocated
+    org_part = int_to_base36(int(org_id))
+    return [
+        f"{prefix}-{org_part}-{int_to_base36(number).rjust(SEQUENCE_WIDTH, '0')}"
+        for number in numbers
+    ]
+
+
 # --- Generate inventory event code ---
 # Purpose: Produce lot/event tracking identifiers for inventory history.
-# Inputs: Change type plus optional item id and requested code kind.
+# Inputs: Change type plus optional item/org ids and requested code kind.
 # Outputs: Hyphenated code string with validated prefix + generated suffix.
 def generate_inventory_event_code(
     change_type: str,
     *,
     item_id: int | None = None,
+    organization_id: int | None = None,
     code_type: Literal["event", "lot"] = "event",
 ) -> str:
     """
     Generate inventory tracking codes for events and lots with consistent semantics.
     """
-    if code_type == "lot":
-        prefix = LOT_PREFIX
-    else:
-        normalized = (change_type or "").strip().lower()
-        prefix = EVENT_PREFIXES.get(normalized, DEFAULT_EVENT_PREFIX)
-
-    return f"{prefix}-{_generate_suffix(item_id)}"
+    return generate_inventory_event_codes(
+        change_type,
+        1,
+        item_id=item_id,
+        organization_id=organization_id,
+        code_type=code_type,
+    )[0]
 
 
 # --- Parse inventory code ---
@@ -0,0 +1,84 @@
+"""Row-level diffs between two JSON-style payloads.
+
+Synopsis:
+Compares two dict payloads section by section and reports only what changed.
+Lists of dict rows carrying an ``id`` are diffed as added rows, removed ids,
+and per-row changed fields; anything else is reported by its new value. Used
+by bootstrap delta responses and BatchBot context diffs.
+
+Glossary:
+- Section: Top-level payload key (for example ``inventory`` or ``recipes``).
+- Row diff: ``added``/``removed``/``changed`` breakdown of one id-keyed list.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional
+
+__all__ = ["diff_payloads", "diff_rows"]
+
+
+# --- Diff payloads ---
+# Purpose: Describe what changed between two payload dicts.
+# Inputs: Previous and current payload mappings.
+# Outputs: Dict of changed sections only (empty when identical).
+def diff_payloads(previous: Mapping[str, Any], current: Mapping[str, Any]) -> Dict[str, Any]:
+    changes: Dict[str, Any] = {}
+    for section in sorted(set(previous) | set(current)):
+        before = previous.get(section)
+        after = current.get(section)
+        if before == after:
+            continue
+        if isinstance(before, list) and isinstance(after, list):
+            section_diff = diff_rows(before, after)
+        elif isinstance(before, dict) and isinstance(after, dict):
+            section_diff = {
+                key: diff_rows(before.get(key), after.get(key))
+                if isinstance(after.get(key), list) and isinstance(before.get(key), list)
+                else after.get(key)
+                for key in sorted(set(before) | set(after))
+                if before.get(key) != after.get(key)
+            }
+        else:
+            section_diff = after
+        changes[section] = section_diff
+    return changes
+
+
+# --- Diff rows ---
+# Purpose: Compare two id-keyed row lists.
+# Inputs: Before/after values (lists of dicts with an ``id`` key).
+# Outputs: added/removed/changed dict, or ``{"replaced": after}`` when rows lack ids.
+def diff_rows(before: Any, after: Any) -> Dict[str, Any]:
+    before_rows = _rows_by_id(before)
+    after_rows = _rows_by_id(after)
+    if before_rows is None or after_rows is None:
+        return {"replaced": after}
+    result: Dict[str, Any] = {}
+    added = [row for row_id, row in after_rows.items() if row_id not in before_rows]
+    removed = [row_id for row_id in before_rows if row_id not in after_rows]
+    changed: List[Dict[str, Any]] = []
+    for row_id, row in after_rows.items():
+        old = before_rows.get(row_id)
+        if old is None or old == row:
+            continue
+        delta = {key: value for key, value in row.items() if old.get(key) != value}
+        changed.append({"id": row_id, **delta})
+    if added:
+        result["added"] = added
+    if removed:
+        result["removed"] = removed
+    if changed:
+        result["changed"] = changed
+    return result
+
+
+def _rows_by_id(rows: Any) -> Optional[Dict[Any, Mapping[str, Any]]]:
+    if not isinstance(rows, list):
+        return None
+    keyed: Dict[Any, Mapping[str, Any]] = {}
+    for row in rows:
+        if not isinstance(row, dict) or "id" not in row:
+            return None
+        keyed[row["id"]] = row
+    return keyed
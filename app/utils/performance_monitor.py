@@ -5,9 +5,10 @@ import time
 from functools import wraps
 from typing import Any, Callable, TypeVar
 
-from flask import current_app, g
+from flask import current_app, g, has_request_context
+from sqlalchemy import event
 
-__all__ = ["PerformanceMonitor", "profile_route"]
+__all__ = ["PerformanceMonitor", "install_query_metrics", "profile_route"]
 
 logger = logging.getLogger(__name__)
 TFunc = TypeVar("TFunc", bound=Callable[..., Any])
@@ -79,3 +80,41 @@ def profile_route(
         return response
 
     return wrapper  # type: ignore[return-value]
+
+
+def install_query_metrics(app) -> bool:
+    """Count queries per request and expose them as response headers.
+
+    Enabled by ``QUERY_METRICS_HEADERS_ENABLED`` so load tests can attribute
+    query counts to endpoints via ``X-Query-Count`` / ``X-Query-Time-Ms``.
+    """
+    if not app.config.get("QUERY_METRICS_HEADERS_ENABLED"):
+        return False
+
+    from ..extensions import db
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("perf_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_query(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("perf_query_started")
+        if not started:
+            return
+        duration = time.perf_counter() - started.pop()
+        if has_request_context():
+            PerformanceMonitor.record_query(duration)
+
+    @app.after_request
+    def _emit_query_metrics(response):
+        metrics = g.get("perf_metrics") or {"query_count": 0, "query_time": 0.0}
+        response.headers["X-Query-Count"] = str(metrics["query_count"])
+        response.headers["X-Query-Time-Ms"] = f"{metrics['query_time'] * 1000:.1f}"
+        return response
+
+    return True
+
@@ -2,12 +2,16 @@ from __future__ import annotations
 import logging
 
 import copy
+import time
 from typing import Any, Dict
 
 logger = logging.getLogger(__name__)
 
 
 DEFAULT_SETTINGS_KEY = "settings"
+_FEATURE_FLAG_MAP_KEY = "feature_flag_map"
+# Bounds staleness when the flag version lives in a per-process cache.
+_FEATURE_FLAG_MAP_TTL_SECONDS = 60
 
 
 class SettingsService:
@@ -150,16 +154,48 @@ def set_app_setting(key: str, value: Any, *, description: str | None = None) ->
         return False
 
 
-def is_feature_enabled(feature_key: str) -> bool:
-    """Determine whether a feature flag is enabled (database only)."""
+def _feature_flag_map() -> Dict[str, bool]:
+    """Return every stored flag, loaded once per flag cache version (and TTL)."""
+    from flask import current_app, g, has_request_context
+
+    from app.extensions import db
     from app.models.feature_flag import FeatureFlag
+    from app.services.cache_invalidation import feature_flag_cache_key
+
+    if has_request_context():
+        request_flags = getattr(g, "_feature_flag_map", None)
+        if request_flags is not None:
+            return request_flags
+
+    version_key = feature_flag_cache_key()
+    now = time.monotonic()
+    cached = current_app.extensions.get(_FEATURE_FLAG_MAP_KEY)
+    if (
+        cached is not None
+        and cached[0] == version_key
+        and now - cached[1] < _FEATURE_FLAG_MAP_TTL_SECONDS
+    ):
+        flags = cached[2]
+    else:
+        flags = {
+            key: bool(enabled)
+            for key, enabled in db.session.query(FeatureFlag.key, FeatureFlag.enabled)
+        }
+        current_app.extensions[_FEATURE_FLAG_MAP_KEY] = (version_key, now, flags)
+
+    if has_request_context():
+        g._feature_flag_map = flags
+    return flags
 
+
+def is_feature_enabled(feature_key: str) -> bool:
+    """Determine whether a feature flag is enabled (database only)."""
     try:
-        flag = FeatureFlag.query.filter_by(key=feature_key).first()
-        if flag is not None:
-            return bool(flag.enabled)
+        flags = _feature_flag_map()
+        if feature_key in flags:
+            return flags[feature_key]
     except Exception:
-        logger.warning("Suppressed exception fallback at app/utils/settings.py:155", exc_info=True)
+        logger.warning("Suppressed exception fallback at app/utils/settings.py:198", exc_info=True)
         pass
     try:
         from app.services.developer.dashboard_service import FEATURE_FLAG_SECTIONS
@@ -6,12 +6,13 @@ from collections.abc import Mapping
 from dataclasses import dataclass
 from typing import Any, Iterable, List
 
-from flask import g, has_request_context, session
+from flask import current_app, g, has_app_context, has_request_context, session
 from flask_login import current_user
 from sqlalchemy.orm import load_only
 
 from ..extensions import db
 from ..models import Unit
+from ..services.cache_invalidation import unit_catalog_cache_key
 from ..services.unit_conversion import ConversionEngine
 from .cache_manager import app_cache
 from .validation_helpers import validate_density
@@ -20,6 +21,8 @@ logger = logging.getLogger(__name__)
 
 _REQUEST_CACHE_ATTR = "_global_unit_list"
 _CACHE_TTL_SECONDS = 3600
+_SEARCH_INDEX_KEY = "unit_search_index"
+_SEARCH_INDEX_MAX_SCOPES = 256
 _SLOW_QUERY_THRESHOLD = 0.05
 _UNIT_LOAD_COLUMNS = (
     Unit.id,
@@ -117,7 +120,8 @@ def _cache_scope_token() -> str:
 
 
 def _cache_key() -> str:
-    return f"units:{_cache_scope_token()}"
+    # Versioned so unit writes (custom units included) drop every scope's list.
+    return unit_catalog_cache_key(f"units:{_cache_scope_token()}")
 
 
 def _get_request_cache() -> List[UnitOption] | None:
@@ -210,6 +214,102 @@ def get_global_unit_list() -> List[UnitOption]:
     return safe_units
 
 
+class _TrieNode:
+    __slots__ = ("children", "positions")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.positions: list[int] = []
+
+
+class _PrefixTrie:
+    """Character trie whose nodes list matching unit positions in sorted order."""
+
+    def __init__(self) -> None:
+        self.root = _TrieNode()
+
+    def insert(self, key: str, position: int) -> None:
+        # Positions arrive in ascending order, so appends keep each list sorted.
+        node = self.root
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            if not node.positions or node.positions[-1] != position:
+                node.positions.append(position)
+
+    def lookup(self, prefix: str) -> list[int]:
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.positions
+
+
+class UnitSearchIndex:
+    """Pre-sorted unit list with per-type tries over name substrings and symbol prefixes.
+
+    Names are indexed by every suffix, so a prefix walk answers the legacy
+    case-insensitive substring match; symbols are indexed by prefix.
+    """
+
+    def __init__(self, units: Iterable[Any]):
+        self.units: List[UnitOption] = sorted(
+            _normalize_unit_collection(units),
+            key=lambda u: (str(u.unit_type or ""), str(u.name or "")),
+        )
+        self.positions_by_type: dict[str, list[int]] = {}
+        self._tries: dict[str | None, _PrefixTrie] = {None: _PrefixTrie()}
+        for position, unit in enumerate(self.units):
+            unit_type = unit.unit_type
+            self.positions_by_type.setdefault(unit_type, []).append(position)
+            typed_trie = self._tries.setdefault(unit_type, _PrefixTrie())
+            name = (unit.name or "").lower()
+            keys = {name[start:] for start in range(len(name))}
+            symbol = (unit.symbol or "").strip().lower()
+            if symbol:
+                keys.add(symbol)
+            for key in sorted(keys):
+                self._tries[None].insert(key, position)
+                typed_trie.insert(key, position)
+
+    def search(
+        self, query: str = "", unit_type: str | None = None, limit: int | None = None
+    ) -> List[UnitOption]:
+        """Units of `unit_type` whose name contains or symbol starts with `query`."""
+        query = (query or "").strip().lower()
+        unit_type = unit_type or None
+        if query:
+            trie = self._tries.get(unit_type)
+            positions = trie.lookup(query) if trie else []
+        elif unit_type:
+            positions = self.positions_by_type.get(unit_type, [])
+        else:
+            positions = range(len(self.units))
+        if limit is not None:
+            positions = positions[:limit]
+        return [self.units[position] for position in positions]
+
+
+def get_unit_search_index() -> UnitSearchIndex:
+    """Return the search index for the active unit scope, built once per unit list version."""
+    if not has_app_context():
+        return UnitSearchIndex(get_global_unit_list())
+
+    cache_key = _cache_key()
+    indexes = current_app.extensions.setdefault(_SEARCH_INDEX_KEY, {})
+    entry = indexes.get(cache_key)
+    now = time.monotonic()
+    if entry is not None and now - entry[0] < _CACHE_TTL_SECONDS:
+        return entry[1]
+
+    index = UnitSearchIndex(get_global_unit_list())
+    indexes.pop(cache_key, None)
+    indexes[cache_key] = (now, index)
+    while len(indexes) > _SEARCH_INDEX_MAX_SCOPES:
+        indexes.pop(next(iter(indexes)))
+    return index
+
+
 def _ingredient_has_density(ingredient: Any | None) -> bool:
     if not ingredient:
         return False
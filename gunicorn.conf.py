@@ -6,10 +6,12 @@ Defines worker counts, timeouts, and logging defaults for Gunicorn.
 Glossary:
 - Worker: Gunicorn process handling requests.
 - Preload: Load the app before forking workers.
+- GC freeze: Move preloaded objects out of GC tracking so forks keep sharing pages.
 """
 
 from __future__ import annotations
 
+import gc
 import logging
 import multiprocessing
 import os
@@ -83,6 +85,38 @@ max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
 # Preload application for memory efficiency (opt-in; safer to default off)
 preload_app = _env_bool("GUNICORN_PRELOAD_APP", False)
 
+
+def _patch_gevent_before_preload() -> None:
+    """Monkey patch in the master so preloaded modules see gevent primitives.
+
+    Gunicorn's gevent worker patches after fork, which is too late for locks
+    and sockets created while the master imports the preloaded app.
+    """
+    if not preload_app or worker_class != "gevent":
+        return
+    try:
+        from gevent import monkey
+    except ImportError:  # pragma: no cover - gevent optional locally
+        return
+    patch_threads = os.environ.get("GEVENT_PATCH_THREADS")
+    if patch_threads is None:
+        thread_patch = sys.version_info < (3, 13)
+    else:
+        thread_patch = patch_threads.strip().lower() in {"1", "true", "yes", "on"}
+    kwargs = {} if thread_patch else {"thread": False, "threading": False}
+    monkey.patch_all(**kwargs)
+
+
+_patch_gevent_before_preload()
+
+
+def when_ready(server) -> None:
+    """Freeze the preloaded heap so workers share it copy-on-write."""
+    if preload_app:
+        gc.collect()
+        gc.freeze()
+        server.log.info("Preloaded app heap frozen (%s objects)", gc.get_freeze_count())
+
 # Logging
 access_log_format = (
     '%(h)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" '
@@ -74,6 +74,7 @@ LOCUST_FAIL_FAST_LOGIN = _get_bool_env("LOCUST_FAIL_FAST_LOGIN", True)
 LOCUST_ABORT_ON_AUTH_FAILURE = _get_bool_env("LOCUST_ABORT_ON_AUTH_FAILURE", False)
 LOCUST_MAX_LOGIN_ATTEMPTS = max(1, _get_int_env("LOCUST_MAX_LOGIN_ATTEMPTS", 2))
 LOCUST_DASHBOARD_PATH = os.getenv("LOCUST_DASHBOARD_PATH", "/user_dashboard")
+LOCUST_ENABLE_PRODUCTION_FLOWS = _get_bool_env("LOCUST_ENABLE_PRODUCTION_FLOWS", True)
 
 
 def _sanitize_cli_args() -> None:
@@ -115,8 +116,20 @@ def _extract_global_item_id(payload) -> Optional[int]:
     return None
 
 
+def _read_credentials_file() -> str:
+    path = (os.getenv("LOCUST_USER_CREDENTIALS_FILE") or "").strip()
+    if not path:
+        return ""
+    try:
+        with open(path, encoding="utf-8") as handle:
+            return handle.read().strip()
+    except OSError as exc:
+        LOGGER.warning("LOCUST_USER_CREDENTIALS_FILE unreadable (%s): %s", path, exc)
+        return ""
+
+
 def _load_user_credentials():
-    raw = (os.getenv("LOCUST_USER_CREDENTIALS") or "").strip()
+    raw = (os.getenv("LOCUST_USER_CREDENTIALS") or "").strip() or _read_credentials_file()
     if raw:
         try:
             payload = json.loads(raw)
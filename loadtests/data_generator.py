@@ -0,0 +1,615 @@
+"""
+Load-test tenant data generator.
+
+Synopsis:
+Seeds N organizations with realistic, reproducible distributions of inventory
+items, FIFO lots, history, recipes, batches, and product SKUs so Locust
+scenarios run against production-shaped tenants instead of whatever happens to
+be in the database. High-volume rows are bulk inserted; each tenant gets its
+own login users and the credentials are written for LOCUST_USER_CREDENTIALS.
+
+Glossary:
+- Tenant profile: Size knobs (medians and means) for one seeded organization.
+- Popularity skew: Zipf-like weighting so a few ingredients appear in most recipes.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import random
+import sys
+from dataclasses import dataclass
+from datetime import timedelta
+
+# Add the parent directory to Python path to import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sqlalchemy as sa
+
+from app.extensions import db
+from app.models import (
+    Batch,
+    BatchIngredient,
+    InventoryItem,
+    InventoryLot,
+    Organization,
+    Permission,
+    Role,
+    SubscriptionTier,
+    UnifiedInventoryHistory,
+    User,
+)
+from app.models.product import Product, ProductSKU, ProductVariant
+from app.models.product_category import ProductCategory
+from app.models.recipe import Recipe, RecipeIngredient
+from app.services.quantity_base import to_base_quantity
+from app.utils.timezone_utils import TimezoneUtils
+
+DEFAULT_ORG_PREFIX = "Load Tenant"
+DEFAULT_USER_PREFIX = "loadtenant"
+
+_INGREDIENT_UNITS = (("gram", 0.6), ("ml", 0.25), ("count", 0.15))
+_HISTORY_DEDUCTIONS = (("batch", 0.7), ("use", 0.15), ("spoil", 0.1), ("trash", 0.05))
+_BATCH_STATUSES = (
+    ("completed", 0.8),
+    ("in_progress", 0.08),
+    ("failed", 0.06),
+    ("cancelled", 0.06),
+)
+_CONTAINER_CAPACITIES = (50, 100, 120, 240, 250, 500)
+_PRODUCT_SIZES = ("2 oz", "4 oz", "8 oz", "16 oz")
+
+
+@dataclass(frozen=True)
+class TenantProfile:
+    """Per-organization size distribution knobs."""
+
+    items_median: int
+    items_max: int
+    lots_mean: float
+    deductions_per_lot: int
+    recipes_median: int
+    batches_per_recipe: float
+    products_median: int
+    users_per_org: int
+
+
+PROFILES = {
+    "small": TenantProfile(30, 120, 2.0, 2, 6, 2.0, 3, 1),
+    "realistic": TenantProfile(150, 1500, 3.0, 3, 25, 4.0, 12, 2),
+    "heavy": TenantProfile(800, 5000, 6.0, 5, 120, 8.0, 60, 4),
+}
+
+
+def _weighted(rng: random.Random, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights, k=1)[0]
+
+
+def _lognormal_count(rng: random.Random, median: int, low: int, high: int) -> int:
+    """Right-skewed count: most tenants are small, a few are very large."""
+    value = int(round(rng.lognormvariate(math.log(max(median, 1)), 0.6)))
+    return max(low, min(high, value))
+
+
+def _mean_count(rng: random.Random, mean: float, low: int = 1) -> int:
+    """Geometric-ish count with the given mean (never below ``low``)."""
+    extra = max(mean - low, 0.0)
+    if extra <= 0:
+        return low
+    return low + int(rng.expovariate(1.0 / extra))
+
+
+def _popular_sample(rng: random.Random, population: list, k: int) -> list:
+    """Sample ``k`` distinct entries, favouring the front of ``population``."""
+    k = min(k, len(population))
+    weights = [1.0 / (rank + 1) ** 1.1 for rank in range(len(population))]
+    picked: dict = {}
+    while len(picked) < k:
+        choice = rng.choices(population, weights=weights, k=1)[0]
+        picked.setdefault(choice, None)
+    return list(picked)
+
+
+def _base_factor(unit: str) -> float:
+    return to_base_quantity(amount=1000, unit_name=unit) / 1000
+
+
+def _resolve_context(tier_name: str):
+    tier = SubscriptionTier.query.filter_by(name=tier_name).first()
+    if not tier:
+        raise RuntimeError(f"Subscription tier {tier_name!r} not found; run seeders first.")
+    tier.permissions = Permission.query.filter_by(is_active=True).all()
+    owner_role = Role.query.filter_by(name="organization_owner", is_system_role=True).first()
+    category = ProductCategory.query.filter_by(name="Uncategorized").first()
+    if not category:
+        category = ProductCategory(name="Uncategorized")
+        db.session.add(category)
+        db.session.flush()
+    return tier, owner_role, category
+
+
+# --- Tenant seeding ---
+# Purpose: Seed one organization with its users, inventory, recipes, batches, and SKUs.
+# Inputs: Seeded RNG, tenant index, profile, and shared tier/role/category rows.
+# Outputs: Dict with credentials and row counts (caller commits).
+def seed_tenant(
+    rng: random.Random,
+    index: int,
+    profile: TenantProfile,
+    *,
+    tier,
+    owner_role,
+    category,
+    org_prefix: str = DEFAULT_ORG_PREFIX,
+    user_prefix: str = DEFAULT_USER_PREFIX,
+    password: str = "loadtest123",
+) -> dict:
+    now = TimezoneUtils.utc_now()
+    org = Organization(
+        name=f"{org_prefix} {index:04d}",
+        contact_email=f"{user_prefix}{index}@example.com",
+        subscription_tier_id=tier.id,
+        is_active=True,
+        subscription_status="active",
+        billing_status="active",
+    )
+    db.session.add(org)
+    db.session.flush()
+
+    credentials = []
+    users = []
+    for seat in range(1, profile.users_per_org + 1):
+        username = f"{user_prefix}{index}_{seat}"
+        user = User(
+            username=username,
+            email=f"{username}@example.com",
+            first_name="Load Tenant",
+            last_name=f"{index}-{seat}",
+            organization_id=org.id,
+            user_type="customer",
+            is_active=True,
+            email_verified=True,
+        )
+        user.set_password(password)
+        db.session.add(user)
+        users.append(user)
+        credentials.append({"username": username, "password": password})
+    db.session.flush()
+    if owner_role:
+        for user in users:
+            user.assign_role(owner_role)
+    owner_id = users[0].id
+
+    # Inventory: ingredients dominate, plus containers sized for recipe yields.
+    item_count = _lognormal_count(rng, profile.items_median, 10, profile.items_max)
+    container_count = max(3, item_count // 12)
+    item_rows = []
+    for position in range(item_count):
+        unit = _weighted(rng, _INGREDIENT_UNITS)
+        perishable = rng.random() < 0.3
+        item_rows.append(
+            {
+                "name": f"Ingredient {position:05d}",
+                "type": "ingredient",
+                "unit": unit,
+                "cost_per_unit": round(rng.lognormvariate(math.log(0.05), 0.8), 4),
+                "is_perishable": perishable,
+                "shelf_life_days": rng.choice((90, 180, 365)) if perishable else None,
+                "capacity": None,
+                "capacity_unit": None,
+                "organization_id": org.id,
+                "created_by": owner_id,
+            }
+        )
+    for position in range(container_count):
+        capacity = rng.choice(_CONTAINER_CAPACITIES)
+        item_rows.append(
+            {
+                "name": f"Jar {capacity} #{position:03d}",
+                "type": "container",
+                "unit": "count",
+                "cost_per_unit": round(rng.uniform(0.15, 1.5), 2),
+                "capacity": float(capacity),
+                "capacity_unit": rng.choice(("gram", "ml")),
+                "is_perishable": False,
+                "shelf_life_days": None,
+                "organization_id": org.id,
+                "created_by": owner_id,
+            }
+        )
+    # executemany needs every row to carry the same keys.
+    db.session.execute(sa.insert(InventoryItem.__table__), item_rows)
+    items = db.session.execute(
+        sa.select(
+            InventoryItem.id,
+            InventoryItem.type,
+            InventoryItem.unit,
+            InventoryItem.shelf_life_days,
+        )
+        .where(InventoryItem.organization_id == org.id)
+        .order_by(InventoryItem.id)
+    ).all()
+
+    factors = {unit: _base_factor(unit) for unit, _ in _INGREDIENT_UNITS}
+    lot_rows, on_hand = [], {}
+    for item_id, item_type, unit, shelf_life in items:
+        lot_count = _mean_count(rng, profile.lots_mean)
+        for lot_index in range(lot_count):
+            original = float(
+                int(rng.lognormvariate(math.log(1000 if item_type != "container" else 200), 0.7))
+                + 1
+            )
+            # Older lots are mostly consumed; the newest lot is mostly full.
+            newest = lot_index == lot_count - 1
+            consumed = rng.betavariate(1, 3) if newest else rng.betavariate(3, 1)
+            remaining = round(original * (1 - consumed), 1)
+            received = now - timedelta(days=(lot_count - lot_index) * rng.randint(7, 45))
+            factor = factors.get(unit, factors["count"])
+            lot_rows.append(
+                {
+                    "inventory_item_id": item_id,
+                    "remaining_quantity": remaining,
+                    "original_quantity": original,
+                    "remaining_quantity_base": int(round(remaining * factor)),
+                    "original_quantity_base": int(round(original * factor)),
+                    "unit": unit,
+                    "unit_cost": round(rng.uniform(0.01, 0.5), 4),
+                    "received_date": received,
+                    "created_at": received,
+                    "expiration_date": (
+                        received + timedelta(days=shelf_life) if shelf_life else None
+                    ),
+                    "shelf_life_days": shelf_life,
+                    "source_type": "restock",
+                    "fifo_code": f"LT{org.id}-{item_id}-{lot_index}",
+                    "organization_id": org.id,
+                    "created_by": owner_id,
+                }
+            )
+            totals = on_hand.setdefault(item_id, [0.0, 0])
+            totals[0] += remaining
+            totals[1] += int(round(remaining * factor))
+    db.session.execute(sa.insert(InventoryLot.__table__), lot_rows)
+    db.session.execute(
+        sa.update(InventoryItem.__table__)
+        .where(InventoryItem.__table__.c.id == sa.bindparam("b_id"))
+        .values(quantity=sa.bindparam("b_qty"), quantity_base=sa.bindparam("b_base")),
+        [
+            {"b_id": item_id, "b_qty": round(qty, 3), "b_base": base}
+            for item_id, (qty, base) in on_hand.items()
+        ],
+    )
+
+    history_rows = []
+    for lot in db.session.execute(
+        sa.select(
+            InventoryLot.id,
+            InventoryLot.inventory_item_id,
+            InventoryLot.original_quantity,
+            InventoryLot.remaining_quantity,
+            InventoryLot.unit,
+            InventoryLot.received_date,
+        ).where(InventoryLot.organization_id == org.id)
+    ):
+        factor = factors.get(lot.unit, factors["count"])
+        history_rows.append(
+            {
+                "inventory_item_id": lot.inventory_item_id,
+                "timestamp": lot.received_date,
+                "change_type": "restock",
+                "quantity_change": lot.original_quantity,
+                "quantity_change_base": int(round(lot.original_quantity * factor)),
+                "unit": lot.unit,
+                "affected_lot_id": lot.id,
+                "organization_id": org.id,
+                "created_by": owner_id,
+            }
+        )
+        consumed = lot.original_quantity - lot.remaining_quantity
+        for step in range(profile.deductions_per_lot):
+            amount = round(consumed / profile.deductions_per_lot, 3)
+            if amount <= 0:
+                break
+            history_rows.append(
+                {
+                    "inventory_item_id": lot.inventory_item_id,
+                    "timestamp": lot.received_date + timedelta(days=step + 1),
+                    "change_type": _weighted(rng, _HISTORY_DEDUCTIONS),
+                    "quantity_change": -amount,
+                    "quantity_change_base": -int(round(amount * factor)),
+                    "unit": lot.unit,
+                    "affected_lot_id": lot.id,
+                    "organization_id": org.id,
+                    "created_by": owner_id,
+                }
+            )
+    db.session.execute(sa.insert(UnifiedInventoryHistory.__table__), history_rows)
+
+    # Recipes draw ingredients with popularity skew; batches follow each recipe.
+    ingredients = [row for row in items if row.type == "ingredient"]
+    recipe_count = _lognormal_count(rng, profile.recipes_median, 2, 10 * profile.recipes_median)
+    recipes = []
+    for position in range(recipe_count):
+        yield_unit = rng.choice(("gram", "ml"))
+        recipe = Recipe(
+            name=f"Recipe {position:04d}",
+            label_prefix=f"R{position:04d}"[:8],
+            predicted_yield=float(rng.choice((250, 500, 1000, 2000))),
+            predicted_yield_unit=yield_unit,
+            category_id=category.id,
+            organization_id=org.id,
+            created_by=owner_id,
+        )
+        recipes.append(recipe)
+    db.session.add_all(recipes)
+    db.session.flush()
+
+    recipe_rows, batch_rows, recipe_lines = [], [], {}
+    for recipe in recipes:
+        lines = _popular_sample(rng, ingredients, rng.randint(3, 12))
+        recipe_lines[recipe.id] = lines
+        for order, line in enumerate(lines):
+            recipe_rows.append(
+                {
+                    "recipe_id": recipe.id,
+                    "inventory_item_id": line.id,
+                    "quantity": float(rng.randint(5, 200)),
+                    "unit": line.unit,
+                    "order_position": order,
+                    "organization_id": org.id,
+                }
+            )
+        for seq in range(1, _mean_count(rng, profile.batches_per_recipe, low=0) + 1):
+            status = _weighted(rng, _BATCH_STATUSES)
+            started = now - timedelta(days=rng.randint(1, 365), hours=rng.randint(0, 23))
+            finished = started + timedelta(hours=rng.randint(1, 48))
+            batch_rows.append(
+                {
+                    "recipe_id": recipe.id,
+                    "label_code": f"{recipe.label_prefix}-{started.year}-{seq:03d}",
+                    "batch_type": "ingredient",
+                    "projected_yield": recipe.predicted_yield,
+                    "projected_yield_unit": recipe.predicted_yield_unit,
+                    "final_quantity": (
+                        round(recipe.predicted_yield * rng.uniform(0.9, 1.02), 1)
+                        if status == "completed"
+                        else None
+                    ),
+                    "output_unit": recipe.predicted_yield_unit,
+                    "scale": 1.0,
+                    "status": status,
+                    "started_at": started,
+                    "completed_at": finished if status == "completed" else None,
+                    "failed_at": finished if status == "failed" else None,
+                    "cancelled_at": finished if status == "cancelled" else None,
+                    "organization_id": org.id,
+                    "created_by": owner_id,
+                }
+            )
+    if recipe_rows:
+        db.session.execute(sa.insert(RecipeIngredient.__table__), recipe_rows)
+    if batch_rows:
+        db.session.execute(sa.insert(Batch.__table__), batch_rows)
+
+    batch_ingredient_rows = []
+    for batch_id, recipe_id in db.session.execute(
+        sa.select(Batch.id, Batch.recipe_id).where(Batch.organization_id == org.id)
+    ):
+        for line in recipe_lines[recipe_id]:
+            batch_ingredient_rows.append(
+                {
+                    "batch_id": batch_id,
+                    "inventory_item_id": line.id,
+                    "quantity_used": float(rng.randint(5, 200)),
+                    "unit": line.unit,
+                    "cost_per_unit": round(rng.uniform(0.01, 0.5), 4),
+                    "organization_id": org.id,
+                }
+            )
+    if batch_ingredient_rows:
+        db.session.execute(sa.insert(BatchIngredient.__table__), batch_ingredient_rows)
+
+    # Products: a few variants each, sized SKUs backed by product inventory + a lot.
+    sku_count = 0
+    product_count = _lognormal_count(rng, profile.products_median, 1, 10 * profile.products_median)
+    count_factor = factors["count"]
+    for position in range(product_count):
+        product = Product(
+            name=f"Product {position:04d}",
+            category_id=category.id,
+            organization_id=org.id,
+            created_by=owner_id,
+        )
+        db.session.add(product)
+        db.session.flush()
+        for variant_index in range(rng.randint(1, 3)):
+            variant = ProductVariant(
+                product_id=product.id,
+                name=f"Variant {variant_index + 1}",
+                organization_id=org.id,
+                created_by=owner_id,
+            )
+            db.session.add(variant)
+            db.session.flush()
+            for size_label in rng.sample(_PRODUCT_SIZES, rng.randint(1, 3)):
+                stock = float(rng.randint(0, 400))
+                item = InventoryItem(
+                    name=f"{product.name} - {variant.name} - {size_label}",
+                    type="product",
+                    unit="count",
+                    quantity=stock,
+                    quantity_base=int(round(stock * count_factor)),
+                    organization_id=org.id,
+                    created_by=owner_id,
+                )
+                db.session.add(item)
+                db.session.flush()
+                sku_code = f"LT{org.id}-{product.id}-{variant.id}-{item.id}"
+                db.session.add(
+                    ProductSKU(
+                        product_id=product.id,
+                        variant_id=variant.id,
+                        size_label=size_label,
+                        sku_code=sku_code,
+                        sku=sku_code,
+                        sku_name=item.name,
+                        inventory_item_id=item.id,
+                        unit="count",
+                        retail_price=round(rng.uniform(6, 40), 2),
+                        organization_id=org.id,
+                        created_by=owner_id,
+                    )
+                )
+                if stock:
+                    db.session.add(
+                        InventoryLot(
+                            inventory_item_id=item.id,
+                            remaining_quantity=stock,
+                            original_quantity=stock,
+                            remaining_quantity_base=int(round(stock * count_factor)),
+                            original_quantity_base=int(round(stock * count_factor)),
+                            unit="count",
+                            unit_cost=round(rng.uniform(1, 8), 2),
+                            source_type="finished_batch",
+                            fifo_code=f"LTP{org.id}-{item.id}",
+                            organization_id=org.id,
+                            created_by=owner_id,
+                        )
+                    )
+                sku_count += 1
+    db.session.flush()
+
+    return {
+        "organization_id": org.id,
+        "credentials": credentials,
+        "counts": {
+            "items": len(items),
+            "lots": len(lot_rows),
+            "history": len(history_rows),
+            "recipes": len(recipes),
+            "batches": len(batch_rows),
+            "skus": sku_count,
+        },
+    }
+
+
+# --- Seed tenants ---
+# Purpose: Seed several tenants reproducibly inside the current app context.
+# Inputs: Tenant count, profile name, RNG seed, naming prefixes, and tier name.
+# Outputs: List of per-tenant result dicts (commits once per tenant).
+def seed_tenants(
+    org_count: int,
+    profile: str = "realistic",
+    *,
+    seed: int = 42,
+    org_prefix: str = DEFAULT_ORG_PREFIX,
+    user_prefix: str = DEFAULT_USER_PREFIX,
+    password: str = "loadtest123",
+    tier_name: str = "Exempt Plan",
+) -> list[dict]:
+    tenant_profile = PROFILES[profile]
+    tier, owner_role, category = _resolve_context(tier_name)
+    start = (
+        Organization.query.filter(Organization.name.like(f"{org_prefix} %")).count() + 1
+    )
+    results = []
+    for index in range(start, start + org_count):
+        # Per-tenant RNG keeps each tenant stable regardless of how many are seeded.
+        rng = random.Random(f"{seed}:{index}")
+        results.append(
+            seed_tenant(
+                rng,
+                index,
+                tenant_profile,
+                tier=tier,
+                owner_role=owner_role,
+                category=category,
+                org_prefix=org_prefix,
+                user_prefix=user_prefix,
+                password=password,
+            )
+        )
+        db.session.commit()
+    return results
+
+
+# --- Cleanup tenants ---
+# Purpose: Delete seeded tenants and every org-scoped row load runs created.
+# Inputs: Organization name prefix used when seeding.
+# Outputs: Number of organizations removed.
+def cleanup_tenants(org_prefix: str = DEFAULT_ORG_PREFIX) -> int:
+    org_ids = [
+        org_id
+        for (org_id,) in db.session.query(Organization.id).filter(
+            Organization.name.like(f"{org_prefix} %")
+        )
+    ]
+    if not org_ids:
+        return 0
+    # Break the batch <-> product_sku cycle before the ordered deletes.
+    db.session.execute(
+        sa.update(Batch.__table__)
+        .where(Batch.__table__.c.organization_id.in_(org_ids))
+        .values(sku_id=None)
+    )
+    for table in reversed(db.metadata.sorted_tables):
+        if table.name == "organization" or "organization_id" not in table.c:
+            continue
+        db.session.execute(table.delete().where(table.c.organization_id.in_(org_ids)))
+    db.session.execute(
+        Organization.__table__.delete().where(Organization.__table__.c.id.in_(org_ids))
+    )
+    db.session.commit()
+    return len(org_ids)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app import create_app
+
+    parser = argparse.ArgumentParser(description="Seed realistic load-test tenants")
+    parser.add_argument("action", choices=["seed", "cleanup"], help="Action to perform")
+    parser.add_argument("--orgs", type=int, default=10, help="Tenants to seed (default: 10)")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="realistic")
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed (default: 42)")
+    parser.add_argument("--org-prefix", default=DEFAULT_ORG_PREFIX)
+    parser.add_argument("--user-prefix", default=DEFAULT_USER_PREFIX)
+    parser.add_argument("--password", default="loadtest123")
+    parser.add_argument("--tier", default="Exempt Plan", help="Subscription tier name")
+    parser.add_argument(
+        "--credentials-out",
+        default="loadtests/tenant_credentials.json",
+        help="Where to write the LOCUST_USER_CREDENTIALS JSON list",
+    )
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if args.action == "cleanup":
+            removed = cleanup_tenants(args.org_prefix)
+            print(f"✅ Cleanup complete: {removed} tenant organizations removed")
+            sys.exit(0)
+
+        results = seed_tenants(
+            args.orgs,
+            args.profile,
+            seed=args.seed,
+            org_prefix=args.org_prefix,
+            user_prefix=args.user_prefix,
+            password=args.password,
+            tier_name=args.tier,
+        )
+        credentials = [cred for result in results for cred in result["credentials"]]
+        with open(args.credentials_out, "w", encoding="utf-8") as handle:
+            json.dump(credentials, handle, indent=2)
+        totals: dict[str, int] = {}
+        for result in results:
+            for key, value in result["counts"].items():
+                totals[key] = totals.get(key, 0) + value
+        print(f"✅ Seeded {len(results)} tenants ({args.profile}): {totals}")
+        print(f"   Credentials: {args.credentials_out} ({len(credentials)} users)")
+        print(f"   Run with LOCUST_USER_CREDENTIALS_FILE={args.credentials_out}")
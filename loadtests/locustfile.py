@@ -1,14 +1,25 @@
 """Locust Load Testing Configuration - Production Mix."""
 
+from locust import events
+
 from loadtests.common import _sanitize_cli_args
+from loadtests.slo import register_slo_listeners
 from loadtests.users.anonymous import AnonymousUser
 from loadtests.users.batch_workflow import BatchWorkflowUser
 from loadtests.users.inventory_ops import InventoryOpsUser
 from loadtests.users.product_ops import ProductOpsUser
+from loadtests.users.production_flows import (
+    BulkInventoryUser,
+    ExportUser,
+    PosReservationUser,
+    ProductionFlowUser,
+)
+from loadtests.users.public_library import PublicLibraryUser
 from loadtests.users.recipe_ops import RecipeOpsUser
 
 
 _sanitize_cli_args()
+register_slo_listeners(events)
 
 
 user_classes = [
@@ -17,4 +28,9 @@ user_classes = [
     InventoryOpsUser,
     ProductOpsUser,
     AnonymousUser,
+    ProductionFlowUser,
+    PosReservationUser,
+    BulkInventoryUser,
+    ExportUser,
+    PublicLibraryUser,
 ]
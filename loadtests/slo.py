@@ -0,0 +1,243 @@
+"""Per-scenario SLOs and the end-of-run summary report for load tests.
+
+Aggregation and evaluation are plain functions so they can be unit tested
+without Locust; ``register_slo_listeners`` wires them to Locust events.
+Server-side query counts come from the ``X-Query-Count`` response header,
+which the app emits when ``QUERY_METRICS_HEADERS_ENABLED`` is on.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+
+@dataclass(frozen=True)
+class ScenarioSLO:
+    """Latency/error budget applied to every endpoint in one scenario."""
+
+    name: str
+    endpoints: Tuple[str, ...]
+    p95_ms: float
+    p99_ms: float
+    max_failure_ratio: float = 0.01
+    prefix: bool = False
+
+    def matches(self, endpoint: str) -> bool:
+        if self.prefix:
+            return any(endpoint.startswith(entry) for entry in self.endpoints)
+        return endpoint in self.endpoints
+
+
+SCENARIO_SLOS: Tuple[ScenarioSLO, ...] = (
+    ScenarioSLO("planning", ("plan_production",), p95_ms=1200, p99_ms=2500),
+    ScenarioSLO(
+        "batches",
+        ("start_batch", "complete_batch", "fail_batch"),
+        p95_ms=1500,
+        p99_ms=3000,
+    ),
+    ScenarioSLO(
+        "pos",
+        ("reserve_inventory", "confirm_sale"),
+        p95_ms=400,
+        p99_ms=900,
+        max_failure_ratio=0.005,
+    ),
+    ScenarioSLO("bulk_inventory", ("bulk_inventory_update",), p95_ms=2500, p99_ms=5000),
+    ScenarioSLO("exports", ("export_",), p95_ms=1500, p99_ms=3000, prefix=True),
+    ScenarioSLO(
+        "public_search",
+        (
+            "public_recipe_library",
+            "public_recipe_library_search",
+            "global_items_search",
+            "public_global_item_search",
+            "public_units",
+        ),
+        p95_ms=500,
+        p99_ms=1200,
+    ),
+)
+
+
+# --- Query stats ---
+# Purpose: Accumulate per-endpoint server query counts from response headers.
+class QueryCountStats:
+    def __init__(self):
+        self._stats: Dict[str, List[int]] = {}
+
+    def record(self, endpoint: str, header_value) -> None:
+        try:
+            count = int(header_value)
+        except (TypeError, ValueError):
+            return
+        entry = self._stats.setdefault(endpoint, [0, 0, 0])
+        entry[0] += 1
+        entry[1] += count
+        entry[2] = max(entry[2], count)
+
+    def merge(self, payload: Dict[str, List[int]]) -> None:
+        for endpoint, (samples, total, peak) in (payload or {}).items():
+            entry = self._stats.setdefault(endpoint, [0, 0, 0])
+            entry[0] += samples
+            entry[1] += total
+            entry[2] = max(entry[2], peak)
+
+    def drain(self) -> Dict[str, List[int]]:
+        snapshot, self._stats = self._stats, {}
+        return snapshot
+
+    def summary(self, endpoint: str) -> Tuple[Optional[float], Optional[int]]:
+        entry = self._stats.get(endpoint)
+        if not entry or not entry[0]:
+            return None, None
+        return round(entry[1] / entry[0], 1), entry[2]
+
+
+# --- Summary rows ---
+# Purpose: Flatten Locust stats entries into report rows with query counts.
+# Inputs: Iterable of Locust StatsEntry-like objects and QueryCountStats.
+# Outputs: List of dict rows sorted by request count.
+def build_summary_rows(entries: Iterable, query_stats: QueryCountStats) -> List[dict]:
+    rows = []
+    for entry in entries:
+        if not entry.num_requests:
+            continue
+        avg_queries, max_queries = query_stats.summary(entry.name)
+        rows.append(
+            {
+                "name": entry.name,
+                "method": entry.method,
+                "requests": entry.num_requests,
+                "failures": entry.num_failures,
+                "failure_ratio": round(entry.num_failures / entry.num_requests, 4),
+                "p50_ms": entry.get_response_time_percentile(0.50),
+                "p95_ms": entry.get_response_time_percentile(0.95),
+                "p99_ms": entry.get_response_time_percentile(0.99),
+                "max_ms": round(entry.max_response_time or 0),
+                "avg_queries": avg_queries,
+                "max_queries": max_queries,
+            }
+        )
+    rows.sort(key=lambda row: row["requests"], reverse=True)
+    return rows
+
+
+# --- SLO evaluation ---
+# Purpose: Check every row against the scenario SLO that owns its endpoint.
+# Inputs: Summary rows and the SLO definitions.
+# Outputs: List of human-readable breach messages (empty when all pass).
+def evaluate_slos(
+    rows: Iterable[dict], slos: Iterable[ScenarioSLO] = SCENARIO_SLOS
+) -> List[str]:
+    breaches = []
+    slos = tuple(slos)
+    for row in rows:
+        slo = next((candidate for candidate in slos if candidate.matches(row["name"])), None)
+        if slo is None:
+            continue
+        label = f"[{slo.name}] {row['name']}"
+        if row["p95_ms"] > slo.p95_ms:
+            breaches.append(f"{label}: p95 {row['p95_ms']:.0f}ms > {slo.p95_ms:.0f}ms")
+        if row["p99_ms"] > slo.p99_ms:
+            breaches.append(f"{label}: p99 {row['p99_ms']:.0f}ms > {slo.p99_ms:.0f}ms")
+        if row["failure_ratio"] > slo.max_failure_ratio:
+            breaches.append(
+                f"{label}: failure ratio {row['failure_ratio']:.2%} > "
+                f"{slo.max_failure_ratio:.2%}"
+            )
+    return breaches
+
+
+def format_report(rows: List[dict], breaches: List[str]) -> str:
+    """Render rows and breaches as a Markdown table."""
+    lines = [
+        "| endpoint | method | reqs | fail % | p50 ms | p95 ms | p99 ms | max ms | avg q | max q |",
+        "| --- | --- | ---: | ---: | ---: | ---: | ---: | ---: | ---: | ---: |",
+    ]
+    for row in rows:
+        lines.append(
+            f"| {row['name']} | {row['method']} | {row['requests']} | "
+            f"{row['failure_ratio']:.2%} | {row['p50_ms']:.0f} | {row['p95_ms']:.0f} | "
+            f"{row['p99_ms']:.0f} | {row['max_ms']} | "
+            f"{'-' if row['avg_queries'] is None else row['avg_queries']} | "
+            f"{'-' if row['max_queries'] is None else row['max_queries']} |"
+        )
+    lines.append("")
+    if breaches:
+        lines.append("SLO breaches:")
+        lines.extend(f"- {breach}" for breach in breaches)
+    else:
+        lines.append("All scenario SLOs met.")
+    return "\n".join(lines)
+
+
+def write_report(path: str, rows: List[dict], breaches: List[str]) -> None:
+    """Write JSON when ``path`` ends in .json, Markdown otherwise."""
+    with open(path, "w", encoding="utf-8") as handle:
+        if path.endswith(".json"):
+            json.dump({"endpoints": rows, "slo_breaches": breaches}, handle, indent=2)
+        else:
+            handle.write(format_report(rows, breaches) + "\n")
+
+
+# --- Locust wiring ---
+# Purpose: Collect query headers, merge worker reports, and gate the exit code.
+# Inputs: ``locust.events`` plus enforce/report settings.
+# Outputs: The QueryCountStats instance backing the listeners.
+def register_slo_listeners(
+    events,
+    *,
+    enforce: Optional[bool] = None,
+    report_path: Optional[str] = None,
+) -> QueryCountStats:
+    if enforce is None:
+        enforce = (os.getenv("LOCUST_SLO_ENFORCE") or "").strip().lower() in {
+            "1",
+            "true",
+            "yes",
+            "on",
+        }
+    if report_path is None:
+        report_path = (os.getenv("LOCUST_REPORT_PATH") or "").strip() or None
+    query_stats = QueryCountStats()
+
+    @events.request.add_listener
+    def _record_query_count(name, response=None, exception=None, **kwargs):
+        headers = getattr(response, "headers", None)
+        if exception is None and headers is not None:
+            query_stats.record(name, headers.get(QUERY_COUNT_HEADER))
+
+    @events.report_to_master.add_listener
+    def _send_query_counts(client_id, data, **kwargs):
+        data["query_counts"] = query_stats.drain()
+
+    @events.worker_report.add_listener
+    def _merge_query_counts(client_id, data, **kwargs):
+        query_stats.merge(data.get("query_counts"))
+
+    @events.quitting.add_listener
+    def _report_and_gate(environment, **kwargs):
+        if getattr(environment, "runner", None) is not None and type(
+            environment.runner
+        ).__name__ == "WorkerRunner":
+            return
+        rows = build_summary_rows(environment.stats.entries.values(), query_stats)
+        breaches = evaluate_slos(rows)
+        report = format_report(rows, breaches)
+        LOGGER.info("Load test summary\n%s", report)
+        print(report)
+        if report_path:
+            write_report(report_path, rows, breaches)
+        if breaches and enforce:
+            environment.process_exit_code = 1
+
+    return query_stats
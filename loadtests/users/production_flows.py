@@ -0,0 +1,232 @@
+"""Production-flow load tests (planning, batches, POS, bulk inventory, exports).
+
+These users expect tenants seeded by ``loadtests/data_generator.py`` so every
+login owns recipes with stocked ingredients and product SKUs. Request names
+match the scenario groups in ``loadtests/slo.py``.
+"""
+
+import random
+import time
+
+from locust import task, between
+
+from loadtests.common import (
+    LOCUST_ENABLE_PRODUCTION_FLOWS,
+    BaseAuthenticatedUser,
+)
+
+EXPORT_PATHS = (
+    "/exports/recipe/{recipe_id}/soap-inci",
+    "/exports/recipe/{recipe_id}/soap-inci.csv",
+    "/exports/recipe/{recipe_id}/candle-label",
+    "/exports/recipe/{recipe_id}/baker-sheet.csv",
+    "/exports/recipe/{recipe_id}/lotion-inci.pdf",
+)
+
+
+class TenantScopedUser(BaseAuthenticatedUser):
+    """Authenticated user that caches its own tenant's ids.
+
+    The shared caches in ``loadtests.common`` are process-wide, which is fine
+    for a single load-test org but hands one tenant's ids to another when the
+    credential pool spans several seeded organizations.
+    """
+
+    abstract = True
+
+    def on_start(self):
+        super().on_start()
+        self._tenant_ids = {}
+        self._tenant_loaded_at = 0.0
+
+    def _tenant_payload(self):
+        if time.time() - self._tenant_loaded_at < 300 and self._tenant_ids:
+            return self._tenant_ids
+        recipes = self._fetch_recipe_bootstrap()
+        products = self._fetch_product_bootstrap()
+        self._tenant_ids = {
+            "recipes": [r["id"] for r in recipes if isinstance(r, dict) and r.get("id")],
+            "sku_items": list(products.get("sku_inventory_ids") or []),
+            "ingredients": [
+                entry
+                for entry in self._fetch_ingredient_list()
+                if isinstance(entry, dict) and entry.get("id")
+            ],
+        }
+        self._tenant_loaded_at = time.time()
+        return self._tenant_ids
+
+    def _tenant_pick(self, key):
+        values = self._tenant_payload().get(key) or []
+        return random.choice(values) if values else None
+
+    def _json_post(self, path, payload, *, name, referer="/batches/"):
+        """POST JSON and mark non-2xx or ``success: false`` replies as failures."""
+        if not self._ensure_authenticated():
+            return None
+        with self.client.post(
+            path,
+            json=payload,
+            headers=self._csrf_headers(referer_path=referer),
+            name=name,
+            catch_response=True,
+        ) as response:
+            data = self._safe_json(response)
+            if self._handle_auth_failure(response, name):
+                response.failure("auth failure")
+            elif response.status_code >= 400:
+                response.failure(f"HTTP {response.status_code}")
+            elif isinstance(data, dict) and data.get("success") is False:
+                response.failure(str(data.get("error") or data.get("message"))[:200])
+            else:
+                response.success()
+            return data
+
+
+class ProductionFlowUser(TenantScopedUser):
+    """Plan -> start -> finish (complete or fail) against seeded recipes."""
+
+    abstract = not LOCUST_ENABLE_PRODUCTION_FLOWS
+    wait_time = between(3, 8)
+    weight = 3
+
+    @task(3)
+    def plan_production(self):
+        recipe_id = self._tenant_pick("recipes")
+        if not recipe_id:
+            return
+        self._json_post(
+            f"/production-planning/recipe/{recipe_id}/plan",
+            {"scale": random.choice((0.5, 1.0, 2.0))},
+            name="plan_production",
+            referer=f"/production-planning/recipe/{recipe_id}/plan",
+        )
+
+    @task(2)
+    def start_and_finish_batch(self):
+        recipe_id = self._tenant_pick("recipes")
+        if not recipe_id:
+            return
+        self._ensure_csrf_token("/batches/")
+        data = self._json_post(
+            "/batches/api/start-batch",
+            {
+                "recipe_id": recipe_id,
+                "scale": 1.0,
+                "batch_type": "ingredient",
+                "notes": "Locust production flow",
+                "force_start": True,
+            },
+            name="start_batch",
+        )
+        batch_id = (data or {}).get("batch_id") if isinstance(data, dict) else None
+        if not batch_id:
+            return
+        referer = f"/batches/in-progress/{batch_id}"
+        if random.random() < 0.1:
+            self._json_post(
+                f"/batches/finish-batch/{batch_id}/fail",
+                {"reason": "Locust production flow failure"},
+                name="fail_batch",
+                referer=referer,
+            )
+            return
+        form = {
+            "output_type": "ingredient",
+            "final_quantity": str(random.randint(100, 1000)),
+            "output_unit": "gram",
+        }
+        if self.csrf_token:
+            form["csrf_token"] = self.csrf_token
+        with self.client.post(
+            f"/batches/finish-batch/{batch_id}/complete",
+            data=form,
+            headers=self._csrf_headers(referer_path=referer),
+            allow_redirects=False,
+            name="complete_batch",
+            catch_response=True,
+        ) as response:
+            if response.status_code >= 400:
+                response.failure(f"HTTP {response.status_code}")
+            else:
+                response.success()
+
+
+class PosReservationUser(TenantScopedUser):
+    """POS-style reserve then confirm-sale against seeded product SKUs."""
+
+    abstract = not LOCUST_ENABLE_PRODUCTION_FLOWS
+    wait_time = between(1, 4)
+    weight = 3
+
+    @task
+    def reserve_and_confirm(self):
+        item_id = self._tenant_pick("sku_items")
+        if not item_id:
+            return
+        self._ensure_csrf_token("/products/")
+        order_id = f"LOCUST-{int(time.time() * 1000)}-{random.randint(1000, 9999)}"
+        reserved = self._json_post(
+            "/reservations/api/reservations/create",
+            {"item_id": item_id, "quantity": 1, "order_id": order_id, "source": "locust"},
+            name="reserve_inventory",
+            referer="/products/",
+        )
+        if not (isinstance(reserved, dict) and reserved.get("success")):
+            return
+        self._json_post(
+            f"/reservations/api/reservations/{order_id}/confirm_sale",
+            {"notes": "Locust POS sale"},
+            name="confirm_sale",
+            referer="/products/",
+        )
+
+
+class BulkInventoryUser(TenantScopedUser):
+    """Bulk restock/spoil submissions (requires FEATURE_BULK_INVENTORY_UPDATES)."""
+
+    abstract = not LOCUST_ENABLE_PRODUCTION_FLOWS
+    wait_time = between(10, 30)
+    weight = 1
+
+    @task
+    def submit_bulk_update(self):
+        ingredients = self._tenant_payload().get("ingredients") or []
+        if not ingredients:
+            return
+        lines = []
+        for entry in random.sample(ingredients, min(len(ingredients), random.randint(5, 25))):
+            change_type = random.choices(("restock", "spoil", "trash"), weights=(8, 1, 1))[0]
+            lines.append(
+                {
+                    "inventory_item_id": entry["id"],
+                    "change_type": change_type,
+                    "quantity": random.randint(1, 50) if change_type != "restock" else 500,
+                    "unit": entry.get("unit") or "gram",
+                    "notes": "Locust bulk update",
+                }
+            )
+        self._ensure_csrf_token("/inventory/")
+        self._json_post(
+            "/inventory/api/bulk-adjustments",
+            {"lines": lines},
+            name="bulk_inventory_update",
+            referer="/inventory/",
+        )
+
+
+class ExportUser(TenantScopedUser):
+    """Recipe document exports (HTML, CSV, PDF)."""
+
+    abstract = not LOCUST_ENABLE_PRODUCTION_FLOWS
+    wait_time = between(8, 20)
+    weight = 1
+
+    @task
+    def export_recipe_document(self):
+        recipe_id = self._tenant_pick("recipes")
+        if not recipe_id:
+            return
+        template = random.choice(EXPORT_PATHS)
+        kind = template.rsplit("/", 1)[-1].replace("-", "_").replace(".", "_")
+        self._authed_get(template.format(recipe_id=recipe_id), name=f"export_{kind}")
@@ -0,0 +1,49 @@
+"""Public recipe library and global-item search load tests."""
+
+import random
+
+from locust import HttpUser, task, between
+
+from loadtests.common import GLOBAL_ITEM_SEARCH_TERMS, LOCUST_ENABLE_BROWSE_USERS
+
+LIBRARY_SEARCH_TERMS = ("soap", "candle", "lotion", "lavender", "bread", "balm")
+
+
+class PublicLibraryUser(HttpUser):
+    """Anonymous visitor searching the recipe library and global items."""
+
+    abstract = not LOCUST_ENABLE_BROWSE_USERS
+    wait_time = between(3, 9)
+    weight = 2
+
+    @task(4)
+    def search_recipe_library(self):
+        self.client.get(
+            "/recipes/library",
+            params={"search": random.choice(LIBRARY_SEARCH_TERMS)},
+            name="public_recipe_library_search",
+        )
+
+    @task(2)
+    def browse_recipe_library(self):
+        self.client.get("/recipes/library", name="public_recipe_library")
+
+    @task(3)
+    def search_global_items_page(self):
+        self.client.get(
+            "/global-items",
+            params={"search": random.choice(GLOBAL_ITEM_SEARCH_TERMS)},
+            name="global_items_search",
+        )
+
+    @task(4)
+    def search_global_items_api(self):
+        self.client.get(
+            "/api/public/global-items/search",
+            params={"q": random.choice(GLOBAL_ITEM_SEARCH_TERMS), "type": "ingredient"},
+            name="public_global_item_search",
+        )
+
+    @task(1)
+    def public_units(self):
+        self.client.get("/api/public/units", name="public_units")
@@ -0,0 +1,80 @@
+"""Recipe proportion fingerprint index.
+
+Synopsis:
+Adds the recipe_fingerprint table that stores normalized proportion hashes per
+recipe so duplicate detection can probe indexed buckets instead of comparing
+every recipe pairwise. Rows are populated on recipe save and by the
+`flask rebuild-recipe-fingerprints` backfill command.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.postgres_helpers import safe_create_index, safe_drop_index, table_exists
+
+
+revision = "0033_recipe_fingerprint_index"
+down_revision = "0032_user_email_uniqueness"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not table_exists("recipe_fingerprint"):
+        op.create_table(
+            "recipe_fingerprint",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("recipe_id", sa.Integer(), nullable=False),
+            sa.Column("organization_id", sa.Integer(), nullable=True),
+            sa.Column("ingredient_set_hash", sa.String(length=64), nullable=False),
+            sa.Column("ratio_bucket_hash", sa.String(length=64), nullable=True),
+            sa.Column(
+                "ingredient_count", sa.Integer(), nullable=False, server_default="0"
+            ),
+            sa.Column("proportions", sa.JSON(), nullable=True),
+            sa.Column("totals", sa.JSON(), nullable=True),
+            sa.Column(
+                "fingerprint_version",
+                sa.Integer(),
+                nullable=False,
+                server_default="1",
+            ),
+            sa.Column("computed_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["recipe_id"], ["recipe.id"], ondelete="CASCADE"),
+            sa.ForeignKeyConstraint(["organization_id"], ["organization.id"]),
+            sa.UniqueConstraint("recipe_id", name="uq_recipe_fingerprint_recipe_id"),
+        )
+    safe_create_index(
+        "ix_recipe_fingerprint_org_set",
+        "recipe_fingerprint",
+        ["organization_id", "ingredient_set_hash"],
+        verbose=False,
+    )
+    safe_create_index(
+        "ix_recipe_fingerprint_set",
+        "recipe_fingerprint",
+        ["ingredient_set_hash"],
+        verbose=False,
+    )
+    safe_create_index(
+        "ix_recipe_fingerprint_bucket",
+        "recipe_fingerprint",
+        ["ratio_bucket_hash"],
+        verbose=False,
+    )
+
+
+def downgrade():
+    safe_drop_index(
+        "ix_recipe_fingerprint_bucket", table_name="recipe_fingerprint", verbose=False
+    )
+    safe_drop_index(
+        "ix_recipe_fingerprint_set", table_name="recipe_fingerprint", verbose=False
+    )
+    safe_drop_index(
+        "ix_recipe_fingerprint_org_set", table_name="recipe_fingerprint", verbose=False
+    )
+    if table_exists("recipe_fingerprint"):
+        op.drop_table("recipe_fingerprint")
@@ -0,0 +1,47 @@
+"""Recipe library full-text and trigram search indexes.
+
+Synopsis:
+Enables `pg_trgm` and adds a GIN `tsvector` expression index over recipe name
+and public description plus a GIN trigram index on lower(name) so ranked
+public library search stays index-backed. SQLite gets its FTS5 mirror from
+0042.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+from migrations.postgres_helpers import is_postgresql
+
+
+revision = "0034_recipe_library_search"
+down_revision = "0033_recipe_fingerprint_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not is_postgresql():
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_recipe_library_search_tsv
+        ON recipe USING gin (
+            to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(public_description, ''))
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_recipe_name_trgm
+        ON recipe USING gin (lower(name) gin_trgm_ops)
+        """
+    )
+
+
+def downgrade():
+    if not is_postgresql():
+        return
+    op.execute("DROP INDEX IF EXISTS ix_recipe_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_recipe_library_search_tsv")
@@ -0,0 +1,78 @@
+"""Precomputed global item cost distribution table.
+
+Synopsis:
+Adds global_item_cost_stats, one row per global item holding cost quantiles,
+IQR fences, trimmed aggregates, and a ten-bin histogram. Rows are filled on
+first read or by `flask refresh-global-item-cost-stats`, and flagged stale by
+inventory lot listeners.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.postgres_helpers import safe_create_index, safe_drop_index, table_exists
+
+
+revision = "0035_global_item_cost_stats"
+down_revision = "0034_recipe_library_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not table_exists("global_item_cost_stats"):
+        op.create_table(
+            "global_item_cost_stats",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("global_item_id", sa.Integer(), nullable=False),
+            sa.Column(
+                "sample_count", sa.Integer(), nullable=False, server_default="0"
+            ),
+            sa.Column("min_cost", sa.Float(), nullable=True),
+            sa.Column("max_cost", sa.Float(), nullable=True),
+            sa.Column("p10", sa.Float(), nullable=True),
+            sa.Column("q1", sa.Float(), nullable=True),
+            sa.Column("median", sa.Float(), nullable=True),
+            sa.Column("q3", sa.Float(), nullable=True),
+            sa.Column("p90", sa.Float(), nullable=True),
+            sa.Column("lower_fence", sa.Float(), nullable=True),
+            sa.Column("upper_fence", sa.Float(), nullable=True),
+            sa.Column("mean_ex_outliers", sa.Float(), nullable=True),
+            sa.Column("low", sa.Float(), nullable=True),
+            sa.Column("high", sa.Float(), nullable=True),
+            sa.Column(
+                "outliers_low_count", sa.Integer(), nullable=False, server_default="0"
+            ),
+            sa.Column(
+                "outliers_high_count", sa.Integer(), nullable=False, server_default="0"
+            ),
+            sa.Column("histogram", sa.JSON(), nullable=True),
+            sa.Column(
+                "is_stale", sa.Boolean(), nullable=False, server_default=sa.false()
+            ),
+            sa.Column("computed_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(
+                ["global_item_id"], ["global_item.id"], ondelete="CASCADE"
+            ),
+            sa.UniqueConstraint(
+                "global_item_id", name="uq_global_item_cost_stats_global_item_id"
+            ),
+        )
+    safe_create_index(
+        "ix_global_item_cost_stats_stale",
+        "global_item_cost_stats",
+        ["is_stale"],
+        verbose=False,
+    )
+
+
+def downgrade():
+    safe_drop_index(
+        "ix_global_item_cost_stats_stale",
+        table_name="global_item_cost_stats",
+        verbose=False,
+    )
+    if table_exists("global_item_cost_stats"):
+        op.drop_table("global_item_cost_stats")
@@ -0,0 +1,49 @@
+"""Batch cost rollup cache columns and child batch_id indexes.
+
+Synopsis:
+Adds `batch.cost_rollup` (JSON category totals) and `batch.cost_rolled_up_at`
+so completed batches keep their cost rollup on the row, and indexes the
+batch_id foreign key on the child cost tables that lacked one so the grouped
+rollup query can probe them by batch.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from migrations.postgres_helpers import (
+    safe_add_column,
+    safe_create_index,
+    safe_drop_column,
+    safe_drop_index,
+)
+
+
+revision = "0036_batch_cost_rollup"
+down_revision = "0035_global_item_cost_stats"
+branch_labels = None
+depends_on = None
+
+
+_BATCH_ID_INDEXES = (
+    ("ix_batch_ingredient_batch_id", "batch_ingredient"),
+    ("ix_batch_container_batch_id", "batch_container"),
+    ("ix_extra_batch_ingredient_batch_id", "extra_batch_ingredient"),
+    ("ix_extra_batch_container_batch_id", "extra_batch_container"),
+)
+
+
+def upgrade():
+    safe_add_column("batch", sa.Column("cost_rollup", sa.JSON(), nullable=True))
+    safe_add_column(
+        "batch", sa.Column("cost_rolled_up_at", sa.DateTime(), nullable=True)
+    )
+    for index_name, table_name in _BATCH_ID_INDEXES:
+        safe_create_index(index_name, table_name, ["batch_id"], verbose=False)
+
+
+def downgrade():
+    for index_name, table_name in _BATCH_ID_INDEXES:
+        safe_drop_index(index_name, table_name=table_name, verbose=False)
+    safe_drop_column("batch", "cost_rolled_up_at")
+    safe_drop_column("batch", "cost_rollup")
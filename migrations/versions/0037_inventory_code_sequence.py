@@ -0,0 +1,51 @@
+"""Add per-organization inventory code sequence counters.
+
+Synopsis:
+Creates `inventory_code_sequence`, the counter row behind sequential lot and
+event code suffixes. The sequence allocator reserves blocks of numbers from
+it with one upsert ... RETURNING per block instead of generating random
+suffixes that can collide on `inventory_lot.fifo_code`.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.postgres_helpers import table_exists
+
+
+revision = "0037_inventory_code_sequence"
+down_revision = "0036_batch_cost_rollup"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not table_exists("inventory_code_sequence"):
+        op.create_table(
+            "inventory_code_sequence",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "organization_id",
+                sa.Integer(),
+                sa.ForeignKey("organization.id"),
+                nullable=False,
+            ),
+            sa.Column("prefix", sa.String(length=8), nullable=False),
+            sa.Column(
+                "current_value", sa.BigInteger(), nullable=False, server_default="0"
+            ),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.UniqueConstraint(
+                "organization_id",
+                "prefix",
+                name="uq_inventory_code_sequence_org_prefix",
+            ),
+        )
+
+
+def downgrade():
+    if table_exists("inventory_code_sequence"):
+        op.drop_table("inventory_code_sequence")
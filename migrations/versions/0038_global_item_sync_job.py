@@ -0,0 +1,61 @@
+"""Add the deferred global item sync job queue.
+
+Synopsis:
+Creates `global_item_sync_job`, which holds global item edits whose linked
+inventory fan-out is applied by the scheduler instead of inside the edit
+request, along with the before snapshot and per-field affected counts.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.postgres_helpers import safe_create_index, table_exists
+
+
+revision = "0038_global_item_sync_job"
+down_revision = "0037_inventory_code_sequence"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not table_exists("global_item_sync_job"):
+        op.create_table(
+            "global_item_sync_job",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "global_item_id",
+                sa.Integer(),
+                sa.ForeignKey("global_item.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column(
+                "status", sa.String(length=16), nullable=False, server_default="pending"
+            ),
+            sa.Column("before_snapshot", sa.JSON(), nullable=True),
+            sa.Column("linked_count", sa.Integer(), nullable=True),
+            sa.Column("result", sa.JSON(), nullable=True),
+            sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("error_message", sa.Text(), nullable=True),
+            sa.Column(
+                "requested_by", sa.Integer(), sa.ForeignKey("user.id"), nullable=True
+            ),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("started_at", sa.DateTime(), nullable=True),
+            sa.Column("finished_at", sa.DateTime(), nullable=True),
+        )
+    safe_create_index(
+        "ix_global_item_sync_job_global_item_id",
+        "global_item_sync_job",
+        ["global_item_id"],
+    )
+    safe_create_index(
+        "ix_global_item_sync_job_status", "global_item_sync_job", ["status"]
+    )
+
+
+def downgrade():
+    if table_exists("global_item_sync_job"):
+        op.drop_table("global_item_sync_job")
@@ -0,0 +1,48 @@
+"""Batch freshness summary cache columns and history batch index.
+
+Synopsis:
+Adds `batch.freshness_summary` (JSON BatchFreshnessSummary) and
+`batch.freshness_computed_at` so completed batches keep their freshness report
+on the row, and indexes `unified_inventory_history(batch_id, timestamp)` so the
+set-based freshness query can probe consumption events by batch.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from migrations.postgres_helpers import (
+    safe_add_column,
+    safe_create_index,
+    safe_drop_column,
+    safe_drop_index,
+)
+
+
+revision = "0039_batch_freshness_summary"
+down_revision = "0038_global_item_sync_job"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    safe_add_column("batch", sa.Column("freshness_summary", sa.JSON(), nullable=True))
+    safe_add_column(
+        "batch", sa.Column("freshness_computed_at", sa.DateTime(), nullable=True)
+    )
+    safe_create_index(
+        "ix_unified_history_batch_timestamp",
+        "unified_inventory_history",
+        ["batch_id", "timestamp"],
+        verbose=False,
+    )
+
+
+def downgrade():
+    safe_drop_index(
+        "ix_unified_history_batch_timestamp",
+        table_name="unified_inventory_history",
+        verbose=False,
+    )
+    safe_drop_column("batch", "freshness_computed_at")
+    safe_drop_column("batch", "freshness_summary")
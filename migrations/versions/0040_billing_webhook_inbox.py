@@ -0,0 +1,69 @@
+"""Billing webhook inbox columns on stripe_event.
+
+Synopsis:
+Turns `stripe_event` from a dedupe log into the webhook inbox: the raw event
+payload, provider, per-customer ordering key, provider creation time, and
+retry bookkeeping (attempts, started/next-attempt timestamps), plus a
+`(status, ordering_key)` index for the worker's claim query.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from migrations.postgres_helpers import (
+    safe_add_column,
+    safe_create_index,
+    safe_drop_column,
+    safe_drop_index,
+)
+
+
+revision = "0040_billing_webhook_inbox"
+down_revision = "0039_batch_freshness_summary"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    safe_add_column(
+        "stripe_event",
+        sa.Column(
+            "provider", sa.String(length=16), nullable=False, server_default="stripe"
+        ),
+    )
+    safe_add_column("stripe_event", sa.Column("payload", sa.JSON(), nullable=True))
+    safe_add_column(
+        "stripe_event", sa.Column("ordering_key", sa.String(length=255), nullable=True)
+    )
+    safe_add_column("stripe_event", sa.Column("event_created", sa.Integer(), nullable=True))
+    safe_add_column("stripe_event", sa.Column("started_at", sa.DateTime(), nullable=True))
+    safe_add_column(
+        "stripe_event", sa.Column("next_attempt_at", sa.DateTime(), nullable=True)
+    )
+    safe_add_column(
+        "stripe_event",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+    )
+    safe_create_index(
+        "ix_stripe_event_status_ordering",
+        "stripe_event",
+        ["status", "ordering_key"],
+        verbose=False,
+    )
+
+
+def downgrade():
+    safe_drop_index(
+        "ix_stripe_event_status_ordering", table_name="stripe_event", verbose=False
+    )
+    for column in (
+        "attempts",
+        "next_attempt_at",
+        "started_at",
+        "event_created",
+        "ordering_key",
+        "payload",
+        "provider",
+    ):
+        safe_drop_column("stripe_event", column)
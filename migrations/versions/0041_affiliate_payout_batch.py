@@ -0,0 +1,80 @@
+"""Add affiliate payout batch checkpoints.
+
+Synopsis:
+Creates `affiliate_payout_batch`, one row per org-month payout push recording
+the earning rows, amount, destination, and provider idempotency key before the
+transfer is sent, so an interrupted payout run resumes without paying twice.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.postgres_helpers import safe_create_index, table_exists
+
+
+revision = "0041_affiliate_payout_batch"
+down_revision = "0040_billing_webhook_inbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not table_exists("affiliate_payout_batch"):
+        op.create_table(
+            "affiliate_payout_batch",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "organization_id",
+                sa.Integer(),
+                sa.ForeignKey("organization.id"),
+                nullable=False,
+            ),
+            sa.Column("earning_month", sa.Date(), nullable=False),
+            sa.Column(
+                "status", sa.String(length=16), nullable=False, server_default="planned"
+            ),
+            sa.Column("idempotency_key", sa.String(length=128), nullable=False),
+            sa.Column("earning_ids", sa.JSON(), nullable=False),
+            sa.Column("amount_cents", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("currency", sa.String(length=3), nullable=False, server_default="usd"),
+            sa.Column(
+                "payout_provider",
+                sa.String(length=32),
+                nullable=False,
+                server_default="stripe",
+            ),
+            sa.Column("destination", sa.String(length=255), nullable=False),
+            sa.Column("payout_reference", sa.String(length=128), nullable=True),
+            sa.Column("run_id", sa.String(length=32), nullable=True),
+            sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("error_message", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("claimed_at", sa.DateTime(), nullable=True),
+            sa.Column("finished_at", sa.DateTime(), nullable=True),
+            sa.UniqueConstraint(
+                "idempotency_key", name="uq_affiliate_payout_batch_idempotency_key"
+            ),
+        )
+    safe_create_index(
+        "ix_affiliate_payout_batch_organization_id",
+        "affiliate_payout_batch",
+        ["organization_id"],
+    )
+    safe_create_index(
+        "ix_affiliate_payout_batch_status", "affiliate_payout_batch", ["status"]
+    )
+    safe_create_index(
+        "ix_affiliate_payout_batch_run_id", "affiliate_payout_batch", ["run_id"]
+    )
+    safe_create_index(
+        "ix_affiliate_payout_batch_org_month",
+        "affiliate_payout_batch",
+        ["organization_id", "earning_month"],
+    )
+
+
+def downgrade():
+    if table_exists("affiliate_payout_batch"):
+        op.drop_table("affiliate_payout_batch")
@@ -0,0 +1,60 @@
+"""Recipe library FTS5 mirror for SQLite.
+
+Synopsis:
+Creates the `recipe_library_fts` external-content FTS5 table over recipe name
+and public description, its insert/update/delete sync triggers, and the
+initial rebuild, so SQLite databases get ranked library search without the
+search service running DDL on a request. PostgreSQL uses the indexes from
+0034 and skips this revision.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+from migrations.postgres_helpers import is_sqlite, table_exists
+
+
+revision = "0042_recipe_library_sqlite_fts"
+down_revision = "0041_affiliate_payout_batch"
+branch_labels = None
+depends_on = None
+
+FTS_TABLE = "recipe_library_fts"
+
+
+def upgrade():
+    if not is_sqlite() or not table_exists("recipe"):
+        return
+    op.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "name, public_description, content='recipe', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON recipe BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, name, public_description) "
+        "VALUES (new.id, new.name, new.public_description); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON recipe BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, public_description) "
+        "VALUES ('delete', old.id, old.name, old.public_description); END"
+    )
+    op.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, "
+        f"public_description ON recipe BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, public_description) "
+        "VALUES ('delete', old.id, old.name, old.public_description); "
+        f"INSERT INTO {FTS_TABLE}(rowid, name, public_description) "
+        "VALUES (new.id, new.name, new.public_description); END"
+    )
+    op.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def downgrade():
+    if not is_sqlite():
+        return
+    for suffix in ("au", "ad", "ai"):
+        op.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+    op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
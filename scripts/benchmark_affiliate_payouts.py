@@ -0,0 +1,160 @@
+"""Measure affiliate payout runner throughput against a local fake provider.
+
+Synopsis:
+Optionally seeds synthetic referrer organizations with payout accounts and
+pending monthly earnings, then runs ``AffiliatePayoutRunner`` with
+``FakePayoutProvider`` (simulated transfer latency and failure rate) until no
+eligible batch is left, printing batches pushed, runs, and batches per second.
+Compare ``--workers 1`` with higher values to see the effect of concurrency.
+
+Glossary:
+- Batch: Pending earnings for one referrer organization and month.
+- Pass: One ``AffiliatePayoutRunner.run`` call of at most ``--limit`` batches.
+
+Example:
+    python scripts/benchmark_affiliate_payouts.py --seed 1000 --latency 0.2 --workers 8
+"""
+
+from __future__ import annotations
+
+import secrets
+import time
+from datetime import date
+
+import click
+
+from app import create_app
+from app.extensions import db
+from app.models import Organization, User
+from app.models.affiliate import (
+    AffiliateMonthlyEarning,
+    AffiliatePayoutAccount,
+    AffiliateProfile,
+    AffiliateReferral,
+)
+from app.services.affiliate import AffiliatePayoutRunner, FakePayoutProvider
+from app.services.affiliate.payout_runner import latest_eligible_month
+from app.services.affiliate_service import AffiliateService
+from app.utils.timezone_utils import TimezoneUtils
+
+
+def seed_payout_batches(count: int, referrals_per_batch: int, earning_month: date) -> int:
+    """Create ``count`` payable org-month batches and return earning rows added."""
+    tag = secrets.token_hex(4)
+    rows = 0
+    for index in range(count):
+        referrer = Organization(name=f"Payout bench {tag} {index}")
+        db.session.add(referrer)
+        db.session.flush()
+        user = User(
+            username=f"payout_bench_{tag}_{index}",
+            organization_id=referrer.id,
+            user_type="customer",
+        )
+        db.session.add(user)
+        db.session.flush()
+        profile = AffiliateProfile(
+            organization_id=referrer.id,
+            user_id=user.id,
+            referral_code=f"bench-{tag}-{index}",
+        )
+        db.session.add(profile)
+        db.session.add(
+            AffiliatePayoutAccount(
+                organization_id=referrer.id,
+                payout_provider="stripe",
+                payout_account_reference=f"acct_bench_{tag}_{index}",
+            )
+        )
+        db.session.flush()
+        for ref_index in range(referrals_per_batch):
+            referred = Organization(name=f"Payout bench {tag} {index} ref {ref_index}")
+            db.session.add(referred)
+            db.session.flush()
+            referral = AffiliateReferral(
+                affiliate_profile_id=profile.id,
+                referrer_user_id=user.id,
+                referrer_organization_id=referrer.id,
+                referred_organization_id=referred.id,
+                referral_code=profile.referral_code,
+            )
+            db.session.add(referral)
+            db.session.flush()
+            db.session.add(
+                AffiliateMonthlyEarning(
+                    affiliate_referral_id=referral.id,
+                    referrer_organization_id=referrer.id,
+                    referrer_user_id=user.id,
+                    referred_organization_id=referred.id,
+                    earning_month=earning_month,
+                    gross_revenue_cents=5000,
+                    commission_amount_cents=1000,
+                    payout_status="pending",
+                )
+            )
+            rows += 1
+        if index % 100 == 99:
+            db.session.commit()
+    db.session.commit()
+    return rows
+
+
+@click.command()
+@click.option("--seed", "seed_count", default=0, show_default=True, help="Batches to seed first")
+@click.option("--referrals", default=3, show_default=True, help="Earning rows per seeded batch")
+@click.option("--latency", default=0.1, show_default=True, help="Fake transfer latency in seconds")
+@click.option("--failure-rate", default=0.0, show_default=True, help="Share of fake transfers that fail")
+@click.option("--workers", default=4, show_default=True, help="Concurrent provider pushes")
+@click.option("--limit", default=500, show_default=True, help="Batches per runner pass")
+@click.option("--send-email", is_flag=True, help="Send payout status emails as a real run would")
+def main(
+    seed_count: int,
+    referrals: int,
+    latency: float,
+    failure_rate: float,
+    workers: int,
+    limit: int,
+    send_email: bool,
+):
+    app = create_app()
+    with app.app_context():
+        today = TimezoneUtils.utc_now().date()
+        month = latest_eligible_month(today, AffiliateService.PAYOUT_ARREARS_DAYS)
+        if seed_count:
+            rows = seed_payout_batches(seed_count, referrals, month)
+            click.echo(f"Seeded {seed_count} batches ({rows} earning rows) for {month:%Y-%m}")
+
+        provider = FakePayoutProvider(latency_seconds=latency, failure_rate=failure_rate, seed=0)
+        totals = {"sent_batches": 0, "failed_batches": 0, "resumed_batches": 0, "blocked_rows": 0}
+        runs = 0
+        started = time.perf_counter()
+        while True:
+            result = AffiliatePayoutRunner(
+                provider,
+                max_workers=workers,
+                as_of_date=today,
+                arrears_days=AffiliateService.PAYOUT_ARREARS_DAYS,
+                send_email=send_email,
+            ).run(limit_batches=limit)
+            runs += 1
+            for key in totals:
+                totals[key] += int(result.get(key, 0) or 0)
+            # Failed pushes retry next pass; stop once a pass makes no progress.
+            if not result["sent_batches"]:
+                break
+        elapsed = time.perf_counter() - started
+
+        rate = totals["sent_batches"] / elapsed if elapsed > 0 else 0.0
+        click.echo(
+            f"Pushed {totals['sent_batches']} batches in {elapsed:.2f} s over {runs} run(s) "
+            f"with {workers} worker(s): {rate:,.1f} batches/s"
+        )
+        click.echo(
+            f"Provider calls: {provider.calls}, transfers: {len(provider.transfers)}, "
+            f"failed pushes: {totals['failed_batches']}, resumed: {totals['resumed_batches']}, "
+            f"churn-blocked rows: {totals['blocked_rows']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Profile worker cold start: import time, create_app time, and RSS.
+
+Runs ``create_app()`` in a fresh interpreter with ``-X importtime`` and prints
+the slowest imports, the app factory wall time, and resident memory. Modules in
+DEFERRED_MODULES must stay out of boot; ``--check`` exits non-zero if any are
+imported eagerly so CI catches regressions.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import click
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Heavy optional dependencies that must load on first use, not at boot.
+DEFERRED_MODULES = (
+    "google.generativeai",
+    "google_auth_oauthlib",
+    "numpy",
+    "weasyprint",
+)
+
+_CHILD_SCRIPT = """
+import json, resource, sys, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+config = json.loads(sys.argv[1]) or None
+create_app(config)
+finished = time.perf_counter()
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    rss_kb //= 1024
+print(json.dumps({
+    "import_ms": round((imported - started) * 1000, 1),
+    "create_app_ms": round((finished - imported) * 1000, 1),
+    "max_rss_mb": round(rss_kb / 1024, 1),
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Parse ``-X importtime`` output into rows (self/cumulative microseconds)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        try:
+            self_value = int(self_us.strip())
+            cumulative_value = int(cumulative_us.strip())
+        except ValueError:
+            continue  # header row
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append(
+            {
+                "module": name.strip(),
+                "self_us": self_value,
+                "cumulative_us": cumulative_value,
+                "depth": depth,
+            }
+        )
+    return rows
+
+
+def profile_startup(config: dict | None = None) -> dict:
+    """Build the app in a fresh interpreter and return timing/memory stats."""
+    env = dict(os.environ)
+    env.setdefault("SQLALCHEMY_CREATE_ALL", "0")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD_SCRIPT, json.dumps(config or {})],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    stdout_lines = [line for line in completed.stdout.splitlines() if line.startswith("{")]
+    if completed.returncode != 0 or not stdout_lines:
+        raise RuntimeError(f"create_app failed in profiler child:\n{completed.stderr[-2000:]}")
+    stats = json.loads(stdout_lines[-1])
+    modules = set(stats.pop("modules"))
+    stats["imports"] = parse_importtime(completed.stderr)
+    stats["eager_deferred"] = [
+        name
+        for name in DEFERRED_MODULES
+        if name in modules or any(module.startswith(f"{name}.") for module in modules)
+    ]
+    return stats
+
+
+@click.command()
+@click.option("--top", default=25, show_default=True, help="Rows in each table")
+@click.option("--json-out", type=click.Path(dir_okay=False), help="Write full stats as JSON")
+@click.option("--testing", is_flag=True, help="Use an in-memory SQLite testing config")
+@click.option("--check", is_flag=True, help="Fail if a deferred module loads at boot")
+def main(top: int, json_out: str | None, testing: bool, check: bool):
+    config = (
+        {"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"}
+        if testing
+        else None
+    )
+    stats = profile_startup(config)
+    imports = stats["imports"]
+
+    click.echo(
+        f"import app: {stats['import_ms']:.0f} ms | create_app: "
+        f"{stats['create_app_ms']:.0f} ms | max RSS: {stats['max_rss_mb']:.0f} MB"
+    )
+    click.echo(f"\nTop {top} packages by cumulative import time (top-level only):")
+    for row in sorted(
+        (row for row in imports if row["depth"] == 0),
+        key=lambda row: row["cumulative_us"],
+        reverse=True,
+    )[:top]:
+        click.echo(f"  {row['cumulative_us'] / 1000:8.1f} ms  {row['module']}")
+    click.echo(f"\nTop {top} app modules by cumulative import time:")
+    for row in sorted(
+        (row for row in imports if row["module"].startswith("app.")),
+        key=lambda row: row["cumulative_us"],
+        reverse=True,
+    )[:top]:
+        click.echo(f"  {row['cumulative_us'] / 1000:8.1f} ms  {row['module']}")
+
+    if stats["eager_deferred"]:
+        click.echo(f"\nDeferred modules imported at boot: {', '.join(stats['eager_deferred'])}")
+    else:
+        click.echo("\nDeferred modules stay out of boot.")
+    if json_out:
+        Path(json_out).write_text(json.dumps(stats, indent=2) + "\n")
+    if check and stats["eager_deferred"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
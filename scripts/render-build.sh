@@ -48,3 +48,6 @@ else
   echo "==> Building static assets"
   flask build-assets
 fi
+
+echo "==> Building public media manifest"
+flask build-media-manifest
@@ -0,0 +1,236 @@
+"""Replay synthetic Stripe webhooks through the billing inbox and time them.
+
+Synopsis:
+Builds signed, Stripe-shaped invoice events spread across a set of customers,
+posts them to ``/billing/webhooks/stripe`` (the in-process test client by
+default, or ``--url`` for a running server that shares the database), then
+drains the inbox with ``BillingWebhookQueue`` and prints intake, processing,
+and end-to-end throughput. A share of events is re-sent to exercise dedupe.
+
+Glossary:
+- Delivery: One signed POST; duplicates reuse an event id.
+- Drain: Repeated ``process_pending`` passes until no due lane is left.
+
+Example:
+    python scripts/replay_billing_webhooks.py --events 5000 --customers 200 --seed-orgs
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import click
+
+from app import create_app
+from app.extensions import db
+from app.models.models import Organization
+from app.models.stripe_event import StripeEvent
+from app.services.billing_webhook_queue import BillingWebhookQueue
+
+WEBHOOK_PATH = "/billing/webhooks/stripe"
+CUSTOMER_PREFIX = "cus_replay_"
+EVENT_PREFIX = "evt_replay_"
+_EVENT_TYPES = ("invoice.payment_succeeded", "invoice.payment_failed")
+
+
+def build_events(count: int, customers: int, *, seed: int = 0) -> List[Dict[str, Any]]:
+    """Return ``count`` invoice events with increasing ``created`` per customer."""
+    rng = random.Random(seed)
+    started = int(time.time()) - count
+    events = []
+    for index in range(count):
+        customer_id = f"{CUSTOMER_PREFIX}{rng.randrange(customers)}"
+        created = started + index
+        events.append(
+            {
+                "id": f"{EVENT_PREFIX}{seed}_{index}",
+                "object": "event",
+                "type": rng.choice(_EVENT_TYPES),
+                "created": created,
+                "livemode": False,
+                "data": {
+                    "object": {
+                        "id": f"in_replay_{seed}_{index}",
+                        "object": "invoice",
+                        "customer": customer_id,
+                        "period_end": created + 30 * 86400,
+                    }
+                },
+            }
+        )
+    return events
+
+
+def sign_payload(payload: bytes, secret: str, timestamp: int | None = None) -> str:
+    """Build a ``Stripe-Signature`` header the way Stripe signs deliveries."""
+    timestamp = int(timestamp if timestamp is not None else time.time())
+    signed = f"{timestamp}.".encode() + payload
+    digest = hmac.new(secret.encode(), signed, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def seed_organizations(customers: int) -> int:
+    existing = {
+        customer_id
+        for (customer_id,) in db.session.query(Organization.stripe_customer_id).filter(
+            Organization.stripe_customer_id.like(f"{CUSTOMER_PREFIX}%")
+        )
+    }
+    created = 0
+    for index in range(customers):
+        customer_id = f"{CUSTOMER_PREFIX}{index}"
+        if customer_id in existing:
+            continue
+        db.session.add(Organization(name=f"Webhook replay {index}", stripe_customer_id=customer_id))
+        created += 1
+    db.session.commit()
+    return created
+
+
+def _post_in_process(app, bodies: List[bytes], secret: str, concurrency: int) -> Dict[int, int]:
+    def _send(chunk: List[bytes]) -> Dict[int, int]:
+        statuses: Dict[int, int] = {}
+        client = app.test_client()
+        for body in chunk:
+            response = client.post(
+                WEBHOOK_PATH,
+                data=body,
+                headers={"Stripe-Signature": sign_payload(body, secret)},
+                content_type="application/json",
+            )
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        return statuses
+
+    return _fan_out(_send, bodies, concurrency)
+
+
+def _post_remote(url: str, bodies: List[bytes], secret: str, concurrency: int) -> Dict[int, int]:
+    import requests
+
+    def _send(chunk: List[bytes]) -> Dict[int, int]:
+        statuses: Dict[int, int] = {}
+        with requests.Session() as session:
+            for body in chunk:
+                response = session.post(
+                    url,
+                    data=body,
+                    headers={
+                        "Stripe-Signature": sign_payload(body, secret),
+                        "Content-Type": "application/json",
+                    },
+                    timeout=30,
+                )
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        return statuses
+
+    return _fan_out(_send, bodies, concurrency)
+
+
+def _fan_out(send, bodies: List[bytes], concurrency: int) -> Dict[int, int]:
+    concurrency = max(1, min(concurrency, len(bodies) or 1))
+    chunks = [bodies[offset::concurrency] for offset in range(concurrency)]
+    totals: Dict[int, int] = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for statuses in executor.map(send, chunks):
+            for status, count in statuses.items():
+                totals[status] = totals.get(status, 0) + count
+    return totals
+
+
+def drain(workers: int) -> Dict[str, int]:
+    totals = {"processed": 0, "failed": 0, "skipped": 0, "batches": 0}
+    while True:
+        result = BillingWebhookQueue.process_pending(max_workers=workers)
+        if not result["lanes"]:
+            return totals
+        totals["batches"] += 1
+        for key in ("processed", "failed", "skipped"):
+            totals[key] += result[key]
+        if not result["processed"] and not result["failed"]:
+            # Everything left is waiting on a retry backoff.
+            return totals
+
+
+def _rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:,.0f}/s" if seconds > 0 else "n/a"
+
+
+@click.command()
+@click.option("--events", "event_count", default=2000, show_default=True, help="Distinct events to send")
+@click.option("--customers", default=100, show_default=True, help="Distinct Stripe customers")
+@click.option("--duplicates", default=0.05, show_default=True, help="Share of events re-sent")
+@click.option("--concurrency", default=8, show_default=True, help="Concurrent senders")
+@click.option("--workers", default=4, show_default=True, help="Worker lanes while draining")
+@click.option("--secret", default="whsec_replay", show_default=True, help="Webhook signing secret")
+@click.option("--url", help="Post to a running server instead of the in-process client")
+@click.option("--seed", default=0, show_default=True, help="Random seed for event layout")
+@click.option("--seed-orgs", is_flag=True, help="Create organizations for the replay customers")
+@click.option("--cleanup", is_flag=True, help="Delete replay inbox rows afterwards")
+def main(
+    event_count: int,
+    customers: int,
+    duplicates: float,
+    concurrency: int,
+    workers: int,
+    secret: str,
+    url: str | None,
+    seed: int,
+    seed_orgs: bool,
+    cleanup: bool,
+):
+    # Intake must only persist here so processing can be timed on its own.
+    app = create_app(
+        {
+            "STRIPE_WEBHOOK_SECRET": secret,
+            "RATELIMIT_ENABLED": False,
+            "SCHEDULER_ENABLED": True,
+        }
+    )
+    events = build_events(event_count, customers, seed=seed)
+    resent = random.Random(seed).sample(events, int(len(events) * max(0.0, duplicates)))
+    bodies = [json.dumps(event).encode() for event in events + resent]
+
+    with app.app_context():
+        if seed_orgs:
+            click.echo(f"Seeded {seed_organizations(customers)} organizations")
+
+        started = time.perf_counter()
+        if url:
+            statuses = _post_remote(url, bodies, secret, concurrency)
+        else:
+            statuses = _post_in_process(app, bodies, secret, concurrency)
+        intake_seconds = time.perf_counter() - started
+
+        queued = StripeEvent.query.filter(StripeEvent.event_id.like(f"{EVENT_PREFIX}{seed}_%")).count()
+        drain_started = time.perf_counter()
+        totals = drain(workers)
+        processing_seconds = time.perf_counter() - drain_started
+        end_to_end = time.perf_counter() - started
+
+        click.echo(
+            f"Sent {len(bodies)} deliveries ({len(resent)} duplicates) across {customers} customers; "
+            f"statuses: {dict(sorted(statuses.items()))}; inbox rows: {queued}"
+        )
+        click.echo(f"Intake:      {intake_seconds:8.2f} s  {_rate(len(bodies), intake_seconds)}")
+        click.echo(
+            f"Processing:  {processing_seconds:8.2f} s  {_rate(totals['processed'], processing_seconds)}"
+            f"  (processed {totals['processed']}, failed {totals['failed']},"
+            f" batches {totals['batches']}, workers {workers})"
+        )
+        click.echo(f"End to end:  {end_to_end:8.2f} s  {_rate(totals['processed'], end_to_end)}")
+
+        if cleanup:
+            StripeEvent.query.filter(
+                StripeEvent.event_id.like(f"{EVENT_PREFIX}{seed}_%")
+            ).delete(synchronize_session=False)
+            db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
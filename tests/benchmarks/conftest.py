@@ -0,0 +1,129 @@
+"""Benchmark fixtures.
+
+Synopsis:
+Builds one seeded app per benchmark session (temp SQLite by default, or the
+throwaway database named by ``--benchmark-db-url``), exposes a ``benchmark``
+fixture that records and gates results, and prints a summary table.
+
+Glossary:
+- Bench app: Session-scoped app seeded with the synthetic org.
+- Bench request: Request context logged in as the synthetic org's user.
+"""
+
+import os
+import tempfile
+
+import pytest
+from flask_login import login_user
+
+from app import create_app
+from app.extensions import db
+from app.models.models import User
+from tests.benchmarks.support import (
+    BenchmarkRecorder,
+    resolve_scale,
+    seed_synthetic_org,
+)
+from tests.conftest import _create_test_data, _test_app_config
+
+_RECORDER_KEY = pytest.StashKey[BenchmarkRecorder]()
+
+
+@pytest.fixture(scope="session")
+def bench_app(request):
+    database_url = request.config.getoption("--benchmark-db-url")
+    db_fd = db_path = None
+    if not database_url:
+        db_fd, db_path = tempfile.mkstemp(suffix=".bench.sqlite")
+        database_url = f"sqlite:///{db_path}"
+
+    previous_test_db_uri = os.environ.get("SQLALCHEMY_TEST_DATABASE_URI")
+    os.environ["SQLALCHEMY_TEST_DATABASE_URI"] = database_url
+    app = create_app(_test_app_config(database_url))
+    try:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            _create_test_data()
+            user = User.query.filter_by(email="test@example.com").one()
+            seeded = seed_synthetic_org(
+                resolve_scale(request.config.getoption("--benchmark-scale")),
+                user.organization,
+                user,
+            )
+            recorder = BenchmarkRecorder(
+                dialect=db.engine.dialect.name,
+                scale=seeded.scale,
+                rounds=request.config.getoption("--benchmark-rounds"),
+                threshold=request.config.getoption("--benchmark-threshold"),
+                update_baseline=request.config.getoption(
+                    "--benchmark-update-baseline"
+                ),
+            )
+            request.config.stash[_RECORDER_KEY] = recorder
+            app.extensions["benchmark_seed"] = seeded
+        yield app
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+        if db_path:
+            os.close(db_fd)
+            os.unlink(db_path)
+        if previous_test_db_uri is None:
+            os.environ.pop("SQLALCHEMY_TEST_DATABASE_URI", None)
+        else:
+            os.environ["SQLALCHEMY_TEST_DATABASE_URI"] = previous_test_db_uri
+
+
+@pytest.fixture
+def seeded_org(bench_app):
+    """Yield the synthetic org inside a request logged in as its user."""
+    seeded = bench_app.extensions["benchmark_seed"]
+    with bench_app.test_request_context("/"):
+        login_user(db.session.get(User, seeded.user_id))
+        try:
+            yield seeded
+        finally:
+            db.session.rollback()
+            db.session.remove()
+
+
+@pytest.fixture
+def benchmark(request, bench_app):
+    """Measure a callable and fail the test if it regresses past baseline."""
+    recorder = request.config.stash[_RECORDER_KEY]
+
+    def _measure(name, func, **kwargs):
+        result = recorder.measure(name, func, **kwargs)
+        if result.failures:
+            pytest.fail("\n".join(result.failures), pytrace=False)
+        return result
+
+    return _measure
+
+
+def pytest_sessionfinish(session):
+    recorder = session.config.stash.get(_RECORDER_KEY, None)
+    if recorder is None or not recorder.results:
+        return
+    if session.config.getoption("--benchmark-update-baseline"):
+        recorder.write_baselines()
+    json_path = session.config.getoption("--benchmark-json")
+    if json_path:
+        recorder.write_json(json_path)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    recorder = config.stash.get(_RECORDER_KEY, None)
+    if recorder is None or not recorder.results:
+        return
+    scale = recorder.scale
+    terminalreporter.section(
+        f"benchmarks ({recorder.dialect}, {scale.label}: {scale.items} items x "
+        f"{scale.lots_per_item} lots x {scale.history_per_item} history)"
+    )
+    for line in recorder.report_lines():
+        terminalreporter.write_line(line)
+    if config.getoption("--benchmark-update-baseline"):
+        terminalreporter.write_line(f"baselines written to {recorder.baseline_path}")
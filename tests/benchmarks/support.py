@@ -0,0 +1,446 @@
+"""Benchmark harness for BatchTrack hot paths.
+
+Synopsis:
+Seeds a synthetic organization of configurable size, times callables over
+several rounds while counting SQL statements, and compares each result with
+the committed baseline so wall-time or query-count regressions fail the run.
+
+Glossary:
+- Scale: Synthetic org size (items, lots per item, history rows per item).
+- Baseline: Stored median wall time and query count per dialect/scale/name.
+- Noise floor: Absolute slowdown (ms) ignored before the ratio gate applies.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+import sqlalchemy as sa
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import InventoryItem, InventoryLot, UnifiedInventoryHistory
+from app.models.product_category import ProductCategory
+from app.models.recipe import Recipe, RecipeIngredient
+from app.services.quantity_base import to_base_quantity
+from app.utils.timezone_utils import TimezoneUtils
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+NOISE_FLOOR_MS = 2.0
+
+
+# --- Scale presets ---
+# Purpose: Describe the synthetic org sizes the suite can seed.
+@dataclass(frozen=True)
+class BenchScale:
+    label: str
+    items: int
+    lots_per_item: int
+    history_per_item: int
+    recipe_ingredients: int
+
+
+SCALE_PRESETS = {
+    "small": BenchScale("small", 50, 5, 20, 8),
+    "medium": BenchScale("medium", 500, 10, 50, 20),
+    "large": BenchScale("large", 2000, 20, 100, 40),
+}
+
+
+def resolve_scale(value: str) -> BenchScale:
+    """Return a preset by name or parse an ``ITEMSxLOTSxHISTORY`` spec."""
+    key = (value or "small").strip().lower()
+    if key in SCALE_PRESETS:
+        return SCALE_PRESETS[key]
+    try:
+        items, lots, history = (int(part) for part in key.split("x"))
+    except ValueError as exc:
+        raise ValueError(
+            f"Unknown benchmark scale {value!r}; use "
+            f"{', '.join(SCALE_PRESETS)} or ITEMSxLOTSxHISTORY"
+        ) from exc
+    if min(items, lots, history) < 1:
+        raise ValueError("Benchmark scale values must be positive")
+    return BenchScale(key, items, lots, history, min(items, 20))
+
+
+# --- Synthetic org ---
+# Purpose: Bulk-seed inventory, FIFO lots, history, and a recipe.
+@dataclass
+class SeededOrg:
+    organization_id: int
+    user_id: int
+    item_ids: list[int]
+    recipe_id: int
+    lot_grams: float
+    scale: BenchScale
+
+
+def seed_synthetic_org(scale: BenchScale, organization, user) -> SeededOrg:
+    """Bulk insert the synthetic org data for ``scale`` and return its ids."""
+    lot_grams = 1000.0
+    lot_base = to_base_quantity(amount=lot_grams, unit_name="gram")
+    now = TimezoneUtils.utc_now()
+    org_id = organization.id
+
+    db.session.execute(
+        sa.insert(InventoryItem.__table__),
+        [
+            {
+                "name": f"Bench Ingredient {index:05d}",
+                "type": "ingredient",
+                "unit": "gram",
+                "quantity": lot_grams * scale.lots_per_item,
+                "quantity_base": lot_base * scale.lots_per_item,
+                "cost_per_unit": 0.01 + (index % 17) / 100,
+                "organization_id": org_id,
+                "created_by": user.id,
+            }
+            for index in range(scale.items)
+        ],
+    )
+    item_ids = list(
+        db.session.execute(
+            sa.select(InventoryItem.id)
+            .where(InventoryItem.organization_id == org_id)
+            .order_by(InventoryItem.id)
+        ).scalars()
+    )
+    # A few stocked containers so production planning can pick a strategy.
+    db.session.execute(
+        sa.insert(InventoryItem.__table__),
+        [
+            {
+                "name": f"Bench Jar {capacity}g",
+                "type": "container",
+                "unit": "count",
+                "quantity": 1000.0,
+                "quantity_base": to_base_quantity(amount=1000, unit_name="count"),
+                "cost_per_unit": 0.25,
+                "capacity": float(capacity),
+                "capacity_unit": "gram",
+                "organization_id": org_id,
+                "created_by": user.id,
+            }
+            for capacity in (50, 100, 250, 500)
+        ],
+    )
+    db.session.execute(
+        sa.insert(InventoryLot.__table__),
+        [
+            {
+                "inventory_item_id": item_id,
+                "remaining_quantity": lot_grams,
+                "original_quantity": lot_grams,
+                "remaining_quantity_base": lot_base,
+                "original_quantity_base": lot_base,
+                "unit": "gram",
+                "unit_cost": 0.01 + lot / 100,
+                "received_date": now - timedelta(days=scale.lots_per_item - lot),
+                "created_at": now,
+                "source_type": "restock",
+                "fifo_code": f"LOT-B{item_id}-{lot}",
+                "organization_id": org_id,
+                "created_by": user.id,
+            }
+            for item_id in item_ids
+            for lot in range(scale.lots_per_item)
+        ],
+    )
+    lots_by_item: dict[int, list[int]] = {}
+    for lot_id, item_id in db.session.execute(
+        sa.select(InventoryLot.id, InventoryLot.inventory_item_id)
+        .where(InventoryLot.organization_id == org_id)
+        .order_by(InventoryLot.id)
+    ):
+        lots_by_item.setdefault(item_id, []).append(lot_id)
+
+    history_rows = []
+    for item_id in item_ids:
+        lot_ids = lots_by_item[item_id]
+        for entry in range(scale.history_per_item):
+            restock = entry < len(lot_ids)
+            history_rows.append(
+                {
+                    "inventory_item_id": item_id,
+                    "timestamp": now - timedelta(hours=scale.history_per_item - entry),
+                    "change_type": "restock" if restock else "use",
+                    "quantity_change": lot_grams if restock else -1.0,
+                    "quantity_change_base": lot_base if restock else -lot_base // 1000,
+                    "unit": "gram",
+                    "unit_cost": 0.01,
+                    "affected_lot_id": lot_ids[entry % len(lot_ids)],
+                    "organization_id": org_id,
+                    "created_by": user.id,
+                }
+            )
+    db.session.execute(sa.insert(UnifiedInventoryHistory.__table__), history_rows)
+
+    category = ProductCategory.query.filter_by(name="Uncategorized").first()
+    recipe = Recipe(
+        name="Bench Recipe",
+        label_prefix="BENCH",
+        predicted_yield=float(scale.recipe_ingredients * 10),
+        predicted_yield_unit="gram",
+        category_id=category.id,
+        organization_id=org_id,
+        created_by=user.id,
+    )
+    db.session.add(recipe)
+    db.session.flush()
+    db.session.execute(
+        sa.insert(RecipeIngredient.__table__),
+        [
+            {
+                "recipe_id": recipe.id,
+                "inventory_item_id": item_id,
+                "quantity": 10.0,
+                "unit": "gram",
+                "order_position": position,
+            }
+            for position, item_id in enumerate(item_ids[: scale.recipe_ingredients])
+        ],
+    )
+    db.session.commit()
+
+    return SeededOrg(
+        organization_id=org_id,
+        user_id=user.id,
+        item_ids=item_ids,
+        recipe_id=recipe.id,
+        lot_grams=lot_grams,
+        scale=scale,
+    )
+
+
+# --- Scanner corpus ---
+# Purpose: Mix exploit-scanner probes with ordinary app paths, as seen at the edge.
+SCANNER_PROBE_PATHS = (
+    "/wp-login.php",
+    "/wp-admin/setup-config.php",
+    "/wp-content/plugins/wp-file-manager/readme.txt",
+    "/wp-includes/wlwmanifest.xml",
+    "/xmlrpc.php",
+    "/.env",
+    "/api/.env",
+    "/admin/.env.production",
+    "/.git/config",
+    "/.git/HEAD",
+    "/.svn/entries",
+    "/vendor/phpunit/phpunit/src/Util/PHP/eval-stdin.php",
+    "/phpmyadmin/index.php",
+    "/pma/scripts/setup.php",
+    "/cgi-bin/luci/;stok=/locale",
+    "/_profiler/phpinfo",
+    "/index.php/index/think/app/invokefunction",
+    "/config/database.yml",
+    "/backup.sql",
+    "/db.bak",
+    "/server.key",
+    "/docker-compose.yml",
+    "/owa/auth/logon.aspx",
+    "/HNAP1/",
+    "/boaform/admin/formLogin",
+    "/actuator/env",
+    "/solr/admin/info/system",
+    "/console/login/LoginForm.jsp",
+    "/remote/fgt_lang",
+    "/.aws/credentials",
+)
+APP_PATHS = (
+    "/",
+    "/dashboard",
+    "/inventory/",
+    "/inventory/view/{n}",
+    "/recipes/{n}/view",
+    "/batches/{n}",
+    "/products/{n}",
+    "/api/dashboard-alerts",
+    "/api/bootstrap/recipes",
+    "/api/unit-search",
+    "/static/js/app.{n}.js",
+    "/static/css/main.css",
+    "/tools/",
+    "/pricing",
+    "/auth/login",
+)
+
+
+def scanner_probe_corpus(size: int = 2000, *, probe_share: float = 0.7, seed: int = 7):
+    """Return ``size`` paths, ``probe_share`` of them scanner probes with noise."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        if rng.random() < probe_share:
+            path = rng.choice(SCANNER_PROBE_PATHS)
+            # Scanners vary case and prefix directories, so many paths are unique.
+            if rng.random() < 0.3:
+                path = f"/{rng.choice(('old', 'new', 'blog', 'wp', 'site'))}{path}"
+            if rng.random() < 0.3:
+                path = f"/{rng.randrange(10**6)}{path}"
+            if rng.random() < 0.2:
+                path = path.upper()
+        else:
+            path = rng.choice(APP_PATHS).format(n=rng.randrange(1, 5000))
+        corpus.append(path)
+    return corpus
+
+
+# --- Benchmark recorder ---
+# Purpose: Time callables, count queries, and gate against baselines.
+@dataclass
+class BenchmarkResult:
+    name: str
+    rounds: int
+    median_ms: float
+    min_ms: float
+    max_ms: float
+    queries: int
+    baseline: Optional[dict] = None
+    failures: list[str] = field(default_factory=list)
+
+
+class BenchmarkRecorder:
+    """Collects timed results for one run and compares them to baselines."""
+
+    def __init__(
+        self,
+        *,
+        dialect: str,
+        scale: BenchScale,
+        rounds: int,
+        threshold: float,
+        update_baseline: bool = False,
+        baseline_path: Path = BASELINE_PATH,
+    ):
+        self.dialect = dialect
+        self.scale = scale
+        self.rounds = max(1, int(rounds))
+        self.threshold = float(threshold)
+        self.update_baseline = update_baseline
+        self.baseline_path = baseline_path
+        self.baselines = self._load_baselines()
+        self.results: list[BenchmarkResult] = []
+
+    def key(self, name: str) -> str:
+        return f"{self.dialect}/{self.scale.label}/{name}"
+
+    def _load_baselines(self) -> dict:
+        if not self.baseline_path.exists():
+            return {}
+        return json.loads(self.baseline_path.read_text()).get("entries", {})
+
+    def measure(
+        self,
+        name: str,
+        func: Callable[[], object],
+        *,
+        setup: Optional[Callable[[], object]] = None,
+        teardown: Optional[Callable[[], object]] = None,
+        warmup: int = 1,
+    ) -> BenchmarkResult:
+        """Run ``func`` for warmup + measured rounds and record the result."""
+        statements: list[str] = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        timings: list[float] = []
+        query_counts: list[int] = []
+        engine = db.engine
+        for round_index in range(warmup + self.rounds):
+            if setup:
+                setup()
+            statements.clear()
+            event.listen(engine, "before_cursor_execute", _count)
+            started = time.perf_counter()
+            try:
+                func()
+            finally:
+                elapsed = (time.perf_counter() - started) * 1000
+                event.remove(engine, "before_cursor_execute", _count)
+            if teardown:
+                teardown()
+            if round_index >= warmup:
+                timings.append(elapsed)
+                query_counts.append(len(statements))
+
+        result = BenchmarkResult(
+            name=name,
+            rounds=self.rounds,
+            median_ms=round(statistics.median(timings), 3),
+            min_ms=round(min(timings), 3),
+            max_ms=round(max(timings), 3),
+            queries=max(query_counts),
+            baseline=self.baselines.get(self.key(name)),
+        )
+        if not self.update_baseline:
+            result.failures = self.regressions(result)
+        self.results.append(result)
+        return result
+
+    def regressions(self, result: BenchmarkResult) -> list[str]:
+        """Return failure messages when ``result`` regresses past its baseline."""
+        baseline = result.baseline
+        if not baseline:
+            return []
+        failures = []
+        allowed_ms = baseline["median_ms"] * (1 + self.threshold)
+        if (
+            result.median_ms > allowed_ms
+            and result.median_ms - baseline["median_ms"] > NOISE_FLOOR_MS
+        ):
+            failures.append(
+                f"{result.name}: median {result.median_ms:.2f}ms exceeds baseline "
+                f"{baseline['median_ms']:.2f}ms by more than {self.threshold:.0%}"
+            )
+        if result.queries > baseline["queries"]:
+            failures.append(
+                f"{result.name}: {result.queries} queries exceeds baseline "
+                f"{baseline['queries']}"
+            )
+        return failures
+
+    def write_baselines(self) -> None:
+        """Merge this run's results into the baseline file."""
+        entries = dict(self.baselines)
+        for result in self.results:
+            entries[self.key(result.name)] = {
+                "median_ms": result.median_ms,
+                "queries": result.queries,
+            }
+        payload = {"version": 1, "entries": dict(sorted(entries.items()))}
+        self.baseline_path.write_text(json.dumps(payload, indent=2) + "\n")
+
+    def write_json(self, path: str) -> None:
+        """Write this run's results (with baselines) for CI artifacts."""
+        payload = {
+            "dialect": self.dialect,
+            "scale": asdict(self.scale),
+            "rounds": self.rounds,
+            "threshold": self.threshold,
+            "results": [asdict(result) for result in self.results],
+        }
+        Path(path).write_text(json.dumps(payload, indent=2) + "\n")
+
+    def report_lines(self) -> list[str]:
+        lines = [
+            f"{'benchmark':<34}{'median ms':>11}{'min ms':>10}{'queries':>9}"
+            f"{'base ms':>10}{'base q':>8}"
+        ]
+        for result in self.results:
+            baseline = result.baseline or {}
+            lines.append(
+                f"{result.name:<34}{result.median_ms:>11.2f}{result.min_ms:>10.2f}"
+                f"{result.queries:>9}{baseline.get('median_ms', float('nan')):>10.2f}"
+                f"{baseline.get('queries', '-'):>8}"
+                + ("  REGRESSED" if result.failures else "")
+            )
+        return lines
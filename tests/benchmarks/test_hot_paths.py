@@ -0,0 +1,227 @@
+"""Hot-path benchmarks gated against committed baselines.
+
+Synopsis:
+Times the inventory, stock-check, planning, batch-start, conversion, soap
+tool, BatchBot chat-turn, POS counter reservation, and scanner-probe middleware
+entry points against the synthetic org and fails when wall time or query
+counts regress. Run with ``pytest tests/benchmarks --benchmark``.
+
+Glossary:
+- Benchmark: Timed, query-counted call recorded by the ``benchmark`` fixture.
+- Rollback teardown: Per-round rollback so mutating paths see identical state.
+"""
+
+import itertools
+
+import pytest
+
+from app.extensions import db
+from app.models.inventory import InventoryItem
+from app.models.models import User
+from app.models.recipe import Recipe
+from app.services.ai import StubAIClient
+from app.services.ai.stub_ai_client import estimate_tokens
+from app.services.batch_service.batch_operations import BatchOperationsService
+from app.services.batchbot_service import BatchBotService
+from app.services.cache_invalidation import invalidate_batchbot_context_cache
+from app.services.inventory_adjustment import process_inventory_adjustment
+from app.services.inventory_adjustment._fifo_ops import deduct_fifo_inventory
+from app.services.middleware_probe_service import (
+    MiddlewareProbeService,
+    _classify_normalized_path,
+)
+from app.services.pos_integration import POSIntegrationService
+from app.services.production_planning import ProductionRequest
+from app.services.production_planning._core import execute_production_planning
+from app.services.production_planning.service import PlanProductionService
+from app.services.stock_check.core import UniversalStockCheckService
+from app.services.tools.soap_tool import SoapToolComputationService
+from app.services.unit_conversion import ConversionEngine
+from tests.benchmarks.support import scanner_probe_corpus
+from tests.test_soap_tool_compute_service import _payload as soap_payload
+
+pytestmark = pytest.mark.benchmark
+
+
+def test_convert_units(benchmark, seeded_org):
+    item_id = seeded_org.item_ids[0]
+
+    def _convert():
+        weight = ConversionEngine.convert_units(2.5, "kg", "gram")
+        assert weight["success"] and weight["converted_value"] == pytest.approx(2500)
+        volume = ConversionEngine.convert_units(
+            100, "ml", "gram", ingredient_id=item_id, density=0.92
+        )
+        assert volume["success"]
+
+    benchmark("convert_units", _convert)
+
+
+def test_process_inventory_adjustment_restock(benchmark, seeded_org):
+    item_id = seeded_org.item_ids[1]
+
+    def _restock():
+        success, message = process_inventory_adjustment(
+            item_id=item_id,
+            change_type="restock",
+            quantity=250.0,
+            unit="gram",
+            cost_override=0.02,
+            created_by=seeded_org.user_id,
+            defer_commit=True,
+        )
+        assert success, message
+
+    benchmark("process_inventory_adjustment", _restock, teardown=db.session.rollback)
+
+
+def test_deduct_fifo_inventory_across_lots(benchmark, seeded_org):
+    item_id = seeded_org.item_ids[2]
+    # Span several lots so the FIFO walk, not a single-lot hit, is measured.
+    quantity = seeded_org.lot_grams * min(3, seeded_org.scale.lots_per_item) - 1
+
+    def _deduct():
+        success, message = deduct_fifo_inventory(
+            item_id,
+            quantity,
+            change_type="use",
+            created_by=seeded_org.user_id,
+        )
+        assert success, message
+
+    benchmark("deduct_fifo_inventory", _deduct, teardown=db.session.rollback)
+
+
+def test_check_recipe_stock(benchmark, seeded_org):
+    service = UniversalStockCheckService()
+
+    def _check():
+        result = service.check_recipe_stock(seeded_org.recipe_id, scale=2.0)
+        assert result["success"], result
+        assert len(result["stock_check"]) == seeded_org.scale.recipe_ingredients
+
+    benchmark("check_recipe_stock", _check, teardown=db.session.rollback)
+
+
+def test_execute_production_planning(benchmark, seeded_org):
+    request = ProductionRequest(
+        recipe_id=seeded_org.recipe_id,
+        scale=1.0,
+        organization_id=seeded_org.organization_id,
+    )
+
+    def _plan():
+        plan = execute_production_planning(request, include_containers=True)
+        assert plan.feasible, plan.issues
+
+    benchmark("execute_production_planning", _plan, teardown=db.session.rollback)
+
+
+def test_start_batch(benchmark, seeded_org):
+    recipe = db.session.get(Recipe, seeded_org.recipe_id)
+    snapshot = PlanProductionService.build_plan(
+        recipe=recipe,
+        scale=1.0,
+        batch_type="ingredient",
+        notes="benchmark",
+        containers=[],
+    ).to_dict()
+
+    def _start():
+        batch, errors = BatchOperationsService.start_batch(snapshot)
+        assert batch is not None and errors == [], errors
+
+    # start_batch commits; each round deducts 10g per ingredient from 1kg lots.
+    benchmark("start_batch", _start)
+
+
+def test_soap_tool_calculate(benchmark, seeded_org):
+    payload = soap_payload()
+
+    def _calculate():
+        result = SoapToolComputationService.calculate(payload)
+        assert result["lye_adjusted_g"] > 0
+
+    benchmark("soap_tool_calculate", _calculate)
+
+
+def _batchbot_turn_prompt_tokens(service, history):
+    """Chat once and return the response plus the new user turn's token estimate."""
+    response = service.chat(prompt="What should I reorder this week?", history=history)
+    user_turn = service.client.calls[-1]["contents"][-1]["parts"][0]["text"]
+    return response, estimate_tokens(user_turn)
+
+
+def test_batchbot_chat_turn_context(benchmark, seeded_org, bench_app):
+    # Offline stub: prompt tokens are estimated and no network call is made.
+    bench_app.config["GOOGLE_AI_CLIENT_BACKEND"] = "stub"
+    service = BatchBotService(db.session.get(User, seeded_org.user_id))
+    assert isinstance(service.client, StubAIClient)
+    first, full_tokens = _batchbot_turn_prompt_tokens(service, [])
+    history = [first.history_entry, {"role": "model", "content": first.text}]
+
+    def _cold_full_turn():
+        invalidate_batchbot_context_cache(seeded_org.organization_id)
+        response, _tokens = _batchbot_turn_prompt_tokens(service, [])
+        assert response.context["mode"] == "full"
+
+    def _cached_followup_turn():
+        response, tokens = _batchbot_turn_prompt_tokens(service, list(history))
+        assert response.context["mode"] == "unchanged"
+        assert tokens < full_tokens / 2
+
+    benchmark("batchbot_turn_full_context", _cold_full_turn)
+    benchmark("batchbot_turn_cached_context", _cached_followup_turn)
+
+
+def test_pos_reserve_counter_fast_path(benchmark, seeded_org, bench_app):
+    bench_app.config["POS_RESERVATION_COUNTERS"] = "memory"
+    product = InventoryItem(
+        name="Benchmark Counter Product",
+        type="product",
+        unit="count",
+        quantity=1_000_000,
+        organization_id=seeded_org.organization_id,
+    )
+    db.session.add(product)
+    db.session.commit()
+    # First call seeds the SKU counter from the DB; timed calls never query.
+    assert POSIntegrationService.reserve_inventory(product.id, 1, "bench-seed")[0]
+    order_numbers = itertools.count()
+
+    def _reserve():
+        success, message = POSIntegrationService.reserve_inventory(
+            product.id, 1, f"bench-{next(order_numbers)}"
+        )
+        assert success, message
+
+    benchmark("pos_reserve_counter_fast_path", _reserve)
+
+
+def test_probe_path_classification(benchmark, seeded_org):
+    corpus = scanner_probe_corpus()
+
+    def _classify():
+        blocked = sum(
+            MiddlewareProbeService.is_high_confidence_probe_path(path) for path in corpus
+        )
+        assert 0 < blocked < len(corpus)
+
+    # Cold: every round starts with an empty decision LRU.
+    benchmark("probe_path_classify_cold", _classify, setup=_classify_normalized_path.cache_clear)
+    benchmark("probe_path_classify_warm", _classify)
+
+
+def test_probe_gate_rejects_before_request_context(benchmark, seeded_org, bench_app):
+    client = bench_app.test_client()
+    addresses = (f"203.0.113.{n % 250 + 1}" for n in itertools.count())
+
+    def _probe():
+        response = client.get(
+            "/vendor/phpunit/phpunit/src/Util/PHP/eval-stdin.php",
+            headers={"X-Forwarded-For": next(addresses)},
+        )
+        assert response.status_code == 403
+
+    # Only the bot-trap strike is written; no session or user load happens.
+    benchmark("probe_gate_reject", _probe)
@@ -22,6 +22,85 @@ from app.extensions import db
 from app.models.models import Organization, Permission, Role, SubscriptionTier, User
 
 
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark", "BatchTrack hot-path benchmarks")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run tests marked `benchmark` (skipped by default).",
+    )
+    group.addoption(
+        "--benchmark-scale",
+        default=os.environ.get("BENCHMARK_SCALE", "small"),
+        help="Synthetic org size: small, medium, large, or ITEMSxLOTSxHISTORY.",
+    )
+    group.addoption(
+        "--benchmark-rounds",
+        type=int,
+        default=int(os.environ.get("BENCHMARK_ROUNDS", "15")),
+        help="Measured rounds per benchmark (after one warmup call).",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=float(os.environ.get("BENCHMARK_THRESHOLD", "0.5")),
+        help="Allowed median wall-time regression as a ratio of the baseline.",
+    )
+    group.addoption(
+        "--benchmark-update-baseline",
+        action="store_true",
+        default=False,
+        help="Rewrite tests/benchmarks/baselines.json instead of gating.",
+    )
+    group.addoption(
+        "--benchmark-json",
+        default=None,
+        help="Write this run's benchmark results to a JSON file.",
+    )
+    group.addoption(
+        "--benchmark-db-url",
+        default=os.environ.get("BENCHMARK_DATABASE_URL"),
+        help="Throwaway database URL for benchmarks (defaults to temp SQLite).",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: hot-path benchmark (run with --benchmark)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks run only with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def _test_app_config(database_url: str) -> dict:
+    """Return the create_app overrides shared by test and benchmark apps."""
+    return {
+        "TESTING": True,
+        "DATABASE_URL": database_url,
+        "WTF_CSRF_ENABLED": False,
+        "SECRET_KEY": "test-secret-key",
+        "REDIS_URL": None,
+        "SESSION_TYPE": "filesystem",
+        "RATELIMIT_STORAGE_URI": "memory://",
+        "BOT_TRAP_REDIS_ENABLED": False,
+        "SIGNUP_PUBLIC_ALLOW_LIVE_PRICING_NETWORK": False,
+        "STRIPE_SECRET_KEY": "sk_test_fake",
+        "STRIPE_WEBHOOK_SECRET": "whsec_test_fake",
+        "LOGIN_DISABLED": False,  # Ensure authentication is active in tests
+        "TESTING_DISABLE_AUTH": False,  # Disable any test-specific auth bypass
+        "SQLALCHEMY_SESSION_OPTIONS": {"expire_on_commit": False},
+        # Don't disable login - we need to test permissions properly
+    }
+
+
 @pytest.fixture(scope="function")  # Changed to function scope for isolation
 def app():
     """Create and configure a new app instance for each test."""
@@ -30,25 +109,7 @@ def app():
     previous_test_db_uri = os.environ.get("SQLALCHEMY_TEST_DATABASE_URI")
     os.environ["SQLALCHEMY_TEST_DATABASE_URI"] = f"sqlite:///{db_path}"
 
-    app = create_app(
-        {
-            "TESTING": True,
-            "DATABASE_URL": f"sqlite:///{db_path}",
-            "WTF_CSRF_ENABLED": False,
-            "SECRET_KEY": "test-secret-key",
-            "REDIS_URL": None,
-            "SESSION_TYPE": "filesystem",
-            "RATELIMIT_STORAGE_URI": "memory://",
-            "BOT_TRAP_REDIS_ENABLED": False,
-            "SIGNUP_PUBLIC_ALLOW_LIVE_PRICING_NETWORK": False,
-            "STRIPE_SECRET_KEY": "sk_test_fake",
-            "STRIPE_WEBHOOK_SECRET": "whsec_test_fake",
-            "LOGIN_DISABLED": False,  # Ensure authentication is active in tests
-            "TESTING_DISABLE_AUTH": False,  # Disable any test-specific auth bypass
-            "SQLALCHEMY_SESSION_OPTIONS": {"expire_on_commit": False},
-            # Don't disable login - we need to test permissions properly
-        }
-    )
+    app = create_app(_test_app_config(f"sqlite:///{db_path}"))
 
     try:
         with app.app_context():
@@ -0,0 +1,272 @@
+from datetime import date, datetime, timedelta
+
+from app.extensions import db
+from app.models import Organization, User
+from app.models.affiliate import (
+    AffiliateMonthlyEarning,
+    AffiliatePayoutAccount,
+    AffiliatePayoutBatch,
+    AffiliateProfile,
+    AffiliateReferral,
+)
+from app.services.affiliate import (
+    AffiliatePayoutRunner,
+    FakePayoutProvider,
+    PayoutProviderError,
+)
+from app.services.affiliate.payout_runner import latest_eligible_month
+from app.services.affiliate_service import AffiliateService
+from app.utils.timezone_utils import TimezoneUtils
+
+AS_OF = date(2026, 10, 19)
+PAID_MONTH = date(2026, 8, 1)
+WAITING_MONTH = date(2026, 9, 1)
+
+
+def _referrer(name, *, account="acct_test"):
+    org = Organization(name=name)
+    db.session.add(org)
+    db.session.flush()
+    user = User(username=f"{name.lower().replace(' ', '_')}_owner", organization_id=org.id)
+    db.session.add(user)
+    db.session.flush()
+    profile = AffiliateProfile(
+        organization_id=org.id, user_id=user.id, referral_code=f"code-{org.id}"
+    )
+    db.session.add(profile)
+    db.session.add(
+        AffiliatePayoutAccount(
+            organization_id=org.id, payout_provider="stripe", payout_account_reference=account
+        )
+    )
+    db.session.flush()
+    return org, user, profile
+
+
+def _earning(org, user, profile, month, cents, *, churned_at=None):
+    referred = Organization(name=f"Referred {org.id}-{cents}-{month}")
+    db.session.add(referred)
+    db.session.flush()
+    referral = AffiliateReferral(
+        affiliate_profile_id=profile.id,
+        referrer_user_id=user.id,
+        referrer_organization_id=org.id,
+        referred_organization_id=referred.id,
+        referral_code=profile.referral_code,
+        churned_at=churned_at,
+    )
+    db.session.add(referral)
+    db.session.flush()
+    row = AffiliateMonthlyEarning(
+        affiliate_referral_id=referral.id,
+        referrer_organization_id=org.id,
+        referrer_user_id=user.id,
+        referred_organization_id=referred.id,
+        earning_month=month,
+        commission_amount_cents=cents,
+        payout_status="pending",
+    )
+    db.session.add(row)
+    db.session.flush()
+    return row
+
+
+def _runner(provider, **kwargs):
+    return AffiliatePayoutRunner(provider, as_of_date=AS_OF, send_email=False, **kwargs)
+
+
+def test_latest_eligible_month_matches_arrears_window():
+    day = date(2025, 1, 1)
+    while day < date(2027, 1, 1):
+        cutoff = latest_eligible_month(day, AffiliateService.PAYOUT_ARREARS_DAYS)
+        for month in (cutoff, (cutoff + timedelta(days=32)).replace(day=1)):
+            window = AffiliateService._compute_payout_arrears_window(month, as_of_date=day)
+            assert window["is_eligible"] is (month <= cutoff)
+        day += timedelta(days=1)
+
+
+def test_runner_pushes_eligible_batches_concurrently(app):
+    with app.app_context():
+        batches = []
+        for index in range(6):
+            org, user, profile = _referrer(f"Referrer {index}", account=f"acct_{index}")
+            rows = [_earning(org, user, profile, PAID_MONTH, 500) for _ in range(2)]
+            _earning(org, user, profile, WAITING_MONTH, 700)
+            batches.append((org, rows))
+        db.session.commit()
+
+        provider = FakePayoutProvider(latency_seconds=0.01)
+        result = _runner(provider, max_workers=4).run(limit_batches=50)
+
+        assert result["ok"] is True
+        assert result["sent_batches"] == 6
+        assert result["skipped_not_eligible"] == 6
+        assert result["sent_commission_cents"] == 6 * 1000
+        assert len(provider.transfers) == 6
+        for _org, rows in batches:
+            references = {
+                db.session.get(AffiliateMonthlyEarning, row.id).payout_reference for row in rows
+            }
+            assert len(references) == 1 and references.pop().startswith("tr_fake_")
+        assert {c.status for c in AffiliatePayoutBatch.query.all()} == {"sent"}
+        waiting = AffiliateMonthlyEarning.query.filter_by(earning_month=WAITING_MONTH).all()
+        assert {row.payout_status for row in waiting} == {"pending"}
+
+
+def test_runner_blocks_churned_rows_and_pays_the_rest(app):
+    with app.app_context():
+        org, user, profile = _referrer("Churn Referrer")
+        kept = _earning(org, user, profile, PAID_MONTH, 400)
+        churned = _earning(
+            org, user, profile, PAID_MONTH, 900, churned_at=datetime(2026, 9, 15)
+        )
+        db.session.commit()
+
+        provider = FakePayoutProvider()
+        result = _runner(provider).run()
+
+        assert result["sent_batches"] == 1
+        assert result["blocked_rows"] == 1
+        assert provider.transferred_cents == 400
+        assert db.session.get(AffiliateMonthlyEarning, kept.id).payout_status == "sent"
+        assert db.session.get(AffiliateMonthlyEarning, churned.id).payout_status == "unsuccessful"
+
+
+def test_failed_push_resumes_with_the_same_idempotency_key(app):
+    with app.app_context():
+        org, user, profile = _referrer("Retry Referrer")
+        row = _earning(org, user, profile, PAID_MONTH, 1200)
+        db.session.commit()
+
+        class _DownProvider(FakePayoutProvider):
+            def create_transfer(self, request):
+                raise PayoutProviderError("provider unavailable")
+
+        first = _runner(_DownProvider()).run()
+        assert first["failed_batches"] == 1
+        checkpoint = AffiliatePayoutBatch.query.one()
+        assert checkpoint.status == "planned"
+        key = checkpoint.idempotency_key
+
+        provider = FakePayoutProvider()
+        second = _runner(provider).run()
+        assert second["resumed_batches"] == 1
+        assert second["sent_batches"] == 1
+        assert list(provider.transfers) == [key]
+        assert db.session.get(AffiliateMonthlyEarning, row.id).payout_status == "sent"
+
+
+def test_interrupted_push_is_not_paid_twice(app):
+    with app.app_context():
+        org, user, profile = _referrer("Crash Referrer")
+        row = _earning(org, user, profile, PAID_MONTH, 800)
+        db.session.commit()
+
+        provider = FakePayoutProvider()
+        runner = _runner(provider)
+        summary = {"blocked_rows": 0, "skipped_no_payable": 0}
+        checkpoint_ids = runner._plan(10, summary)
+        (checkpoint,) = runner._claim(checkpoint_ids)
+        # The transfer went out, then the process died before recording it.
+        provider.create_transfer(runner._transfer_request(checkpoint, org.name))
+        checkpoint.claimed_at = TimezoneUtils.utc_now() - timedelta(hours=1)
+        db.session.commit()
+
+        result = _runner(provider).run()
+
+        assert result["resumed_batches"] == 1
+        assert result["sent_batches"] == 1
+        assert provider.calls == 2
+        assert len(provider.transfers) == 1
+        assert db.session.get(AffiliateMonthlyEarning, row.id).payout_status == "sent"
+
+
+def _fail_terminally(org, row):
+    class _DownProvider(FakePayoutProvider):
+        def create_transfer(self, request):
+            raise PayoutProviderError("provider unavailable")
+
+    down = _DownProvider()
+    for _ in range(3):
+        _runner(down).run()
+    checkpoint = AffiliatePayoutBatch.query.filter_by(organization_id=org.id).one()
+    assert checkpoint.status == "failed"
+    assert db.session.get(AffiliateMonthlyEarning, row.id).payout_status == "pending"
+    return checkpoint
+
+
+def test_terminally_failed_batch_is_retried_with_its_original_key(app):
+    with app.app_context():
+        org, user, profile = _referrer("Failed Referrer")
+        row = _earning(org, user, profile, PAID_MONTH, 900)
+        db.session.commit()
+        checkpoint = _fail_terminally(org, row)
+        key = checkpoint.idempotency_key
+
+        provider = FakePayoutProvider()
+        result = _runner(provider).run()
+
+        assert result["sent_batches"] == 1
+        assert list(provider.transfers) == [key]
+        assert AffiliatePayoutBatch.query.filter_by(organization_id=org.id).count() == 1
+        assert db.session.get(AffiliatePayoutBatch, checkpoint.id).status == "sent"
+
+
+def test_failed_batch_paid_at_the_provider_is_not_paid_again(app):
+    with app.app_context():
+        org, user, profile = _referrer("Timeout Referrer")
+        row = _earning(org, user, profile, PAID_MONTH, 700)
+        db.session.commit()
+        checkpoint = _fail_terminally(org, row)
+
+        # The last push timed out on our side but Stripe created the transfer.
+        provider = FakePayoutProvider()
+        runner = _runner(provider)
+        provider.create_transfer(runner._transfer_request(checkpoint, org.name))
+        provider.calls = 0
+
+        result = runner.run()
+
+        assert result["recovered_batches"] == 1
+        assert result["sent_batches"] == 0
+        assert provider.calls == 0
+        assert len(provider.transfers) == 1
+        stored = db.session.get(AffiliateMonthlyEarning, row.id)
+        assert stored.payout_status == "sent"
+        assert stored.payout_reference == "tr_fake_1"
+        assert db.session.get(AffiliatePayoutBatch, checkpoint.id).status == "sent"
+
+
+def test_update_monthly_earnings_status_updates_rows_in_bulk(app):
+    with app.app_context():
+        org, user, profile = _referrer("Status Referrer")
+        rows = [_earning(org, user, profile, PAID_MONTH, cents) for cents in (100, 200, 300)]
+        rows[0].payout_status = "paid"
+        db.session.commit()
+
+        result = AffiliateService.update_monthly_earnings_status(
+            organization_id=org.id,
+            earning_month=PAID_MONTH,
+            target_status="complete",
+            payout_reference=" tr_manual ",
+        )
+
+        assert result["status_changed_rows"] == 2
+        assert result["status_changed_commission_cents"] == 500
+        assert result["updated_rows"] == 3
+        assert result["referrer_user_ids"] == [user.id]
+        for row in rows:
+            stored = db.session.get(AffiliateMonthlyEarning, row.id)
+            assert stored.payout_reference == "tr_manual"
+        assert {db.session.get(AffiliateMonthlyEarning, r.id).payout_status for r in rows[1:]} == {
+            "complete"
+        }
+
+        reverted = AffiliateService.update_monthly_earnings_status(
+            organization_id=org.id, earning_month=PAID_MONTH, target_status="pending"
+        )
+        assert reverted["status_changed_rows"] == 3
+        assert all(
+            db.session.get(AffiliateMonthlyEarning, row.id).payout_reference is None
+            for row in rows
+        )
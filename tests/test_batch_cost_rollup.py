@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import (
+    Batch,
+    BatchConsumable,
+    BatchContainer,
+    BatchIngredient,
+    ExtraBatchContainer,
+    ExtraBatchIngredient,
+    InventoryItem,
+    Organization,
+    UnifiedInventoryHistory,
+)
+from app.models.product_category import ProductCategory
+from app.models.recipe import Recipe
+from app.services.batch_service import BatchCostRollupService, BatchService
+from app.services.batch_service.batch_management import BatchManagementService
+from app.services.costing_engine import weighted_unit_cost_for_batch_item
+
+
+def _count_queries():
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _record)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", _record)
+
+
+def _build_batches(count: int):
+    org = Organization.query.first()
+    category = ProductCategory.query.filter_by(name="Uncategorized").first()
+    recipe = Recipe(
+        name="Rollup Recipe",
+        label_prefix="ROLL",
+        predicted_yield=10.0,
+        predicted_yield_unit="gram",
+        category_id=category.id,
+        organization_id=org.id,
+    )
+    item = InventoryItem(
+        name="Rollup Item", type="ingredient", unit="gram", quantity=0, organization_id=org.id
+    )
+    db.session.add_all([recipe, item])
+    db.session.flush()
+
+    expected = {}
+    for index in range(count):
+        batch = Batch(
+            recipe_id=recipe.id,
+            label_code=f"ROLL-{index:03d}",
+            batch_type="ingredient",
+            status="in_progress",
+            organization_id=org.id,
+        )
+        db.session.add(batch)
+        db.session.flush()
+        common = dict(batch_id=batch.id, inventory_item_id=item.id, unit="gram")
+        container = dict(batch_id=batch.id, container_id=item.id)
+        db.session.add_all(
+            [
+                BatchIngredient(quantity_used=10 + index, cost_per_unit=0.5, **common),
+                BatchIngredient(quantity_used=2, cost_per_unit=None, **common),
+                BatchContainer(container_quantity=3, quantity_used=3, cost_each=1.25, **container),
+                BatchConsumable(quantity_used=4, cost_per_unit=0.1, **common),
+                ExtraBatchIngredient(quantity_used=1, cost_per_unit=2.0, **common),
+                ExtraBatchContainer(container_quantity=1, quantity_used=1, cost_each=0.75, **container),
+            ]
+        )
+        expected[batch.id] = (10 + index) * 0.5 + 3 * 1.25 + 4 * 0.1 + 2.0 + 0.75
+    db.session.commit()
+    return expected
+
+
+@pytest.mark.usefixtures("app_context")
+def test_calculate_batch_costs_uses_one_grouped_query():
+    expected = _build_batches(25)
+    batches = Batch.query.filter(Batch.id.in_(expected)).all()
+
+    statements, stop = _count_queries()
+    try:
+        BatchService.calculate_batch_costs(batches)
+    finally:
+        stop()
+
+    assert len(statements) == 1
+    for batch in batches:
+        assert batch.total_cost == pytest.approx(expected[batch.id])
+
+    summary = BatchManagementService.get_batch_cost_summary(batches[0])
+    assert summary["ingredient_total"] == pytest.approx(10 * 0.5)
+    assert summary["container_total"] == pytest.approx(3.75)
+    assert summary["extra_container_total"] == pytest.approx(0.75)
+    assert summary["total_cost"] == pytest.approx(expected[batches[0].id])
+
+
+@pytest.mark.usefixtures("app_context")
+def test_completed_batches_read_cached_rollup_without_queries():
+    expected = _build_batches(3)
+    completed = Batch.query.filter(Batch.id.in_(expected)).order_by(Batch.id).all()
+    for batch in completed:
+        batch.status = "completed"
+    BatchCostRollupService.persist_rollup(completed[0])
+    db.session.commit()
+
+    assert BatchCostRollupService.backfill_completed(chunk_size=1) == 2
+    assert BatchCostRollupService.backfill_completed() == 0
+
+    batches = Batch.query.filter(Batch.id.in_(expected)).all()
+    statements, stop = _count_queries()
+    try:
+        rollups = BatchCostRollupService.apply_to_batches(batches)
+    finally:
+        stop()
+
+    assert statements == []
+    for batch in batches:
+        assert batch.total_cost == pytest.approx(expected[batch.id])
+        assert rollups[batch.id]["consumable_total"] == pytest.approx(0.4)
+
+
+@pytest.mark.usefixtures("app_context")
+def test_weighted_unit_cost_aggregates_deductions_in_sql():
+    _build_batches(1)
+    batch = Batch.query.filter_by(label_code="ROLL-000").one()
+    item = InventoryItem.query.filter_by(name="Rollup Item").one()
+    item.cost_per_unit = 9.0
+    for change, unit_cost in ((-2.0, 1.0), (-6.0, 3.0), (5.0, 100.0)):
+        db.session.add(
+            UnifiedInventoryHistory(
+                inventory_item_id=item.id,
+                batch_id=batch.id,
+                change_type="batch" if change < 0 else "restock",
+                quantity_change=change,
+                unit="gram",
+                unit_cost=unit_cost,
+                organization_id=item.organization_id,
+            )
+        )
+    db.session.commit()
+
+    assert weighted_unit_cost_for_batch_item(item.id, batch.id) == pytest.approx(2.5)
+    assert weighted_unit_cost_for_batch_item(item.id, batch.id + 999) == pytest.approx(9.0)
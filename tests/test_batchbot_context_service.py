@@ -0,0 +1,132 @@
+from flask_login import login_user
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import InventoryItem, User
+from app.services.batchbot_context_service import (
+    BatchBotContextService,
+    latest_context_version,
+)
+from app.services.batchbot_service import BatchBotService
+
+
+def _count_queries(func):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    return result, len(statements)
+
+
+def _seed_items(org_id: int, count: int = 3) -> list[InventoryItem]:
+    items = [
+        InventoryItem(
+            name=f"Context Oil {index}",
+            type="ingredient",
+            unit="gram",
+            quantity=100 + index,
+            cost_per_unit=0.01,
+            organization_id=org_id,
+        )
+        for index in range(count)
+    ]
+    db.session.add_all(items)
+    db.session.commit()
+    return items
+
+
+def test_context_snapshot_is_cached_until_org_entities_change(app, test_user):
+    with app.app_context():
+        user = db.session.get(User, test_user.id)
+        org = user.organization
+        items = _seed_items(org.id)
+
+        first, cold_queries = _count_queries(lambda: BatchBotContextService.get_snapshot(org))
+        again, warm_queries = _count_queries(lambda: BatchBotContextService.get_snapshot(org))
+        assert cold_queries > 0
+        assert warm_queries == 0
+        assert again.version == first.version
+
+        items[0].quantity = 1
+        db.session.commit()
+        rebuilt = BatchBotContextService.get_snapshot(org)
+
+    assert rebuilt.version != first.version
+    assert rebuilt.payload["inventory_sample"][0]["quantity"] == 1.0
+
+
+def test_context_diff_reports_only_changed_rows():
+    previous = {
+        "organization": {"id": 1, "name": "Org", "subscription": "Solo"},
+        "inventory_sample": [
+            {"id": 1, "name": "Oil", "quantity": 5.0},
+            {"id": 2, "name": "Lye", "quantity": 9.0},
+        ],
+        "recent_batches": [],
+    }
+    current = {
+        "organization": {"id": 1, "name": "Org", "subscription": "Team"},
+        "inventory_sample": [
+            {"id": 1, "name": "Oil", "quantity": 2.0},
+            {"id": 3, "name": "Wax", "quantity": 4.0},
+        ],
+        "recent_batches": [],
+    }
+
+    changes = BatchBotContextService.diff(previous, current)
+
+    assert changes == {
+        "organization": {"subscription": "Team"},
+        "inventory_sample": {
+            "added": [{"id": 3, "name": "Wax", "quantity": 4.0}],
+            "removed": [2],
+            "changed": [{"id": 1, "quantity": 2.0}],
+        },
+    }
+    assert BatchBotContextService.diff(current, current) == {}
+
+
+def test_chat_sends_full_context_then_unchanged_then_diff(app, test_user):
+    with app.app_context():
+        app.config["GOOGLE_AI_CLIENT_BACKEND"] = "stub"
+        user = db.session.get(User, test_user.id)
+        item_ids = [item.id for item in _seed_items(user.organization_id)]
+
+        with app.test_request_context():
+            login_user(user)
+            service = BatchBotService(user)
+            history = []
+
+            def _turn(prompt):
+                response = service.chat(prompt=prompt, history=list(history))
+                history.append(response.history_entry)
+                history.append({"role": "model", "content": response.text})
+                return response
+
+            full = _turn("What is low on stock?")
+            unchanged = _turn("And what should I reorder?")
+            db.session.get(InventoryItem, item_ids[1]).quantity = 0.5
+            db.session.commit()
+            diff = _turn("What changed?")
+
+        prompts = [call["contents"][-1]["parts"][0]["text"] for call in service.client.calls]
+
+    assert full.context["mode"] == "full"
+    assert "Context Snapshot (JSON)" in prompts[0]
+    assert unchanged.context["mode"] == "unchanged"
+    assert unchanged.context["version"] == full.context["version"]
+    assert diff.context["mode"] == "diff"
+    assert diff.context["base_version"] == full.context["version"]
+    assert '"changed":[{"id":%d,"quantity":0.5' % item_ids[1] in prompts[2]
+    assert "Context Oil 0" not in prompts[2]
+    assert len(prompts[1]) < len(prompts[0]) / 2
+    assert len(prompts[2]) < len(prompts[0])
+    assert latest_context_version(
+        [{"role": "user", "parts": [{"text": diff.history_entry["content"]}]}]
+    ) == diff.context["version"]
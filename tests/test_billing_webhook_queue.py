@@ -0,0 +1,173 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from app.extensions import db
+from app.models.models import Organization
+from app.models.stripe_event import StripeEvent
+from app.services.billing_service import BillingService
+from app.services.billing_webhook_queue import BillingWebhookQueue
+from app.utils.timezone_utils import TimezoneUtils
+
+
+def _invoice_event(event_id, customer, created, event_type="invoice.payment_succeeded"):
+    return {
+        "id": event_id,
+        "type": event_type,
+        "created": created,
+        "data": {"object": {"object": "invoice", "customer": customer}},
+    }
+
+
+def test_enqueue_dedupes_by_event_id_and_keys_by_customer(app):
+    with app.app_context():
+        event = _invoice_event("evt_queue_dupe", "cus_queue_a", 100)
+
+        row_id = BillingWebhookQueue.enqueue("stripe", event)
+        assert row_id is not None
+        assert BillingWebhookQueue.enqueue("stripe", event) is None
+
+        row = db.session.get(StripeEvent, row_id)
+        assert row.status == "received"
+        assert row.ordering_key == "cus_queue_a"
+        assert row.event_created == 100
+        assert row.payload["id"] == "evt_queue_dupe"
+
+
+def test_process_pending_keeps_provider_order_per_customer(app):
+    with app.app_context():
+        # Enqueued out of order; the worker must apply them by Stripe `created`.
+        for event_id, customer, created in (
+            ("evt_order_3", "cus_order_a", 3),
+            ("evt_order_1", "cus_order_a", 1),
+            ("evt_order_b", "cus_order_b", 2),
+            ("evt_order_2", "cus_order_a", 2),
+        ):
+            BillingWebhookQueue.enqueue("stripe", _invoice_event(event_id, customer, created))
+
+        applied = []
+        with patch.object(
+            BillingService,
+            "dispatch_webhook_row",
+            side_effect=lambda row: applied.append(row.event_id),
+        ):
+            totals = BillingWebhookQueue.process_pending(max_workers=1)
+
+        assert totals["processed"] == 4
+        assert totals["lanes"] == 2
+        customer_a = [event_id for event_id in applied if event_id != "evt_order_b"]
+        assert customer_a == ["evt_order_1", "evt_order_2", "evt_order_3"]
+        assert {row.status for row in StripeEvent.query.all()} == {"processed"}
+
+
+def test_failure_blocks_later_events_for_that_customer_only(app):
+    with app.app_context():
+        for event_id, customer, created in (
+            ("evt_fail_1", "cus_fail", 1),
+            ("evt_fail_2", "cus_fail", 2),
+            ("evt_ok_1", "cus_ok", 1),
+        ):
+            BillingWebhookQueue.enqueue("stripe", _invoice_event(event_id, customer, created))
+
+        def _dispatch(row):
+            if row.event_id == "evt_fail_1":
+                raise RuntimeError("stripe unavailable")
+
+        with patch.object(BillingService, "dispatch_webhook_row", side_effect=_dispatch):
+            totals = BillingWebhookQueue.process_pending(max_workers=2)
+            assert totals["processed"] == 1
+            assert totals["failed"] == 1
+            assert totals["skipped"] == 1
+
+            failed = StripeEvent.query.filter_by(event_id="evt_fail_1").one()
+            assert failed.status == "received"
+            assert failed.attempts == 1
+            assert failed.next_attempt_at is not None
+            assert "stripe unavailable" in failed.error_message
+            assert StripeEvent.query.filter_by(event_id="evt_fail_2").one().status == "received"
+
+            # The retry is not due yet, so the whole customer lane stays parked.
+            assert BillingWebhookQueue.process_pending()["lanes"] == 0
+
+
+def test_stale_processing_row_is_reclaimed_and_applied(app):
+    with app.app_context():
+        row_id = BillingWebhookQueue.enqueue(
+            "stripe", _invoice_event("evt_stale", "cus_stale", 1)
+        )
+        row = db.session.get(StripeEvent, row_id)
+        row.status = "processing"
+        row.attempts = 1
+        row.started_at = TimezoneUtils.utc_now() - timedelta(hours=1)
+        db.session.commit()
+        # Keep the row loaded so the reclaim runs with it in the identity map.
+        assert db.session.get(StripeEvent, row_id).status == "processing"
+
+        with patch.object(BillingService, "dispatch_webhook_row") as mock_dispatch:
+            totals = BillingWebhookQueue.process_pending(max_workers=1)
+
+        assert totals["processed"] == 1
+        mock_dispatch.assert_called_once()
+        row = db.session.get(StripeEvent, row_id)
+        assert row.status == "processed"
+        assert row.attempts == 2
+
+
+def test_process_event_skips_rows_already_claimed(app):
+    with app.app_context():
+        row_id = BillingWebhookQueue.enqueue(
+            "stripe", _invoice_event("evt_claimed", "cus_claimed", 1)
+        )
+        with patch.object(BillingService, "dispatch_webhook_row") as mock_dispatch:
+            assert BillingWebhookQueue.process_event(row_id) is True
+            assert BillingWebhookQueue.process_event(row_id) is None
+        mock_dispatch.assert_called_once()
+
+
+def test_intake_only_persists_when_scheduler_owns_processing(app):
+    with app.app_context():
+        app.config["SCHEDULER_ENABLED"] = True
+        org = Organization(
+            name="Queued Webhook Org",
+            stripe_customer_id="cus_queue_intake",
+            billing_status="active",
+            subscription_status="active",
+        )
+        db.session.add(org)
+        db.session.commit()
+
+        event = _invoice_event(
+            "evt_queue_intake", "cus_queue_intake", 1, event_type="invoice.payment_failed"
+        )
+        assert BillingService.handle_webhook_event("stripe", event) == 200
+        assert BillingService.handle_webhook_event("stripe", event) == 200
+
+        db.session.refresh(org)
+        assert org.billing_status == "active"
+        assert StripeEvent.query.filter_by(event_id="evt_queue_intake").count() == 1
+
+        assert BillingWebhookQueue.process_pending()["processed"] == 1
+        db.session.refresh(org)
+        assert org.billing_status == "payment_failed"
+
+
+def test_inline_redelivery_applies_a_row_that_is_still_received(app):
+    with app.app_context():
+        app.config["SCHEDULER_ENABLED"] = False
+        event = _invoice_event("evt_inline_retry", "cus_inline_retry", 1)
+
+        with patch.object(
+            BillingService,
+            "dispatch_webhook_row",
+            side_effect=RuntimeError("stripe unavailable"),
+        ):
+            assert BillingService.handle_webhook_event("stripe", event) == 500
+        row = StripeEvent.query.filter_by(event_id="evt_inline_retry").one()
+        assert row.status == "received"
+
+        with patch.object(BillingService, "dispatch_webhook_row") as mock_dispatch:
+            assert BillingService.handle_webhook_event("stripe", event) == 200
+            assert BillingService.handle_webhook_event("stripe", event) == 200
+        mock_dispatch.assert_called_once()
+        db.session.refresh(row)
+        assert row.status == "processed"
+        assert row.attempts == 2
@@ -0,0 +1,125 @@
+import pytest
+
+from app.extensions import cache, db
+from app.models.product_category import ProductCategory
+from app.models.recipe import Recipe
+from app.services.cache_invalidation import (
+    recipe_bootstrap_cache_key,
+    recipe_bootstrap_version,
+)
+
+
+def _login(client, user_id):
+    with client.session_transaction() as sess:
+        sess["_user_id"] = str(user_id)
+        sess["_fresh"] = True
+
+
+def _add_recipe(org_id, name, prefix):
+    category = ProductCategory.query.filter_by(name="Uncategorized").first()
+    recipe = Recipe(
+        name=name,
+        label_prefix=prefix,
+        predicted_yield=1.0,
+        predicted_yield_unit="gram",
+        category_id=category.id,
+        organization_id=org_id,
+        is_current=True,
+    )
+    db.session.add(recipe)
+    db.session.commit()
+    return recipe.id
+
+
+@pytest.mark.usefixtures("app")
+def test_recipe_bootstrap_answers_304_and_deltas_from_version(app, client, test_user):
+    app.config["SKIP_PERMISSIONS"] = True
+    user_id, org_id = test_user.id, test_user.organization_id
+    _login(client, user_id)
+    with app.app_context():
+        kept_id = _add_recipe(org_id, "Bootstrap Kept", "BSK")
+
+    first = client.get("/api/bootstrap/recipes")
+    assert first.status_code == 200
+    body = first.get_json()
+    etag = first.headers["ETag"]
+    version = body["version"]
+    assert body["mode"] == "full"
+    assert kept_id in [row["id"] for row in body["recipes"]]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    unchanged = client.get("/api/bootstrap/recipes", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.data == b""
+    assert client.get(f"/api/bootstrap/recipes?v={version}").status_code == 304
+    assert client.get(f"/api/bootstrap/recipes?since={version}").status_code == 304
+
+    with app.app_context():
+        added_id = _add_recipe(org_id, "Bootstrap Added", "BSA")
+
+    changed = client.get("/api/bootstrap/recipes", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.get_json()["version"] > version
+
+    delta = client.get(f"/api/bootstrap/recipes?since={version}").get_json()
+    assert delta["mode"] == "delta"
+    assert delta["since"] == version
+    assert [row["id"] for row in delta["changes"]["recipes"]["added"]] == [added_id]
+    assert "recipes" not in delta
+
+    # An unknown base version falls back to the full payload.
+    fallback = client.get("/api/bootstrap/recipes?since=1").get_json()
+    assert fallback["mode"] == "full"
+    assert {kept_id, added_id} <= {row["id"] for row in fallback["recipes"]}
+
+
+@pytest.mark.usefixtures("app")
+def test_product_bootstrap_etag_is_scoped_per_kind(app, client, test_user):
+    app.config["SKIP_PERMISSIONS"] = True
+    _login(client, test_user.id)
+
+    recipes = client.get("/api/bootstrap/recipes")
+    products = client.get("/api/bootstrap/products")
+    assert products.status_code == 200
+    assert {"products", "sku_inventory_ids", "version"} <= set(products.get_json())
+
+    crossed = client.get(
+        "/api/bootstrap/products", headers={"If-None-Match": recipes.headers["ETag"]}
+    )
+    assert crossed.status_code == 200
+    same = client.get(
+        "/api/bootstrap/products", headers={"If-None-Match": products.headers["ETag"]}
+    )
+    assert same.status_code == 304
+
+
+@pytest.mark.usefixtures("app")
+def test_recipe_bootstrap_retires_builds_that_read_before_commit(app, client, test_user):
+    app.config["SKIP_PERMISSIONS"] = True
+    user_id, org_id = test_user.id, test_user.organization_id
+    _login(client, user_id)
+    with app.app_context():
+        category = ProductCategory.query.filter_by(name="Uncategorized").first()
+        recipe = Recipe(
+            name="Bootstrap Pending",
+            label_prefix="BSP",
+            predicted_yield=1.0,
+            predicted_yield_unit="gram",
+            category_id=category.id,
+            organization_id=org_id,
+            is_current=True,
+        )
+        db.session.add(recipe)
+        db.session.flush()
+        # A concurrent build reads before the commit and caches what it saw
+        # under the version the flush already published.
+        in_flight = recipe_bootstrap_version(org_id)
+        cache.set(recipe_bootstrap_cache_key(org_id, in_flight), {"recipes": [], "count": 0})
+        db.session.commit()
+        recipe_id = recipe.id
+        assert recipe_bootstrap_version(org_id) > in_flight
+
+    body = client.get("/api/bootstrap/recipes").get_json()
+    assert body["version"] > in_flight
+    assert recipe_id in [row["id"] for row in body["recipes"]]
@@ -0,0 +1,113 @@
+import random
+from difflib import SequenceMatcher
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import GlobalItem
+from app.services.density_assignment_service import (
+    DensityAssignmentService,
+    _ReferenceIndex,
+)
+
+
+def _count_global_item_loads(func):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM global_item" in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    return result, len(statements)
+
+
+def _legacy_similarity(items, ingredient_name, threshold):
+    best_match, best_score = None, 0
+    for item in items:
+        for candidate in [item["name"]] + list(item.get("aliases", [])):
+            score = SequenceMatcher(
+                None, ingredient_name.lower().strip(), candidate.lower().strip()
+            ).ratio()
+            if score > best_score and score >= threshold:
+                best_score, best_match = score, item
+    return best_match
+
+
+def test_bulk_matches_share_one_index_and_rebuild_on_global_item_change(app):
+    with app.app_context():
+        db.session.add_all(
+            [
+                GlobalItem(
+                    name="Sodium Hydroxide",
+                    item_type="ingredient",
+                    density=2.13,
+                    aliases=["Lye", "Caustic Soda"],
+                ),
+                GlobalItem(name="Glycerin", item_type="ingredient", density=1.26),
+                GlobalItem(name="Kaolin Clay", item_type="ingredient", density=2.6),
+            ]
+        )
+        db.session.commit()
+        DensityAssignmentService.reset_reference_index()
+
+        names = ["glycerin", "lye", "Kaolin Clays", "Glycerine", "unobtainium", ""] * 50
+        results, loads = _count_global_item_loads(
+            lambda: DensityAssignmentService.find_best_matches(names)
+        )
+        summary = [
+            ((item or {}).get("name"), match_type) for item, match_type in results[:6]
+        ]
+        single = DensityAssignmentService.find_best_match("Caustic Soda")
+
+        db.session.add(
+            GlobalItem(name="Unobtainium", item_type="ingredient", density=9.9)
+        )
+        db.session.commit()
+        rebuilt, rebuilt_loads = _count_global_item_loads(
+            lambda: DensityAssignmentService.find_best_match("unobtainium")
+        )
+
+    assert loads == 1
+    assert summary == [
+        ("Glycerin", "exact"),
+        ("Sodium Hydroxide", "alias"),
+        ("Kaolin Clay", "similarity"),
+        ("Glycerin", "similarity"),
+        (None, None),
+        (None, None),
+    ]
+    assert single[0]["name"] == "Sodium Hydroxide" and single[1] == "alias"
+    assert rebuilt_loads == 1
+    assert rebuilt[0]["density_g_per_ml"] == 9.9 and rebuilt[1] == "exact"
+
+
+def test_ngram_shortlist_matches_legacy_similarity_scan():
+    rng = random.Random(11)
+    alphabet = "abcdeilmnorstu "
+
+    def _word():
+        return "".join(rng.choice(alphabet) for _ in range(rng.randint(2, 14)))
+
+    items = [
+        {"name": _word(), "aliases": [_word() for _ in range(rng.randint(0, 2))]}
+        for _ in range(200)
+    ]
+    index = _ReferenceIndex(items)
+    queries = [item["name"] for item in items[:60]]
+    # Near-duplicates with one edit so fuzzy matches actually occur.
+    for query in list(queries):
+        chars = list(query)
+        chars[rng.randrange(len(chars))] = rng.choice(alphabet)
+        queries.append("".join(chars))
+    queries += [_word() for _ in range(60)]
+
+    for threshold in (0.6, 0.7, 0.85):
+        for query in queries:
+            expected = _legacy_similarity(items, query, threshold)
+            actual = index.best_similarity(query.lower().strip(), threshold)
+            assert actual is expected, (threshold, query)
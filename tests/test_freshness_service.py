@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import Batch, InventoryItem, Organization, UnifiedInventoryHistory
+from app.models.inventory_lot import InventoryLot
+from app.models.product_category import ProductCategory
+from app.models.recipe import Recipe
+from app.services.freshness_service import FreshnessService
+
+T0 = datetime(2026, 1, 1, 8, 0, 0)
+
+
+def _count_queries():
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _record)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", _record)
+
+
+def _lot(item, code, **dates):
+    lot = InventoryLot(
+        inventory_item_id=item.id,
+        remaining_quantity=0.0,
+        original_quantity=10.0,
+        remaining_quantity_base=0,
+        original_quantity_base=10_000_000,
+        unit="gram",
+        unit_cost=1.0,
+        source_type="restock",
+        fifo_code=code,
+        organization_id=item.organization_id,
+        **dates,
+    )
+    db.session.add(lot)
+    db.session.flush()
+    return lot
+
+
+def _deduct(batch, item, quantity, when, lot=None, change_type="batch"):
+    db.session.add(
+        UnifiedInventoryHistory(
+            inventory_item_id=item.id,
+            change_type=change_type,
+            quantity_change=quantity,
+            unit="gram",
+            timestamp=when,
+            affected_lot_id=lot.id if lot else None,
+            batch_id=batch.id,
+            organization_id=batch.organization_id,
+        )
+    )
+
+
+def _build_batches(count: int):
+    org = Organization.query.first()
+    category = ProductCategory.query.filter_by(name="Uncategorized").first()
+    recipe = Recipe(
+        name="Freshness Recipe",
+        label_prefix="FRSH",
+        predicted_yield=10.0,
+        predicted_yield_unit="gram",
+        category_id=category.id,
+        organization_id=org.id,
+    )
+    oil = InventoryItem(
+        name="Olive Oil", type="ingredient", unit="gram", quantity=0, organization_id=org.id
+    )
+    milk = InventoryItem(
+        name="Goat Milk",
+        type="ingredient",
+        unit="gram",
+        quantity=0,
+        organization_id=org.id,
+        is_perishable=True,
+        shelf_life_days=30,
+    )
+    db.session.add_all([recipe, oil, milk])
+    db.session.flush()
+
+    batches = []
+    for index in range(count):
+        batch = Batch(
+            recipe_id=recipe.id,
+            label_code=f"FRSH-{index:03d}",
+            batch_type="ingredient",
+            status="in_progress",
+            organization_id=org.id,
+        )
+        db.session.add(batch)
+        db.session.flush()
+        dated = _lot(
+            oil, f"FRSH-A-{index}", received_date=T0, expiration_date=T0 + timedelta(days=10)
+        )
+        shelf = _lot(oil, f"FRSH-B-{index}", received_date=T0, shelf_life_days=20)
+        _deduct(batch, oil, -4.0, T0 + timedelta(days=2.5), dated)  # 75%
+        _deduct(batch, oil, -4.0, T0 + timedelta(days=15), shelf)  # 25%
+        _deduct(batch, milk, -2.0, T0 + timedelta(days=1))  # shelf-life fallback, 0%
+        _deduct(batch, oil, 3.0, T0 + timedelta(days=1), dated)  # returns are ignored
+        _deduct(batch, oil, -9.0, T0 + timedelta(days=1), dated, change_type="spoil")
+        batches.append(batch)
+    db.session.commit()
+    return batches
+
+
+def _summary_shape(summary):
+    return (
+        summary.overall_freshness_percent,
+        [
+            (i.item_name, i.weighted_freshness_percent, i.lots_contributed, i.total_used)
+            for i in summary.items
+        ],
+    )
+
+
+def test_many_batches_share_one_joined_query(app):
+    with app.test_request_context():
+        batches = _build_batches(4)
+        db.session.expire_all()
+        batches = (
+            Batch.query.filter(Batch.label_code.like("FRSH-%"))
+            .order_by(Batch.id.asc())
+            .all()
+        )
+
+        statements, stop = _count_queries()
+        try:
+            summaries = FreshnessService.compute_batch_freshness_many(batches)
+        finally:
+            stop()
+
+        assert len(statements) == 1
+        assert list(summaries) == [batch.id for batch in batches]
+        for batch in batches:
+            assert _summary_shape(summaries[batch.id]) == (
+                40.0,
+                [("Olive Oil", 50.0, 2, 8.0), ("Goat Milk", 0.0, 0, 2.0)],
+            )
+
+
+def test_persisted_summary_is_reused_without_history_queries(app):
+    with app.test_request_context():
+        batch = _build_batches(1)[0]
+        computed = FreshnessService.compute_batch_freshness(batch)
+        FreshnessService.persist_batch_freshness(batch)
+        db.session.commit()
+        # Reload the expired batch row the way a fresh request would.
+        db.session.refresh(batch)
+
+        statements, stop = _count_queries()
+        try:
+            cached = FreshnessService.compute_batch_freshness(batch)
+            items = FreshnessService.compute_item_freshness_for_batch(batch)
+        finally:
+            stop()
+
+        assert statements == []
+        assert cached == computed
+        assert items == computed.items
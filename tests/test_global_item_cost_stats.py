@@ -0,0 +1,175 @@
+import itertools
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import GlobalItem, InventoryItem, InventoryLot, Organization
+from app.models.global_item_cost_stats import GlobalItemCostStats
+from app.services.statistics.global_item_stats import GlobalItemStatsService
+
+_LOT_CODES = itertools.count(1)
+
+
+def _linked_item(org_id: int, global_item: GlobalItem, name: str) -> InventoryItem:
+    item = InventoryItem(
+        name=name,
+        organization_id=org_id,
+        unit="gram",
+        quantity=0,
+        type="ingredient",
+        global_item_id=global_item.id,
+    )
+    db.session.add(item)
+    db.session.commit()
+    return item
+
+
+def _add_lots(item: InventoryItem, costs) -> None:
+    for cost in costs:
+        db.session.add(
+            InventoryLot(
+                inventory_item_id=item.id,
+                remaining_quantity=1.0,
+                original_quantity=1.0,
+                remaining_quantity_base=1,
+                original_quantity_base=1,
+                unit="gram",
+                unit_cost=cost,
+                source_type="restock",
+                fifo_code=f"COST-STATS-{next(_LOT_CODES)}",
+                organization_id=item.organization_id,
+            )
+        )
+    db.session.commit()
+
+
+def _count_queries():
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _record)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", _record)
+
+
+@pytest.mark.usefixtures("app_context")
+def test_cost_distribution_is_precomputed_and_served_from_one_row():
+    org = Organization.query.first()
+    global_item = GlobalItem(name="Cost Stats Shea", item_type="ingredient", default_unit="g")
+    db.session.add(global_item)
+    db.session.commit()
+    first = _linked_item(org.id, global_item, "Shea A")
+    second = _linked_item(org.id, global_item, "Shea B")
+    costs = [1.0, 1.1, 1.2, 1.25, 1.3, 1.4, 1.5, 1.6, 9.0]
+    _add_lots(first, costs[:5] + [0.0])
+    _add_lots(second, costs[5:])
+
+    result = GlobalItemStatsService.refresh_cost_distribution(global_item.id)
+
+    values = np.array(costs)
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    upper = q3 + 1.5 * (q3 - q1)
+    kept = values[values <= upper]
+    assert result["count"] == len(costs)
+    assert result["median"] == pytest.approx(median)
+    assert result["q1"] == pytest.approx(q1)
+    assert result["outliers_high_count"] == 1
+    assert result["outliers_low_count"] == 0
+    assert result["mean_ex_outliers"] == pytest.approx(kept.mean())
+    assert (result["low"], result["high"]) == (1.0, 1.6)
+    assert result["min"] == 1.0 and result["max"] == 9.0
+    assert len(result["histogram"]) == 10
+    assert sum(bucket["count"] for bucket in result["histogram"]) == len(kept)
+    assert result["histogram"][-1]["bin_end"] == 1.6
+
+    global_item_id = global_item.id
+    statements, stop = _count_queries()
+    try:
+        cached = GlobalItemStatsService.get_cost_distribution(global_item_id)
+    finally:
+        stop()
+    assert cached == result
+    assert len(statements) == 1
+
+
+@pytest.mark.usefixtures("app_context")
+def test_reads_serve_stale_rows_until_the_refresh_job_runs():
+    org = Organization.query.first()
+    global_item = GlobalItem(name="Cost Stats Lye", item_type="ingredient", default_unit="g")
+    db.session.add(global_item)
+    db.session.commit()
+    item = _linked_item(org.id, global_item, "Lye")
+    _add_lots(item, [2.0, 3.0])
+
+    # No row yet: computed for the read, stored only by the refresh job.
+    assert GlobalItemStatsService.get_cost_distribution(global_item.id)["count"] == 2
+    assert GlobalItemCostStats.query.filter_by(global_item_id=global_item.id).count() == 0
+    GlobalItemStatsService.refresh_stale_cost_distributions()
+
+    _add_lots(item, [4.0])
+    row = GlobalItemCostStats.query.filter_by(global_item_id=global_item.id).one()
+    db.session.refresh(row)
+    assert row.is_stale is True
+
+    global_item_id = global_item.id
+    statements, stop = _count_queries()
+    try:
+        served = GlobalItemStatsService.get_cost_distribution(global_item_id)
+    finally:
+        stop()
+    assert served["count"] == 2
+    assert not any(s.lstrip().upper().startswith("UPDATE") for s in statements)
+
+    assert GlobalItemStatsService.refresh_stale_cost_distributions() >= 1
+    refreshed = GlobalItemStatsService.get_cost_distribution(global_item_id)
+    assert refreshed["count"] == 3
+    assert refreshed["median"] == pytest.approx(3.0)
+    db.session.refresh(row)
+    assert row.is_stale is False
+
+    item.global_item_id = None
+    db.session.commit()
+    db.session.refresh(row)
+    assert row.is_stale is True
+    GlobalItemStatsService.refresh_stale_cost_distributions()
+    assert GlobalItemStatsService.get_cost_distribution(global_item_id)["count"] == 0
+
+
+@pytest.mark.usefixtures("app_context")
+def test_lot_insert_reads_the_item_link_from_the_session():
+    org = Organization.query.first()
+    global_item = GlobalItem(name="Cost Stats Tallow", item_type="ingredient", default_unit="g")
+    db.session.add(global_item)
+    db.session.commit()
+    item = _linked_item(org.id, global_item, "Tallow")
+    _add_lots(item, [1.0])
+    GlobalItemStatsService.refresh_stale_cost_distributions()
+    assert item.global_item_id == global_item.id
+
+    statements, stop = _count_queries()
+    try:
+        _add_lots(item, [2.0, 3.0])
+    finally:
+        stop()
+    assert not any("FROM inventory_item" in s for s in statements)
+    updates = [s for s in statements if "global_item_cost_stats" in s]
+    assert len(updates) == 1
+
+
+@pytest.mark.usefixtures("app_context")
+def test_refresh_stale_cost_distributions_backfills_missing_rows():
+    org = Organization.query.first()
+    global_item = GlobalItem(name="Cost Stats Wax", item_type="ingredient", default_unit="g")
+    db.session.add(global_item)
+    db.session.commit()
+    _add_lots(_linked_item(org.id, global_item, "Wax"), [5.0])
+
+    assert GlobalItemStatsService.refresh_stale_cost_distributions() >= 1
+    assert GlobalItemStatsService.refresh_stale_cost_distributions() == 0
+    row = GlobalItemCostStats.query.filter_by(global_item_id=global_item.id).one()
+    assert row.sample_count == 1
+    assert row.histogram == []
@@ -0,0 +1,216 @@
+from datetime import timedelta
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import GlobalItem, InventoryItem, Organization, UnifiedInventoryHistory
+from app.models.global_item_sync_job import GlobalItemSyncJob
+from app.services.global_item_sync_service import (
+    SYNC_JOB_STALE_RUNNING_SECONDS,
+    GlobalItemSyncService,
+)
+from app.utils.timezone_utils import TimezoneUtils
+
+
+def _count_updates(func):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE INVENTORY_ITEM"):
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    return result, len(statements)
+
+
+def _seed(org_count: int = 3, *, container: bool = False):
+    global_item = GlobalItem(
+        name="Sync Bottle" if container else "Sync Shea",
+        item_type="container" if container else "ingredient",
+        default_unit="count" if container else "g",
+        density=None if container else 0.9,
+        capacity=8.0 if container else None,
+        capacity_unit="floz" if container else None,
+    )
+    db.session.add(global_item)
+    db.session.flush()
+    item_ids = []
+    for index in range(org_count):
+        org = Organization(name=f"Sync Org {index}")
+        db.session.add(org)
+        db.session.flush()
+        item = InventoryItem(
+            name=global_item.name,
+            type=global_item.item_type,
+            unit=global_item.default_unit,
+            density=global_item.density,
+            capacity=global_item.capacity,
+            capacity_unit=global_item.capacity_unit,
+            organization_id=org.id,
+            global_item_id=global_item.id,
+            ownership="global",
+        )
+        db.session.add(item)
+        db.session.flush()
+        item_ids.append(item.id)
+    db.session.commit()
+    return global_item, item_ids
+
+
+def test_conditional_bulk_updates_keep_org_customizations(app):
+    with app.app_context():
+        global_item, item_ids = _seed()
+        customized = db.session.get(InventoryItem, item_ids[1])
+        customized.unit = "oz"
+        customized.density = 0.95
+        db.session.commit()
+
+        before = {"default_unit": "g", "density": 0.9}
+        global_item.name = "Sync Shea Butter"
+        global_item.default_unit = "kg"
+        global_item.density = 0.92
+
+        result, updates = _count_updates(
+            lambda: GlobalItemSyncService.sync_linked_inventory_items(
+                global_item, before=before
+            )
+        )
+        db.session.commit()
+        rows = {row.id: row for row in InventoryItem.query.filter(InventoryItem.id.in_(item_ids))}
+        history = UnifiedInventoryHistory.query.filter_by(change_type="sync_global").count()
+
+    assert updates == 3  # name, unit, density - independent of fan-out
+    assert result == {
+        "updated": 3,
+        "organizations": 3,
+        "fields": {"name": 3, "unit": 2, "density": 2},
+    }
+    assert {row.name for row in rows.values()} == {"Sync Shea Butter"}
+    assert rows[item_ids[0]].unit == "kg" and rows[item_ids[0]].density == 0.92
+    assert rows[item_ids[1]].unit == "oz" and rows[item_ids[1]].density == 0.95
+    assert history == 3
+
+
+def test_unchanged_edit_touches_nothing(app):
+    with app.app_context():
+        global_item, _ = _seed(org_count=2, container=True)
+        before = {"default_unit": "count", "capacity": 8.0, "capacity_unit": "floz"}
+
+        result = GlobalItemSyncService.sync_linked_inventory_items(global_item, before=before)
+        global_item.capacity = 16.0
+        resized = GlobalItemSyncService.sync_linked_inventory_items(global_item, before=before)
+
+    assert result == {"updated": 0, "organizations": 0, "fields": {}}
+    assert resized["fields"] == {"capacity": 2}
+
+
+def test_large_fan_out_is_queued_and_applied_by_job(app):
+    with app.app_context():
+        app.config["GLOBAL_ITEM_SYNC_INLINE_LIMIT"] = 2
+        app.config["SCHEDULER_ENABLED"] = True
+        global_item, item_ids = _seed(org_count=3)
+        before = {"default_unit": "g", "density": 0.9}
+        global_item.density = 0.88
+
+        queued = GlobalItemSyncService.request_sync(global_item, before=before)
+        global_item.density = 0.87
+        requeued = GlobalItemSyncService.request_sync(
+            global_item, before={"default_unit": "g", "density": 0.88}
+        )
+        db.session.commit()
+        untouched = db.session.get(InventoryItem, item_ids[0]).density
+
+        totals = GlobalItemSyncService.run_pending_jobs()
+        job = db.session.get(GlobalItemSyncJob, queued["job_id"])
+        densities = {
+            row.density for row in InventoryItem.query.filter(InventoryItem.id.in_(item_ids))
+        }
+
+    assert queued == {"queued": True, "linked": 3, "job_id": queued["job_id"]}
+    assert requeued["job_id"] == queued["job_id"]
+    assert untouched == 0.9
+    assert totals == {"processed": 1, "succeeded": 1, "failed": 0}
+    assert job.status == "done"
+    assert job.result["fields"] == {"density": 3}
+    assert densities == {0.87}
+
+
+def test_large_fan_out_syncs_inline_without_a_scheduler(app):
+    with app.app_context():
+        app.config["GLOBAL_ITEM_SYNC_INLINE_LIMIT"] = 2
+        app.config["SCHEDULER_ENABLED"] = False
+        global_item, item_ids = _seed(org_count=3)
+        global_item.density = 0.8
+
+        result = GlobalItemSyncService.request_sync(
+            global_item, before={"default_unit": "g", "density": 0.9}
+        )
+        db.session.commit()
+        job_count = GlobalItemSyncJob.query.count()
+
+    assert result["queued"] is False
+    assert result["fields"] == {"density": 3}
+    assert job_count == 0
+
+
+def test_stale_running_job_is_reclaimed_and_rerun(app):
+    with app.app_context():
+        global_item, item_ids = _seed(org_count=2)
+        global_item.density = 0.7
+        job = GlobalItemSyncJob(
+            global_item_id=global_item.id,
+            before_snapshot={"default_unit": "g", "density": 0.9},
+            status="running",
+            attempts=1,
+            started_at=TimezoneUtils.utc_now()
+            - timedelta(seconds=SYNC_JOB_STALE_RUNNING_SECONDS + 60),
+        )
+        db.session.add(job)
+        db.session.commit()
+        job_id = job.id
+
+        # A loaded job row must not break the stale-claim update.
+        db.session.get(GlobalItemSyncJob, job_id)
+        totals = GlobalItemSyncService.run_pending_jobs()
+        job = db.session.get(GlobalItemSyncJob, job_id)
+        status, attempts = job.status, job.attempts
+
+    assert totals == {"processed": 1, "succeeded": 1, "failed": 0}
+    assert status == "done"
+    assert attempts == 2
+
+
+def test_bulk_name_sync_marks_recipe_fingerprints_stale(app):
+    from app.models import Recipe, RecipeIngredient
+    from app.models.recipe_fingerprint import STALE_FINGERPRINT_VERSION, RecipeFingerprint
+
+    with app.app_context():
+        global_item, item_ids = _seed(org_count=1)
+        item = db.session.get(InventoryItem, item_ids[0])
+        recipe = Recipe(name="Sync Balm", organization_id=item.organization_id)
+        db.session.add(recipe)
+        db.session.flush()
+        db.session.add(
+            RecipeIngredient(
+                recipe_id=recipe.id, inventory_item_id=item.id, quantity=10.0, unit="g"
+            )
+        )
+        fingerprint = RecipeFingerprint(
+            recipe_id=recipe.id,
+            organization_id=item.organization_id,
+            ingredient_set_hash="sync",
+            fingerprint_version=1,
+        )
+        db.session.add(fingerprint)
+        db.session.commit()
+
+        global_item.name = "Sync Shea Butter"
+        GlobalItemSyncService.sync_linked_inventory_items(global_item)
+        db.session.commit()
+        db.session.refresh(fingerprint)
+
+    assert fingerprint.fingerprint_version == STALE_FINGERPRINT_VERSION
@@ -0,0 +1,123 @@
+import random
+from difflib import SequenceMatcher
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import GlobalItem, InventoryItem, Organization, Unit
+from app.services.global_link_suggestions import (
+    GlobalLinkSuggestionService,
+    _ItemNameIndex,
+)
+
+
+def _count_queries(func):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    return result, len(statements)
+
+
+def _ensure_units():
+    for name, unit_type in (("g", "weight"), ("ml", "volume"), ("count", "count")):
+        if not Unit.query.filter_by(name=name).first():
+            db.session.add(
+                Unit(name=name, symbol=name, unit_type=unit_type, conversion_factor=1.0)
+            )
+    db.session.commit()
+
+
+def _seed_org(names_and_units):
+    org = Organization(name="Suggestion Org")
+    db.session.add(org)
+    db.session.flush()
+    for name, unit in names_and_units:
+        db.session.add(
+            InventoryItem(
+                name=name, type="ingredient", unit=unit, quantity=0.0, organization_id=org.id
+            )
+        )
+    db.session.commit()
+    return org.id
+
+
+def test_all_globals_scored_in_one_pass_and_ranked(app):
+    with app.app_context():
+        _ensure_units()
+        org_id = _seed_org(
+            [
+                ("shea butter", "g"),
+                ("Coconut Oil 76", "ml"),
+                ("coconut oil", "count"),
+                ("lye", "g"),
+            ]
+        )
+        db.session.add_all(
+            [
+                GlobalItem(name="Shea Butter", item_type="ingredient", default_unit="g"),
+                GlobalItem(name="Coconut Oil", item_type="ingredient", default_unit="g"),
+                GlobalItem(
+                    name="Sodium Hydroxide",
+                    item_type="ingredient",
+                    default_unit="g",
+                    aliases=["Lye", "Caustic Soda"],
+                ),
+                GlobalItem(name="Beeswax", item_type="ingredient", default_unit="g"),
+            ]
+            + [
+                GlobalItem(name=f"Filler Botanical {i}", item_type="ingredient", default_unit="g")
+                for i in range(40)
+            ]
+        )
+        db.session.commit()
+
+        ranked, queries = _count_queries(
+            lambda: GlobalLinkSuggestionService.rank_suggestions_for_org(org_id)
+        )
+        summary = [
+            (gi.name, [(item.name, round(conf, 3)) for item, conf in matches])
+            for gi, matches in ranked
+        ]
+        first_global, first_items = GlobalLinkSuggestionService.get_first_suggestion_for_org(
+            org_id
+        )
+        first = (first_global.name, [item.name for item in first_items])
+
+    assert queries == 3  # globals, unlinked items, unit types
+    assert summary == [
+        ("Shea Butter", [("shea butter", 1.0)]),
+        ("Sodium Hydroxide", [("lye", 0.98)]),
+        ("Coconut Oil", [("Coconut Oil 76", 0.88)]),
+    ]
+    assert first == ("Shea Butter", ["shea butter"])
+
+
+def test_trigram_index_matches_brute_force_similarity():
+    rng = random.Random(7)
+    alphabet = "abcdeilmnorstu "
+    names = ["".join(rng.choice(alphabet) for _ in range(rng.randint(2, 14))) for _ in range(300)]
+    # Near-duplicates with one or two edits so fuzzy matches actually occur.
+    for name in names[:100]:
+        chars = list(name)
+        chars[rng.randrange(len(chars))] = rng.choice(alphabet)
+        names.append("".join(chars))
+    index = _ItemNameIndex(names)
+
+    for target in names[:120]:
+        global_item = GlobalItem(name=target, aliases=[])
+        gname = target.strip().lower()
+        expected = set()
+        for position, name in enumerate(names):
+            name = name.strip().lower()
+            if not name or not gname:
+                continue
+            if name == gname or SequenceMatcher(None, name, gname).ratio() >= 0.85:
+                expected.add(position)
+        assert set(index.score(global_item, 0.85)) == expected, target
@@ -0,0 +1,200 @@
+import random
+import threading
+import time
+
+from app.services.job_scheduler import (
+    JobScheduler,
+    LANE_DEFAULT,
+    LANE_LATENCY,
+    LocalLeaderLock,
+    RedisLeaderLock,
+    ScheduledJob,
+    build_default_jobs,
+)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _DeniedLock(LocalLeaderLock):
+    def acquire(self) -> bool:
+        return False
+
+
+class _FakeRedis:
+    """Minimal SET NX / compare-and-set EVAL semantics for the leader lease."""
+
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def eval(self, script, numkeys, key, token, *args):
+        if self.values.get(key) != token:
+            return 0
+        if "pexpire" in script:
+            return 1
+        del self.values[key]
+        return 1
+
+
+def test_jobs_run_on_jittered_interval_and_record_metrics(app):
+    clock = _FakeClock()
+    calls = []
+
+    def _ok():
+        calls.append("ok")
+        return len(calls)
+
+    def _boom():
+        raise RuntimeError("boom")
+
+    scheduler = JobScheduler(
+        app,
+        [
+            ScheduledJob("ok", _ok, interval_seconds=60, jitter_seconds=6),
+            ScheduledJob("boom", _boom, interval_seconds=30),
+            ScheduledJob("disabled", _ok, interval_seconds=0),
+        ],
+        clock=clock,
+        rng=random.Random(3),
+    )
+    try:
+        assert scheduler.run_pending() == ["boom"]
+        first_ok = scheduler._next_run["ok"]
+        assert 1000.0 <= first_ok <= 1006.0
+
+        clock.now = first_ok
+        assert scheduler.run_pending() == ["ok"]
+        scheduler.wait_idle(timeout=5)
+        assert first_ok + 60 <= scheduler._next_run["ok"] <= first_ok + 66
+
+        clock.now += 1
+        assert scheduler.run_pending() == []
+        clock.now = 1031.0
+        assert scheduler.run_pending() == ["boom"]
+        scheduler.wait_idle(timeout=5)
+    finally:
+        scheduler.shutdown()
+
+    metrics = scheduler.metrics_snapshot()
+    assert set(metrics) == {"ok", "boom"}
+    assert metrics["ok"]["runs"] == 1 and metrics["ok"]["last_result"] == 1
+    assert metrics["boom"]["runs"] == 2 and metrics["boom"]["failures"] == 2
+    assert metrics["boom"]["last_error"] == "RuntimeError: boom"
+    assert metrics["ok"]["avg_duration_ms"] is not None
+
+
+def test_bounded_workers_and_overlap_skip(app):
+    clock = _FakeClock()
+    release = threading.Event()
+    active = []
+    peak = []
+    guard = threading.Lock()
+
+    def _slow():
+        with guard:
+            active.append(1)
+            peak.append(len(active))
+        release.wait(5)
+        with guard:
+            active.pop()
+
+    jobs = [ScheduledJob(f"slow-{i}", _slow, interval_seconds=10) for i in range(3)]
+    scheduler = JobScheduler(app, jobs, max_workers=1, clock=clock)
+    try:
+        assert len(scheduler.run_pending()) == 3
+        clock.now += 10
+        assert scheduler.run_pending() == []
+        time.sleep(0.05)
+        release.set()
+        scheduler.wait_idle(timeout=5)
+    finally:
+        scheduler.shutdown()
+
+    assert max(peak) == 1
+    metrics = scheduler.metrics_snapshot()
+    assert sum(entry["skipped_overlaps"] for entry in metrics.values()) == 3
+    assert all(entry["runs"] == 1 for entry in metrics.values())
+
+
+def test_latency_lane_runs_while_long_jobs_hold_every_worker(app):
+    clock = _FakeClock()
+    release = threading.Event()
+    dispatched = threading.Event()
+
+    jobs = [
+        ScheduledJob("sweep-1", lambda: release.wait(5), interval_seconds=10),
+        ScheduledJob("sweep-2", lambda: release.wait(5), interval_seconds=10),
+        ScheduledJob("dispatch", dispatched.set, interval_seconds=10, lane=LANE_LATENCY),
+    ]
+    scheduler = JobScheduler(app, jobs, max_workers=1, latency_workers=1, clock=clock)
+    try:
+        assert len(scheduler.run_pending()) == 3
+        assert dispatched.wait(5)
+        release.set()
+        scheduler.wait_idle(timeout=5)
+    finally:
+        scheduler.shutdown()
+
+
+def test_only_the_leader_runs_jobs(app):
+    calls = []
+    job = ScheduledJob("tick", lambda: calls.append(1), interval_seconds=5)
+    follower = JobScheduler(app, [job], lock=_DeniedLock(), clock=_FakeClock())
+    try:
+        assert follower.run_pending() == []
+        assert follower.run_once() == {}
+    finally:
+        follower.shutdown()
+    assert calls == []
+
+    redis = _FakeRedis()
+    leader = RedisLeaderLock(redis, ttl_seconds=5)
+    other = RedisLeaderLock(redis, ttl_seconds=5)
+    assert leader.acquire() is True
+    assert other.acquire() is False
+    assert other.renew() is False and leader.renew() is True
+    other.release()
+    assert redis.values
+    leader.release()
+    assert other.acquire() is True
+
+
+def test_default_jobs_follow_config_intervals(app):
+    app.config.update(
+        SCHEDULER_TIMER_EXPIRY_INTERVAL_SECONDS=60,
+        SCHEDULER_RESERVATION_CLEANUP_INTERVAL_SECONDS=0,
+        SCHEDULER_JITTER_RATIO=0.5,
+    )
+    jobs = {job.name: job for job in build_default_jobs(app)}
+
+    assert "pos.cleanup_expired_reservations" not in jobs
+    assert jobs["timers.complete_expired"].interval_seconds == 60
+    assert jobs["timers.complete_expired"].jitter_seconds == 30
+    assert {"retention.sweep_delete_due", "freshness.snapshots", "domain_events.dispatch"} <= set(jobs)
+    assert jobs["domain_events.dispatch"].lane == LANE_LATENCY
+    assert jobs["billing.process_webhooks"].lane == LANE_LATENCY
+    assert jobs["retention.sweep_delete_due"].lane == LANE_DEFAULT
+
+
+def test_run_scheduler_cli_once_runs_selected_job(app):
+    app.config.update(SCHEDULER_LOCK_BACKEND="local")
+    runner = app.test_cli_runner()
+
+    listed = runner.invoke(args=["run-scheduler", "--list"])
+    assert "timers.complete_expired" in listed.output
+
+    result = runner.invoke(args=["run-scheduler", "--once", "--job", "timers.complete_expired"])
+    assert result.exit_code == 0, result.output
+    assert '"runs": 1' in result.output
+    assert '"failures": 0' in result.output
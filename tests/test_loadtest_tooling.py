@@ -0,0 +1,126 @@
+from types import SimpleNamespace
+
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models import Batch, InventoryItem, InventoryLot, Organization, User
+from app.models.product import ProductSKU
+from app.utils.performance_monitor import install_query_metrics
+from loadtests.data_generator import cleanup_tenants, seed_tenants
+from loadtests.slo import (
+    QueryCountStats,
+    ScenarioSLO,
+    build_summary_rows,
+    evaluate_slos,
+    format_report,
+)
+
+
+class _StatsEntry(SimpleNamespace):
+    def get_response_time_percentile(self, percentile):
+        return self.percentiles[percentile]
+
+
+def test_query_metrics_headers_are_opt_in(app):
+    assert install_query_metrics(app) is False
+
+    app.config["QUERY_METRICS_HEADERS_ENABLED"] = True
+    assert install_query_metrics(app) is True
+    response = app.test_client().get("/api/public/units")
+    assert int(response.headers["X-Query-Count"]) >= 1
+    assert float(response.headers["X-Query-Time-Ms"]) >= 0
+
+
+def test_slo_report_flags_breaches_and_attributes_queries():
+    queries = QueryCountStats()
+    for value in ("4", "6", None, "bogus"):
+        queries.record("reserve_inventory", value)
+    queries.merge({"reserve_inventory": [1, 10, 10]})
+
+    entries = [
+        _StatsEntry(
+            name="reserve_inventory",
+            method="POST",
+            num_requests=200,
+            num_failures=4,
+            max_response_time=950.4,
+            percentiles={0.50: 120, 0.95: 380, 0.99: 1100},
+        ),
+        _StatsEntry(
+            name="export_soap_inci_csv",
+            method="GET",
+            num_requests=50,
+            num_failures=0,
+            max_response_time=400,
+            percentiles={0.50: 90, 0.95: 200, 0.99: 300},
+        ),
+        _StatsEntry(name="idle", method="GET", num_requests=0, num_failures=0),
+    ]
+    rows = build_summary_rows(entries, queries)
+
+    assert [row["name"] for row in rows] == ["reserve_inventory", "export_soap_inci_csv"]
+    assert rows[0]["avg_queries"] == 6.7 and rows[0]["max_queries"] == 10
+    assert rows[1]["avg_queries"] is None
+
+    slos = (
+        ScenarioSLO("pos", ("reserve_inventory",), p95_ms=400, p99_ms=900, max_failure_ratio=0.01),
+        ScenarioSLO("exports", ("export_",), p95_ms=150, p99_ms=3000, prefix=True),
+    )
+    breaches = evaluate_slos(rows, slos)
+    assert breaches == [
+        "[pos] reserve_inventory: p99 1100ms > 900ms",
+        "[pos] reserve_inventory: failure ratio 2.00% > 1.00%",
+        "[exports] export_soap_inci_csv: p95 200ms > 150ms",
+    ]
+    report = format_report(rows, breaches)
+    assert "| reserve_inventory | POST | 200 | 2.00% | 120 | 380 | 1100 | 950 | 6.7 | 10 |" in report
+    assert "SLO breaches:" in report
+
+
+def test_seed_tenants_builds_isolated_orgs_and_cleans_up(app):
+    with app.app_context():
+        results = seed_tenants(2, "small", seed=7, tier_name="Test Tier")
+
+        assert len(results) == 2
+        org_ids = {result["organization_id"] for result in results}
+        for result in results:
+            counts = result["counts"]
+            assert counts["items"] >= 10 and counts["lots"] >= counts["items"]
+            assert counts["recipes"] >= 2 and counts["skus"] >= 1
+            org_id = result["organization_id"]
+            item_total = db.session.query(func.sum(InventoryItem.quantity_base)).filter(
+                InventoryItem.organization_id == org_id,
+                InventoryItem.type == "ingredient",
+            ).scalar()
+            lot_total = db.session.query(
+                func.sum(InventoryLot.remaining_quantity_base)
+            ).join(InventoryItem).filter(
+                InventoryLot.organization_id == org_id,
+                InventoryItem.type == "ingredient",
+            ).scalar()
+            assert item_total == lot_total
+            username = result["credentials"][0]["username"]
+            user = User.query.filter_by(username=username).one()
+            assert user.organization_id == org_id and user.check_password("loadtest123")
+
+        labels = db.session.query(Batch.organization_id, Batch.label_code).filter(
+            Batch.organization_id.in_(org_ids)
+        ).all()
+        assert len(labels) == len(set(labels))
+
+        # Same seed, fresh prefix: identical tenant shape.
+        again = seed_tenants(
+            1,
+            "small",
+            seed=7,
+            org_prefix="Load Replay",
+            user_prefix="loadreplay",
+            tier_name="Test Tier",
+        )
+        assert again[0]["counts"] == results[0]["counts"]
+
+        assert cleanup_tenants() == 2
+        assert cleanup_tenants("Load Replay") == 1
+        assert Organization.query.filter(Organization.id.in_(org_ids)).count() == 0
+        assert ProductSKU.query.filter(ProductSKU.organization_id.in_(org_ids)).count() == 0
+        assert User.query.filter(User.username.like("loadtenant%")).count() == 0
@@ -0,0 +1,149 @@
+import threading
+
+import pytest
+
+from app.services.login_lockout_service import (
+    STATUS_LOCKED,
+    STATUS_OK,
+    STATUS_THROTTLED,
+    InMemoryLockoutBackend,
+    LoginLockoutService,
+    RedisLockoutBackend,
+    _Subject,
+)
+
+
+def _account(threshold=3):
+    return _Subject("acct:window", "acct:lock", threshold, 3600)
+
+
+def _ip(threshold=3):
+    return _Subject("ip:window", "ip:lock", threshold, 0)
+
+
+def test_memory_backend_slides_window_and_locks_accounts():
+    backend = InMemoryLockoutBackend()
+    window_ms = 1_000
+
+    assert backend.record([_account()], 0, window_ms, "a") == [(STATUS_OK, 1)]
+    assert backend.record([_account()], 500, window_ms, "b") == [(STATUS_OK, 2)]
+    # The first failure slides out before the third lands.
+    assert backend.record([_account()], 1_200, window_ms, "c") == [(STATUS_OK, 2)]
+    assert backend.record([_account()], 1_300, window_ms, "d") == [(STATUS_LOCKED, 3)]
+
+    # The account lock outlives the window until it is cleared.
+    assert backend.check([_account()], 10_000, window_ms)[0][0] == STATUS_LOCKED
+    backend.clear(["acct:window", "acct:lock"])
+    assert backend.check([_account()], 10_000, window_ms) == [(STATUS_OK, 0)]
+
+
+def test_memory_backend_throttles_ip_until_failures_expire():
+    backend = InMemoryLockoutBackend()
+    window_ms = 1_000
+    for now in (0, 100):
+        backend.record([_ip()], now, window_ms, str(now))
+    assert backend.record([_ip()], 200, window_ms, "x") == [(STATUS_THROTTLED, 3)]
+    assert backend.check([_ip()], 900, window_ms) == [(STATUS_THROTTLED, 3)]
+    assert backend.check([_ip()], 1_050, window_ms) == [(STATUS_OK, 2)]
+
+
+def test_memory_backend_counts_every_concurrent_failure():
+    backend = InMemoryLockoutBackend()
+    subject = _Subject("busy:window", "busy:lock", 10_000_000, 0)
+
+    def worker(offset):
+        for i in range(200):
+            backend.record([subject], 1_000, 60_000, f"{offset}:{i}")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert backend.check([subject], 1_000, 60_000) == [(STATUS_OK, 1_600)]
+
+
+class _FakeRedis:
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+
+    def eval(self, script, numkeys, *args):
+        self.calls.append((script, numkeys, args))
+        return self.reply
+
+
+def test_redis_backend_sends_all_subjects_in_one_eval():
+    client = _FakeRedis([2, 3, 1, 7])
+    backend = RedisLockoutBackend(client)
+
+    results = backend.record([_account(), _ip(5)], 1_000, 900_000, "m")
+
+    assert results == [(STATUS_LOCKED, 3), (STATUS_THROTTLED, 7)]
+    assert len(client.calls) == 1
+    _script, numkeys, args = client.calls[0]
+    assert numkeys == 4
+    assert args == (
+        "acct:window",
+        "acct:lock",
+        "ip:window",
+        "ip:lock",
+        1_000,
+        900_000,
+        "m",
+        3,
+        3600,
+        5,
+        0,
+    )
+
+
+@pytest.mark.usefixtures("app")
+def test_service_locks_account_and_throttles_ip_separately(app):
+    app.config["AUTH_LOGIN_LOCKOUT_THRESHOLD"] = 3
+    app.config["AUTH_LOGIN_IP_LOCKOUT_THRESHOLD"] = 5
+
+    with app.app_context():
+        assert isinstance(LoginLockoutService.backend(), InMemoryLockoutBackend)
+        for _ in range(2):
+            state = LoginLockoutService.record_failure(
+                user_id=41, identifier="victim", ip="203.0.113.9"
+            )
+            assert not state.locked
+        state = LoginLockoutService.record_failure(
+            user_id=41, identifier="victim", ip="203.0.113.9"
+        )
+        assert state.locked and state.requires_password_reset
+
+        # Spraying other accounts from the same IP trips the IP throttle.
+        LoginLockoutService.record_failure(identifier="other-1", ip="203.0.113.9")
+        state = LoginLockoutService.record_failure(
+            identifier="other-2", ip="203.0.113.9"
+        )
+        assert state.locked and not state.requires_password_reset
+        assert not LoginLockoutService.is_locked(
+            identifier="other-3", ip="198.51.100.1"
+        ).locked
+
+        LoginLockoutService.clear_failures(user_id=41, identifiers=["victim"])
+        assert not LoginLockoutService.is_locked(user_id=41).locked
+
+
+@pytest.mark.usefixtures("app")
+def test_service_honours_and_clears_v1_password_reset_locks(app):
+    from app.utils.cache_manager import app_cache
+
+    with app.app_context():
+        legacy_key = "login_lockout:v1:user:77"
+        app_cache.set(
+            legacy_key,
+            {"count": 10, "window_started_at": 0, "requires_password_reset": True},
+            ttl=600,
+        )
+
+        assert LoginLockoutService.is_locked(user_id=77).requires_password_reset
+        assert LoginLockoutService.record_failure(user_id=77).requires_password_reset
+
+        LoginLockoutService.clear_failures(user_id=77)
+        assert app_cache.get(legacy_key) is None
+        assert not LoginLockoutService.is_locked(user_id=77).locked
@@ -358,6 +358,46 @@ def test_redis_probe_hot_path_blocks_high_confidence_probe_immediately(
     assert blocked_response.status_code == 403
 
 
+def test_probe_gate_skips_strike_write_for_cached_block_and_expires_login_cookies(
+    app, monkeypatch
+):
+    from app.services.public_bot_trap_service import PublicBotTrapService
+
+    client = app.test_client()
+    now_ref = {"value": datetime(2026, 2, 20, 12, 0, tzinfo=timezone.utc)}
+    fake_redis = _FakeRedis(lambda: now_ref["value"])
+    monkeypatch.setattr(
+        PublicBotTrapService,
+        "_redis_client",
+        classmethod(lambda cls: fake_redis),
+    )
+    monkeypatch.setattr(
+        PublicBotTrapService,
+        "_utcnow",
+        staticmethod(lambda: now_ref["value"]),
+    )
+    app.config["BOT_TRAP_IP_BLOCK_SECONDS"] = 60
+    original_record_hit = PublicBotTrapService.record_hit.__func__
+    hits = []
+
+    def _counting_record_hit(cls, *args, **kwargs):
+        hits.append(kwargs.get("source"))
+        return original_record_hit(cls, *args, **kwargs)
+
+    monkeypatch.setattr(PublicBotTrapService, "record_hit", classmethod(_counting_record_hit))
+
+    client.set_cookie("session", "signed-in")
+    client.set_cookie("remember_token", "remembered")
+    first = client.get("/wp-admin/setup-config.php", follow_redirects=False)
+    second = client.get("/.env", follow_redirects=False)
+
+    assert (first.status_code, second.status_code) == (403, 403)
+    assert hits == ["middleware_early_path_block"]
+    expired = first.headers.getlist("Set-Cookie")
+    assert any(c.startswith("session=;") and "Expires=Thu, 01 Jan 1970" in c for c in expired)
+    assert any(c.startswith("remember_token=;") for c in expired)
+
+
 def test_redis_temporary_block_ttl_unblocks_even_if_db_row_is_missing(app, monkeypatch):
     from app.extensions import db
     from app.models.public_bot_trap import BotTrapIpState
@@ -479,3 +519,66 @@ def test_bot_trap_hit_audit_logging_is_disabled_by_default(app):
 
     with app.app_context():
         assert BotTrapHit.query.count() == 0
+
+
+def _legacy_probe_match(path, prefixes, tokens, suffixes):
+    normalized = (path or "").strip().lower()
+    if not normalized or normalized == "/":
+        return False
+    if any(normalized.startswith(prefix) for prefix in prefixes):
+        return True
+    if any(token in normalized for token in tokens):
+        return True
+    last_segment = normalized.rsplit("/", 1)[-1]
+    return any(last_segment.endswith(suffix) for suffix in suffixes)
+
+
+def test_compiled_probe_rules_match_legacy_scans():
+    from app.services.middleware_probe_service import MiddlewareProbeService as M
+    from tests.benchmarks.support import scanner_probe_corpus
+
+    corpus = scanner_probe_corpus(3000) + [
+        "",
+        "/",
+        " /WP-LOGIN.PHP ",
+        "/a/b.php/",
+        "/static/x.env",
+        "/recipes/secret-sauce",
+        "/" + "a" * 400 + ".php",
+    ]
+    for path in corpus:
+        expected = (
+            _legacy_probe_match(
+                path,
+                M.SUSPICIOUS_UNKNOWN_PATH_PREFIXES,
+                M.SUSPICIOUS_UNKNOWN_PATH_TOKENS,
+                M.SUSPICIOUS_UNKNOWN_PATH_SUFFIXES,
+            ),
+            _legacy_probe_match(
+                path,
+                M.HIGH_CONFIDENCE_PATH_PREFIXES,
+                M.HIGH_CONFIDENCE_PATH_TOKENS,
+                M.HIGH_CONFIDENCE_PATH_SUFFIXES,
+            ),
+        )
+        assert M.classify_path(path) == expected, path
+
+
+def test_probe_gate_blocks_without_loading_the_session(app, monkeypatch):
+    client = app.test_client()
+
+    def _fail_open_session(*_args, **_kwargs):
+        raise AssertionError("probe gate should answer before the session opens")
+
+    monkeypatch.setattr(app.session_interface, "open_session", _fail_open_session)
+
+    response = client.get(
+        "/wp-login.php", headers={"Accept": "application/json"}, follow_redirects=False
+    )
+
+    assert response.status_code == 403
+    assert response.get_json() == {"error": "Access blocked"}
+    with app.app_context():
+        from app.models.public_bot_trap import BotTrapIpState
+
+        assert BotTrapIpState.query.filter_by(ip="127.0.0.1").first() is not None
@@ -1,4 +1,28 @@
+from unittest.mock import patch
+
 from bs4 import BeautifulSoup
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.feature_flag import FeatureFlag
+from app.models.subscription_tier import SubscriptionTier
+from app.services.public_pricing_page_service import PublicPricingPageService
+from app.services.signup_plan_catalog_service import SignupPlanCatalogService
+
+# The bot-trap IP check runs on every public request (Redis is off in tests);
+# it is the only query a snapshot-served pricing view may run.
+_PER_REQUEST_TABLES = ("bot_trap_ip_state",)
+
+
+def _count_queries():
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _record)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", _record)
 
 
 def test_pricing_page_uses_lightweight_shell_without_heavy_assets(app):
@@ -61,3 +85,112 @@ def test_pricing_comparison_section_rows_use_data_cells(app):
     for row in section_rows:
         assert row.find("th") is None
         assert row.find("td") is not None
+
+
+def test_pricing_catalog_is_served_from_snapshot_until_tiers_change(app):
+    with app.app_context():
+        tier = SubscriptionTier(
+            name="Snapshot Pro",
+            user_limit=25,
+            is_customer_facing=True,
+            billing_provider="stripe",
+            marketing_tagline="Snapshot tagline before",
+        )
+        db.session.add(tier)
+        db.session.commit()
+        tier_id = tier.id
+
+    client = app.test_client()
+    assert "Snapshot tagline before" in client.get("/pricing").get_data(as_text=True)
+
+    with app.app_context():
+        statements, stop = _count_queries()
+        try:
+            response = client.get("/pricing")
+        finally:
+            stop()
+    assert response.status_code == 200
+    assert "Snapshot tagline before" in response.get_data(as_text=True)
+    remaining = [
+        sql for sql in statements if not any(t in sql.lower() for t in _PER_REQUEST_TABLES)
+    ]
+    assert remaining == []
+
+    with app.app_context():
+        db.session.get(SubscriptionTier, tier_id).marketing_tagline = (
+            "Snapshot tagline after"
+        )
+        db.session.commit()
+
+    html = client.get("/pricing").get_data(as_text=True)
+    assert "Snapshot tagline after" in html
+    assert "Snapshot tagline before" not in html
+
+
+def test_pricing_free_tier_variant_follows_feature_flag(app):
+    client = app.test_client()
+    assert "Test Tier" not in client.get("/pricing").get_data(as_text=True)
+
+    with app.app_context():
+        flag = FeatureFlag.query.filter_by(key="FEATURE_PRICING_SIGNUP_FREE_TIER").first()
+        if flag is None:
+            db.session.add(
+                FeatureFlag(key="FEATURE_PRICING_SIGNUP_FREE_TIER", enabled=True)
+            )
+        else:
+            flag.enabled = True
+        db.session.commit()
+
+    assert "Test Tier" in client.get("/pricing").get_data(as_text=True)
+
+
+def test_pricing_serves_previous_snapshot_while_a_rebuild_is_in_flight(app):
+    with app.app_context():
+        tier = SubscriptionTier(
+            name="Rebuild Pro",
+            user_limit=30,
+            is_customer_facing=True,
+            billing_provider="stripe",
+            marketing_tagline="Rebuild tagline before",
+        )
+        db.session.add(tier)
+        db.session.commit()
+        tier_id = tier.id
+
+    client = app.test_client()
+    assert "Rebuild tagline before" in client.get("/pricing").get_data(as_text=True)
+
+    with app.app_context():
+        db.session.get(SubscriptionTier, tier_id).marketing_tagline = "Rebuild tagline after"
+        db.session.commit()
+        # Another worker thread holds the rebuild for this variant.
+        assert PublicPricingPageService._claim_build("paid_only")
+
+    html = client.get("/pricing").get_data(as_text=True)
+    assert "Rebuild tagline before" in html
+
+    with app.app_context():
+        PublicPricingPageService._release_build("paid_only")
+    assert "Rebuild tagline after" in client.get("/pricing").get_data(as_text=True)
+
+
+def test_signup_plan_catalog_snapshot_builds_each_tier_once_per_version(app):
+    with app.app_context():
+        tiers = SubscriptionTier.query.filter_by(is_customer_facing=True).all()
+        assert tiers
+        build = SignupPlanCatalogService.build_available_tiers_payload
+        with patch.object(
+            SignupPlanCatalogService,
+            "build_available_tiers_payload",
+            side_effect=build,
+        ) as mock_build:
+            first = SignupPlanCatalogService.snapshot_available_tiers_payload(tiers)
+            again = SignupPlanCatalogService.snapshot_available_tiers_payload(tiers[:1])
+            assert mock_build.call_count == 1
+            assert again[str(tiers[0].id)] is first[str(tiers[0].id)]
+
+            tiers[0].marketing_tagline = "Snapshot invalidated"
+            db.session.commit()
+            rebuilt = SignupPlanCatalogService.snapshot_available_tiers_payload(tiers[:1])
+            assert mock_build.call_count == 2
+            assert rebuilt[str(tiers[0].id)]["marketing_tagline"] == "Snapshot invalidated"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 from app.services import public_media_service
@@ -94,3 +95,99 @@ def test_build_media_signature_uses_youtube_embed_url():
     )
     assert "hero:youtube:https://www.youtube.com/embed/dQw4w9WgXcQ?rel=0" in signature
     assert "final-cta:video:images/homepage/final.mp4" in signature
+
+
+def _png_bytes(width: int, height: int) -> bytes:
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + b"\x00\x00\x00\rIHDR"
+        + width.to_bytes(4, "big")
+        + height.to_bytes(4, "big")
+        + b"\x08\x06\x00\x00\x00"
+    )
+
+
+def test_media_manifest_entries_carry_version_dimensions_and_variants(app, tmp_path):
+    static_root = tmp_path / "static"
+    folder = static_root / "images" / "homepage" / "hero" / "primary"
+    _write_bytes(folder / "hero.png", _png_bytes(1200, 630))
+    _write_bytes(folder / "hero.webp", b"RIFF\x00\x00\x00\x00WEBPVP8X" + b"\x00" * 14)
+
+    app.static_folder = str(static_root)
+    with app.app_context():
+        public_media_service.reset_media_manifest()
+        resolved = public_media_service.resolve_first_media_from_folder(
+            "images/homepage/hero/primary"
+        )
+
+    assert resolved["path"] == "images/homepage/hero/primary/hero.png"
+    assert (resolved["width"], resolved["height"]) == (1200, 630)
+    assert resolved["size"] == len(_png_bytes(1200, 630))
+    assert len(resolved["version"]) == 12
+    assert resolved["variants"] == {"webp": "images/homepage/hero/primary/hero.webp"}
+
+
+def test_media_manifest_serves_from_memory_until_folder_mtime_changes(
+    app, tmp_path, monkeypatch
+):
+    static_root = tmp_path / "static"
+    folder = static_root / "images" / "help" / "recipes"
+    _write_bytes(folder / "b.png", _png_bytes(10, 10))
+
+    scans = []
+    real_scan = public_media_service._scan_folder
+
+    def counting_scan(root, relative_folder):
+        scans.append(relative_folder)
+        return real_scan(root, relative_folder)
+
+    monkeypatch.setattr(public_media_service, "_scan_folder", counting_scan)
+    app.static_folder = str(static_root)
+    app.config["PUBLIC_MEDIA_MANIFEST_TTL"] = 0
+    with app.app_context():
+        public_media_service.reset_media_manifest()
+        first = public_media_service.resolve_media_list_from_folder("images/help/recipes")
+        again = public_media_service.resolve_media_list_from_folder("images/help/recipes")
+        assert scans == ["images/help/recipes"]
+        assert [m["path"] for m in first] == [m["path"] for m in again]
+
+        _write_bytes(folder / "a.png", _png_bytes(20, 20))
+        os.utime(folder, ns=(folder.stat().st_atime_ns, folder.stat().st_mtime_ns + 10**9))
+        refreshed = public_media_service.resolve_media_list_from_folder("images/help/recipes")
+
+    assert len(scans) == 2
+    assert [m["path"].rsplit("/", 1)[-1] for m in refreshed] == ["a.png", "b.png"]
+
+
+def test_rebuilt_media_manifest_versions_static_urls_as_immutable(app, tmp_path):
+    static_root = tmp_path / "static"
+    folder = static_root / "images" / "homepage" / "features" / "recipe-tracking"
+    _write_bytes(folder / "card.png", _png_bytes(64, 48))
+
+    app.static_folder = str(static_root)
+    with app.app_context():
+        public_media_service.reset_media_manifest()
+        manifest_path = public_media_service.write_media_manifest()
+        public_media_service.reset_media_manifest()
+        version = public_media_service.get_media_version(
+            "images/homepage/features/recipe-tracking/card.png"
+        )
+        with app.test_request_context():
+            from app.template_context import static_asset_url
+
+            url = static_asset_url("images/homepage/features/recipe-tracking/card.png")
+
+    assert manifest_path.is_file()
+    assert version and url.endswith(f"?v={version}")
+
+    client = app.test_client()
+    response = client.get(url)
+    assert response.status_code == 200
+    assert "immutable" in response.headers["Cache-Control"]
+    assert response.headers["ETag"] == f'"{version}"'
+
+    revalidated = client.get(url, headers={"If-None-Match": f'"{version}"'})
+    assert revalidated.status_code == 304
+
+    unversioned = client.get("/static/images/homepage/features/recipe-tracking/card.png")
+    assert "immutable" not in (unversioned.headers.get("Cache-Control") or "")
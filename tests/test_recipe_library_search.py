@@ -0,0 +1,163 @@
+import pytest
+
+from app.extensions import db
+from app.models import Organization, ProductCategory, Recipe
+from app.services.recipe_library_search_service import (
+    LibrarySearchFilters,
+    RecipeLibrarySearchService,
+)
+
+
+def _category(name: str, portioned: bool) -> ProductCategory:
+    category = ProductCategory.query.filter_by(name=name).first()
+    if category is None:
+        category = ProductCategory(name=name, is_typically_portioned=portioned)
+        db.session.add(category)
+        db.session.commit()
+    return category
+
+
+def _listed(org, name, category, *, description="", downloads=0):
+    recipe = Recipe(
+        name=name,
+        organization_id=org.id,
+        category_id=category.id,
+        public_description=description,
+        is_public=True,
+        status="published",
+        marketplace_status="listed",
+        is_current=True,
+        download_count=downloads,
+    )
+    db.session.add(recipe)
+    db.session.commit()
+    return recipe
+
+
+@pytest.fixture
+def fts_index(app_context):
+    assert RecipeLibrarySearchService.create_sqlite_index() is True
+
+
+@pytest.mark.usefixtures("app_context", "fts_index")
+def test_library_search_ranks_matches_and_counts_facets():
+    org = Organization.query.first()
+    soap = _category("Library Soap", portioned=True)
+    candle = _category("Library Candle", portioned=False)
+
+    _listed(org, "Lavender Soap", soap, description="Calming lavender bar")
+    _listed(org, "Oatmeal Soap", soap, description="Gentle bar with a hint of lavender")
+    lavender_candle = _listed(org, "Lavender Candle", candle, description="Soy candle")
+    _listed(org, "Cedar Candle", candle, description="Woodsy")
+    hidden = _listed(org, "Lavender Draft", soap)
+    hidden.is_public = False
+    db.session.commit()
+
+    page = RecipeLibrarySearchService.search(LibrarySearchFilters(search="lavender"))
+
+    names = [recipe.name for recipe in page.recipes]
+    assert page.sort == "relevance"
+    assert set(names) == {"Lavender Soap", "Oatmeal Soap", "Lavender Candle"}
+    assert names[-1] == "Oatmeal Soap"  # name hits outrank description-only hits
+    assert page.total == 3
+    assert page.category_counts == {soap.id: 2, candle.id: 1}
+    assert page.product_type_counts == {"portioned": 2, "bulk": 1}
+
+    # Prefix matching and multi-token narrowing.
+    narrowed = RecipeLibrarySearchService.search(
+        LibrarySearchFilters(search="laven cand")
+    )
+    assert [recipe.id for recipe in narrowed.recipes] == [lavender_candle.id]
+
+    # Category facet stays disjunctive: counts ignore the active category filter.
+    filtered = RecipeLibrarySearchService.search(
+        LibrarySearchFilters(search="lavender", category_id=candle.id)
+    )
+    assert [recipe.name for recipe in filtered.recipes] == ["Lavender Candle"]
+    assert filtered.category_counts == {soap.id: 2, candle.id: 1}
+    assert filtered.product_type_counts == {"portioned": 0, "bulk": 1}
+
+
+@pytest.mark.usefixtures("app_context", "fts_index")
+def test_library_search_keyset_pagination_walks_all_rows_once():
+    org = Organization.query.first()
+    soap = _category("Library Soap", portioned=True)
+    created = [
+        _listed(org, f"Batch Soap {idx}", soap, downloads=idx % 3) for idx in range(7)
+    ]
+
+    seen: list[int] = []
+    cursor = None
+    for _ in range(10):
+        page = RecipeLibrarySearchService.search(
+            LibrarySearchFilters(), sort="downloads", cursor=cursor, limit=3
+        )
+        seen.extend(recipe.id for recipe in page.recipes)
+        assert page.total == 7
+        cursor = page.next_cursor
+        if not cursor:
+            break
+
+    assert sorted(seen) == sorted(recipe.id for recipe in created)
+    assert len(seen) == len(set(seen))
+    downloads = [db.session.get(Recipe, rid).download_count for rid in seen]
+    assert downloads == sorted(downloads, reverse=True)
+
+
+@pytest.mark.usefixtures("app_context", "fts_index")
+def test_library_search_fts_index_tracks_recipe_edits():
+    org = Organization.query.first()
+    soap = _category("Library Soap", portioned=True)
+    recipe = _listed(org, "Rose Soap", soap)
+
+    assert RecipeLibrarySearchService.search(
+        LibrarySearchFilters(search="rose")
+    ).recipes == [recipe]
+
+    recipe.name = "Peony Soap"
+    db.session.commit()
+
+    assert RecipeLibrarySearchService.search(
+        LibrarySearchFilters(search="rose")
+    ).recipes == []
+    assert RecipeLibrarySearchService.search(
+        LibrarySearchFilters(search="peony")
+    ).recipes == [recipe]
+
+
+@pytest.mark.usefixtures("app_context")
+def test_library_search_never_builds_the_fts_index():
+    org = Organization.query.first()
+    recipe = _listed(org, "Rose Soap", _category("Library Soap", portioned=True))
+
+    page = RecipeLibrarySearchService.search(LibrarySearchFilters(search="rose"))
+
+    assert page.backend == "like"
+    assert page.recipes == [recipe]
+    assert RecipeLibrarySearchService.sqlite_index_ready() is False
+
+
+def test_recipe_library_route_renders_ranked_page_with_cursor(app):
+    from app.models.feature_flag import FeatureFlag
+
+    with app.app_context():
+        db.session.add(FeatureFlag(key="FEATURE_RECIPE_MARKETPLACE_DISPLAY", enabled=True))
+        org = Organization.query.first()
+        soap = _category("Library Soap", portioned=True)
+        for idx in range(3):
+            _listed(org, f"Honey Soap {idx}", soap)
+        next_cursor = RecipeLibrarySearchService.search(
+            LibrarySearchFilters(search="honey"), limit=2
+        ).next_cursor
+
+    client = app.test_client()
+    response = client.get("/recipes/library", query_string={"search": "honey"})
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert "Honey Soap" in html
+    assert "Best match" in html
+
+    follow_up = client.get(
+        "/recipes/library", query_string={"search": "honey", "after": next_cursor}
+    )
+    assert follow_up.status_code == 200
@@ -82,3 +82,170 @@ def test_proportionality_detects_ratio_changes():
     assert not RecipeProportionalityService.are_recipes_proportionally_identical(
         base, changed
     )
+
+
+def _make_recipe(org, name, lines):
+    from app.models import Recipe, RecipeIngredient
+
+    recipe = Recipe(name=name, organization_id=org.id)
+    db.session.add(recipe)
+    db.session.flush()
+    for item, quantity in lines:
+        db.session.add(
+            RecipeIngredient(
+                recipe_id=recipe.id,
+                inventory_item_id=item.id,
+                quantity=quantity,
+                unit="gram",
+            )
+        )
+    db.session.commit()
+    return recipe
+
+
+@pytest.mark.usefixtures("app_context")
+def test_fingerprint_index_finds_scaled_duplicates_only():
+    _ensure_unit("gram", "weight", 1.0, None)
+    _ensure_unit("ounce", "weight", 28.3495, "gram")
+
+    org = Organization.query.first()
+    sugar = InventoryItem(
+        name="Fingerprint Sugar", unit="gram", type="ingredient", quantity=0.0,
+        organization_id=org.id,
+    )
+    oil = InventoryItem(
+        name="Fingerprint Oil", unit="gram", type="ingredient", quantity=0.0,
+        organization_id=org.id,
+    )
+    db.session.add_all([sugar, oil])
+    db.session.commit()
+
+    same = _make_recipe(org, "Base", [(sugar, 30.0), (oil, 70.0)])
+    different = _make_recipe(org, "Other", [(sugar, 40.0), (oil, 60.0)])
+    assert (
+        RecipeProportionalityService.ensure_fingerprints(organization_id=org.id) == 2
+    )
+
+    payload = [
+        {"item_id": sugar.id, "quantity": 300.0 / 28.3495, "unit": "ounce"},
+        {"item_id": oil.id, "quantity": 700.0, "unit": "gram"},
+    ]
+    matches = RecipeProportionalityService.find_proportional_matches(
+        payload, organization_id=org.id
+    )
+    assert matches == [same.id]
+    assert different.id not in matches
+
+    # Already-current rows are skipped by the incremental backfill.
+    assert RecipeProportionalityService.ensure_fingerprints(organization_id=org.id) == 0
+
+
+@pytest.mark.usefixtures("app_context")
+def test_bucket_probe_covers_grid_boundaries():
+    resolution = RecipeProportionalityService.BUCKET_RESOLUTION
+    boundary = resolution * 40.5  # exactly between two buckets
+    probes = RecipeProportionalityService._bucket_probe_keys(
+        {"a": boundary, "b": 1 - boundary}, 0.0001
+    )
+    below = RecipeProportionalityService._fingerprint_from_signature(
+        _signature({"a": boundary - 0.00005, "b": 1 - boundary + 0.00005})
+    )
+    above = RecipeProportionalityService._fingerprint_from_signature(
+        _signature({"a": boundary + 0.00005, "b": 1 - boundary - 0.00005})
+    )
+    assert below.ratio_bucket_hash != above.ratio_bucket_hash
+    assert below.ratio_bucket_hash in probes
+    assert above.ratio_bucket_hash in probes
+
+    # Tolerances wider than the grid fall back to the ingredient-set block.
+    assert (
+        RecipeProportionalityService._bucket_probe_keys({"a": 0.5, "b": 0.5}, 0.01)
+        is None
+    )
+
+
+@pytest.mark.usefixtures("app_context")
+def test_group_proportional_duplicates_clusters_within_set_blocks():
+    _ensure_unit("gram", "weight", 1.0, None)
+
+    org = Organization.query.first()
+    butter = InventoryItem(
+        name="Group Butter", unit="gram", type="ingredient", quantity=0.0,
+        organization_id=org.id,
+    )
+    wax = InventoryItem(
+        name="Group Wax", unit="gram", type="ingredient", quantity=0.0,
+        organization_id=org.id,
+    )
+    db.session.add_all([butter, wax])
+    db.session.commit()
+
+    first = _make_recipe(org, "Balm A", [(butter, 50.0), (wax, 50.0)])
+    second = _make_recipe(org, "Balm B", [(butter, 5.0), (wax, 5.0)])
+    _make_recipe(org, "Balm C", [(butter, 80.0), (wax, 20.0)])
+    _make_recipe(org, "Butter Only", [(butter, 10.0)])
+    RecipeProportionalityService.ensure_fingerprints(organization_id=org.id)
+
+    groups = RecipeProportionalityService.group_proportional_duplicates(
+        organization_id=org.id
+    )
+    assert groups == [[first.id, second.id]]
+
+
+@pytest.mark.usefixtures("app_context")
+def test_item_link_marks_fingerprints_stale_and_validator_backfill_does_not_commit():
+    from app.models import GlobalItem
+    from app.models.recipe_fingerprint import (
+        STALE_FINGERPRINT_VERSION,
+        RecipeFingerprint,
+    )
+
+    _ensure_unit("gram", "weight", 1.0, None)
+
+    org = Organization.query.first()
+    lye = InventoryItem(
+        name="Stale Lye", unit="gram", type="ingredient", quantity=0.0,
+        organization_id=org.id,
+    )
+    water = InventoryItem(
+        name="Stale Water", unit="gram", type="ingredient", quantity=0.0,
+        organization_id=org.id,
+    )
+    global_lye = GlobalItem(name="Stale Global Lye", item_type="ingredient")
+    db.session.add_all([lye, water, global_lye])
+    db.session.commit()
+    recipe = _make_recipe(org, "Lye Solution", [(lye, 30.0), (water, 70.0)])
+    RecipeProportionalityService.ensure_fingerprints(organization_id=org.id)
+    row = RecipeFingerprint.query.filter_by(recipe_id=recipe.id).one()
+    unlinked_hash = row.ingredient_set_hash
+
+    lye.global_item_id = global_lye.id
+    db.session.commit()
+    db.session.refresh(row)
+    assert row.fingerprint_version == STALE_FINGERPRINT_VERSION
+
+    assert (
+        RecipeProportionalityService.ensure_fingerprints(
+            organization_id=org.id, commit=False
+        )
+        == 1
+    )
+    db.session.rollback()
+    db.session.refresh(row)
+    assert row.fingerprint_version == STALE_FINGERPRINT_VERSION
+
+    RecipeProportionalityService.ensure_fingerprints(organization_id=org.id)
+    db.session.refresh(row)
+    assert row.fingerprint_version == RecipeProportionalityService.FINGERPRINT_VERSION
+    assert row.ingredient_set_hash != unlinked_hash
+
+    water.density = 1.0
+    db.session.commit()
+    db.session.refresh(row)
+    assert row.fingerprint_version == STALE_FINGERPRINT_VERSION
+
+
+def _signature(proportions):
+    from app.services.recipe_proportionality_service import _RecipeSignature
+
+    return _RecipeSignature(totals=dict(proportions), proportions=dict(proportions))
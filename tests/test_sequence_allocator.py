@@ -0,0 +1,175 @@
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from app.extensions import db
+from app.models import InventoryItem, Organization, UnifiedInventoryHistory
+from app.models.batch import BatchSequence
+from app.models.inventory_lot import InventoryCodeSequence
+from app.services.inventory_adjustment._fifo_ops import (
+    create_new_fifo_lot,
+    deduct_fifo_inventory,
+)
+from app.services.sequence_allocator import SequenceAllocator
+from app.utils.code_generator import BATCH_LABEL_COUNTER
+from app.utils.inventory_event_code_generator import (
+    generate_inventory_event_code,
+    generate_inventory_event_codes,
+    parse_inventory_code,
+    validate_inventory_code,
+)
+from tests.test_inventory_costing_toggle import _enable_quantity_tracking_for_org
+
+
+def _count_counter_writes(func):
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "_sequence" in statement and statement.lstrip().upper().startswith("INSERT"):
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    return result, len(statements)
+
+
+def _org(name: str) -> int:
+    org = Organization(name=name)
+    db.session.add(org)
+    db.session.commit()
+    return org.id
+
+
+def test_inventory_codes_come_from_reserved_blocks(app):
+    with app.app_context():
+        app.config["INVENTORY_CODE_SEQUENCE_BLOCK_SIZE"] = 50
+        org_id = _org("Sequence Org")
+
+        codes, writes = _count_counter_writes(
+            lambda: generate_inventory_event_codes("sale", 30, organization_id=org_id)
+            + [
+                generate_inventory_event_code("sale", organization_id=org_id)
+                for _ in range(30)
+            ]
+        )
+        lot_code = generate_inventory_event_code(
+            "restock", organization_id=org_id, code_type="lot"
+        )
+        db.session.commit()
+        counters = {
+            row.prefix: row.current_value
+            for row in InventoryCodeSequence.query.filter_by(organization_id=org_id)
+        }
+
+    assert writes == 2
+    assert len(set(codes)) == 60
+    assert codes[0] == f"SLD-{org_id}-00001"
+    assert codes[-1] == f"SLD-{org_id}-0001O"  # 60 in base36
+    assert lot_code == f"LOT-{org_id}-00001"
+    assert parse_inventory_code(lot_code)["is_lot"] is True
+    assert validate_inventory_code(codes[0])
+    assert counters == {"SLD": 100, "LOT": 50}
+
+
+def test_rolled_back_block_is_not_reused(app):
+    with app.app_context():
+        org_id = _org("Rollback Org")
+        first = SequenceAllocator.next_value(BATCH_LABEL_COUNTER, org_id, 2030)
+        db.session.rollback()
+        again = SequenceAllocator.next_value(BATCH_LABEL_COUNTER, org_id, 2030)
+        db.session.commit()
+        following = SequenceAllocator.next_value(BATCH_LABEL_COUNTER, org_id, 2030)
+        db.session.commit()
+        stored = BatchSequence.query.filter_by(organization_id=org_id, year=2030).one()
+
+    assert (first, again, following) == (1, 1, 2)
+    assert stored.current_sequence == 2
+
+
+def test_failed_block_reservation_falls_back_without_breaking_the_transaction(app):
+    def _fail(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO INVENTORY_CODE_SEQUENCE"):
+            raise OperationalError(statement, parameters, Exception("counter unavailable"))
+
+    with app.app_context():
+        org_id = _org("Savepoint Org")
+        db.session.add(Organization(name="Savepoint Pending Org"))
+        db.session.flush()
+
+        event.listen(db.engine, "before_cursor_execute", _fail)
+        try:
+            code = generate_inventory_event_code("use", organization_id=org_id)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _fail)
+        db.session.commit()
+        kept = Organization.query.filter_by(name="Savepoint Pending Org").count()
+
+    assert code.startswith("USE-") and code.count("-") == 1
+    assert kept == 1
+
+
+def test_batch_label_blocks_reserve_once_per_block(app):
+    with app.app_context():
+        app.config["BATCH_LABEL_SEQUENCE_BLOCK_SIZE"] = 10
+        org_id = _org("Label Block Org")
+
+        values, writes = _count_counter_writes(
+            lambda: [
+                SequenceAllocator.next_value(BATCH_LABEL_COUNTER, org_id, 2031)
+                for _ in range(3)
+            ]
+        )
+        db.session.commit()
+        stored = BatchSequence.query.filter_by(organization_id=org_id, year=2031).one()
+
+    assert values == [1, 2, 3]
+    assert writes == 1
+    assert stored.current_sequence == 10
+
+
+def test_multi_lot_deduction_draws_its_event_codes_at_once(app):
+    with app.app_context():
+        app.config["INVENTORY_CODE_SEQUENCE_BLOCK_SIZE"] = 1
+        org = Organization(name="Deduct Sequence Org")
+        db.session.add(org)
+        db.session.flush()
+        _enable_quantity_tracking_for_org(db.session, org)
+        item = InventoryItem(
+            name="Sequenced Oil",
+            unit="gram",
+            quantity=0,
+            is_tracked=True,
+            organization_id=org.id,
+            type="ingredient",
+        )
+        db.session.add(item)
+        db.session.flush()
+        for _ in range(3):
+            created, message, _lot_id = create_new_fifo_lot(
+                item.id, 10, "restock", unit="gram"
+            )
+            assert created, message
+
+        (success, message), writes = _count_counter_writes(
+            lambda: deduct_fifo_inventory(item.id, 25, change_type="use")
+        )
+        codes = [
+            row.fifo_code
+            for row in UnifiedInventoryHistory.query.filter_by(
+                inventory_item_id=item.id, change_type="use"
+            ).order_by(UnifiedInventoryHistory.id)
+        ]
+        org_id = org.id
+
+    assert success, message
+    assert writes == 1
+    assert codes == [f"USE-{org_id}-0000{n}" for n in (1, 2, 3)]
+
+
+def test_codes_fall_back_to_random_suffix_outside_app_context():
+    code = generate_inventory_event_code("spoil", item_id=42)
+
+    assert code.startswith("SPL-")
+    assert code.count("-") == 1
@@ -0,0 +1,130 @@
+import math
+import random
+
+import pytest
+
+from app.services.tools.soap_tool import (
+    SoapToolComputationService,
+    SoapToolComputeRequest,
+    compute_batch_metrics,
+)
+from app.services.tools.soap_tool._additives import compute_additives
+from app.services.tools.soap_tool._core import _apply_citric_lye_adjustment
+from app.services.tools.soap_tool._lye_water import compute_lye_water
+from app.services.tools.soap_tool._quality_report import build_quality_report
+
+ACIDS = (
+    "lauric",
+    "myristic",
+    "palmitic",
+    "stearic",
+    "ricinoleic",
+    "oleic",
+    "linoleic",
+    "linolenic",
+    "capric",
+)
+
+OIL_POOL = [
+    {"name": "Olive", "sap_koh": 0.188, "iodine": 84, "fatty_profile": {"palmitic": 14, "stearic": 3, "oleic": 69, "linoleic": 12, "linolenic": 2}},
+    {"name": "Coconut", "sap_koh": 257, "iodine": 10, "fatty_profile": {"lauric": 48, "myristic": 19, "palmitic": 9, "stearic": 3, "oleic": 8, "linoleic": 2}},
+    {"name": "Castor", "sap_koh": 180, "iodine": 86, "fatty_profile": {"ricinoleic": 90, "oleic": 4, "linoleic": 4}},
+    {"name": "Mystery", "sap_koh": 0, "iodine": 0, "fatty_profile": {}},
+]
+
+
+def _random_oil(rng: random.Random) -> dict:
+    if rng.random() < 0.5:
+        oil = dict(rng.choice(OIL_POOL))
+    else:
+        oil = {
+            "name": "Random",
+            "sap_koh": rng.choice([0, rng.uniform(0.1, 0.3), rng.uniform(120, 300)]),
+            "iodine": rng.choice([0, rng.uniform(1, 180)]),
+            "fatty_profile": {
+                acid: rng.uniform(0, 60)
+                for acid in rng.sample(ACIDS, rng.randint(0, 5))
+            },
+        }
+    oil["grams"] = rng.choice([0, rng.uniform(1, 900), rng.uniform(1, 900)])
+    return oil
+
+
+def _random_payload(rng: random.Random) -> dict:
+    return {
+        "oils": [_random_oil(rng) for _ in range(rng.randint(0, 9))],
+        "additives": {"citric_pct": rng.choice([0, 0, rng.uniform(0, 5)])},
+        "lye": {
+            "selected": rng.choice(["NaOH", "KOH", "KOH90", "bogus"]),
+            "superfat": rng.uniform(-5, 25),
+            "purity": rng.uniform(85, 100),
+        },
+        "water": {
+            "method": rng.choice(["percent", "concentration", "ratio", "odd"]),
+            "water_pct": rng.choice([0, rng.uniform(20, 40)]),
+            "lye_concentration": rng.choice([0, rng.uniform(10, 60)]),
+            "water_ratio": rng.choice([0, rng.uniform(0.5, 5)]),
+        },
+    }
+
+
+def _scalar_metrics(payload: dict) -> dict:
+    request = SoapToolComputeRequest.from_payload(payload)
+    lye_water = compute_lye_water(request)
+    additives = compute_additives(
+        total_oils_g=lye_water["total_oils_g"],
+        lye_type=lye_water["lye_type"],
+        additive_settings=request.additives,
+        fragrances=request.fragrances,
+    )
+    lye_water = _apply_citric_lye_adjustment(lye_water, additives)
+    report = build_quality_report(
+        oils=request.oils,
+        total_oils=lye_water["total_oils_g"],
+        sap_avg=lye_water["sap_avg_koh"],
+        superfat=lye_water["superfat_pct"],
+        water_data=lye_water,
+        additives=additives,
+    )
+    return lye_water, report
+
+
+def _assert_same(expected, actual, path=""):
+    if isinstance(expected, dict):
+        assert set(expected) == set(actual), path
+        for key in expected:
+            _assert_same(expected[key], actual[key], f"{path}.{key}")
+    elif isinstance(expected, bool) or isinstance(expected, str):
+        assert expected == actual, path
+    else:
+        assert math.isclose(expected, actual, rel_tol=1e-9, abs_tol=1e-9), (
+            path,
+            expected,
+            actual,
+        )
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_batch_metrics_match_scalar_path(seed):
+    rng = random.Random(seed)
+    payloads = [_random_payload(rng) for _ in range(rng.randint(1, 12))]
+
+    batch = SoapToolComputationService.calculate_batch(payloads)
+
+    assert len(batch) == len(payloads)
+    for payload, actual in zip(payloads, batch):
+        lye_water, report = _scalar_metrics(payload)
+        quality = actual.pop("quality")
+        _assert_same(lye_water, actual)
+        _assert_same(
+            {key: report[key] for key in quality},
+            quality,
+        )
+
+
+def test_batch_metrics_handles_empty_inputs():
+    assert compute_batch_metrics([]) == []
+    (result,) = SoapToolComputationService.calculate_batch([None])
+    assert result["total_oils_g"] == 0.0
+    assert result["lye_adjusted_g"] == 0.0
+    assert result["quality"]["fatty_acids_pct"] == {}
@@ -0,0 +1,197 @@
+import random
+import time
+
+import numpy as np
+import pytest
+
+from app.services.tools.soap_tool import optimize_oil_blend
+from app.services.tools.soap_tool._optimizer import _project_to_bounded_simplex
+
+OLIVE = {
+    "name": "Olive Oil",
+    "fatty_profile": {"palmitic": 14, "stearic": 3, "oleic": 69, "linoleic": 12, "linolenic": 2},
+    "iodine": 84,
+    "cost_per_g": 0.010,
+}
+COCONUT = {
+    "name": "Coconut Oil 76",
+    "fatty_profile": {"lauric": 48, "myristic": 19, "palmitic": 9, "stearic": 3, "oleic": 8, "linoleic": 2},
+    "iodine": 10,
+    "cost_per_g": 0.006,
+}
+CASTOR = {
+    "name": "Castor Oil",
+    "fatty_profile": {"ricinoleic": 90, "oleic": 4, "linoleic": 4},
+    "iodine": 86,
+    "cost_per_g": 0.012,
+}
+SHEA = {
+    "name": "Shea Butter",
+    "fatty_profile": {"palmitic": 5, "stearic": 40, "oleic": 48, "linoleic": 6},
+    "iodine": 60,
+    "cost_per_g": 0.020,
+}
+PALM = {
+    "name": "Palm Oil",
+    "fatty_profile": {"myristic": 1, "palmitic": 44, "stearic": 5, "oleic": 39, "linoleic": 10},
+    "iodine": 53,
+    "cost_per_g": 0.004,
+}
+
+TARGET_RANGES = {
+    "hardness": [29, 54],
+    "cleansing": [12, 22],
+    "conditioning": [44, 69],
+    "bubbly": [14, 46],
+    "creamy": [16, 48],
+    "iodine": [41, 70],
+}
+
+
+def test_optimizer_meets_ranges_within_oil_limits():
+    result = optimize_oil_blend(
+        {
+            "oils": [OLIVE, COCONUT, dict(CASTOR, max_pct=5), SHEA, dict(PALM, max_pct=40)],
+            "targets": TARGET_RANGES,
+            "target_oils_g": 1000,
+        }
+    )
+
+    assert result["ok"] is True
+    assert result["solver"]["converged"] is True
+    assert all(status["met"] for status in result["targets"].values())
+    rows = {row["index"]: row for row in result["adjusted_rows"]}
+    assert sum(row["grams"] for row in rows.values()) == pytest.approx(1000)
+    assert rows[2]["pct"] <= 5 + 1e-6
+    assert rows[4]["pct"] <= 40 + 1e-6
+    expected_cost = sum(
+        rows[idx]["grams"] * oil["cost_per_g"]
+        for idx, oil in enumerate([OLIVE, COCONUT, CASTOR, SHEA, PALM])
+    )
+    assert result["total_cost"] == pytest.approx(expected_cost)
+
+
+def test_optimizer_prefers_cheaper_equivalent_oil():
+    cheap_olive = dict(OLIVE, name="Pomace Olive", cost_per_g=0.005)
+    result = optimize_oil_blend(
+        {
+            "oils": [OLIVE, cheap_olive, COCONUT],
+            "targets": {"cleansing": [12, 18], "conditioning": [60, 80]},
+        }
+    )
+
+    rows = {row["index"]: row for row in result["adjusted_rows"]}
+    assert rows[0]["pct"] == pytest.approx(0.0, abs=1e-3)
+    assert rows[1]["pct"] > 50
+    assert 12 - 0.05 <= result["predicted"]["cleansing"] <= 18 + 0.05
+
+
+def test_optimizer_returns_closest_blend_when_targets_unreachable():
+    result = optimize_oil_blend(
+        {
+            "oils": [OLIVE, CASTOR],
+            "targets": {"cleansing": {"min": 20}},
+        }
+    )
+
+    assert result["ok"] is True
+    assert result["targets"]["cleansing"]["met"] is False
+    assert any("cannot reach" in warning for warning in result["warnings"])
+
+
+def test_optimizer_rejects_impossible_oil_limits_and_missing_targets():
+    assert optimize_oil_blend({"oils": [OLIVE], "targets": {}})["ok"] is False
+    result = optimize_oil_blend(
+        {
+            "oils": [dict(OLIVE, max_pct=40), dict(COCONUT, max_pct=40)],
+            "targets": {"hardness": [30, 50]},
+        }
+    )
+    assert result["ok"] is False
+    assert "100%" in result["error"]
+
+
+def test_bounded_simplex_projection_keeps_every_bound():
+    lower = np.array([0.0, 0.1, 0.05])
+    upper = np.array([0.5, 0.35, 0.3])
+    # Clip-then-rescale would turn these into ~55.6% / 38.9% / 5.6%.
+    fractions = _project_to_bounded_simplex(np.array([0.9, 0.4, 0.0]), lower, upper)
+
+    assert (fractions >= lower).all() and (fractions <= upper).all()
+    assert fractions.sum() == pytest.approx(1.0, abs=1e-12)
+    assert fractions == pytest.approx([0.5, 0.35, 0.15], abs=1e-12)
+
+
+def test_optimizer_holds_oil_limits_when_targets_are_unreachable():
+    limits = [(20, 100), (0, 15), (0, 10), (0, 100)]
+    oils = [OLIVE, COCONUT, CASTOR, SHEA]
+    result = optimize_oil_blend(
+        {
+            "oils": [
+                dict(oil, min_pct=low, max_pct=high) for oil, (low, high) in zip(oils, limits)
+            ],
+            "targets": {"cleansing": {"min": 40}, "iodine": {"max": 30}},
+        }
+    )
+
+    assert result["ok"] is True
+    pcts = [row["pct"] for row in sorted(result["adjusted_rows"], key=lambda row: row["index"])]
+    assert sum(pcts) == pytest.approx(100.0, abs=1e-9)
+    for pct, (low, high) in zip(pcts, limits):
+        assert low - 1e-9 <= pct <= high + 1e-9
+    assert pcts[1] == pytest.approx(15.0, abs=1e-9)
+
+
+def test_optimizer_solves_thirty_candidates_quickly():
+    rng = random.Random(7)
+    oils = []
+    for _ in range(30):
+        base = rng.choice([OLIVE, COCONUT, CASTOR, SHEA, PALM])
+        oils.append(
+            dict(
+                base,
+                fatty_profile={
+                    key: value * rng.uniform(0.8, 1.2)
+                    for key, value in base["fatty_profile"].items()
+                },
+                cost_per_g=rng.uniform(0.003, 0.03),
+            )
+        )
+
+    started = time.perf_counter()
+    result = optimize_oil_blend({"oils": oils, "targets": TARGET_RANGES})
+    elapsed = time.perf_counter() - started
+
+    assert result["solver"]["converged"] is True
+    assert all(status["met"] for status in result["targets"].values())
+    assert elapsed < 0.5
+
+
+def test_public_soap_optimize_blend_api_is_accessible(app):
+    client = app.test_client()
+    response = client.post(
+        "/tools/api/soap/optimize-blend",
+        json={"oils": [OLIVE, COCONUT, CASTOR], "targets": TARGET_RANGES},
+    )
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["success"] is True
+    assert payload["result"]["ok"] is True
+    assert len(payload["result"]["adjusted_rows"]) == 3
+
+
+def test_public_soap_optimize_blend_api_rejects_oversized_oil_lists(app):
+    from app.services.tools.soap_tool import MAX_OPTIMIZER_OILS
+
+    client = app.test_client()
+    response = client.post(
+        "/tools/api/soap/optimize-blend",
+        json={"oils": [OLIVE] * (MAX_OPTIMIZER_OILS + 1), "targets": TARGET_RANGES},
+    )
+
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+    assert optimize_oil_blend(
+        {"oils": [OLIVE] * (MAX_OPTIMIZER_OILS + 1), "targets": TARGET_RANGES}
+    )["ok"] is False
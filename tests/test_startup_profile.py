@@ -0,0 +1,50 @@
+import os
+
+import pytest
+from sqlalchemy import text
+
+from app.extensions import db
+from scripts.profile_startup import DEFERRED_MODULES, parse_importtime, profile_startup
+
+
+def test_heavy_optional_modules_stay_out_of_boot():
+    stats = profile_startup({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"})
+
+    assert stats["eager_deferred"] == [], stats["eager_deferred"]
+    assert stats["create_app_ms"] > 0 and stats["max_rss_mb"] > 0
+    modules = {row["module"] for row in stats["imports"]}
+    assert "app" in modules and not modules & set(DEFERRED_MODULES)
+
+
+def test_parse_importtime_reads_self_cumulative_and_depth():
+    rows = parse_importtime(
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        450 | app\n"
+        "import time:        30 |         30 |   app.extensions\n"
+    )
+    assert rows == [
+        {"module": "app", "self_us": 120, "cumulative_us": 450, "depth": 0},
+        {"module": "app.extensions", "self_us": 30, "cumulative_us": 30, "depth": 1},
+    ]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_drops_inherited_db_connections(app):
+    with app.app_context():
+        db.session.execute(text("SELECT 1"))
+        db.session.remove()
+        assert db.engine.pool.checkedin() == 1
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # child
+            os.close(read_fd)
+            os.write(write_fd, str(db.engine.pool.checkedin()).encode())
+            os._exit(0)
+        os.close(write_fd)
+        child_checked_in = int(os.read(read_fd, 16).decode())
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+
+        assert child_checked_in == 0
+        assert db.engine.pool.checkedin() == 1
@@ -0,0 +1,98 @@
+import pytest
+from flask import g
+
+from app.extensions import db
+from app.models import Unit
+from app.utils.unit_utils import UnitOption, UnitSearchIndex
+
+
+def _legacy_search(units, query, unit_type, limit):
+    matches = [u for u in units if not unit_type or u.unit_type == unit_type]
+    if query:
+        matches = [u for u in matches if query.lower() in (u.name or "").lower()]
+    matches.sort(key=lambda u: (str(u.unit_type or ""), str(u.name or "")))
+    return matches[:limit]
+
+
+def test_index_matches_legacy_substring_search_and_adds_symbol_prefixes():
+    names = [
+        ("gram", "g", "weight"),
+        ("kilogram", "kg", "weight"),
+        ("ounce", "oz", "weight"),
+        ("fluid ounce", "fl oz", "volume"),
+        ("milliliter", "ml", "volume"),
+        ("liter", "L", "volume"),
+        ("Piece", None, "count"),
+        ("dozen", "dz", "count"),
+        ("Gallon", "gal", "volume"),
+    ]
+    units = [
+        UnitOption(id=i, name=name, symbol=symbol, unit_type=unit_type)
+        for i, (name, symbol, unit_type) in enumerate(names)
+    ]
+    index = UnitSearchIndex(reversed(units))
+
+    for query in ["", "g", "Gram", "ounce", "unc", "l", "LI", "ter", "zz", " piece "]:
+        for unit_type in [None, "weight", "volume", "count", "length"]:
+            legacy = _legacy_search(units, query.strip(), unit_type, 50)
+            found = index.search(query, unit_type, limit=50)
+            # Every legacy (name substring) match is returned, in the same order.
+            assert [u for u in found if u in legacy] == legacy, (query, unit_type)
+            for extra in set(found) - set(legacy):
+                assert (extra.symbol or "").lower().startswith(query.strip().lower())
+
+    assert [u.name for u in index.search("fl", "volume")] == ["fluid ounce"]
+    assert [u.name for u in index.search("gal")] == ["Gallon"]
+    assert [u.name for u in index.search("", "weight", limit=2)] == ["gram", "kilogram"]
+
+
+def _login(client, user_id):
+    with client.session_transaction() as sess:
+        sess["_user_id"] = str(user_id)
+        sess["_fresh"] = True
+
+
+@pytest.mark.usefixtures("app")
+def test_reference_data_is_etagged_and_changes_with_units(app, client, test_user):
+    app.config["SKIP_PERMISSIONS"] = True
+    user_id, org_id = test_user.id, test_user.organization_id
+    _login(client, user_id)
+
+    first = client.get("/api/reference-data")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    body = first.get_json()
+    assert {"units", "categories", "containers", "version"} <= set(body)
+    assert first.cache_control.private
+    assert first.cache_control.max_age == 60
+    assert not first.cache_control.no_cache
+
+    unchanged = client.get("/api/reference-data", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.data == b""
+    by_version = client.get(f"/api/reference-data?v={body['version']}")
+    assert by_version.status_code == 304
+
+    with app.app_context():
+        db.session.add(
+            Unit(
+                name="zz Custom Scoop",
+                symbol="scp",
+                unit_type="count",
+                conversion_factor=1.0,
+                is_custom=True,
+                organization_id=org_id,
+            )
+        )
+        db.session.commit()
+    # The test_user fixture keeps one app context open across these requests,
+    # so drop the per-request unit memo a real request would start without.
+    g.pop("_global_unit_list", None)
+
+    changed = client.get("/api/reference-data", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert "zz Custom Scoop" in [u["name"] for u in changed.get_json()["units"]]
+
+    search = client.get("/api/unit-search?type=count&q=scp")
+    assert [u["name"] for u in search.get_json()["data"]] == ["zz Custom Scoop"]